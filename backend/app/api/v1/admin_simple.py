@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from typing import Dict, Any, Optional
 from datetime import datetime
+import logging
 import re
 
 from app.core.database import get_db
 from app.utils.supabase_deps import require_admin_supabase as require_admin
 from app.models.user import User
+from app.utils.search import USER_FULL_NAME, search_condition, search_rank
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["admin"])
 
+# Columns matched by the user search (trigram indexed)
+USER_SEARCH_COLUMNS = (User.email, User.username, USER_FULL_NAME)
+
 @router.get("/dashboard")
 async def get_admin_dashboard(
     current_admin: User = Depends(require_admin),
@@ -87,15 +94,7 @@ async def list_users(
         filters.append(User.deleted_at.is_(None))
     
     if search:
-        search_term = f"%{search}%"
-        filters.append(
-            or_(
-                User.email.ilike(search_term),
-                User.first_name.ilike(search_term),
-                User.last_name.ilike(search_term),
-                User.username.ilike(search_term)
-            )
-        )
+        filters.append(search_condition(search, *USER_SEARCH_COLUMNS))
     
     if role:
         if role == "admin":
@@ -110,7 +109,9 @@ async def list_users(
     count_query = select(func.count()).select_from(query.subquery())
     total_count = await db.scalar(count_query)
     
-    # Apply pagination
+    # Apply pagination; searches list the closest matches first
+    if search:
+        query = query.order_by(search_rank(search, *USER_SEARCH_COLUMNS).desc())
     query = query.order_by(User.created_at.desc())
     query = query.offset((page - 1) * per_page).limit(per_page)
     
@@ -483,4 +484,123 @@ async def get_audit_log(
         "page": page,
         "per_page": per_page,
         "pages": 0
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/moderation/reload")
+async def reload_moderation_terms(
+    current_admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Recompile this worker's debate moderation word lists from moderation_terms.
+    
+    Other workers pick up the change on their next periodic check.
+    """
+    from app.services.moderation_lexicon import moderation_lexicon
+    
+    active_terms = await moderation_lexicon.reload(db)
+    return {
+        "active_terms": active_terms,
+        "compiled_terms": moderation_lexicon.current.size
+    }
+
+
+def _format_ai_usage(
+    feature, model, calls, errors, retries, cache_hits, cache_misses,
+    prompt_tokens, output_tokens, latency_ms_total, cost_usd
+) -> Dict[str, Any]:
+    """One feature/model row of the AI usage report"""
+    calls, cache_hits, cache_misses = calls or 0, cache_hits or 0, cache_misses or 0
+    latency_ms_total = latency_ms_total or 0
+    lookups = cache_hits + cache_misses
+    return {
+        "feature": feature,
+        "model": model,
+        "calls": calls,
+        "errors": errors or 0,
+        "retries": retries or 0,
+        "cache_hits": cache_hits,
+        "cache_misses": cache_misses,
+        "cache_hit_rate": round(cache_hits / lookups, 3) if lookups else None,
+        "prompt_tokens": prompt_tokens or 0,
+        "output_tokens": output_tokens or 0,
+        "total_latency_seconds": round(latency_ms_total / 1000, 1),
+        "avg_latency_ms": round(latency_ms_total / calls) if calls else None,
+        "estimated_cost_usd": float(cost_usd or 0)
+    }
+
+
+@router.get("/ai-usage")
+async def get_ai_usage(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    feature: Optional[str] = None,
+    current_admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+) -> Dict[str, Any]:
+    """Get AI call latency, token usage, cache hits and estimated cost per feature and model."""
+    from datetime import timedelta, timezone
+    from app.core.ai_telemetry import ai_telemetry
+    from app.models.ai_usage import AICallRollup
+    
+    try:
+        # Include whatever this worker has not flushed yet
+        await ai_telemetry.flush_to_db(db)
+    except Exception as e:
+        logger.warning(f"Failed to flush AI call rollups, serving this worker's totals: {e}")
+        await db.rollback()
+        # Totals since this worker started; other workers' calls are not included
+        snapshot = ai_telemetry.snapshot()
+        return {
+            "hours": hours,
+            "source": "worker_snapshot",
+            "usage": [
+                _format_ai_usage(
+                    name, model, stats.calls, stats.errors, stats.retries,
+                    stats.cache_hits, stats.cache_misses, stats.prompt_tokens,
+                    stats.output_tokens, int(stats.latency_seconds * 1000), stats.cost_usd
+                )
+                for (name, model), stats in sorted(
+                    snapshot.items(), key=lambda item: item[1].latency_seconds, reverse=True
+                )
+                if not feature or name == feature
+            ]
+        }
+    
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    query = (
+        select(
+            AICallRollup.feature,
+            AICallRollup.model,
+            func.sum(AICallRollup.calls).label("calls"),
+            func.sum(AICallRollup.errors).label("errors"),
+            func.sum(AICallRollup.retries).label("retries"),
+            func.sum(AICallRollup.cache_hits).label("cache_hits"),
+            func.sum(AICallRollup.cache_misses).label("cache_misses"),
+            func.sum(AICallRollup.prompt_tokens).label("prompt_tokens"),
+            func.sum(AICallRollup.output_tokens).label("output_tokens"),
+            func.sum(AICallRollup.latency_ms_total).label("latency_ms_total"),
+            func.sum(AICallRollup.cost_usd).label("cost_usd")
+        )
+        .where(AICallRollup.bucket_start >= since)
+        .group_by(AICallRollup.feature, AICallRollup.model)
+        .order_by(func.sum(AICallRollup.latency_ms_total).desc())
+    )
+    if feature:
+        query = query.where(AICallRollup.feature == feature)
+    
+    result = await db.execute(query)
+    
+    usage = [
+        _format_ai_usage(
+            row.feature, row.model, row.calls, row.errors, row.retries,
+            row.cache_hits, row.cache_misses, row.prompt_tokens,
+            row.output_tokens, row.latency_ms_total, row.cost_usd
+        )
+        for row in result
+    ]
+    
+    return {
+        "hours": hours,
+        "source": "rollups",
+        "usage": usage
+    }
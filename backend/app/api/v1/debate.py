@@ -6,7 +6,7 @@ from uuid import UUID
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
@@ -24,8 +24,10 @@ from app.schemas.debate import (
     ContentFlagUpdate,
     DebateAssignmentFilters
 )
+from app.services.debate_service import DebateService
 
 router = APIRouter(prefix="/debate", tags=["debate"])
+debate_service = DebateService()
 
 
 def require_teacher(current_user: User = Depends(get_current_user)) -> User:
@@ -62,6 +64,7 @@ async def create_debate_assignment(
 async def list_debate_assignments(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; replaces page"),
     search: Optional[str] = None,
     grade_level: Optional[str] = None,
     subject: Optional[str] = None,
@@ -72,63 +75,24 @@ async def list_debate_assignments(
     db: AsyncSession = Depends(get_db)
 ):
     """List teacher's debate assignments with filtering and pagination"""
-    # Base query
-    query = select(DebateAssignment).where(
-        DebateAssignment.teacher_id == current_teacher.id
+    filters = DebateAssignmentFilters(
+        search=search,
+        grade_level=grade_level,
+        subject=subject,
+        date_from=date_from,
+        date_to=date_to,
+        include_archived=include_archived
     )
-    
-    # Apply filters
-    filters = []
-    
-    if not include_archived:
-        filters.append(DebateAssignment.deleted_at.is_(None))
-    
-    if search:
-        search_term = f"%{search}%"
-        filters.append(
-            or_(
-                DebateAssignment.title.ilike(search_term),
-                DebateAssignment.topic.ilike(search_term),
-                DebateAssignment.description.ilike(search_term)
-            )
+    try:
+        listing = await debate_service.list_assignments(
+            db, current_teacher.id, filters, page=page, per_page=per_page, cursor=cursor
         )
-    
-    if grade_level:
-        filters.append(DebateAssignment.grade_level == grade_level)
-    
-    if subject:
-        filters.append(DebateAssignment.subject == subject)
-    
-    if date_from:
-        filters.append(DebateAssignment.created_at >= date_from)
-    
-    if date_to:
-        filters.append(DebateAssignment.created_at <= date_to)
-    
-    if filters:
-        query = query.where(and_(*filters))
-    
-    # Get total count
-    total_query = select(func.count()).select_from(
-        select(DebateAssignment).where(
-            DebateAssignment.teacher_id == current_teacher.id
-        ).subquery()
-    )
-    total_result = await db.execute(total_query)
-    total_count = total_result.scalar()
-    
-    # Get filtered count
-    filtered_query = select(func.count()).select_from(query.subquery())
-    filtered_result = await db.execute(filtered_query)
-    filtered_count = filtered_result.scalar()
-    
-    # Apply pagination
-    query = query.order_by(DebateAssignment.created_at.desc())
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    
-    # Execute query
-    result = await db.execute(query)
-    assignments = result.scalars().all()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    assignments = listing["assignments"]
     
     # Convert to summary format
     assignment_summaries = []
@@ -151,10 +115,11 @@ async def list_debate_assignments(
     
     return DebateAssignmentListResponse(
         assignments=assignment_summaries,
-        total=total_count,
-        filtered=filtered_count,
+        total=listing["total"],
+        filtered=listing["filtered"],
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=listing["next_cursor"]
     )
 
 
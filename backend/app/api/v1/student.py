@@ -5,7 +5,7 @@ import logging
 from sqlalchemy import select, and_, or_, func, exists, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi import status as http_status
 from pydantic import BaseModel, Field
 
@@ -13,7 +13,7 @@ from app.core.database import get_db
 from app.models.user import User, UserRole
 from app.models.classroom import Classroom, ClassroomStudent, ClassroomAssignment, StudentAssignment
 from app.models.reading import ReadingAssignment
-from app.models.vocabulary import VocabularyList
+from app.models.vocabulary import VocabularyList, VocabularyWord
 from app.models.debate import DebateAssignment
 from app.models.writing import WritingAssignment
 from app.models.vocabulary_practice import VocabularyPuzzleAttempt, VocabularyFillInBlankAttempt, VocabularyPracticeProgress
@@ -21,6 +21,7 @@ from app.models.umaread import UmareadAssignmentProgress
 from app.models.tests import AssignmentTest, StudentTestAttempt
 from app.models.umatest import TestAssignment
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
+from app.utils.http_cache import make_etag, not_modified
 from app.schemas.classroom import ClassroomResponse
 from app.services.vocabulary_practice import VocabularyPracticeService
 from app.services.vocabulary_test import VocabularyTestService
@@ -320,6 +321,8 @@ async def leave_classroom(
 @router.get("/vocabulary/{assignment_id}")
 async def get_vocabulary_assignment(
     assignment_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(require_student_or_teacher),
     db: AsyncSession = Depends(get_db)
 ):
@@ -374,6 +377,20 @@ async def get_vocabulary_assignment(
             detail="This assignment is not currently active"
         )
     
+    # Revalidate against the list, its words and the classroom settings before loading words
+    word_stats = (await db.execute(
+        select(func.count(VocabularyWord.id), func.max(VocabularyWord.updated_at))
+        .where(VocabularyWord.list_id == assignment_id)
+    )).one()
+    etag = make_etag(
+        "vocabulary", assignment_id, vocab_list.updated_at, *word_stats,
+        classroom_assignment.vocab_settings, classroom_assignment.start_date, classroom_assignment.end_date,
+        classroom.name, teacher.first_name, teacher.last_name
+    )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
     # Get all words for this vocabulary list
     from sqlalchemy.orm import selectinload
     words_result = await db.execute(
@@ -1851,30 +1868,16 @@ async def clear_all_vocabulary_sessions(
     logger = logging.getLogger(__name__)
     
     try:
-        from app.core.redis import get_redis_client
-        
-        redis = get_redis_client()
-        
-        # Pattern to match all vocabulary sessions for this user
-        pattern = f"vocab:*:{current_user.id}:*"
-        
-        # Get all matching keys
-        cursor = 0
-        keys_to_delete = []
-        while True:
-            cursor, keys = await redis.scan(cursor, match=pattern, count=1000)
-            keys_to_delete.extend(keys)
-            if cursor == 0:
-                break
+        from app.services.vocabulary_session import VocabularySessionManager
         
-        # Delete all found keys
-        if keys_to_delete:
-            await redis.delete(*keys_to_delete)
+        # The user's session hashes are listed in a per-user index set, so
+        # no keyspace scan is needed
+        sessions_cleared = await VocabularySessionManager().clear_all_user_sessions(current_user.id)
         
         return {
             "success": True,
-            "message": f"Cleared {len(keys_to_delete)} vocabulary session keys",
-            "keys_cleared": len(keys_to_delete)
+            "message": f"Cleared {sessions_cleared} vocabulary session keys",
+            "keys_cleared": sessions_cleared
         }
         
     except Exception as e:
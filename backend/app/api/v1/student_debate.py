@@ -4,14 +4,16 @@ from uuid import UUID
 import random
 import logging
 import asyncio
+import time
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
+from app.utils.http_cache import PUBLIC_SHORT, make_etag, not_modified
 from app.models.user import User
 from app.models.debate import (
     DebateAssignment, 
@@ -39,6 +41,10 @@ ai_service = DebateAIService()
 moderation_service = ContentModerationService()
 scoring_service = DebateScoringService()
 
+# Rhetorical techniques are seed data; each worker rebuilds its copy at most this often
+TECHNIQUES_CACHE_SECONDS = 300
+_techniques_cache: Optional[tuple] = None  # (expires_at, etag, payload)
+
 
 @router.get("/assignments", response_model=List[AssignmentOverview])
 async def get_student_debate_assignments(
@@ -693,10 +699,18 @@ async def advance_to_next_debate(
 
 @router.get("/techniques/list", response_model=dict)
 async def get_rhetorical_techniques(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all rhetorical techniques for reference."""
+    global _techniques_cache
+    
+    if _techniques_cache and _techniques_cache[0] > time.monotonic():
+        _, etag, payload = _techniques_cache
+        cached = not_modified(request, response, etag, PUBLIC_SHORT)
+        return cached or payload
     
     from app.models.debate import RhetoricalTechnique
     
@@ -727,10 +741,14 @@ async def get_rhetorical_techniques(
         else:
             improper_techniques.append(technique_data)
     
-    return {
+    payload = {
         "proper": proper_techniques,
         "improper": improper_techniques
     }
+    etag = make_etag("techniques", payload)
+    _techniques_cache = (time.monotonic() + TECHNIQUES_CACHE_SECONDS, etag, payload)
+    
+    return not_modified(request, response, etag, PUBLIC_SHORT) or payload
 
 
 @router.post("/{assignment_id}/retry-ai-response")
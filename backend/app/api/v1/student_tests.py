@@ -18,6 +18,7 @@ from app.models.classroom import ClassroomAssignment, ClassroomStudent
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
 from app.services.bypass_validation import validate_bypass_code
 from app.services.test_schedule import TestScheduleService
+from app.services.student_analytics import schedule_rollup_refresh
 from app.schemas.test_schedule import ValidateOverrideRequest
 
 logger = logging.getLogger(__name__)
@@ -288,7 +289,7 @@ async def start_test(
                     # Re-raise HTTP exceptions as-is
                     raise
                 except Exception as validation_error:
-                    print(f"Error validating override code: {validation_error}")
+                    logger.error(f"Error validating override code: {validation_error}")
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         detail=f"Error validating override code: {str(validation_error)}"
@@ -315,6 +316,7 @@ async def start_test(
         # Create test attempt with race condition handling
         max_retries = 3
         retry_count = 0
+        override_used_up = False
         
         while retry_count < max_retries:
             try:
@@ -361,6 +363,19 @@ async def start_test(
                     grace_period_end=grace_period_end
                 )
                 db.add(test_attempt)
+                
+                if override_id:
+                    # Take the override's use in the same transaction as the
+                    # attempt: the attempt only exists if a use was left
+                    await db.flush()
+                    redeemed = await TestScheduleService.record_override_usage(
+                        db, current_user.id, test_attempt.id, override_id=override_id, commit=False
+                    )
+                    if not redeemed:
+                        await db.rollback()
+                        override_used_up = True
+                        break
+                
                 await db.commit()
                 await db.refresh(test_attempt)
                 break  # Success, exit retry loop
@@ -403,35 +418,17 @@ async def start_test(
                         detail=f"Failed to create test attempt: {str(e)}"
                     )
         
-        # If override was used, record the usage now that we have the test_attempt_id
-        if override_id and override_code:
-            try:
-                # Record the override usage and increment count
-                from app.models.test_schedule import TestOverrideUsage, ClassroomTestOverride
-                
-                # Create usage record
-                usage = TestOverrideUsage(
-                    override_id=override_id,
-                    student_id=current_user.id,
-                    test_attempt_id=test_attempt.id
-                )
-                db.add(usage)
-                
-                # Increment usage count on the override
-                override_result = await db.execute(
-                    select(ClassroomTestOverride).where(
-                        ClassroomTestOverride.id == override_id
-                    )
-                )
-                override_record = override_result.scalar_one_or_none()
-                if override_record:
-                    override_record.current_uses += 1
-                    override_record.used_at = datetime.now(timezone.utc)
-                
-                await db.commit()
-            except Exception as usage_error:
-                # Log the error but don't fail the test start
-                print(f"Warning: Failed to record override usage: {usage_error}")
+        if override_used_up:
+            # Other students took the override's last use after it was validated
+            logger.warning(f"Override {override_id} was used up before student {current_user.id} could redeem it")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Testing not available: {availability.message}. Override code invalid: Override code has reached maximum uses",
+                headers={
+                    "X-Next-Window": str(availability.next_window) if availability.next_window else "",
+                    "X-Schedule-Active": str(availability.schedule_active)
+                }
+            )
     
     # Parse test questions
     test_questions = assignment_test.test_questions or []
@@ -585,6 +582,7 @@ async def submit_test(
     # Mark as submitted
     test_attempt.status = "submitted"
     test_attempt.submitted_at = datetime.now(timezone.utc)
+    rollup_module = "umatest" if test_attempt.test_id else "umaread"
     
     await db.commit()
     
@@ -637,6 +635,9 @@ async def submit_test(
             "attempt_id": test_attempt.id,
             "evaluation_error": str(e)
         }
+    finally:
+        # Evaluation has committed (or failed) by now, so the refresh sees the score
+        schedule_rollup_refresh(current_user.id, rollup_module)
 
 
 @router.get("/{assignment_id}/reading-content", response_model=ReadingContentResponse)
@@ -21,6 +21,7 @@ from app.utils.supabase_deps import get_current_user_supabase as get_current_use
 from app.services.test_schedule import TestScheduleService
 from app.services.umatest_evaluation import UMATestEvaluationService
 from app.services.bypass_validation import validate_bypass_code
+from app.services.student_analytics import schedule_rollup_refresh
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -437,6 +438,9 @@ async def submit_umatest(
             "test_attempt_id": str(test_attempt_id),
             "evaluation_status": "pending"
         }
+    finally:
+        # Evaluation has committed (or failed) by now, so the refresh sees the score
+        schedule_rollup_refresh(current_user.id, "umatest")
 
 
 @router.get("/test/debug/{test_attempt_id}")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, update, or_, delete
+from sqlalchemy import select, func, and_, update, delete
 from typing import List, Optional, Dict
 from uuid import UUID
 import os
@@ -8,6 +8,7 @@ import aiofiles
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.core.config import settings
 from app.schemas.classroom import (
     ClassroomCreate, ClassroomResponse, ClassroomUpdate,
@@ -22,12 +23,13 @@ from app.schemas.reading import (
 )
 from app.models import User, Classroom, ClassroomStudent, UserRole
 from app.models.classroom import ClassroomAssignment
-from app.models.reading import ReadingAssignment as ReadingAssignmentModel, AssignmentImage as AssignmentImageModel, ReadingChunk
+from app.models.reading import ReadingAssignment as ReadingAssignmentModel, AssignmentImage as AssignmentImageModel
 from app.services.reading_async import ReadingAssignmentAsyncService
 from app.services.reading import MarkupParser
 from app.services.image_processing import ImageProcessor
 from app.services import classroom as classroom_service
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
+from app.utils.search import search_condition, search_rank
 
 # Import vocabulary router
 from . import vocabulary
@@ -41,6 +43,13 @@ from . import debate
 
 router = APIRouter()
 
+# Columns matched by the reading assignment searches (trigram indexed)
+READING_SEARCH_COLUMNS = (
+    ReadingAssignmentModel.assignment_title,
+    ReadingAssignmentModel.work_title,
+    ReadingAssignmentModel.author
+)
+
 # Include vocabulary routes
 # Important: Include chains router first to avoid route conflicts with vocabulary/{list_id}
 router.include_router(vocabulary_chains.router, prefix="/vocabulary", tags=["vocabulary-chains"])
@@ -590,13 +599,7 @@ async def get_classroom_available_assignments(
     
     # Apply filters
     if search:
-        query = query.where(
-            or_(
-                ReadingAssignmentModel.assignment_title.ilike(f"%{search}%"),
-                ReadingAssignmentModel.work_title.ilike(f"%{search}%"),
-                ReadingAssignmentModel.author.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(search_condition(search, *READING_SEARCH_COLUMNS))
     
     if assignment_type and assignment_type != "all":
         query = query.where(ReadingAssignmentModel.assignment_type == assignment_type)
@@ -615,7 +618,9 @@ async def get_classroom_available_assignments(
     count_result = await db.execute(select(func.count()).select_from(query.subquery()))
     total_count = count_result.scalar() or 0
     
-    # Apply pagination and sorting
+    # Apply pagination and sorting; searches list the closest matches first
+    if search:
+        query = query.order_by(search_rank(search, *READING_SEARCH_COLUMNS).desc())
     query = query.order_by(ReadingAssignmentModel.created_at.desc())
     query = query.offset((page - 1) * per_page).limit(per_page)
     
@@ -1232,14 +1237,7 @@ async def list_reading_assignments(
     
     # Apply search filter
     if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                ReadingAssignmentModel.assignment_title.ilike(search_term),
-                ReadingAssignmentModel.work_title.ilike(search_term),
-                ReadingAssignmentModel.author.ilike(search_term)
-            )
-        )
+        query = query.where(search_condition(search, *READING_SEARCH_COLUMNS))
     
     # Apply date filters
     if date_from:
@@ -1261,20 +1259,22 @@ async def list_reading_assignments(
     total_result = await db.execute(count_query)
     total_count = total_result.scalar() or 0
     
-    # Apply ordering and pagination
+    # Apply ordering and pagination; searches list the closest matches first
+    if search:
+        query = query.order_by(search_rank(search, *READING_SEARCH_COLUMNS).desc())
     query = query.order_by(ReadingAssignmentModel.created_at.desc()).offset(skip).limit(limit)
     
     # Execute query
     result = await db.execute(query)
     assignments = result.scalars().all()
     
-    return ReadingAssignmentListResponse(
+    return FastJSONResponse(ReadingAssignmentListResponse(
         assignments=assignments,
         total=total_count,
         filtered=total_count,  # Since we're showing filtered results
         page=(skip // limit) + 1,
         per_page=limit
-    )
+    ))
 
 
 @router.get("/assignments/reading/{assignment_id}", response_model=ReadingAssignment)
@@ -1374,26 +1374,10 @@ async def update_assignment_content(
     assignment.raw_content = content["raw_content"]
     assignment.updated_at = datetime.utcnow()
     
-    # If published, re-parse chunks
+    # If published, re-parse chunks and rewrite only the ones that changed
     if assignment.status == "published":
-        parser = MarkupParser()
-        chunks = parser.parse_chunks(content["raw_content"])
-        
-        # Delete existing chunks
-        from sqlalchemy import delete
-        await db.execute(
-            delete(ReadingChunk).where(ReadingChunk.assignment_id == assignment_id)
-        )
-        
-        # Create new chunks
-        for idx, (chunk_content, has_important) in enumerate(chunks):
-            chunk = ReadingChunk(
-                assignment_id=assignment_id,
-                chunk_order=idx + 1,
-                content=chunk_content,
-                has_important_sections=has_important
-            )
-            db.add(chunk)
+        chunks = MarkupParser.tokenize(content["raw_content"]).chunks
+        await ReadingAssignmentAsyncService.sync_chunks(db, assignment_id, chunks)
         
         assignment.total_chunks = len(chunks)
     
@@ -4,7 +4,7 @@ Unified classroom assignment endpoints for all assignment types
 from typing import Optional, List, Union
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import select, and_, or_, func, delete, update
+from sqlalchemy import select, and_, func, delete, update, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -21,6 +21,7 @@ from app.models.debate import DebateAssignment
 from app.models.writing import WritingAssignment
 from app.models.reading import ReadingAssignment as UMALectureAssignment
 from app.models.umatest import TestAssignment
+from app.utils.search import search_condition, search_rank
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -309,6 +310,22 @@ async def check_assignment_removal(
     )
 
 
+def _apply_search(query, search: Optional[str], *columns):
+    """Filter an assignment listing by the search term and add its rank as a second column"""
+    if not search:
+        return query.add_columns(literal(0.0))
+    return query.where(search_condition(search, *columns)).add_columns(search_rank(search, *columns))
+
+
+def _collect_ranked(rows, search_ranks: dict) -> list:
+    """Split (assignment, rank) rows, recording each rank by assignment id"""
+    assignments = []
+    for assignment, rank in rows:
+        search_ranks[str(assignment.id)] = rank or 0
+        assignments.append(assignment)
+    return assignments
+
+
 @router.get("/classrooms/{classroom_id}/assignments/available/all")
 async def get_all_available_assignments(
     classroom_id: UUID,
@@ -371,6 +388,8 @@ async def get_all_available_assignments(
             assigned_test[ca.assignment_id] = ca
     
     all_assignments = []
+    # Search rank of each listed assignment, by id
+    search_ranks = {}
     
     # Handle reading assignments
     if not assignment_type or assignment_type in ["all", "UMARead", "UMADebate", "UMAWrite", "UMALecture"]:
@@ -384,14 +403,13 @@ async def get_all_available_assignments(
         )
         
         # Apply filters
-        if search:
-            reading_query = reading_query.where(
-                or_(
-                    ReadingAssignmentModel.assignment_title.ilike(f"%{search}%"),
-                    ReadingAssignmentModel.work_title.ilike(f"%{search}%"),
-                    ReadingAssignmentModel.author.ilike(f"%{search}%")
-                )
-            )
+        reading_query = _apply_search(
+            reading_query,
+            search,
+            ReadingAssignmentModel.assignment_title,
+            ReadingAssignmentModel.work_title,
+            ReadingAssignmentModel.author
+        )
         
         if assignment_type and assignment_type != "all":
             reading_query = reading_query.where(ReadingAssignmentModel.assignment_type == assignment_type)
@@ -407,7 +425,7 @@ async def get_all_available_assignments(
         
         # Execute query
         reading_result = await db.execute(reading_query)
-        reading_assignments = reading_result.scalars().all()
+        reading_assignments = _collect_ranked(reading_result.all(), search_ranks)
         
         # Format reading assignments
         for assignment in reading_assignments:
@@ -454,13 +472,12 @@ async def get_all_available_assignments(
         )
         
         # Apply filters
-        if search:
-            vocab_query = vocab_query.where(
-                or_(
-                    VocabularyList.title.ilike(f"%{search}%"),
-                    VocabularyList.context_description.ilike(f"%{search}%")
-                )
-            )
+        vocab_query = _apply_search(
+            vocab_query,
+            search,
+            VocabularyList.title,
+            VocabularyList.context_description
+        )
         
         if grade_level and grade_level != "all":
             vocab_query = vocab_query.where(VocabularyList.grade_level == grade_level)
@@ -473,7 +490,7 @@ async def get_all_available_assignments(
         
         # Execute query
         vocab_result = await db.execute(vocab_query)
-        vocab_lists = vocab_result.scalars().all()
+        vocab_lists = _collect_ranked(vocab_result.all(), search_ranks)
         
         # Get word counts
         word_counts = {}
@@ -528,14 +545,13 @@ async def get_all_available_assignments(
         )
         
         # Apply filters
-        if search:
-            debate_query = debate_query.where(
-                or_(
-                    DebateAssignment.title.ilike(f"%{search}%"),
-                    DebateAssignment.topic.ilike(f"%{search}%"),
-                    DebateAssignment.description.ilike(f"%{search}%")
-                )
-            )
+        debate_query = _apply_search(
+            debate_query,
+            search,
+            DebateAssignment.title,
+            DebateAssignment.topic,
+            DebateAssignment.description
+        )
         
         if grade_level and grade_level != "all":
             debate_query = debate_query.where(DebateAssignment.grade_level == grade_level)
@@ -548,7 +564,7 @@ async def get_all_available_assignments(
         
         # Execute query
         debate_result = await db.execute(debate_query)
-        debate_assignments = debate_result.scalars().all()
+        debate_assignments = _collect_ranked(debate_result.all(), search_ranks)
         
         # Format debate assignments
         for assignment in debate_assignments:
@@ -593,14 +609,13 @@ async def get_all_available_assignments(
         )
         
         # Apply filters
-        if search:
-            writing_query = writing_query.where(
-                or_(
-                    WritingAssignment.title.ilike(f"%{search}%"),
-                    WritingAssignment.prompt_text.ilike(f"%{search}%"),
-                    WritingAssignment.subject.ilike(f"%{search}%")
-                )
-            )
+        writing_query = _apply_search(
+            writing_query,
+            search,
+            WritingAssignment.title,
+            WritingAssignment.prompt_text,
+            WritingAssignment.subject
+        )
         
         if grade_level and grade_level != "all":
             writing_query = writing_query.where(WritingAssignment.grade_level == grade_level)
@@ -613,7 +628,7 @@ async def get_all_available_assignments(
         
         # Execute query
         writing_result = await db.execute(writing_query)
-        writing_assignments = writing_result.scalars().all()
+        writing_assignments = _collect_ranked(writing_result.all(), search_ranks)
         
         # Format writing assignments
         for assignment in writing_assignments:
@@ -658,13 +673,12 @@ async def get_all_available_assignments(
         )
         
         # Apply filters
-        if search:
-            test_query = test_query.where(
-                or_(
-                    TestAssignment.test_title.ilike(f"%{search}%"),
-                    TestAssignment.test_description.ilike(f"%{search}%")
-                )
-            )
+        test_query = _apply_search(
+            test_query,
+            search,
+            TestAssignment.test_title,
+            TestAssignment.test_description
+        )
         
         if status:
             if status == "assigned":
@@ -674,7 +688,7 @@ async def get_all_available_assignments(
         
         # Execute query
         test_result = await db.execute(test_query)
-        test_assignments = test_result.scalars().all()
+        test_assignments = _collect_ranked(test_result.all(), search_ranks)
         
         # Format test assignments
         for assignment in test_assignments:
@@ -709,9 +723,15 @@ async def get_all_available_assignments(
             
             all_assignments.append(test_dict)
     
-    # Sort all assignments by created_at desc
+    # Sort all assignments by search rank (when searching), then created_at desc
     # Handle both offset-naive and offset-aware datetimes
-    all_assignments.sort(key=lambda x: x["created_at"].replace(tzinfo=None) if x["created_at"] else datetime.min, reverse=True)
+    all_assignments.sort(
+        key=lambda x: (
+            search_ranks.get(x["id"], 0),
+            x["created_at"].replace(tzinfo=None) if x["created_at"] else datetime.min
+        ),
+        reverse=True
+    )
     
     # Apply pagination
     total_count = len(all_assignments)
@@ -5,16 +5,16 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from uuid import UUID
 from decimal import Decimal
-from sqlalchemy import select, and_, func, desc, or_, text, union_all
+from sqlalchemy import select, and_, desc, text, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from pydantic import BaseModel
 import csv
 import io
-import json
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
 from app.models.user import User, UserRole
 from app.models.classroom import StudentEvent, Classroom, ClassroomStudent, ClassroomAssignment, StudentAssignment
@@ -24,11 +24,11 @@ from app.models.vocabulary import VocabularyList
 from app.models.debate import DebateAssignment, StudentDebate
 from app.models.writing import WritingAssignment, StudentWritingSubmission
 from app.models.umatest import TestAssignment
-from app.models.vocabulary_test import VocabularyTestAttempt
-from app.models.vocabulary_practice import VocabularyPracticeProgress, VocabularyStoryResponse, VocabularyConceptMap
+from app.models.vocabulary_practice import VocabularyStoryResponse
 from app.models.umaread import UmareadStudentResponse
-from app.models.debate import DebatePost, DebateChallenge
-from app.models.tests import TestQuestionEvaluation
+from app.models.debate import DebatePost
+from app.services.student_analytics import get_student_module_analytics
+from app.utils.search import USER_FULL_NAME, escape_like, search_condition
 
 router = APIRouter()
 
@@ -372,14 +372,7 @@ async def get_gradebook(
         if completed_before:
             umaread_query = umaread_query.where(StudentAssignment.completed_at <= completed_before)
         if student_search:
-            search_term = f"%{student_search}%"
-            umaread_query = umaread_query.where(
-                or_(
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                    func.concat(User.first_name, ' ', User.last_name).ilike(search_term)
-                )
-            )
+            umaread_query = umaread_query.where(search_condition(student_search, USER_FULL_NAME))
         if completion_status == "completed":
             umaread_query = umaread_query.where(StudentTestAttempt.id.isnot(None))
         elif completion_status == "incomplete":
@@ -438,6 +431,7 @@ async def get_gradebook(
             f"rs.classroom_id IN ({classroom_id_list})",
             "u.deleted_at IS NULL"
         ]
+        params = {}
         
         if assignment_ids:
             assignment_id_list = ','.join([f"'{str(aid)}'" for aid in assignment_ids])
@@ -447,12 +441,9 @@ async def get_gradebook(
         if completed_before:
             filters.append(f"rs.completed_at <= '{completed_before.isoformat()}'")
         if student_search:
-            search_term = student_search.replace("'", "''")  # Escape single quotes
-            filters.append(
-                f"(u.first_name ILIKE '%{search_term}%' OR "
-                f"u.last_name ILIKE '%{search_term}%' OR "
-                f"CONCAT(u.first_name, ' ', u.last_name) ILIKE '%{search_term}%')"
-            )
+            params["student_search"] = f"%{escape_like(student_search.strip())}%"
+            # Same expression as USER_FULL_NAME, so the trigram index applies
+            filters.append("(u.first_name || ' ' || u.last_name) ILIKE :student_search")
         if completion_status == "completed":
             filters.append("rs.score_percentage IS NOT NULL")
         elif completion_status == "incomplete":
@@ -503,7 +494,7 @@ async def get_gradebook(
             WHERE rs.rn = 1 AND {' AND '.join(filters)}
         """
         
-        vocab_result = await db.execute(text(vocab_sql))
+        vocab_result = await db.execute(text(vocab_sql), params)
         vocab_rows = vocab_result.fetchall()
         
         # Process UMAVocab results
@@ -568,14 +559,7 @@ async def get_gradebook(
         if completed_before:
             debate_query = debate_query.where(StudentDebate.updated_at <= completed_before)
         if student_search:
-            search_term = f"%{student_search}%"
-            debate_query = debate_query.where(
-                or_(
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                    func.concat(User.first_name, ' ', User.last_name).ilike(search_term)
-                )
-            )
+            debate_query = debate_query.where(search_condition(student_search, USER_FULL_NAME))
         if completion_status == "completed":
             debate_query = debate_query.where(StudentDebate.final_percentage.isnot(None))
         elif completion_status == "incomplete":
@@ -676,14 +660,7 @@ async def get_gradebook(
         if completed_before:
             write_query = write_query.where(StudentAssignment.completed_at <= completed_before)
         if student_search:
-            search_term = f"%{student_search}%"
-            write_query = write_query.where(
-                or_(
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                    func.concat(User.first_name, ' ', User.last_name).ilike(search_term)
-                )
-            )
+            write_query = write_query.where(search_condition(student_search, USER_FULL_NAME))
         if completion_status == "completed":
             write_query = write_query.where(StudentWritingSubmission.id.isnot(None))
         elif completion_status == "incomplete":
@@ -780,14 +757,7 @@ async def get_gradebook(
         if completed_before:
             umatest_query = umatest_query.where(StudentTestAttempt.submitted_at <= completed_before)
         if student_search:
-            search_term = f"%{student_search}%"
-            umatest_query = umatest_query.where(
-                or_(
-                    User.first_name.ilike(search_term),
-                    User.last_name.ilike(search_term),
-                    func.concat(User.first_name, ' ', User.last_name).ilike(search_term)
-                )
-            )
+            umatest_query = umatest_query.where(search_condition(student_search, USER_FULL_NAME))
         if completion_status == "completed":
             umatest_query = umatest_query.where(StudentTestAttempt.status == 'graded')
         elif completion_status == "incomplete":
@@ -899,7 +869,8 @@ async def get_gradebook(
     end = start + page_size
     paginated_grades = all_grades[start:end]
     
-    return GradebookResponse(
+    # Already validated; serialize once instead of re-validating against response_model
+    return FastJSONResponse(GradebookResponse(
         grades=paginated_grades,
         summary=GradebookSummary(
             total_students=total_students,
@@ -911,7 +882,7 @@ async def get_gradebook(
         total_count=len(all_grades),
         page=page,
         page_size=page_size
-    )
+    ))
 
 
 @router.get("/reports/gradebook/export")
@@ -1186,20 +1157,14 @@ async def get_student_analytics(
         )
     
     try:
-        # Fetch UMARead analytics
-        umaread_data = await get_umaread_analytics(db, student_id)
-        
-        # Fetch UMAVocab analytics
-        umavocab_data = await get_umavocab_analytics(db, student_id)
-        
-        # Fetch UMADebate analytics
-        umadebate_data = await get_umadebate_analytics(db, student_id)
-        
-        # Fetch UMAWrite analytics
-        umawrite_data = await get_umawrite_analytics(db, student_id)
-        
-        # Fetch UMATest analytics
-        umatest_data = await get_umatest_analytics(db, student_id)
+        # Rollups are read in one query; any module without one is computed
+        # live, concurrently, and stored for next time
+        module_analytics = await get_student_module_analytics(db, student_id)
+        umaread_data = module_analytics["umaread"]
+        umavocab_data = module_analytics["umavocab"]
+        umadebate_data = module_analytics["umadebate"]
+        umawrite_data = module_analytics["umawrite"]
+        umatest_data = module_analytics["umatest"]
         
         # Check if student has any meaningful data
         has_data = (
@@ -1249,522 +1214,6 @@ async def get_student_analytics(
         }
 
 
-async def get_umaread_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
-    """Get UMARead analytics for a student"""
-    # Get assignments completed
-    assignments_result = await db.execute(
-        select(StudentAssignment).where(
-            and_(
-                StudentAssignment.student_id == student_id,
-                StudentAssignment.assignment_type == 'reading',
-                StudentAssignment.status.in_(['completed', 'test_completed'])
-            )
-        )
-    )
-    assignments = assignments_result.scalars().all()
-    
-    # Get detailed responses
-    responses_result = await db.execute(
-        select(UmareadStudentResponse).where(
-            UmareadStudentResponse.student_id == student_id
-        ).order_by(UmareadStudentResponse.created_at.desc())
-    )
-    responses = responses_result.scalars().all()
-    
-    # Get test attempts
-    test_attempts_result = await db.execute(
-        select(
-            StudentTestAttempt,
-            TestQuestionEvaluation
-        ).outerjoin(
-            TestQuestionEvaluation,
-            TestQuestionEvaluation.test_attempt_id == StudentTestAttempt.id
-        ).where(
-            and_(
-                StudentTestAttempt.student_id == student_id,
-                StudentTestAttempt.assignment_id.is_not(None)
-            )
-        )
-    )
-    test_data = test_attempts_result.all()
-    
-    # Calculate aggregated metrics
-    total_responses = len(responses)
-    correct_responses = sum(1 for r in responses if r.is_correct)
-    average_comprehension = round((correct_responses / total_responses * 100) if total_responses > 0 else 0)
-    total_time_spent = round(sum(r.time_spent_seconds or 0 for r in responses) / 60)
-    current_difficulty = max((r.difficulty_level or 3 for r in responses), default=3)
-    
-    # Analyze error patterns
-    error_patterns = {}
-    for response in responses:
-        if not response.is_correct:
-            key = f"{response.question_type}_level_{response.difficulty_level}"
-            error_patterns[key] = error_patterns.get(key, 0) + 1
-    
-    # Analyze progression
-    progression_data = []
-    date_stats = {}
-    for response in responses:
-        date = response.created_at.date().isoformat()
-        if date not in date_stats:
-            date_stats[date] = {'total': 0, 'correct': 0}
-        date_stats[date]['total'] += 1
-        if response.is_correct:
-            date_stats[date]['correct'] += 1
-    
-    for date, stats in date_stats.items():
-        progression_data.append({
-            'date': date,
-            'accuracy': round((stats['correct'] / stats['total']) * 100)
-        })
-    
-    return {
-        "assignmentsCompleted": len(assignments),
-        "averageComprehension": average_comprehension,
-        "totalTimeSpent": total_time_spent,
-        "currentDifficulty": current_difficulty,
-        "responses": [
-            {
-                "assignment_id": r.assignment_id,
-                "chunk_number": r.chunk_number,
-                "question_type": r.question_type,
-                "difficulty_level": r.difficulty_level,
-                "is_correct": r.is_correct,
-                "attempt_number": r.attempt_number,
-                "time_spent_seconds": r.time_spent_seconds,
-                "ai_feedback": r.ai_feedback,
-                "occurred_at": r.created_at.isoformat()
-            }
-            for r in responses[:100]  # Limit to most recent 100
-        ],
-        "testAttempts": [
-            {
-                "assignment_id": ta.StudentTestAttempt.assignment_id,
-                "score": float(ta.StudentTestAttempt.score) if ta.StudentTestAttempt.score else None,
-                "time_spent_seconds": ta.StudentTestAttempt.time_spent_seconds,
-                "completed_at": ta.StudentTestAttempt.submitted_at.isoformat() if ta.StudentTestAttempt.submitted_at else None,
-                "question_number": ta.TestQuestionEvaluation.question_number if ta.TestQuestionEvaluation else None,
-                "rubric_score": ta.TestQuestionEvaluation.rubric_score if ta.TestQuestionEvaluation else None,
-                "scoring_rationale": ta.TestQuestionEvaluation.scoring_rationale if ta.TestQuestionEvaluation else None,
-                "key_concepts_identified": ta.TestQuestionEvaluation.key_concepts_identified if ta.TestQuestionEvaluation else None,
-                "misconceptions_detected": ta.TestQuestionEvaluation.misconceptions_detected if ta.TestQuestionEvaluation else None
-            }
-            for ta in test_data
-        ],
-        "errorPatterns": error_patterns,
-        "progressionData": progression_data
-    }
-
-
-async def get_umavocab_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
-    """Get UMAVocab analytics for a student"""
-    # Get vocabulary test attempts
-    test_attempts_result = await db.execute(
-        select(VocabularyTestAttempt).where(
-            VocabularyTestAttempt.student_id == student_id
-        )
-    )
-    test_attempts = test_attempts_result.scalars().all()
-    
-    # Get practice progress
-    practice_result = await db.execute(
-        select(VocabularyPracticeProgress).where(
-            VocabularyPracticeProgress.student_id == student_id
-        )
-    )
-    practice_progress = practice_result.scalars().all()
-    
-    # Get story responses
-    story_result = await db.execute(
-        select(VocabularyStoryResponse).where(
-            VocabularyStoryResponse.student_id == student_id
-        )
-    )
-    story_responses = story_result.scalars().all()
-    
-    # Get concept maps
-    concept_result = await db.execute(
-        select(VocabularyConceptMap).where(
-            VocabularyConceptMap.student_id == student_id
-        )
-    )
-    concept_maps = concept_result.scalars().all()
-    
-    # Calculate metrics
-    lists_completed = len(set(t.test_id for t in test_attempts))
-    average_test_score = round(sum(t.score_percentage for t in test_attempts) / len(test_attempts)) if test_attempts else 0
-    
-    # Count practice activities completed
-    practice_activities_completed = 0
-    for progress in practice_progress:
-        if progress.practice_status:
-            # Handle both dict and string types
-            if isinstance(progress.practice_status, str):
-                try:
-                    practice_data = json.loads(progress.practice_status)
-                except:
-                    continue
-            else:
-                practice_data = progress.practice_status
-            
-            assignments = practice_data.get('assignments', {})
-            practice_activities_completed += sum(
-                1 for a in assignments.values() 
-                if isinstance(a, dict) and a.get('status') == 'completed'
-            )
-    
-    words_mastered = sum(1 for c in concept_maps if c.word_score >= 3.5)
-    
-    # Identify problem words
-    problem_words = {}
-    for attempt in test_attempts:
-        if attempt.responses:
-            # Handle both dict and string types
-            if isinstance(attempt.responses, str):
-                try:
-                    responses_data = json.loads(attempt.responses)
-                except:
-                    continue
-            else:
-                responses_data = attempt.responses
-                
-            for word_id, response in responses_data.items():
-                if isinstance(response, dict) and not response.get('correct'):
-                    problem_words[word_id] = problem_words.get(word_id, 0) + 1
-    
-    problem_words_list = sorted(
-        [{'wordId': k, 'errorCount': v} for k, v in problem_words.items()],
-        key=lambda x: x['errorCount'],
-        reverse=True
-    )[:10]
-    
-    return {
-        "listsCompleted": lists_completed,
-        "averageTestScore": average_test_score,
-        "practiceActivitiesCompleted": practice_activities_completed,
-        "wordsMastered": words_mastered,
-        "testAttempts": [
-            {
-                "test_id": t.test_id,
-                "score_percentage": float(t.score_percentage),
-                "questions_correct": t.questions_correct,
-                "total_questions": t.total_questions,
-                "time_spent_seconds": t.time_spent_seconds,
-                "completed_at": t.completed_at.isoformat() if t.completed_at else None,
-                "responses": t.responses
-            }
-            for t in test_attempts[:50]
-        ],
-        "practiceProgress": [
-            {
-                "vocabulary_list_id": p.vocabulary_list_id,
-                "practice_status": p.practice_status,
-                "updated_at": p.updated_at.isoformat()
-            }
-            for p in practice_progress
-        ],
-        "storyResponses": [
-            {
-                "vocabulary_list_id": s.vocabulary_list_id,
-                "total_score": s.total_score,
-                "ai_evaluation": s.ai_evaluation,
-                "submitted_at": s.submitted_at.isoformat()
-            }
-            for s in story_responses
-        ],
-        "conceptMaps": [
-            {
-                "word_id": c.word_id,
-                "word_score": float(c.word_score),
-                "ai_evaluation": c.ai_evaluation,
-                "completed_at": c.completed_at.isoformat()
-            }
-            for c in concept_maps
-        ],
-        "problemWords": problem_words_list
-    }
-
-
-async def get_umadebate_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
-    """Get UMADebate analytics for a student"""
-    # Get debate participation
-    debates_result = await db.execute(
-        select(StudentDebate).where(
-            StudentDebate.student_id == student_id
-        )
-    )
-    debates = debates_result.scalars().all()
-    
-    # Get debate posts
-    posts_result = await db.execute(
-        select(DebatePost).join(
-            StudentDebate, DebatePost.student_debate_id == StudentDebate.id
-        ).where(
-            and_(
-                StudentDebate.student_id == student_id,
-                DebatePost.post_type == 'student'
-            )
-        )
-    )
-    posts = posts_result.scalars().all()
-    
-    # Get challenges
-    challenges_result = await db.execute(
-        select(DebateChallenge).where(
-            DebateChallenge.student_id == student_id
-        )
-    )
-    challenges = challenges_result.scalars().all()
-    
-    # Calculate metrics
-    debates_completed = sum(1 for d in debates if d.status == 'completed')
-    average_score = round(
-        sum(d.final_percentage or 0 for d in debates if d.final_percentage) / 
-        sum(1 for d in debates if d.final_percentage)
-    ) if any(d.final_percentage for d in debates) else 0
-    
-    techniques_used = len(set(p.selected_technique for p in posts if p.selected_technique))
-    fallacies_identified = sum(1 for c in challenges if c.challenge_type == 'fallacy' and c.is_correct)
-    
-    # Analyze score breakdown
-    score_dimensions = ['clarity', 'evidence', 'logic', 'persuasiveness', 'rebuttal']
-    score_breakdown = []
-    for dimension in score_dimensions:
-        scores = [getattr(p, f"{dimension}_score") for p in posts if getattr(p, f"{dimension}_score") is not None]
-        if scores:
-            score_breakdown.append({
-                'dimension': dimension,
-                'average': round(sum(scores) / len(scores), 1)
-            })
-    
-    return {
-        "debatesCompleted": debates_completed,
-        "averageScore": average_score,
-        "techniquesUsed": techniques_used,
-        "fallaciesIdentified": fallacies_identified,
-        "debates": [
-            {
-                "assignment_id": d.assignment_id,
-                "status": d.status,
-                "debate_1_percentage": float(d.debate_1_percentage) if d.debate_1_percentage else None,
-                "debate_2_percentage": float(d.debate_2_percentage) if d.debate_2_percentage else None,
-                "debate_3_percentage": float(d.debate_3_percentage) if d.debate_3_percentage else None,
-                "final_percentage": float(d.final_percentage) if d.final_percentage else None,
-                "fallacy_counter": d.fallacy_counter,
-                "created_at": d.created_at.isoformat(),
-                "updated_at": d.updated_at.isoformat()
-            }
-            for d in debates
-        ],
-        "posts": [
-            {
-                "debate_number": p.debate_number,
-                "round_number": p.round_number,
-                "clarity_score": float(p.clarity_score) if p.clarity_score else None,
-                "evidence_score": float(p.evidence_score) if p.evidence_score else None,
-                "logic_score": float(p.logic_score) if p.logic_score else None,
-                "persuasiveness_score": float(p.persuasiveness_score) if p.persuasiveness_score else None,
-                "rebuttal_score": float(p.rebuttal_score) if p.rebuttal_score else None,
-                "final_percentage": float(p.final_percentage) if p.final_percentage else None,
-                "selected_technique": p.selected_technique,
-                "technique_bonus_awarded": float(p.technique_bonus_awarded) if p.technique_bonus_awarded else None,
-                "ai_feedback": p.ai_feedback
-            }
-            for p in posts[:100]
-        ],
-        "challenges": [
-            {
-                "challenge_type": c.challenge_type,
-                "is_correct": c.is_correct,
-                "points_awarded": float(c.points_awarded)
-            }
-            for c in challenges
-        ],
-        "scoreBreakdown": score_breakdown
-    }
-
-
-async def get_umawrite_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
-    """Get UMAWrite analytics for a student"""
-    # Get writing submissions
-    submissions_result = await db.execute(
-        select(StudentWritingSubmission).where(
-            StudentWritingSubmission.student_id == student_id
-        ).order_by(StudentWritingSubmission.submitted_at.desc())
-    )
-    submissions = submissions_result.scalars().all()
-    
-    # Calculate metrics
-    assignments_completed = len(set(s.writing_assignment_id for s in submissions))
-    scored_submissions = [s for s in submissions if s.score is not None]
-    average_score = sum(s.score for s in scored_submissions) / len(scored_submissions) if scored_submissions else 0
-    average_word_count = round(sum(s.word_count for s in submissions) / len(submissions)) if submissions else 0
-    
-    # Calculate improvement rate
-    improvement_rate = 0
-    assignments_by_id = {}
-    for submission in submissions:
-        if submission.writing_assignment_id not in assignments_by_id:
-            assignments_by_id[submission.writing_assignment_id] = []
-        assignments_by_id[submission.writing_assignment_id].append(submission)
-    
-    improvements = []
-    for assignment_id, attempts in assignments_by_id.items():
-        if len(attempts) >= 2:
-            sorted_attempts = sorted(attempts, key=lambda x: x.submission_attempt)
-            first_score = sorted_attempts[0].score or 0
-            last_score = sorted_attempts[-1].score or 0
-            if first_score > 0:
-                improvement = ((last_score - first_score) / first_score) * 100
-                improvements.append(improvement)
-    
-    if improvements:
-        improvement_rate = round(sum(improvements) / len(improvements))
-    
-    # Analyze technique usage
-    technique_usage = {}
-    for submission in submissions:
-        for technique in (submission.selected_techniques or []):
-            technique_usage[technique] = technique_usage.get(technique, 0) + 1
-    
-    # Analyze feedback patterns
-    feedback_patterns = []
-    for submission in submissions:
-        if submission.ai_feedback:
-            if isinstance(submission.ai_feedback, dict):
-                areas = submission.ai_feedback.get('areas_for_improvement', [])
-                feedback_patterns.extend(areas)
-    
-    return {
-        "assignmentsCompleted": assignments_completed,
-        "averageScore": round(average_score, 1),
-        "averageWordCount": average_word_count,
-        "improvementRate": improvement_rate,
-        "submissions": [
-            {
-                "writing_assignment_id": s.writing_assignment_id,
-                "response_text": s.response_text,
-                "selected_techniques": s.selected_techniques,
-                "word_count": s.word_count,
-                "submission_attempt": s.submission_attempt,
-                "score": float(s.score) if s.score else None,
-                "ai_feedback": s.ai_feedback,
-                "submitted_at": s.submitted_at.isoformat()
-            }
-            for s in submissions[:50]
-        ],
-        "techniqueAnalysis": technique_usage,
-        "feedbackPatterns": feedback_patterns[:20]  # Limit to 20 most recent
-    }
-
-
-async def get_umatest_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
-    """Get UMATest analytics for a student"""
-    # Get test attempts
-    test_attempts_result = await db.execute(
-        select(
-            StudentTestAttempt,
-            TestQuestionEvaluation
-        ).outerjoin(
-            TestQuestionEvaluation,
-            TestQuestionEvaluation.test_attempt_id == StudentTestAttempt.id
-        ).where(
-            and_(
-                StudentTestAttempt.student_id == student_id,
-                StudentTestAttempt.test_id.is_not(None)
-            )
-        )
-    )
-    test_data = test_attempts_result.all()
-    
-    # Group by test attempt
-    attempts_dict = {}
-    for row in test_data:
-        attempt = row.StudentTestAttempt
-        evaluation = row.TestQuestionEvaluation
-        
-        if attempt.id not in attempts_dict:
-            attempts_dict[attempt.id] = {
-                'attempt': attempt,
-                'evaluations': []
-            }
-        
-        if evaluation:
-            attempts_dict[attempt.id]['evaluations'].append(evaluation)
-    
-    # Calculate metrics
-    tests_completed = len(set(a['attempt'].test_id for a in attempts_dict.values()))
-    scored_attempts = [a['attempt'] for a in attempts_dict.values() if a['attempt'].score is not None]
-    average_score = round(sum(a.score for a in scored_attempts) / len(scored_attempts)) if scored_attempts else 0
-    pass_rate = round((sum(1 for a in scored_attempts if a.score >= 70) / len(scored_attempts)) * 100) if scored_attempts else 0
-    
-    # Calculate average time per question
-    total_time = 0
-    total_questions = 0
-    for data in attempts_dict.values():
-        if data['attempt'].time_spent_seconds and data['evaluations']:
-            total_time += data['attempt'].time_spent_seconds
-            total_questions += len(data['evaluations'])
-    
-    avg_time_per_question = round(total_time / total_questions) if total_questions > 0 else 0
-    
-    # Analyze concept mastery
-    concept_stats = {}
-    all_misconceptions = []
-    
-    for data in attempts_dict.values():
-        for evaluation in data['evaluations']:
-            if evaluation.key_concepts_identified:
-                for concept in evaluation.key_concepts_identified:
-                    if concept not in concept_stats:
-                        concept_stats[concept] = {'correct': 0, 'total': 0}
-                    concept_stats[concept]['total'] += 1
-                    if evaluation.rubric_score >= 3:
-                        concept_stats[concept]['correct'] += 1
-            
-            if evaluation.misconceptions_detected:
-                all_misconceptions.extend(evaluation.misconceptions_detected)
-    
-    concept_mastery = [
-        {
-            'concept': concept,
-            'mastery': round((stats['correct'] / stats['total']) * 100)
-        }
-        for concept, stats in concept_stats.items()
-    ]
-    
-    return {
-        "testsCompleted": tests_completed,
-        "averageScore": average_score,
-        "passRate": pass_rate,
-        "avgTimePerQuestion": avg_time_per_question,
-        "testAttempts": [
-            {
-                "test_id": data['attempt'].test_id,
-                "score": float(data['attempt'].score) if data['attempt'].score else None,
-                "time_spent_seconds": data['attempt'].time_spent_seconds,
-                "completed_at": data['attempt'].submitted_at.isoformat() if data['attempt'].submitted_at else None,
-                "evaluations": [
-                    {
-                        "question_number": e.question_number,
-                        "rubric_score": e.rubric_score,
-                        "points_earned": float(e.points_earned),
-                        "max_points": float(e.max_points),
-                        "key_concepts_identified": e.key_concepts_identified,
-                        "misconceptions_detected": e.misconceptions_detected,
-                        "scoring_rationale": e.scoring_rationale
-                    }
-                    for e in data['evaluations']
-                ]
-            }
-            for data in list(attempts_dict.values())[:20]  # Limit to 20 most recent
-        ],
-        "conceptMastery": concept_mastery,
-        "misconceptions": list(set(all_misconceptions))[:50]  # Unique misconceptions, limited to 50
-    }
-
-
 @router.get("/student-input/{student_id}")
 async def get_student_input(
     student_id: UUID,
@@ -1976,215 +1425,216 @@ async def get_lecture_progress(
             detail="Access denied to this classroom"
         )
     
-    # Get all UMALecture assignments for this classroom
-    lecture_query = select(
-        ClassroomAssignment.id.label('assignment_id'),
-        ReadingAssignment.id.label('lecture_id'),
-        ReadingAssignment.assignment_title,
-        ReadingAssignment.raw_content
-    ).join(
-        ReadingAssignment,
-        ClassroomAssignment.assignment_id == ReadingAssignment.id
-    ).where(
-        and_(
-            ClassroomAssignment.classroom_id == classroom_id,
-            ClassroomAssignment.assignment_type == 'UMALecture',
-            ClassroomAssignment.removed_from_classroom_at.is_(None),
-            ReadingAssignment.deleted_at.is_(None)
-        )
-    )
-    
-    lecture_result = await db.execute(lecture_query)
-    lectures = lecture_result.all()
-    
-    if not lectures:
-        return {
-            "classroom_id": classroom_id,
-            "classroom_name": classroom.name,
-            "lectures": [],
-            "summary": {
-                "total_students": 0,
-                "students_started": 0,
-                "students_completed": 0,
-                "average_progress": 0.0,
-                "badge_distribution": {}
-            }
-        }
-    
-    # Get all students in the classroom
-    students_query = select(
-        User.id,
-        User.first_name,
-        User.last_name
-    ).join(
-        ClassroomStudent,
-        User.id == ClassroomStudent.student_id
-    ).where(
-        and_(
-            ClassroomStudent.classroom_id == classroom_id,
-            ClassroomStudent.removed_at.is_(None)
+    # One row per (lecture, student) with the per-student progress already
+    # reduced in SQL. Topic counts come from the manifest written at publish
+    # time, so raw_content is never loaded here.
+    progress_sql = text("""
+        WITH lectures AS (
+            SELECT
+                ca.id AS assignment_id,
+                ra.id AS lecture_id,
+                ra.assignment_title,
+                ca.assigned_at,
+                COALESCE((ra.topic_manifest->>'topic_count')::int, 0) AS total_topics
+            FROM classroom_assignments ca
+            JOIN reading_assignments ra ON ra.id = ca.assignment_id
+            WHERE ca.classroom_id = :classroom_id
+            AND ca.assignment_type = 'UMALecture'
+            AND ca.removed_from_classroom_at IS NULL
+            AND ra.deleted_at IS NULL
+        ),
+        students AS (
+            SELECT u.id, u.first_name, u.last_name
+            FROM users u
+            JOIN classroom_students cs ON cs.student_id = u.id
+            WHERE cs.classroom_id = :classroom_id
+            AND cs.removed_at IS NULL
+        ),
+        progress AS (
+            SELECT DISTINCT ON (sa.classroom_assignment_id, sa.student_id)
+                sa.classroom_assignment_id,
+                sa.student_id,
+                sa.started_at,
+                sa.last_activity_at,
+                sa.progress_metadata AS pm
+            FROM student_assignments sa
+            JOIN lectures l ON l.assignment_id = sa.classroom_assignment_id
+            WHERE sa.assignment_type = 'UMALecture'
+            ORDER BY sa.classroom_assignment_id, sa.student_id, sa.created_at
         )
-    ).order_by(User.last_name, User.first_name)
-    
-    students_result = await db.execute(students_query)
-    students = students_result.all()
-    
-    # Process each lecture
+        SELECT
+            l.assignment_id,
+            l.lecture_id,
+            l.assignment_title,
+            l.total_topics,
+            s.id AS student_id,
+            s.first_name,
+            s.last_name,
+            p.started_at,
+            p.last_activity_at,
+            p.pm->>'current_topic' AS current_topic,
+            p.pm->>'current_tab' AS current_tab,
+            COALESCE(p.pm <> '{}'::jsonb, false) AS has_progress,
+            COALESCE((p.pm->>'lecture_complete')::boolean, false) AS lecture_complete,
+            COALESCE(tc.topics_completed, 0) AS topics_completed,
+            COALESCE(tc.basic_completed, false) AS basic_completed,
+            COALESCE(tc.basic_correct, 0) AS basic_correct,
+            COALESCE(tc.basic_total, 0) AS basic_total,
+            COALESCE(tc.intermediate_completed, false) AS intermediate_completed,
+            COALESCE(tc.intermediate_correct, 0) AS intermediate_correct,
+            COALESCE(tc.intermediate_total, 0) AS intermediate_total,
+            COALESCE(tc.advanced_completed, false) AS advanced_completed,
+            COALESCE(tc.advanced_correct, 0) AS advanced_correct,
+            COALESCE(tc.advanced_total, 0) AS advanced_total,
+            COALESCE(tc.expert_completed, false) AS expert_completed,
+            COALESCE(tc.expert_correct, 0) AS expert_correct,
+            COALESCE(tc.expert_total, 0) AS expert_total
+        FROM lectures l
+        -- Keep lectures in a classroom with no students; their counts stay zero
+        LEFT JOIN students s ON true
+        LEFT JOIN progress p
+            ON p.classroom_assignment_id = l.assignment_id
+            AND p.student_id = s.id
+        LEFT JOIN LATERAL (
+            SELECT
+                COUNT(*) FILTER (
+                    WHERE jsonb_typeof(t.value->'completed_tabs') = 'array'
+                    AND jsonb_array_length(t.value->'completed_tabs') > 0
+                ) AS topics_completed,
+                bool_or(t.value->'completed_tabs' ? 'basic') AS basic_completed,
+                SUM(q.basic_correct) AS basic_correct,
+                SUM(q.basic_total) AS basic_total,
+                bool_or(t.value->'completed_tabs' ? 'intermediate') AS intermediate_completed,
+                SUM(q.intermediate_correct) AS intermediate_correct,
+                SUM(q.intermediate_total) AS intermediate_total,
+                bool_or(t.value->'completed_tabs' ? 'advanced') AS advanced_completed,
+                SUM(q.advanced_correct) AS advanced_correct,
+                SUM(q.advanced_total) AS advanced_total,
+                bool_or(t.value->'completed_tabs' ? 'expert') AS expert_completed,
+                SUM(q.expert_correct) AS expert_correct,
+                SUM(q.expert_total) AS expert_total
+            FROM jsonb_each(
+                CASE WHEN jsonb_typeof(p.pm->'topic_completion') = 'object'
+                     THEN p.pm->'topic_completion' ELSE '{}'::jsonb END
+            ) t
+            CROSS JOIN LATERAL (
+                SELECT
+                    COUNT(*) FILTER (WHERE lv.level = 'basic' AND a.answer = 'true'::jsonb) AS basic_correct,
+                    COUNT(*) FILTER (WHERE lv.level = 'basic') AS basic_total,
+                    COUNT(*) FILTER (WHERE lv.level = 'intermediate' AND a.answer = 'true'::jsonb) AS intermediate_correct,
+                    COUNT(*) FILTER (WHERE lv.level = 'intermediate') AS intermediate_total,
+                    COUNT(*) FILTER (WHERE lv.level = 'advanced' AND a.answer = 'true'::jsonb) AS advanced_correct,
+                    COUNT(*) FILTER (WHERE lv.level = 'advanced') AS advanced_total,
+                    COUNT(*) FILTER (WHERE lv.level = 'expert' AND a.answer = 'true'::jsonb) AS expert_correct,
+                    COUNT(*) FILTER (WHERE lv.level = 'expert') AS expert_total
+                FROM jsonb_each(
+                    CASE WHEN jsonb_typeof(t.value->'questions_correct') = 'object'
+                         THEN t.value->'questions_correct' ELSE '{}'::jsonb END
+                ) AS lv(level, answers)
+                CROSS JOIN LATERAL jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(lv.answers) = 'array' THEN lv.answers ELSE '[]'::jsonb END
+                ) AS a(answer)
+            ) q
+        ) tc ON true
+        ORDER BY l.assigned_at, l.assignment_id, s.last_name, s.first_name
+    """)
+
+    result = await db.execute(progress_sql, {"classroom_id": classroom_id})
+    rows = result.mappings().all()
+
+    difficulty_levels = ["basic", "intermediate", "advanced", "expert"]
     lecture_reports = []
-    total_badge_distribution = {"basic": 0, "intermediate": 0, "advanced": 0, "expert": 0}
+    lectures_by_assignment: Dict[int, Dict[str, Any]] = {}
+    total_badge_distribution = {level: 0 for level in difficulty_levels}
     all_progress_percentages = []
     total_students_started = 0
     total_students_completed = 0
-    
-    for lecture in lectures:
-        lecture_id = lecture.lecture_id
-        assignment_id = lecture.assignment_id
-        lecture_metadata = json.loads(lecture.raw_content or "{}")
-        lecture_structure = lecture_metadata.get("lecture_structure", {})
-        topics = lecture_structure.get("topics", {})
-        total_topics = len(topics)
-        
-        # Get student progress for this lecture
-        progress_query = select(
-            StudentAssignment,
-            User.id,
-            User.first_name,
-            User.last_name
-        ).join(
-            User,
-            StudentAssignment.student_id == User.id
-        ).where(
-            and_(
-                StudentAssignment.classroom_assignment_id == assignment_id,
-                StudentAssignment.assignment_type == 'UMALecture'
-            )
-        )
-        
-        progress_result = await db.execute(progress_query)
-        student_progress_data = progress_result.all()
-        
-        # Process student progress
-        student_progress_list = []
-        lecture_badge_distribution = {"basic": 0, "intermediate": 0, "advanced": 0, "expert": 0}
-        lecture_progress_percentages = []
-        lecture_students_started = 0
-        lecture_students_completed = 0
-        
-        for student in students:
-            # Find progress for this student
-            student_assignment = None
-            for prog_data in student_progress_data:
-                if prog_data[1] == student.id:  # User.id
-                    student_assignment = prog_data[0]  # StudentAssignment
-                    break
-            
-            badges = []
-            topics_completed = 0
-            overall_progress = 0.0
-            status = "not_started"
-            
-            if student_assignment and student_assignment.progress_metadata:
-                progress_meta = student_assignment.progress_metadata
-                topic_completion = progress_meta.get("topic_completion", {})
-                
-                # Calculate badges based on highest difficulty completed across all topics
-                difficulty_levels = ["basic", "intermediate", "advanced", "expert"]
-                for level in difficulty_levels:
-                    completed = False
-                    questions_correct = 0
-                    total_questions = 0
-                    
-                    # Check if this difficulty level is completed in any topic
-                    for topic_id, topic_progress in topic_completion.items():
-                        if level in topic_progress.get("completed_tabs", []):
-                            completed = True
-                            lecture_badge_distribution[level] += 1
-                            total_badge_distribution[level] += 1
-                            break
-                        
-                        # Count questions for this level
-                        level_questions = topic_progress.get("questions_correct", {}).get(level, [])
-                        if level_questions:
-                            questions_correct += sum(1 for q in level_questions if q)
-                            total_questions += len(level_questions)
-                    
-                    badges.append({
-                        "level": level,
-                        "completed": completed,
-                        "questions_correct": questions_correct,
-                        "total_questions": total_questions
-                    })
-                
-                # Calculate topics completed
-                topics_completed = len([t for t in topic_completion.values() 
-                                       if t.get("completed_tabs")])
-                
-                # Calculate overall progress
-                if total_topics > 0:
-                    overall_progress = (topics_completed / total_topics) * 100
-                
-                # Determine status
-                if progress_meta.get("lecture_complete"):
-                    status = "completed"
-                    lecture_students_completed += 1
-                    total_students_completed += 1
-                elif topics_completed > 0 or progress_meta.get("current_topic"):
-                    status = "in_progress"
-                    lecture_students_started += 1
-                    total_students_started += 1
-                else:
-                    # Check if they at least started
-                    if student_assignment.started_at:
-                        status = "in_progress"
-                        lecture_students_started += 1
-                        total_students_started += 1
-                
-                lecture_progress_percentages.append(overall_progress)
-                all_progress_percentages.append(overall_progress)
-            else:
-                # No progress - create empty badges
-                for level in ["basic", "intermediate", "advanced", "expert"]:
-                    badges.append({
-                        "level": level,
-                        "completed": False,
-                        "questions_correct": 0,
-                        "total_questions": 0
-                    })
-            
-            student_progress_list.append({
-                "student_id": student.id,
-                "student_name": f"{student.last_name}, {student.first_name}",
+    student_ids = set()
+
+    for row in rows:
+        assignment_id = row["assignment_id"]
+        report = lectures_by_assignment.get(assignment_id)
+        if report is None:
+            report = {
+                "lecture_id": row["lecture_id"],
+                "lecture_title": row["assignment_title"],
                 "assignment_id": assignment_id,
-                "lecture_id": lecture_id,
-                "lecture_title": lecture.assignment_title,
-                "started_at": student_assignment.started_at if student_assignment else None,
-                "last_activity_at": student_assignment.last_activity_at if student_assignment else None,
-                "current_topic": progress_meta.get("current_topic") if student_assignment and student_assignment.progress_metadata else None,
-                "current_tab": progress_meta.get("current_tab") if student_assignment and student_assignment.progress_metadata else None,
-                "topics_completed": topics_completed,
-                "total_topics": total_topics,
-                "badges": badges,
-                "overall_progress": overall_progress,
-                "status": status
+                "students": [],
+                "progress_percentages": [],
+                "summary": {
+                    "total_students": 0,
+                    "students_started": 0,
+                    "students_completed": 0,
+                    "average_progress": 0.0,
+                    "badge_distribution": {level: 0 for level in difficulty_levels}
+                }
+            }
+            lectures_by_assignment[assignment_id] = report
+            lecture_reports.append(report)
+
+        if row["student_id"] is None:
+            continue
+        student_ids.add(row["student_id"])
+        summary = report["summary"]
+        summary["total_students"] += 1
+        total_topics = row["total_topics"]
+        has_progress = row["has_progress"]
+
+        badges = []
+        for level in difficulty_levels:
+            completed = has_progress and row[f"{level}_completed"]
+            if completed:
+                summary["badge_distribution"][level] += 1
+                total_badge_distribution[level] += 1
+            badges.append({
+                "level": level,
+                "completed": completed,
+                "questions_correct": row[f"{level}_correct"] if has_progress else 0,
+                "total_questions": row[f"{level}_total"] if has_progress else 0
             })
-        
-        # Calculate lecture summary
-        lecture_avg_progress = sum(lecture_progress_percentages) / len(lecture_progress_percentages) if lecture_progress_percentages else 0.0
-        
-        lecture_reports.append({
-            "lecture_id": lecture_id,
-            "lecture_title": lecture.assignment_title,
+
+        topics_completed = row["topics_completed"] if has_progress else 0
+        overall_progress = 0.0
+        student_status = "not_started"
+        if has_progress:
+            if total_topics > 0:
+                overall_progress = (topics_completed / total_topics) * 100
+
+            if row["lecture_complete"]:
+                student_status = "completed"
+                summary["students_completed"] += 1
+                total_students_completed += 1
+            elif topics_completed > 0 or row["current_topic"] or row["started_at"]:
+                student_status = "in_progress"
+                summary["students_started"] += 1
+                total_students_started += 1
+
+            report["progress_percentages"].append(overall_progress)
+            all_progress_percentages.append(overall_progress)
+
+        report["students"].append({
+            "student_id": row["student_id"],
+            "student_name": f"{row['last_name']}, {row['first_name']}",
             "assignment_id": assignment_id,
-            "students": student_progress_list,
-            "summary": {
-                "total_students": len(students),
-                "students_started": lecture_students_started,
-                "students_completed": lecture_students_completed,
-                "average_progress": round(lecture_avg_progress, 1),
-                "badge_distribution": lecture_badge_distribution
-            }
+            "lecture_id": row["lecture_id"],
+            "lecture_title": row["assignment_title"],
+            "started_at": row["started_at"],
+            "last_activity_at": row["last_activity_at"],
+            "current_topic": row["current_topic"],
+            "current_tab": row["current_tab"],
+            "topics_completed": topics_completed,
+            "total_topics": total_topics,
+            "badges": badges,
+            "overall_progress": overall_progress,
+            "status": student_status
         })
-    
+
+    for report in lecture_reports:
+        percentages = report.pop("progress_percentages")
+        report["summary"]["average_progress"] = round(
+            sum(percentages) / len(percentages), 1
+        ) if percentages else 0.0
+
     # Calculate overall summary
     overall_avg_progress = sum(all_progress_percentages) / len(all_progress_percentages) if all_progress_percentages else 0.0
     
@@ -2193,10 +1643,10 @@ async def get_lecture_progress(
         "classroom_name": classroom.name,
         "lectures": lecture_reports,
         "summary": {
-            "total_students": len(students),
+            "total_students": len(student_ids),
             "students_started": total_students_started,
             "students_completed": total_students_completed,
             "average_progress": round(overall_avg_progress, 1),
             "badge_distribution": total_badge_distribution
         }
-    }
\ No newline at end of file
+    }
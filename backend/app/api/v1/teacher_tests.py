@@ -17,6 +17,7 @@ from app.models.reading import ReadingAssignment
 from app.models.classroom import ClassroomAssignment, ClassroomStudent
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
 from app.services.test_evaluation_v2 import TestEvaluationServiceV2
+from app.services.student_analytics import schedule_rollup_refresh
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/teacher/tests", tags=["teacher-tests"])
@@ -189,15 +190,16 @@ async def override_test_score(
     # Verify teacher has access to this test attempt
     access_check = await db.execute(
         text("""
-        SELECT sta.id
+        SELECT sta.id, sta.student_id, sta.test_id
         FROM student_test_attempts sta
         JOIN reading_assignments ra ON ra.id = sta.assignment_id
         WHERE sta.id = :attempt_id AND ra.teacher_id = :teacher_id
         """),
         {"attempt_id": test_attempt_id, "teacher_id": current_user.id}
     )
+    attempt_row = access_check.first()
     
-    if not access_check.first():
+    if not attempt_row:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this test attempt"
@@ -344,6 +346,7 @@ async def override_test_score(
     )
     
     await db.commit()
+    schedule_rollup_refresh(attempt_row.student_id, "umatest" if attempt_row.test_id else "umaread")
     
     return {
         "success": True,
@@ -371,15 +374,16 @@ async def regenerate_evaluation(
     # Verify teacher has access
     access_check = await db.execute(
         text("""
-        SELECT sta.id
+        SELECT sta.id, sta.student_id, sta.test_id
         FROM student_test_attempts sta
         JOIN reading_assignments ra ON ra.id = sta.assignment_id
         WHERE sta.id = :attempt_id AND ra.teacher_id = :teacher_id
         """),
         {"attempt_id": test_attempt_id, "teacher_id": current_user.id}
     )
+    attempt_row = access_check.first()
     
-    if not access_check.first():
+    if not attempt_row:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have access to this test attempt"
@@ -448,6 +452,9 @@ async def regenerate_evaluation(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to regenerate evaluation: {str(e)}"
         )
+    finally:
+        # The old score was cleared above either way
+        schedule_rollup_refresh(attempt_row.student_id, "umatest" if attempt_row.test_id else "umaread")
 
 
 @router.get("/evaluation-audits/{test_attempt_id}")
@@ -5,12 +5,13 @@ Phase 1: Test Creation System
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import logging
 
 from app.core.database import get_db, AsyncSessionLocal
+from app.core.responses import FastJSONResponse
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
 from app.models.user import User
 from app.models.umatest import TestAssignment, TestGenerationLog, HandBuiltTestQuestion
@@ -31,6 +32,7 @@ from app.schemas.umatest import (
 )
 from app.services.umatest_ai import umatest_ai_service
 from app.services.umatest_ai_assistant import UMATestAIAssistant
+from app.utils.search import search_condition, search_rank
 
 logger = logging.getLogger(__name__)
 
@@ -146,19 +148,16 @@ async def list_tests(
             query = query.where(TestAssignment.status == status)
     
     if search:
-        query = query.where(
-            or_(
-                TestAssignment.test_title.ilike(f"%{search}%"),
-                TestAssignment.test_description.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(search_condition(search, TestAssignment.test_title, TestAssignment.test_description))
     
     # Get total count
     count_query = select(func.count()).select_from(query.subquery())
     total_result = await db.execute(count_query)
     total_count = total_result.scalar()
     
-    # Apply pagination
+    # Apply pagination; searches list the closest matches first
+    if search:
+        query = query.order_by(search_rank(search, TestAssignment.test_title, TestAssignment.test_description).desc())
     query = query.order_by(TestAssignment.created_at.desc())
     query = query.offset((page - 1) * page_size).limit(page_size)
     
@@ -230,7 +229,8 @@ async def get_test_detail(
     response = TestDetailResponse.from_orm(test)
     response.selected_lectures = lecture_info
     
-    return response
+    # test_structure can be large; serialize it once
+    return FastJSONResponse(response)
 
 
 @router.put("/tests/{test_id}", response_model=TestAssignmentResponse)
@@ -3,7 +3,7 @@ Teacher vocabulary classroom integration endpoints
 """
 from typing import Optional, List
 from uuid import UUID
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -13,6 +13,7 @@ from app.utils.supabase_deps import require_teacher_supabase as require_teacher
 from app.models.user import User
 from app.models.classroom import Classroom, ClassroomAssignment
 from app.models.vocabulary import VocabularyList
+from app.utils.search import search_condition, search_rank
 
 router = APIRouter()
 
@@ -67,12 +68,7 @@ async def get_classroom_available_vocabulary(
     
     # Apply filters
     if search:
-        query = query.where(
-            or_(
-                VocabularyList.title.ilike(f"%{search}%"),
-                VocabularyList.context_description.ilike(f"%{search}%")
-            )
-        )
+        query = query.where(search_condition(search, VocabularyList.title, VocabularyList.context_description))
     
     if grade_level and grade_level != "all":
         query = query.where(VocabularyList.grade_level == grade_level)
@@ -87,7 +83,9 @@ async def get_classroom_available_vocabulary(
     count_result = await db.execute(select(func.count()).select_from(query.subquery()))
     total_count = count_result.scalar() or 0
     
-    # Apply pagination and sorting
+    # Apply pagination and sorting; searches list the closest matches first
+    if search:
+        query = query.order_by(search_rank(search, VocabularyList.title, VocabularyList.context_description).desc())
     query = query.order_by(VocabularyList.created_at.desc())
     query = query.offset((page - 1) * per_page).limit(per_page)
     
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -312,7 +312,7 @@ async def get_schedule_status(
     schedule = await TestScheduleService.get_schedule(db, classroom_id)
     
     # Get current availability
-    availability = await TestScheduleService.check_test_availability(db, classroom_id)
+    availability = TestScheduleService.evaluate_availability(schedule)
     
     # Get active test sessions (would need to implement this query)
     # For now, return 0
@@ -449,25 +449,13 @@ async def get_student_test_availability(
             detail="This endpoint is for students only"
         )
     
-    # Get all classrooms the student is enrolled in
-    result = await db.execute(
-        select(Classroom).join(
-            ClassroomStudent, 
-            and_(
-                ClassroomStudent.classroom_id == Classroom.id,
-                ClassroomStudent.student_id == current_user.id,
-                ClassroomStudent.removed_at.is_(None)
-            )
-        ).where(
-            Classroom.deleted_at.is_(None)
-        )
-    )
-    classrooms = result.scalars().all()
+    # All enrolled classrooms and their schedules in one query
+    classroom_schedules = await TestScheduleService.get_student_schedules(db, current_user.id)
     
+    now = datetime.now(timezone.utc)
     schedule_views = []
-    for classroom in classrooms:
-        availability = TestScheduleService.check_test_availability(db, classroom.id)
-        schedule = await TestScheduleService.get_schedule(db, classroom.id)
+    for classroom, schedule in classroom_schedules:
+        availability = TestScheduleService.evaluate_availability(schedule, now)
         
         view = StudentScheduleView(
             classroom_id=classroom.id,
@@ -478,4 +466,4 @@ async def get_student_test_availability(
         )
         schedule_views.append(view)
     
-    return schedule_views
\ No newline at end of file
+    return schedule_views
@@ -5,7 +5,8 @@ import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, update
+from sqlalchemy import select, and_, func, update, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, Field
 
@@ -193,6 +194,22 @@ async def get_available_tests(
             detail="Only students can view available tests"
         )
     
+    # The student's finished attempts per test: how many, and the latest one
+    # (linked as the result once all attempts are used). Served from
+    # idx_student_test_attempts_student_test_status.
+    attempts = select(
+        func.count(StudentTestAttempt.id).label("attempts_used"),
+        array_agg(
+            aggregate_order_by(StudentTestAttempt.id, StudentTestAttempt.created_at.desc())
+        )[1].label("latest_attempt_id")
+    ).where(
+        and_(
+            StudentTestAttempt.assignment_test_id == AssignmentTest.id,
+            StudentTestAttempt.student_id == current_user.id,
+            StudentTestAttempt.status.in_(["submitted", "evaluated"])  # Only count completed attempts
+        )
+    ).lateral("attempts")
+    
     # Query for available tests - only show tests for completed assignments
     query = select(
         AssignmentTest.id,
@@ -201,7 +218,8 @@ async def get_available_tests(
         AssignmentTest.max_attempts,
         AssignmentTest.expires_at,
         ReadingAssignment.assignment_title,
-        func.count(StudentTestAttempt.id).label("attempts_used")
+        attempts.c.attempts_used,
+        attempts.c.latest_attempt_id
     ).select_from(AssignmentTest).join(
         ReadingAssignment,
         AssignmentTest.assignment_id == ReadingAssignment.id
@@ -212,25 +230,14 @@ async def get_available_tests(
             UmareadAssignmentProgress.student_id == current_user.id,
             UmareadAssignmentProgress.completed_at.isnot(None)  # Must be completed
         )
-    ).outerjoin(
-        StudentTestAttempt,
-        and_(
-            StudentTestAttempt.assignment_test_id == AssignmentTest.id,
-            StudentTestAttempt.student_id == current_user.id,
-            StudentTestAttempt.status.in_(["submitted", "evaluated"])  # Only count completed attempts
-        )
+    ).join(
+        attempts,
+        true()
     ).where(
         and_(
             AssignmentTest.status == "approved",
             AssignmentTest.expires_at > datetime.utcnow()
         )
-    ).group_by(
-        AssignmentTest.id,
-        AssignmentTest.assignment_id,
-        AssignmentTest.time_limit_minutes,
-        AssignmentTest.max_attempts,
-        AssignmentTest.expires_at,
-        ReadingAssignment.assignment_title
     )
     
     results = await db.execute(query)
@@ -249,35 +256,19 @@ async def get_available_tests(
                 "classroom_assignment_id": "",  # Simplified for now
                 "status": "available"
             })
-        elif row.attempts_used > 0:
+        elif row.latest_attempt_id:
             # Has used all attempts - show as completed with link to results
-            # Get the most recent attempt ID for results viewing
-            attempt_query = await db.execute(
-                select(StudentTestAttempt.id)
-                .where(
-                    and_(
-                        StudentTestAttempt.assignment_test_id == row.id,
-                        StudentTestAttempt.student_id == current_user.id,
-                        StudentTestAttempt.status.in_(["submitted", "evaluated"])
-                    )
-                )
-                .order_by(StudentTestAttempt.created_at.desc())
-                .limit(1)
-            )
-            latest_attempt = attempt_query.scalar_one_or_none()
-            
-            if latest_attempt:
-                available_tests.append({
-                    "test_id": str(row.id),
-                    "assignment_id": str(row.assignment_id),
-                    "assignment_title": row.assignment_title,
-                    "time_limit_minutes": row.time_limit_minutes,
-                    "attempts_remaining": 0,
-                    "expires_at": row.expires_at.isoformat(),
-                    "classroom_assignment_id": "",
-                    "status": "completed",
-                    "result_id": str(latest_attempt)
-                })
+            available_tests.append({
+                "test_id": str(row.id),
+                "assignment_id": str(row.assignment_id),
+                "assignment_title": row.assignment_title,
+                "time_limit_minutes": row.time_limit_minutes,
+                "attempts_remaining": 0,
+                "expires_at": row.expires_at.isoformat(),
+                "classroom_assignment_id": "",
+                "status": "completed",
+                "result_id": str(row.latest_attempt_id)
+            })
     
     return available_tests
 
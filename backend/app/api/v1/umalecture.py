@@ -4,7 +4,7 @@ UMALecture API endpoints for teachers and students
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, and_, func, or_, update, delete as sql_delete, text as sql_text
@@ -12,10 +12,12 @@ from datetime import datetime, timezone
 import json
 
 from app.core.database import get_db
+from app.core.responses import FastJSONResponse
 from app.models.user import User, UserRole
 from app.models.classroom import StudentAssignment, ClassroomAssignment
 from app.models.reading import ReadingAssignment
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
+from app.utils.http_cache import make_etag, not_modified
 from app.schemas.umalecture import (
     LectureAssignmentCreate,
     LectureAssignmentResponse,
@@ -490,6 +492,8 @@ async def get_topic_all_content(
     lecture_id: UUID,
     topic_id: str,
     assignment_id: int,
+    request: Request,
+    response: Response,
     student: User = Depends(require_student),
     db: AsyncSession = Depends(get_db)
 ):
@@ -501,6 +505,15 @@ async def get_topic_all_content(
     if not access_check:
         raise HTTPException(status_code=403, detail="Access denied to this lecture")
     
+    # The response includes this student's progress on the topic, so it is part of the version
+    version = await lecture_service.get_content_version(
+        db, assignment_id, topic_id.rstrip('.'), student.id
+    )
+    if version is not None:
+        cached = not_modified(request, response, make_etag("topic", lecture_id, topic_id, version))
+        if cached:
+            return cached
+    
     content = await lecture_service.get_all_topic_content(
         db, lecture_id, topic_id, student.id, assignment_id
     )
@@ -508,7 +521,8 @@ async def get_topic_all_content(
     if not content:
         raise HTTPException(status_code=404, detail="Topic content not found")
     
-    return content
+    # All difficulty levels plus image rows; render directly, keeping the validators
+    return FastJSONResponse(content, headers=dict(response.headers))
 
 
 @router.get("/lectures/{lecture_id}/images/{image_id}")
@@ -553,11 +567,24 @@ async def get_lecture_topics(
 async def get_topic_content(
     assignment_id: int,
     topic_id: str,
+    request: Request,
+    response: Response,
     difficulty: str = "basic",
     student: User = Depends(require_student),
     db: AsyncSession = Depends(get_db)
 ):
     """Get content for a specific topic at a given difficulty level"""
+    version = await lecture_service.get_content_version(db, assignment_id)
+    if version is not None:
+        etag = make_etag("topic", assignment_id, topic_id, difficulty, version)
+        cached = not_modified(request, response, etag)
+        if cached:
+            # A revalidated view is still a view
+            await lecture_service.track_interaction(
+                db, student.id, assignment_id, topic_id, difficulty, "view_content"
+            )
+            return cached
+    
     content = await lecture_service.get_topic_content(
         db, assignment_id, topic_id, difficulty, student.id
     )
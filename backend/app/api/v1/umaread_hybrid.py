@@ -3,7 +3,6 @@ UMARead API with hybrid Redis + PostgreSQL storage
 """
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -14,7 +13,8 @@ from app.core.database import get_db
 from app.models.user import User
 from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
 from app.models.umaread import UmareadStudentResponse, UmareadChunkProgress, UmareadAssignmentProgress
-from app.models.classroom import StudentAssignment, ClassroomAssignment, Classroom, StudentEvent
+from app.models.classroom import StudentAssignment, ClassroomAssignment, Classroom
+from app.services.event_buffer import event_buffer
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
 from app.schemas.umaread import ChunkResponse, AssignmentStartResponse
 from app.services.umaread_simple import UMAReadService
@@ -895,24 +895,16 @@ async def crunch_text(
             db, str(assignment_id), chunk_number
         )
         
-        # Log usage for analytics (optional)
-        try:
-            student_event = StudentEvent(
-                id=str(uuid.uuid4()),
-                student_id=current_user.id,
-                assignment_id=assignment_id,
-                event_type="crunch_text_used",
-                event_data={
-                    "chunk_number": chunk_number,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            )
-            db.add(student_event)
-            await db.commit()
-        except Exception as e:
-            print(f"Warning: Could not log crunch text usage: {e}")
-            # Don't fail the request if logging fails
-            pass
+        # Log usage for analytics (written behind, never fails the request)
+        event_buffer.add_student_event(
+            current_user.id,
+            "crunch_text_used",
+            {
+                "chunk_number": chunk_number,
+                "timestamp": datetime.utcnow().isoformat()
+            },
+            assignment_id=assignment_id
+        )
         
         return {
             "simplified_text": simplified_text,
@@ -4,7 +4,7 @@ Simplified UMARead API endpoints for initial testing
 from typing import Optional
 from uuid import UUID
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import select, and_, func
@@ -14,6 +14,7 @@ from app.core.database import get_db
 from app.models.user import User
 from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
 from app.utils.supabase_deps import get_current_user_supabase as get_current_user
+from app.utils.http_cache import make_etag, not_modified
 from app.schemas.umaread import (
     ChunkResponse,
     AssignmentStartResponse
@@ -23,8 +24,10 @@ from app.services.question_generation import generate_questions_for_chunk, Quest
 from app.services.answer_evaluation import evaluate_answer, should_increase_difficulty
 from app.services.bypass_validation import validate_bypass_code
 from app.services.text_simplification import simplify_chunk_text
+from app.services.student_analytics import schedule_rollup_refresh
 from app.models.reading import AnswerEvaluation
-from app.models.classroom import StudentAssignment, ClassroomAssignment, Classroom, StudentEvent
+from app.models.classroom import StudentAssignment, ClassroomAssignment, Classroom
+from app.services.event_buffer import event_buffer
 import bcrypt
 import re
 
@@ -80,10 +83,19 @@ async def start_assignment(
 async def get_chunk(
     assignment_id: UUID,
     chunk_number: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific chunk's content"""
+    # Revalidate against the assignment's version before loading the chunk
+    version = await umaread_service.get_chunk_version(db, assignment_id)
+    if version is not None:
+        cached = not_modified(request, response, make_etag("chunk", assignment_id, chunk_number, version))
+        if cached:
+            return cached
+
     try:
         return await umaread_service.get_chunk_content(db, assignment_id, chunk_number)
     except ValueError as e:
@@ -431,6 +443,7 @@ async def submit_answer(
                     # Mark assignment as completed in memory
                     completion_key = f"{current_user.id}:{assignment_id}"
                     completed_assignments[completion_key] = True
+                    schedule_rollup_refresh(current_user.id, "umaread")
         
         await db.commit()
         
@@ -537,6 +550,7 @@ async def submit_answer(
                 if not chunk_info.has_next:
                     completion_key = f"{current_user.id}:{assignment_id}"
                     completed_assignments[completion_key] = True
+                    schedule_rollup_refresh(current_user.id, "umaread")
             except:
                 pass
             
@@ -702,26 +716,16 @@ async def crunch_text(
             db, str(assignment_id), chunk_number
         )
         
-        # Log usage for analytics (optional)
-        try:
-            student_event = StudentEvent(
-                id=str(uuid.uuid4()),
-                student_id=current_user.id,
-                assignment_id=assignment_id,
-                event_type="crunch_text_used",
-                event_data={
-                    "chunk_number": chunk_number,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            )
-            db.add(student_event)
-            await db.commit()
-        except Exception as e:
-            print(f"Warning: Could not log crunch text usage: {e}")
-            # Rollback to clean up the session state
-            await db.rollback()
-            # Don't fail the request if logging fails
-            pass
+        # Log usage for analytics (written behind, never fails the request)
+        event_buffer.add_student_event(
+            current_user.id,
+            "crunch_text_used",
+            {
+                "chunk_number": chunk_number,
+                "timestamp": datetime.utcnow().isoformat()
+            },
+            assignment_id=assignment_id
+        )
         
         return {
             "simplified_text": simplified_text,
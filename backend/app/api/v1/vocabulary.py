@@ -1,8 +1,10 @@
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+import gzip
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
@@ -25,6 +27,9 @@ from app.services.vocabulary_story_generator import VocabularyStoryGenerator
 from app.services.vocabulary_puzzle_generator import VocabularyPuzzleGenerator
 from app.services.vocabulary_fill_in_blank_generator import VocabularyFillInBlankGenerator
 from app.services.vocabulary_test import VocabularyTestService
+from app.services.vocabulary_session import VocabularySessionManager
+from app.services.vocabulary_presentation import get_presentation_version, get_presentation_gzip
+from app.utils.http_cache import etag_matches
 import logging
 
 router = APIRouter()
@@ -569,56 +574,81 @@ async def get_review_progress(
 @router.get("/vocabulary/{list_id}/export-presentation")
 async def export_vocabulary_presentation(
     list_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Export vocabulary list as an interactive HTML presentation"""
-    # Get vocabulary list with all words
-    vocabulary_list = await VocabularyService.get_vocabulary_list(db, list_id, include_words=True)
+    # Fingerprint the list without loading its words
+    version = await get_presentation_version(db, list_id)
     
-    if not vocabulary_list:
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vocabulary list not found"
         )
     
     # Check permissions
-    if vocabulary_list.teacher_id != current_user.id and not current_user.is_admin:
+    if version.teacher_id != current_user.id and not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to export this list"
         )
     
     # Check if list is published
-    if vocabulary_list.status != VocabularyStatus.PUBLISHED:
+    if version.status != VocabularyStatus.PUBLISHED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only published vocabulary lists can be exported as presentations"
         )
     
     # Check minimum word count
-    if len(vocabulary_list.words) < 3:
+    if version.word_count < 3:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Vocabulary list must have at least 3 words to create a presentation"
         )
     
-    # Generate HTML presentation
-    html_content = await VocabularyService.generate_presentation_html(vocabulary_list)
-    
     # Create filename
-    safe_title = "".join(c for c in vocabulary_list.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    safe_title = "".join(c for c in version.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
     safe_title = safe_title.replace(' ', '_')[:50]  # Limit length
     filename = f"vocab-presentation-{safe_title}-{datetime.now().strftime('%Y-%m-%d')}.html"
     
+    etag = f'"{version.etag}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(version.last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    
+    # Unchanged since the client's copy
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            if version.last_modified.replace(microsecond=0) <= since:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        except (TypeError, ValueError):
+            pass
+    
+    # Rendered once per list version and cached gzipped
+    body = await get_presentation_gzip(db, version)
+    
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    
     # Return as downloadable file
     return Response(
-        content=html_content,
-        media_type="text/html",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-            "Content-Type": "text/html; charset=utf-8"
-        }
+        content=body,
+        media_type="text/html; charset=utf-8",
+        headers=headers
     )
 
 
@@ -741,6 +771,8 @@ async def update_test_config(
     config = await VocabularyTestService.save_test_config(
         db, list_id, config_data.model_dump()
     )
+    # Students' cached practice status includes the allowed test attempts
+    await VocabularySessionManager().invalidate_list_status(list_id)
     
     # Handle chain membership changes
     from app.services.vocabulary_chain import VocabularyChainService
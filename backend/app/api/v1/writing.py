@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, update, delete
+from sqlalchemy import select, func, and_, update, delete
 from sqlalchemy.orm import selectinload
 from typing import Optional, List
 from uuid import UUID
@@ -24,6 +24,8 @@ from app.schemas.writing import (
     StudentWritingProgress
 )
 from app.services.writing_ai import WritingAIService
+from app.services.student_analytics import schedule_rollup_refresh
+from app.utils.search import search_condition, search_rank
 
 router = APIRouter(prefix="/writing", tags=["writing"])
 logger = logging.getLogger(__name__)
@@ -111,13 +113,7 @@ async def list_writing_assignments(
     
     # Apply filters
     if search:
-        search_term = f"%{search}%"
-        stmt = stmt.where(
-            or_(
-                WritingAssignment.title.ilike(search_term),
-                WritingAssignment.prompt_text.ilike(search_term)
-            )
-        )
+        stmt = stmt.where(search_condition(search, WritingAssignment.title, WritingAssignment.prompt_text))
     
     if grade_level:
         stmt = stmt.where(WritingAssignment.grade_level == grade_level)
@@ -136,7 +132,9 @@ async def list_writing_assignments(
     total_result = await db.execute(count_stmt)
     total = total_result.scalar() or 0
     
-    # Apply pagination
+    # Apply pagination; searches list the closest matches first
+    if search:
+        stmt = stmt.order_by(search_rank(search, WritingAssignment.title, WritingAssignment.prompt_text).desc())
     stmt = stmt.order_by(WritingAssignment.created_at.desc())
     stmt = stmt.offset((page - 1) * per_page).limit(per_page)
     
@@ -641,6 +639,7 @@ async def submit_writing_assignment(
     
     await db.commit()
     await db.refresh(db_submission)
+    schedule_rollup_refresh(current_user.id, "umawrite")
     
     # Store the ID before any additional operations
     submission_id = db_submission.id
@@ -745,6 +744,7 @@ async def evaluate_submission(
             student_assignment.progress_metadata['technique_validations'] = evaluation_result['ai_feedback']['technique_validation']
         
         await db.commit()
+        schedule_rollup_refresh(submission.student_id, "umawrite")
         
         return {
             "message": "Evaluation completed",
@@ -12,7 +12,8 @@ from .ai_models import (
     WRITING_ASSISTANCE_MODEL,
     LECTURE_GENERATION_MODEL,
     get_model_config,
-    get_all_models
+    get_all_models,
+    estimate_cost_usd
 )
 
 from .ai_config import (
@@ -23,7 +24,8 @@ from .ai_config import (
     get_gemini_config,
     get_claude_config,
     get_openai_config,
-    get_whisper_config
+    get_whisper_config,
+    configure_gemini
 )
 
 __all__ = [
@@ -38,6 +40,7 @@ __all__ = [
     'LECTURE_GENERATION_MODEL',
     'get_model_config',
     'get_all_models',
+    'estimate_cost_usd',
     
     # AI Configs
     'GeminiConfig',
@@ -47,5 +50,6 @@ __all__ = [
     'get_gemini_config',
     'get_claude_config',
     'get_openai_config',
-    'get_whisper_config'
+    'get_whisper_config',
+    'configure_gemini'
 ]
\ No newline at end of file
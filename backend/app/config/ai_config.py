@@ -16,6 +16,9 @@ class GeminiConfig(BaseSettings):
     timeout: int = 30
     temperature: float = 0.7
     max_output_tokens: int = 2048
+    # Alternate Gemini-compatible endpoint, e.g. the local load-test stub
+    # (http://127.0.0.1:8089). Empty means the public Google API.
+    api_endpoint: str = os.getenv("GEMINI_API_ENDPOINT", "")
     
     class Config:
         env_prefix = "GEMINI_"
@@ -97,4 +100,27 @@ def get_whisper_config() -> WhisperConfig:
     global _whisper_config
     if _whisper_config is None:
         _whisper_config = WhisperConfig()
-    return _whisper_config
\ No newline at end of file
+    return _whisper_config
+
+
+def configure_gemini(api_key: Optional[str] = None) -> None:
+    """Configure the google.generativeai client
+    
+    Use this instead of calling genai.configure directly so GEMINI_API_ENDPOINT
+    is honored everywhere; every genai.configure call replaces the client
+    options set by the previous one.
+    """
+    import google.generativeai as genai
+    
+    config = get_gemini_config()
+    if api_key is None:
+        api_key = config.api_key
+    
+    if config.api_endpoint:
+        genai.configure(
+            api_key=api_key,
+            transport="rest",
+            client_options={"api_endpoint": config.api_endpoint}
+        )
+    else:
+        genai.configure(api_key=api_key)
@@ -51,6 +51,11 @@ LECTURE_GENERATION_MODEL = os.getenv("LECTURE_GENERATION_MODEL", "gemini-2.0-fla
 # Used in: UMALecture module - generates structured questions for each difficulty level
 LECTURE_QUESTION_MODEL = os.getenv("LECTURE_QUESTION_MODEL", "gemini-2.0-flash-exp")
 
+# General-purpose Gemini AI
+# Used in: Gemini calls that have no dedicated setting above - vocabulary
+# puzzles and evaluators, text simplification, UMATest grading
+GEMINI_DEFAULT_MODEL = os.getenv("GEMINI_DEFAULT_MODEL", "gemini-2.0-flash")
+
 
 def get_model_config(model_type: str) -> Optional[str]:
     """
@@ -72,6 +77,7 @@ def get_model_config(model_type: str) -> Optional[str]:
         'writing_assistance': WRITING_ASSISTANCE_MODEL,
         'lecture_generation': LECTURE_GENERATION_MODEL,
         'lecture_question': LECTURE_QUESTION_MODEL,
+        'gemini_default': GEMINI_DEFAULT_MODEL,
     }
     
     return model_mapping.get(model_type)
@@ -94,4 +100,38 @@ def get_all_models() -> dict:
         'writing_assistance': WRITING_ASSISTANCE_MODEL,
         'lecture_generation': LECTURE_GENERATION_MODEL,
         'lecture_question': LECTURE_QUESTION_MODEL,
-    }
\ No newline at end of file
+        'gemini_default': GEMINI_DEFAULT_MODEL,
+    }
+
+# Estimated pricing in USD per 1M tokens as (input, output)
+# Used by AI call telemetry to attribute spend per feature. Models not listed
+# here are reported with zero cost.
+MODEL_PRICING_PER_MILLION_TOKENS = {
+    'gemini-2.0-flash': (0.10, 0.40),
+    'gemini-2.0-flash-exp': (0.10, 0.40),
+    'gemini-2.0-flash-lite': (0.075, 0.30),
+    'gemini-1.5-flash': (0.075, 0.30),
+    'gemini-1.5-pro': (1.25, 5.00),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+}
+
+
+def estimate_cost_usd(model: str, prompt_tokens: int, output_tokens: int) -> float:
+    """
+    Estimate the cost of a single AI call.
+    
+    Args:
+        model: Model identifier, optionally prefixed with a provider (e.g. 'gemini-1.5-flash')
+        prompt_tokens: Number of input tokens
+        output_tokens: Number of output tokens
+        
+    Returns:
+        Estimated cost in USD
+    """
+    if model and ':' in model:
+        model = model.split(':', 1)[1]
+    pricing = MODEL_PRICING_PER_MILLION_TOKENS.get(model)
+    if not pricing:
+        return 0.0
+    input_price, output_price = pricing
+    return (prompt_tokens * input_price + output_tokens * output_price) / 1_000_000
@@ -0,0 +1,364 @@
+"""
+AI call telemetry
+
+Every LLM call made by the application is recorded here with its feature
+name, model, prompt/response size, token usage, latency, retries, cache
+outcome and error class. Stats are aggregated in-process, exported in the
+Prometheus text format and periodically flushed into the ``ai_call_rollups``
+table so usage can be queried per feature and model.
+
+Usage:
+
+    from app.core.ai_telemetry import ai_telemetry
+
+    with ai_telemetry.track("debate", model_name, prompt) as call:
+        response = model.generate_content(prompt)
+        call.record_response(response)
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.ai_models import estimate_cost_usd
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram buckets in seconds (Prometheus "le" boundaries)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# How often the background task writes pending stats to the rollup table
+ROLLUP_FLUSH_INTERVAL_SECONDS = 60
+
+# Rough characters-per-token ratio used when a provider reports no usage
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class AICallStats:
+    """Aggregated counters for one (feature, model) pair"""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    prompt_chars: int = 0
+    response_chars: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    latency_seconds: float = 0.0
+    cost_usd: float = 0.0
+    error_classes: Counter = field(default_factory=Counter)
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+
+    def merge(self, other: "AICallStats") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.retries += other.retries
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.prompt_chars += other.prompt_chars
+        self.response_chars += other.response_chars
+        self.prompt_tokens += other.prompt_tokens
+        self.output_tokens += other.output_tokens
+        self.latency_seconds += other.latency_seconds
+        self.cost_usd += other.cost_usd
+        self.error_classes.update(other.error_classes)
+        for i, count in enumerate(other.latency_buckets):
+            self.latency_buckets[i] += count
+
+
+@dataclass
+class AICallRecord:
+    """A single in-flight AI call, filled in by the caller inside ``track``"""
+    feature: str
+    model: str
+    prompt_chars: int = 0
+    response_chars: int = 0
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    retries: int = 0
+    error_class: Optional[str] = None
+
+    def record_response(self, response: Any) -> None:
+        """Capture response size and token usage from a provider response.
+
+        Understands Gemini responses (``text`` + ``usage_metadata``), Pydantic AI
+        run results (``data``) and plain strings.
+        """
+        if response is None:
+            return
+        if isinstance(response, str):
+            response_text = response
+        else:
+            try:
+                response_text = getattr(response, "text", None)
+            except Exception:
+                # Gemini raises when a response was blocked and has no parts
+                response_text = None
+            if response_text is None and hasattr(response, "data"):
+                response_text = str(response.data)
+        self.response_chars = len(response_text or "")
+
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.prompt_tokens = getattr(usage, "prompt_token_count", None)
+            self.output_tokens = getattr(usage, "candidates_token_count", None)
+
+    def retry(self) -> None:
+        self.retries += 1
+
+
+def _size_of(prompt: Any) -> int:
+    if prompt is None:
+        return 0
+    if isinstance(prompt, str):
+        return len(prompt)
+    if isinstance(prompt, (list, tuple)):
+        return sum(len(p) for p in prompt if isinstance(p, str))
+    return len(str(prompt))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class AITelemetry:
+    """In-process aggregator for AI call metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Totals since process start, used for the Prometheus export
+        self._totals: Dict[Tuple[str, str], AICallStats] = {}
+        # Deltas not yet written to the rollup table, keyed by hour bucket
+        self._pending: Dict[Tuple[datetime, str, str], AICallStats] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _add(self, feature: str, model: str, delta: AICallStats) -> None:
+        bucket = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        with self._lock:
+            self._totals.setdefault((feature, model), AICallStats()).merge(delta)
+            self._pending.setdefault((bucket, feature, model), AICallStats()).merge(delta)
+
+    @contextmanager
+    def track(self, feature: str, model: Optional[str], prompt: Any = None) -> Iterator[AICallRecord]:
+        """Time an AI call and record its outcome.
+
+        Exceptions raised inside the block are recorded by class and re-raised.
+        """
+        record = AICallRecord(feature=feature, model=model or "unknown", prompt_chars=_size_of(prompt))
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error_class = type(e).__name__
+            raise
+        finally:
+            self._record(record, time.perf_counter() - started)
+
+    def _record(self, record: AICallRecord, latency: float) -> None:
+        prompt_tokens = record.prompt_tokens
+        if prompt_tokens is None:
+            prompt_tokens = record.prompt_chars // CHARS_PER_TOKEN
+        output_tokens = record.output_tokens
+        if output_tokens is None:
+            output_tokens = record.response_chars // CHARS_PER_TOKEN
+
+        delta = AICallStats(
+            calls=1,
+            errors=1 if record.error_class else 0,
+            retries=record.retries,
+            prompt_chars=record.prompt_chars,
+            response_chars=record.response_chars,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            latency_seconds=latency,
+            cost_usd=estimate_cost_usd(record.model, prompt_tokens, output_tokens),
+        )
+        if record.error_class:
+            delta.error_classes[record.error_class] += 1
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                delta.latency_buckets[i] = 1
+                break
+
+        self._add(record.feature, record.model, delta)
+        logger.debug(
+            f"AI call feature={record.feature} model={record.model} latency={latency:.3f}s "
+            f"prompt_tokens={prompt_tokens} output_tokens={output_tokens} "
+            f"retries={record.retries} error={record.error_class}"
+        )
+
+    def record_cache(self, feature: str, model: Optional[str], hit: bool) -> None:
+        """Record a cache lookup made in front of an AI call"""
+        delta = AICallStats(cache_hits=1 if hit else 0, cache_misses=0 if hit else 1)
+        self._add(feature, model or "unknown", delta)
+
+    def snapshot(self) -> Dict[Tuple[str, str], AICallStats]:
+        """Copy of the totals since process start"""
+        with self._lock:
+            copies = {}
+            for key, stats in self._totals.items():
+                copy = AICallStats()
+                copy.merge(stats)
+                copies[key] = copy
+            return copies
+
+    def render_prometheus(self) -> str:
+        """Render totals in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        counters = [
+            ("umadex_ai_calls_total", "AI calls made", "calls"),
+            ("umadex_ai_call_errors_total", "AI calls that raised", "errors"),
+            ("umadex_ai_call_retries_total", "Retries made inside AI calls", "retries"),
+            ("umadex_ai_cache_hits_total", "Cache hits in front of AI calls", "cache_hits"),
+            ("umadex_ai_cache_misses_total", "Cache misses in front of AI calls", "cache_misses"),
+            ("umadex_ai_prompt_chars_total", "Prompt characters sent", "prompt_chars"),
+            ("umadex_ai_response_chars_total", "Response characters received", "response_chars"),
+            ("umadex_ai_prompt_tokens_total", "Prompt tokens (reported or estimated)", "prompt_tokens"),
+            ("umadex_ai_output_tokens_total", "Output tokens (reported or estimated)", "output_tokens"),
+            ("umadex_ai_cost_usd_total", "Estimated AI spend in USD", "cost_usd"),
+        ]
+
+        lines = []
+        for name, help_text, attr in counters:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (feature, model), stats in sorted(snapshot.items()):
+                labels = f'feature="{_escape_label(feature)}",model="{_escape_label(model)}"'
+                lines.append(f"{name}{{{labels}}} {getattr(stats, attr)}")
+
+        lines.append("# HELP umadex_ai_call_errors_by_class_total AI call errors by exception class")
+        lines.append("# TYPE umadex_ai_call_errors_by_class_total counter")
+        for (feature, model), stats in sorted(snapshot.items()):
+            for error_class, count in sorted(stats.error_classes.items()):
+                labels = (
+                    f'feature="{_escape_label(feature)}",model="{_escape_label(model)}",'
+                    f'error_class="{_escape_label(error_class)}"'
+                )
+                lines.append(f"umadex_ai_call_errors_by_class_total{{{labels}}} {count}")
+
+        name = "umadex_ai_call_latency_seconds"
+        lines.append(f"# HELP {name} AI call latency")
+        lines.append(f"# TYPE {name} histogram")
+        for (feature, model), stats in sorted(snapshot.items()):
+            if not stats.calls:
+                continue
+            labels = f'feature="{_escape_label(feature)}",model="{_escape_label(model)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {stats.calls}')
+            lines.append(f"{name}_sum{{{labels}}} {stats.latency_seconds}")
+            lines.append(f"{name}_count{{{labels}}} {stats.calls}")
+
+        return "\n".join(lines) + "\n"
+
+    async def flush_to_db(self, db: AsyncSession) -> int:
+        """Add pending deltas to the ``ai_call_rollups`` table.
+
+        Returns the number of rollup rows written. On failure the deltas are
+        put back so the next flush retries them.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        rows = [
+            {
+                "bucket_start": bucket,
+                "feature": feature,
+                "model": model,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "retries": stats.retries,
+                "cache_hits": stats.cache_hits,
+                "cache_misses": stats.cache_misses,
+                "prompt_chars": stats.prompt_chars,
+                "response_chars": stats.response_chars,
+                "prompt_tokens": stats.prompt_tokens,
+                "output_tokens": stats.output_tokens,
+                "latency_ms_total": int(stats.latency_seconds * 1000),
+                "cost_usd": stats.cost_usd,
+            }
+            for (bucket, feature, model), stats in pending.items()
+        ]
+
+        try:
+            await db.execute(
+                text("""
+                    INSERT INTO ai_call_rollups (
+                        bucket_start, feature, model, calls, errors, retries,
+                        cache_hits, cache_misses, prompt_chars, response_chars,
+                        prompt_tokens, output_tokens, latency_ms_total, cost_usd
+                    ) VALUES (
+                        :bucket_start, :feature, :model, :calls, :errors, :retries,
+                        :cache_hits, :cache_misses, :prompt_chars, :response_chars,
+                        :prompt_tokens, :output_tokens, :latency_ms_total, :cost_usd
+                    )
+                    ON CONFLICT (bucket_start, feature, model) DO UPDATE SET
+                        calls = ai_call_rollups.calls + EXCLUDED.calls,
+                        errors = ai_call_rollups.errors + EXCLUDED.errors,
+                        retries = ai_call_rollups.retries + EXCLUDED.retries,
+                        cache_hits = ai_call_rollups.cache_hits + EXCLUDED.cache_hits,
+                        cache_misses = ai_call_rollups.cache_misses + EXCLUDED.cache_misses,
+                        prompt_chars = ai_call_rollups.prompt_chars + EXCLUDED.prompt_chars,
+                        response_chars = ai_call_rollups.response_chars + EXCLUDED.response_chars,
+                        prompt_tokens = ai_call_rollups.prompt_tokens + EXCLUDED.prompt_tokens,
+                        output_tokens = ai_call_rollups.output_tokens + EXCLUDED.output_tokens,
+                        latency_ms_total = ai_call_rollups.latency_ms_total + EXCLUDED.latency_ms_total,
+                        cost_usd = ai_call_rollups.cost_usd + EXCLUDED.cost_usd,
+                        updated_at = CURRENT_TIMESTAMP
+                """),
+                rows
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            with self._lock:
+                for key, stats in pending.items():
+                    self._pending.setdefault(key, AICallStats()).merge(stats)
+            raise
+
+        return len(rows)
+
+    async def _flush_loop(self, interval: int) -> None:
+        from app.core.database import AsyncSessionLocal
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.flush_to_db(db)
+            except Exception as e:
+                logger.warning(f"Failed to flush AI call rollups: {e}")
+
+    def start(self, interval: int = ROLLUP_FLUSH_INTERVAL_SECONDS) -> None:
+        """Start the periodic rollup flush (called from the app lifespan)"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop(interval))
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still pending"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        from app.core.database import AsyncSessionLocal
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.flush_to_db(db)
+        except Exception as e:
+            logger.warning(f"Failed to flush AI call rollups on shutdown: {e}")
+
+
+ai_telemetry = AITelemetry()
@@ -43,6 +43,10 @@ class Settings(BaseSettings):
     # Backend URL for internal requests
     BACKEND_URL: str = "http://localhost:8000"
     
+    # Monitoring: bearer token the Prometheus scraper sends to /metrics;
+    # the endpoint is disabled while unset
+    METRICS_TOKEN: Optional[str] = None
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -66,9 +66,24 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 async def set_rls_context(session: AsyncSession, user_id: str = None, user_email: str = None, is_admin: bool = False):
-    """Set RLS context for the current session"""
+    """Set RLS context for the current session
+    
+    All session variables are applied with a single parameterized
+    set_config() statement so authenticating a request costs one round-trip.
+    set_config(..., true) is transaction-scoped, same as SET LOCAL.
+    """
+    settings_to_apply = []
     if user_id:
-        await session.execute(text(f"SET LOCAL app.current_user_id = '{user_id}'"))
+        settings_to_apply.append(("app.current_user_id", str(user_id)))
     if user_email:
-        await session.execute(text(f"SET LOCAL app.current_user_email = '{user_email}'"))
-    await session.execute(text(f"SET LOCAL app.is_admin = '{str(is_admin).lower()}'"))
\ No newline at end of file
+        settings_to_apply.append(("app.current_user_email", user_email))
+    settings_to_apply.append(("app.is_admin", str(is_admin).lower()))
+    
+    calls = []
+    params = {}
+    for i, (name, value) in enumerate(settings_to_apply):
+        calls.append(f"set_config(:name_{i}, :value_{i}, true)")
+        params[f"name_{i}"] = name
+        params[f"value_{i}"] = value
+    
+    await session.execute(text(f"SELECT {', '.join(calls)}"), params)
@@ -0,0 +1,44 @@
+"""
+Background warm-up of slow-to-import clients
+
+The AI SDKs, Pillow and the Supabase client together take longer to import
+than the rest of the app, so nothing imports them at module load. Instead the
+app lifespan starts ``preload_clients()`` as a background task: the worker
+begins accepting connections right away, and the libraries are usually loaded
+by the time the first request needs them. A request that gets there first
+simply imports them itself.
+"""
+import asyncio
+import importlib
+import logging
+import time
+
+from app.core.supabase import get_supabase_admin, get_supabase_anon
+
+logger = logging.getLogger(__name__)
+
+# Ordered by how soon requests are likely to need them
+PRELOAD_MODULES = (
+    "google.generativeai",
+    "pydantic_ai",
+    "PIL.Image",
+    "aiohttp",
+)
+
+
+def _preload() -> None:
+    # Every authenticated request verifies its token through the anon client
+    get_supabase_anon()
+    get_supabase_admin()
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+async def preload_clients() -> None:
+    """Import and build the lazily loaded clients in a worker thread"""
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_preload)
+        logger.info(f"Preloaded clients in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        logger.warning(f"Failed to preload clients: {e}")
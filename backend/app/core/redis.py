@@ -53,6 +53,37 @@ class RedisClient:
             raise RuntimeError("Redis client not initialized")
         return await self._redis.expire(key, seconds)
     
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        return await self._redis.hget(key, field)
+    
+    async def hdel(self, key: str, *fields: str):
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        if fields:
+            await self._redis.hdel(key, *fields)
+    
+    async def smembers(self, key: str) -> set:
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        return await self._redis.smembers(key)
+    
+    async def zcount(self, key: str, min_score, max_score) -> int:
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        return await self._redis.zcount(key, min_score, max_score)
+    
+    async def rpush(self, key: str, *values: str) -> int:
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        return await self._redis.rpush(key, *values)
+    
+    async def lpop(self, key: str, count: Optional[int] = None):
+        if not self._redis:
+            raise RuntimeError("Redis client not initialized")
+        return await self._redis.lpop(key, count)
+    
     def pipeline(self):
         if not self._redis:
             raise RuntimeError("Redis client not initialized")
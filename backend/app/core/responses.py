@@ -0,0 +1,51 @@
+"""
+Fast JSON responses
+
+``FastJSONResponse`` is the app's default response class. It renders with
+orjson, which handles UUID, datetime, date and Enum values natively; Decimal,
+sets and pydantic models are converted in ``_default``.
+
+Routes returning large payloads can go further and return a
+``FastJSONResponse`` themselves. FastAPI then skips validating the value
+against ``response_model`` and walking it with ``jsonable_encoder`` - a
+pydantic model is serialized once, by pydantic, straight to bytes. Keep the
+``response_model`` on the route so the OpenAPI schema stays accurate.
+
+Usage:
+
+    @router.get("/reports/gradebook", response_model=GradebookResponse)
+    async def get_gradebook(...):
+        ...
+        return FastJSONResponse(GradebookResponse(...))
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        # Same as jsonable_encoder: integral values stay ints
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes the way API responses are rendered"""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (or pydantic's serializer for models)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,26 +1,38 @@
-"""Supabase client configuration for authentication"""
-from supabase import create_client, Client
+"""Supabase client configuration for authentication
+
+The supabase package is slow to import, so the clients are created on first
+use (or by the startup preload, see app.core.preload) rather than when this
+module is imported.
+"""
+import threading
+from typing import TYPE_CHECKING, Dict
 from app.core.config import settings
 import logging
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
-# Create Supabase client with service role key for backend operations
-supabase_admin: Client = create_client(
-    settings.SUPABASE_URL,
-    settings.SUPABASE_SERVICE_ROLE_KEY
-)
+_clients: Dict[str, "Client"] = {}
+_clients_lock = threading.Lock()
+
 
-# Create Supabase client with anon key for user-facing operations
-supabase_anon: Client = create_client(
-    settings.SUPABASE_URL,
-    settings.SUPABASE_ANON_KEY
-)
+def _get_client(key_setting: str) -> "Client":
+    client = _clients.get(key_setting)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key_setting)
+            if client is None:
+                from supabase import create_client
+                client = create_client(settings.SUPABASE_URL, getattr(settings, key_setting))
+                _clients[key_setting] = client
+    return client
 
-def get_supabase_admin() -> Client:
-    """Get Supabase client with admin privileges"""
-    return supabase_admin
+def get_supabase_admin() -> "Client":
+    """Get Supabase client with admin privileges (service role key)"""
+    return _get_client("SUPABASE_SERVICE_ROLE_KEY")
 
-def get_supabase_anon() -> Client:
+def get_supabase_anon() -> "Client":
     """Get Supabase client with anon privileges"""
-    return supabase_anon
\ No newline at end of file
+    return _get_client("SUPABASE_ANON_KEY")
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Numeric, DateTime, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+
+
+class AICallRollup(Base):
+    """Hourly AI call totals per feature and model, written by app.core.ai_telemetry"""
+    __tablename__ = "ai_call_rollups"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    feature = Column(String(100), nullable=False)
+    model = Column(String(100), nullable=False)
+    calls = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+    cache_hits = Column(Integer, nullable=False, default=0)
+    cache_misses = Column(Integer, nullable=False, default=0)
+    prompt_chars = Column(BigInteger, nullable=False, default=0)
+    response_chars = Column(BigInteger, nullable=False, default=0)
+    prompt_tokens = Column(BigInteger, nullable=False, default=0)
+    output_tokens = Column(BigInteger, nullable=False, default=0)
+    latency_ms_total = Column(BigInteger, nullable=False, default=0)
+    cost_usd = Column(Numeric(12, 6), nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('bucket_start', 'feature', 'model', name='uq_ai_call_rollups_bucket_feature_model'),
+        Index('idx_ai_call_rollups_feature_bucket', 'feature', 'bucket_start'),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class StudentAnalyticsRollup(Base):
+    """Precomputed per-student, per-module analytics, written by app.services.student_analytics"""
+    __tablename__ = "student_analytics_rollups"
+    
+    student_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    module = Column(String(20), primary_key=True)  # umaread, umavocab, umadebate, umawrite, umatest
+    completed_count = Column(Integer, nullable=False, default=0)
+    average_score = Column(Numeric(6, 2), nullable=True)
+    time_spent_minutes = Column(Integer, nullable=True)
+    current_difficulty = Column(Integer, nullable=True)
+    payload = Column(JSONB, nullable=False, default={})  # Full analytics response for the module
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -107,6 +107,20 @@ class ContentFlag(Base):
     assignment = relationship("DebateAssignment", back_populates="content_flags")
 
 
+class ModerationTerm(Base):
+    """Word list entry used by the debate content moderation matcher"""
+    __tablename__ = "moderation_terms"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid())
+    category = Column(String(20), nullable=False)  # profanity, inappropriate, off_topic
+    term = Column(String(200), nullable=False)
+    match_type = Column(String(20), nullable=False, default="word")  # word or substring
+    is_active = Column(Boolean, nullable=False, default=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 # Student Debate Models (Phase 2)
 class StudentDebate(Base):
     __tablename__ = "student_debates"
@@ -25,6 +25,7 @@ class ReadingAssignment(Base):
     status = Column(String(50), default="draft")
     images_processed = Column(Boolean, default=False)
     assignment_type = Column(String(50), nullable=False, default="UMARead")
+    topic_manifest = Column(JSONB, nullable=True)  # UMALecture only: {"topic_count": n, "topic_ids": [...]}
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime, nullable=True)
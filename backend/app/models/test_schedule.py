@@ -52,6 +52,7 @@ class ClassroomTestOverride(Base):
     __table_args__ = (
         CheckConstraint('max_uses > 0', name='positive_max_uses'),
         CheckConstraint('current_uses <= max_uses', name='valid_usage'),
+        CheckConstraint('override_code = upper(override_code)', name='canonical_override_code'),
     )
 
 
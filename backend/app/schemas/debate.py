@@ -131,6 +131,8 @@ class DebateAssignmentListResponse(BaseModel):
     filtered: int
     page: int
     per_page: int
+    # Pass back as ``cursor`` for the next page; None on the last page and for searches
+    next_cursor: Optional[str] = None
 
 
 # Content Flag schemas
@@ -4,13 +4,15 @@ Evaluates student-provided definitions based on context and understanding
 """
 import re
 import json
+from functools import cached_property
 from typing import Dict, Any, Optional
 from app.core.config import settings
-from app.config.ai_config import get_claude_config, get_openai_config, get_gemini_config
+from app.config.ai_config import get_claude_config, get_openai_config, get_gemini_config, configure_gemini
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
 import httpx
 import asyncio
 import logging
-import google.generativeai as genai
+from app.core.ai_telemetry import ai_telemetry
 from datetime import datetime
 from uuid import UUID
 
@@ -30,13 +32,16 @@ class AIVocabularyEvaluator:
         self.gemini_config = get_gemini_config()
         self.claude_config = get_claude_config()
         self.openai_config = get_openai_config()
+
+    @cached_property
+    def gemini_model(self):
+        """Gemini model if an API key is set; the SDK is imported on first use"""
+        if not self.gemini_config.api_key:
+            return None
+        import google.generativeai as genai
         
-        # Initialize Gemini if API key is available
-        if self.gemini_config.api_key:
-            genai.configure(api_key=self.gemini_config.api_key)
-            self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-        else:
-            self.gemini_model = None
+        configure_gemini(self.gemini_config.api_key)
+        return genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
     
     async def evaluate_definition(
         self,
@@ -246,7 +251,7 @@ Ensure all arrays contain string values and all numbers are integers."""
     async def _call_gemini_api(self, prompt: str) -> str:
         """Call Gemini API"""
         try:
-            logger.debug(f"Calling Gemini API with model: gemini-2.0-flash")
+            logger.debug(f"Calling Gemini API with model: {GEMINI_DEFAULT_MODEL}")
             
             # Configure generation settings to return JSON
             generation_config = {
@@ -260,13 +265,15 @@ Ensure all arrays contain string values and all numbers are integers."""
             
             # Generate response in a thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.gemini_model.generate_content(
-                    json_prompt,
-                    generation_config=generation_config
+            with ai_telemetry.track("vocab_definition_evaluation", GEMINI_DEFAULT_MODEL, json_prompt) as call:
+                response = await loop.run_in_executor(
+                    None,
+                    lambda: self.gemini_model.generate_content(
+                        json_prompt,
+                        generation_config=generation_config
+                    )
                 )
-            )
+                call.record_response(response)
             
             if response.text:
                 logger.info("Gemini API call successful")
@@ -1,14 +1,15 @@
 from typing import Optional, Tuple
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
 import uuid
 
-from ..config.ai_models import ANSWER_EVALUATION_MODEL
+from ..config.ai_models import ANSWER_EVALUATION_MODEL, GEMINI_DEFAULT_MODEL
 from ..models.reading import ReadingChunk, ReadingAssignment, QuestionCache
 from ..services.question_generation import Question, QuestionPair
+from ..config.ai_config import configure_gemini
+from ..core.ai_telemetry import ai_telemetry
 
 
 class EvaluationResult(BaseModel):
@@ -185,13 +186,15 @@ async def evaluate_answer(
             grade_level=assignment.grade_level
         )
         
-        # Use Gemini 2.0 Flash for evaluation
+        # Use Gemini for evaluation
         import os
         import google.generativeai as genai
         
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        configure_gemini(os.getenv("GEMINI_API_KEY"))
+        model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+        with ai_telemetry.track("umaread_answer_evaluation", GEMINI_DEFAULT_MODEL, prompt) as call:
+            response = model.generate_content(prompt)
+            call.record_response(response)
         response_text = response.text
         
         # Parse the response
@@ -2,7 +2,8 @@ from app.services.image_analyzer import ImageAnalyzer
 from app.core.database import get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
-from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
+from app.models.reading import ReadingAssignment, AssignmentImage
+from app.services.reading import MarkupParser
 import asyncio
 import logging
 import tempfile
@@ -32,13 +33,13 @@ class AssignmentImageProcessor:
                     logger.error(f"Assignment {assignment_id} not found")
                     return
                 
-                # Get all chunks to find image context
-                chunks_result = await db.execute(
-                    select(ReadingChunk)
-                    .where(ReadingChunk.assignment_id == assignment_id)
-                    .order_by(ReadingChunk.chunk_order)
-                )
-                chunks = chunks_result.scalars().all()
+                # Map each image to the chunks that reference it in one pass
+                # over the markup the chunks were published from
+                document = MarkupParser.tokenize(assignment.raw_content)
+                chunks_by_image = {}
+                for chunk in document.chunks:
+                    for image_key in set(chunk.image_references):
+                        chunks_by_image.setdefault(image_key, []).append(chunk.content)
                 
                 # Get all images
                 images_result = await db.execute(
@@ -50,11 +51,7 @@ class AssignmentImageProcessor:
                 # Process each image
                 for image in images:
                     # Find chunks containing this image
-                    relevant_chunks = [
-                        chunk.content 
-                        for chunk in chunks 
-                        if f"<image>{image.image_tag}</image>" in chunk.content
-                    ]
+                    relevant_chunks = chunks_by_image.get(image.image_tag, [])
                     
                     # Use the display URL directly (it's now a public Supabase URL)
                     image_url = image.display_url
@@ -4,28 +4,19 @@ Content moderation service for UMADebate
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
-import re
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from app.models.debate import ContentFlag, FlagType, FlagStatus
 from app.schemas.debate import ContentFlagCreate
+from app.services.moderation_lexicon import moderation_lexicon, ModerationSignals
 
 
 class ContentModerationService:
     """Service for content moderation in debates"""
     
-    # Basic profanity patterns (will be enhanced with AI in production)
-    PROFANITY_PATTERNS = [
-        # This would contain actual patterns in production
-        # For now, using placeholder patterns
-        r'\b(bad_word_1|bad_word_2)\b',
-    ]
-    
-    # Off-topic detection keywords (will be AI-powered in production)
-    OFF_TOPIC_INDICATORS = [
-        "homework", "test", "grade", "unrelated"
-    ]
+    # Word lists are compiled from the moderation_terms table (will be enhanced
+    # with AI in production); see app.services.moderation_lexicon
     
     async def analyze_content(
         self,
@@ -40,8 +31,11 @@ class ContentModerationService:
             "confidence_scores": {}
         }
         
+        # Tokenize once and gather every signal the checks below need
+        signals = moderation_lexicon.current.scan(content)
+        
         # Check for profanity
-        profanity_check = self._check_profanity(content)
+        profanity_check = self._check_profanity(signals)
         if profanity_check["found"]:
             results["should_flag"] = True
             results["flags"].append({
@@ -52,7 +46,7 @@ class ContentModerationService:
             results["confidence_scores"]["profanity"] = profanity_check["confidence"]
         
         # Check if content is appropriate
-        appropriateness_check = self._check_appropriateness(content)
+        appropriateness_check = self._check_appropriateness(signals)
         if not appropriateness_check["appropriate"]:
             results["should_flag"] = True
             results["flags"].append({
@@ -63,7 +57,7 @@ class ContentModerationService:
             results["confidence_scores"]["inappropriate"] = appropriateness_check["confidence"]
         
         # Check if content is on-topic
-        topic_relevance = self._check_topic_relevance(content, debate_topic)
+        topic_relevance = self._check_topic_relevance(signals, debate_topic)
         if topic_relevance["off_topic"]:
             results["should_flag"] = True
             results["flags"].append({
@@ -74,7 +68,7 @@ class ContentModerationService:
             results["confidence_scores"]["off_topic"] = topic_relevance["confidence"]
         
         # Check for spam patterns
-        spam_check = self._check_spam(content)
+        spam_check = self._check_spam(signals)
         if spam_check["is_spam"]:
             results["should_flag"] = True
             results["flags"].append({
@@ -86,23 +80,20 @@ class ContentModerationService:
         
         return results
     
-    def _check_profanity(self, content: str) -> Dict[str, Any]:
+    def _check_profanity(self, signals: ModerationSignals) -> Dict[str, Any]:
         """Check content for profanity"""
-        content_lower = content.lower()
-        
-        for pattern in self.PROFANITY_PATTERNS:
-            if re.search(pattern, content_lower):
-                return {
-                    "found": True,
-                    "confidence": 0.95
-                }
+        if "profanity" in signals.categories:
+            return {
+                "found": True,
+                "confidence": 0.95
+            }
         
         return {
             "found": False,
             "confidence": 0.0
         }
     
-    def _check_appropriateness(self, content: str) -> Dict[str, Any]:
+    def _check_appropriateness(self, signals: ModerationSignals) -> Dict[str, Any]:
         """Check if content is appropriate for educational context"""
         # In production, this would use AI to check for:
         # - Violence or threats
@@ -110,20 +101,13 @@ class ContentModerationService:
         # - Adult content
         # - Personal attacks
         
-        # For now, basic checks
-        inappropriate_patterns = [
-            r'\b(threat|violence|attack)\b',
-            r'\b(stupid|dumb|idiot)\b',  # Personal attacks
-        ]
-        
-        content_lower = content.lower()
-        for pattern in inappropriate_patterns:
-            if re.search(pattern, content_lower):
-                return {
-                    "appropriate": False,
-                    "confidence": 0.85,
-                    "reason": "Content may contain inappropriate language or personal attacks"
-                }
+        # For now, basic checks against the inappropriate word list
+        if "inappropriate" in signals.categories:
+            return {
+                "appropriate": False,
+                "confidence": 0.85,
+                "reason": "Content may contain inappropriate language or personal attacks"
+            }
         
         return {
             "appropriate": True,
@@ -131,7 +115,7 @@ class ContentModerationService:
             "reason": None
         }
     
-    def _check_topic_relevance(self, content: str, debate_topic: str) -> Dict[str, Any]:
+    def _check_topic_relevance(self, signals: ModerationSignals, debate_topic: str) -> Dict[str, Any]:
         """Check if content is relevant to the debate topic"""
         # In production, this would use AI to:
         # - Analyze semantic similarity
@@ -139,19 +123,18 @@ class ContentModerationService:
         # - Identify completely unrelated content
         
         # For now, basic keyword matching
-        content_lower = content.lower()
         topic_lower = debate_topic.lower()
         
         # Extract key words from topic
         topic_words = set(word for word in topic_lower.split() if len(word) > 3)
-        content_words = set(word for word in content_lower.split() if len(word) > 3)
+        content_words = set(word for word in signals.lowered_words if len(word) > 3)
         
         # Check overlap
         overlap = len(topic_words.intersection(content_words))
         relevance_score = overlap / max(len(topic_words), 1)
         
         # Check for off-topic indicators
-        off_topic_found = any(indicator in content_lower for indicator in self.OFF_TOPIC_INDICATORS)
+        off_topic_found = "off_topic" in signals.categories
         
         if relevance_score < 0.1 or off_topic_found:
             return {
@@ -166,35 +149,26 @@ class ContentModerationService:
             "relevance_score": relevance_score
         }
     
-    def _check_spam(self, content: str) -> Dict[str, Any]:
+    def _check_spam(self, signals: ModerationSignals) -> Dict[str, Any]:
         """Check for spam patterns"""
         # Check for repetitive content
-        words = content.split()
-        if len(words) > 10:
-            unique_words = set(words)
-            repetition_ratio = len(unique_words) / len(words)
-            
-            if repetition_ratio < 0.3:
-                return {
-                    "is_spam": True,
-                    "confidence": 0.9,
-                    "reason": "Content appears to be repetitive spam"
-                }
+        if len(signals.words) > 10 and signals.repetition_ratio < 0.3:
+            return {
+                "is_spam": True,
+                "confidence": 0.9,
+                "reason": "Content appears to be repetitive spam"
+            }
         
         # Check for excessive caps
-        if len(content) > 20:
-            caps_ratio = sum(1 for c in content if c.isupper()) / len(content)
-            if caps_ratio > 0.7:
-                return {
-                    "is_spam": True,
-                    "confidence": 0.85,
-                    "reason": "Excessive use of capital letters"
-                }
+        if signals.char_count > 20 and signals.caps_ratio > 0.7:
+            return {
+                "is_spam": True,
+                "confidence": 0.85,
+                "reason": "Excessive use of capital letters"
+            }
         
         # Check for link spam (in student debates, links might be suspicious)
-        link_pattern = r'https?://|www\.'
-        link_count = len(re.findall(link_pattern, content))
-        if link_count > 2:
+        if signals.link_count > 2:
             return {
                 "is_spam": True,
                 "confidence": 0.8,
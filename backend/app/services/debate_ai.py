@@ -153,7 +153,7 @@ Previous statements in this round:
 {self._summarize_round_posts(debate_context.get('previous_posts', []), debate_context['round_number'])}"""
             
             logger.info(f"Calling get_ai_response with prompt length: {len(prompt)}")
-            response = await get_ai_response(prompt, max_tokens=400)
+            response = await get_ai_response(prompt, max_tokens=400, feature="debate_response")
             logger.info(f"Received AI response: {len(response)} chars")
             
             return {
@@ -192,7 +192,7 @@ Previous statements in this round:
 {self._summarize_round_posts(debate_context.get('previous_posts', []), debate_context['round_number'])}"""
             
             logger.info(f"Calling get_ai_response with prompt length: {len(prompt)}")
-            response = await get_ai_response(prompt, max_tokens=400)
+            response = await get_ai_response(prompt, max_tokens=400, feature="debate_response")
             logger.info(f"Received AI response: {len(response)} chars")
             
             return {
@@ -306,7 +306,7 @@ FEEDBACK: [2-3 sentences focusing on strengths and one area for improvement. Be
 {f"TECHNIQUE_BONUS: [score]" if selected_technique else ""}
 {f"TECHNIQUE_FEEDBACK: [feedback]" if selected_technique else ""}"""
         
-        response = await get_ai_response(prompt, max_tokens=400 if selected_technique else 300)
+        response = await get_ai_response(prompt, max_tokens=400 if selected_technique else 300, feature="debate_post_evaluation")
         
         # Parse response
         scores = self._parse_evaluation_response(response, selected_technique is not None)
@@ -417,7 +417,7 @@ Student's Explanation: {explanation}
 
 Is this a good explanation of why it's a {challenge_value} fallacy? Answer YES or NO and provide brief feedback."""
                     
-                    eval_response = await get_ai_response(prompt, max_tokens=100)
+                    eval_response = await get_ai_response(prompt, max_tokens=100, feature="debate_challenge_evaluation")
                     
                     if 'YES' in eval_response.upper():
                         return ChallengeResult(
@@ -462,7 +462,7 @@ Student's Explanation: {explanation if explanation else 'No explanation provided
 
 Does this post contain a clear appeal to {challenge_value}? Answer YES or NO with brief reasoning."""
             
-            eval_response = await get_ai_response(prompt, max_tokens=150)
+            eval_response = await get_ai_response(prompt, max_tokens=150, feature="debate_challenge_evaluation")
             
             if 'YES' in eval_response.upper()[:10]:
                 return ChallengeResult(
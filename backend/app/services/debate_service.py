@@ -1,11 +1,12 @@
 """
 Service layer for UMADebate operations
 """
-from typing import Optional, List, Dict, Any
+import base64
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, tuple_
 from sqlalchemy.orm import selectinload
 
 from app.models.debate import DebateAssignment, ContentFlag
@@ -15,6 +16,29 @@ from app.schemas.debate import (
     DebateAssignmentUpdate,
     DebateAssignmentFilters
 )
+from app.utils.search import search_condition, search_rank
+
+# Columns matched by the assignment list search (trigram indexed)
+DEBATE_SEARCH_COLUMNS = (
+    DebateAssignment.title,
+    DebateAssignment.topic,
+    DebateAssignment.description
+)
+
+
+def encode_listing_cursor(created_at: datetime, assignment_id: UUID) -> str:
+    """Opaque keyset cursor for the row a listing page ended on"""
+    raw = f"{created_at.isoformat()}|{assignment_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_listing_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, assignment_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(assignment_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
 
 
 class DebateService:
@@ -61,29 +85,23 @@ class DebateService:
         teacher_id: UUID,
         filters: DebateAssignmentFilters,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
-        """List debate assignments with filtering and pagination"""
-        # Base query
-        query = select(DebateAssignment).where(
-            DebateAssignment.teacher_id == teacher_id
-        )
+        """List debate assignments with filtering and pagination
         
-        # Apply filters
+        Pages come either from ``page`` (OFFSET) or, for the unsearched listing,
+        from the opaque ``cursor`` returned as ``next_cursor``, which continues
+        after the last row of the previous page with an index range scan.
+        Searches are ordered by rank and paged by ``page`` only.
+        """
         filter_conditions = []
         
         if not filters.include_archived:
             filter_conditions.append(DebateAssignment.deleted_at.is_(None))
         
         if filters.search:
-            search_term = f"%{filters.search}%"
-            filter_conditions.append(
-                or_(
-                    DebateAssignment.title.ilike(search_term),
-                    DebateAssignment.topic.ilike(search_term),
-                    DebateAssignment.description.ilike(search_term)
-                )
-            )
+            filter_conditions.append(search_condition(filters.search, *DEBATE_SEARCH_COLUMNS))
         
         if filters.grade_level:
             filter_conditions.append(DebateAssignment.grade_level == filters.grade_level)
@@ -97,35 +115,55 @@ class DebateService:
         if filters.date_to:
             filter_conditions.append(DebateAssignment.created_at <= filters.date_to)
         
-        if filter_conditions:
-            query = query.where(and_(*filter_conditions))
+        if cursor and filters.search:
+            raise ValueError("Search results are paged by page number, not cursor")
         
-        # Get counts
-        total_query = select(func.count()).select_from(
-            select(DebateAssignment).where(
-                DebateAssignment.teacher_id == teacher_id
-            ).subquery()
+        # Total and filtered counts in one pass over the teacher's assignments
+        filtered_count_column = (
+            func.count().filter(and_(*filter_conditions)) if filter_conditions else func.count()
+        )
+        counts = (await db.execute(
+            select(func.count(), filtered_count_column)
+            .where(DebateAssignment.teacher_id == teacher_id)
+        )).one()
+        total_count, filtered_count = counts
+        
+        query = select(DebateAssignment).where(
+            DebateAssignment.teacher_id == teacher_id,
+            *filter_conditions
         )
-        total_result = await db.execute(total_query)
-        total_count = total_result.scalar()
         
-        filtered_query = select(func.count()).select_from(query.subquery())
-        filtered_result = await db.execute(filtered_query)
-        filtered_count = filtered_result.scalar()
+        # Searches list the closest matches first; (created_at, id) makes the order total
+        if filters.search:
+            query = query.order_by(search_rank(filters.search, *DEBATE_SEARCH_COLUMNS).desc())
+        query = query.order_by(DebateAssignment.created_at.desc(), DebateAssignment.id.desc())
         
-        # Apply pagination
-        query = query.order_by(DebateAssignment.created_at.desc())
-        query = query.offset((page - 1) * per_page).limit(per_page)
+        if cursor:
+            created_at, last_id = decode_listing_cursor(cursor)
+            query = query.where(
+                tuple_(DebateAssignment.created_at, DebateAssignment.id) < tuple_(created_at, last_id)
+            )
+        else:
+            query = query.offset((page - 1) * per_page)
         
-        result = await db.execute(query)
+        # One extra row tells whether another page follows
+        result = await db.execute(query.limit(per_page + 1))
         assignments = result.scalars().all()
+        has_more = len(assignments) > per_page
+        assignments = assignments[:per_page]
+        
+        next_cursor = None
+        if has_more and not filters.search:
+            last = assignments[-1]
+            next_cursor = encode_listing_cursor(last.created_at, last.id)
         
         return {
             "assignments": assignments,
             "total": total_count,
             "filtered": filtered_count,
             "page": page,
-            "per_page": per_page
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }
     
     async def update_assignment(
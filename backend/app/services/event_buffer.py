@@ -0,0 +1,289 @@
+"""
+Write-behind buffer for student analytics writes
+
+Analytics rows that nothing reads back on the request path - crunch-text
+usage events and lecture content interactions - are queued in memory and written by a background task in multi-row statements,
+once a second or as soon as a batch fills up. A click therefore costs a list
+append instead of an INSERT and a commit.
+
+If the database is unreachable, or the buffer outgrows its cap, the rows are
+pushed to a Redis list and picked up again by whichever worker flushes next,
+so they survive the failure and a worker restart. A batch that fails for any
+other reason is retried row by row so one bad row cannot hold back the rest;
+a row that fails ``EVENT_MAX_ATTEMPTS`` times on its own is moved to a
+dead-letter list instead of being retried forever.
+
+Usage:
+
+    from app.services.event_buffer import event_buffer
+
+    event_buffer.add_student_event(student_id, "crunch_text_used", {...}, assignment_id=assignment_id)
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import redis_client
+from app.models.classroom import StudentEvent
+
+logger = logging.getLogger(__name__)
+
+# How often the background task writes buffered rows
+EVENT_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Flush early once this many rows are waiting
+EVENT_FLUSH_BATCH_SIZE = 500
+
+# Past this many rows (e.g. the database is down) new rows go straight to Redis
+EVENT_BUFFER_MAX_ROWS = 20000
+
+# Redis list holding rows that could not be written yet
+EVENT_SPILL_KEY = "analytics:event_spill"
+
+# Failed writes of a row on its own before it is dead-lettered
+EVENT_MAX_ATTEMPTS = 3
+
+# Redis list holding rows given up on, with the last error, for inspection
+EVENT_DEAD_LETTER_KEY = "analytics:event_dead_letter"
+
+STUDENT_EVENT = "student_event"
+LECTURE_INTERACTION = "lecture_interaction"
+
+LECTURE_INTERACTION_COLUMNS = (
+    "student_id", "assignment_id", "lecture_id",
+    "topic_id", "difficulty_level", "interaction_type",
+    "question_text", "student_answer", "is_correct",
+    "time_spent_seconds"
+)
+
+
+def _str(value: Any) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def _is_outage(error: Exception) -> bool:
+    """Whether a write failed because the database is unreachable, not because of the rows"""
+    if isinstance(error, (OperationalError, InterfaceError)):
+        return True
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+
+
+class EventBuffer:
+    """Batches analytics inserts from all requests handled by this worker"""
+
+    def __init__(self):
+        self._rows: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _add(self, kind: str, row: Dict[str, Any]) -> None:
+        # Rows are kept JSON-ready so they can be spilled to Redis unchanged
+        self._rows.append({"kind": kind, "row": row})
+        if len(self._rows) >= EVENT_FLUSH_BATCH_SIZE and self._wakeup is not None:
+            self._wakeup.set()
+
+    def add_student_event(
+        self,
+        student_id: UUID,
+        event_type: str,
+        event_data: Optional[Dict[str, Any]] = None,
+        classroom_id: Optional[UUID] = None,
+        assignment_id: Optional[UUID] = None
+    ) -> None:
+        """Queue a student_events row"""
+        self._add(STUDENT_EVENT, {
+            "student_id": _str(student_id),
+            "classroom_id": _str(classroom_id),
+            "assignment_id": _str(assignment_id),
+            "event_type": event_type,
+            "event_data": event_data or {},
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+
+    def add_lecture_interaction(
+        self,
+        student_id: UUID,
+        assignment_id: int,
+        lecture_id: UUID,
+        topic_id: str,
+        difficulty: str,
+        interaction_type: str,
+        question_text: Optional[str] = None,
+        student_answer: Optional[str] = None,
+        is_correct: Optional[bool] = None
+    ) -> None:
+        """Queue a lecture_student_interactions row"""
+        self._add(LECTURE_INTERACTION, {
+            "student_id": _str(student_id),
+            "assignment_id": assignment_id,
+            "lecture_id": _str(lecture_id),
+            "topic_id": topic_id,
+            "difficulty_level": difficulty,
+            "interaction_type": interaction_type,
+            "question_text": question_text,
+            "student_answer": student_answer,
+            "is_correct": is_correct,
+            "time_spent_seconds": 0
+        })
+
+    async def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            await redis_client.rpush(EVENT_SPILL_KEY, *(json.dumps(row) for row in rows))
+        except Exception as e:
+            # Last resort: keep them in memory for the next attempt, up to the cap
+            if len(self._rows) >= EVENT_BUFFER_MAX_ROWS:
+                logger.error(f"Dropping {len(rows)} analytics rows, Redis spill failed: {e}")
+                return
+            logger.error(f"Failed to spill {len(rows)} analytics rows to Redis: {e}")
+            self._rows[:0] = rows
+
+    async def _dead_letter(self, item: Dict[str, Any], error: Exception) -> None:
+        logger.error(f"Giving up on {item['kind']} row after {EVENT_MAX_ATTEMPTS} attempts: {error}")
+        try:
+            await redis_client.rpush(EVENT_DEAD_LETTER_KEY, json.dumps({**item, "error": str(error)}))
+        except Exception as e:
+            logger.error(f"Dropping dead-lettered analytics row, Redis push failed: {e}")
+
+    async def _take_spilled(self, limit: int) -> List[Dict[str, Any]]:
+        try:
+            spilled = await redis_client.lpop(EVENT_SPILL_KEY, limit)
+        except Exception:
+            return []
+        return [json.loads(item) for item in spilled or []]
+
+    async def _write(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        by_kind: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for item in rows:
+            by_kind[item["kind"]].append(item["row"])
+
+        if by_kind[STUDENT_EVENT]:
+            await db.execute(insert(StudentEvent), [
+                {
+                    "student_id": UUID(row["student_id"]),
+                    "classroom_id": UUID(row["classroom_id"]) if row["classroom_id"] else None,
+                    "assignment_id": UUID(row["assignment_id"]) if row["assignment_id"] else None,
+                    "event_type": row["event_type"],
+                    "event_data": row["event_data"],
+                    "created_at": datetime.fromisoformat(row["created_at"])
+                }
+                for row in by_kind[STUDENT_EVENT]
+            ])
+
+        interactions = by_kind[LECTURE_INTERACTION]
+        if interactions:
+            # One multi-row VALUES list; column types come from the target table
+            params = {}
+            value_rows = []
+            for i, row in enumerate(interactions):
+                value_rows.append("(" + ", ".join(f":{column}_{i}" for column in LECTURE_INTERACTION_COLUMNS) + ")")
+                for column in LECTURE_INTERACTION_COLUMNS:
+                    params[f"{column}_{i}"] = row[column]
+            await db.execute(
+                text(f"""
+                    INSERT INTO lecture_student_interactions ({", ".join(LECTURE_INTERACTION_COLUMNS)})
+                    VALUES {", ".join(value_rows)}
+                """),
+                params
+            )
+
+    async def _write_one_by_one(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Write each row in its own savepoint; failed rows are retried later or dead-lettered"""
+        retry = []
+        for i, item in enumerate(rows):
+            try:
+                async with db.begin_nested():
+                    await self._write(db, [item])
+            except Exception as e:
+                if _is_outage(e):
+                    await db.rollback()
+                    await self._spill(rows)
+                    raise
+                item["attempts"] = item.get("attempts", 0) + 1
+                if item["attempts"] >= EVENT_MAX_ATTEMPTS:
+                    await self._dead_letter(item, e)
+                else:
+                    logger.warning(f"Failed to write {item['kind']} row (attempt {item['attempts']}): {e}")
+                    retry.append(item)
+        await db.commit()
+        if retry:
+            await self._spill(retry)
+
+    async def flush_to_db(self, db: AsyncSession) -> int:
+        """Write one batch of previously spilled and buffered rows; returns the batch size"""
+        # Spilled rows go first so a backlog drains ahead of new rows
+        rows = await self._take_spilled(EVENT_FLUSH_BATCH_SIZE)
+        fresh = self._rows[:EVENT_FLUSH_BATCH_SIZE - len(rows)]
+        del self._rows[:len(fresh)]
+        rows += fresh
+        if not rows:
+            return 0
+
+        try:
+            await self._write(db, rows)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            if _is_outage(e):
+                await self._spill(rows)
+                raise
+            # Something in the batch is bad; find it without losing the rest
+            await self._write_one_by_one(db, rows)
+
+        return len(rows)
+
+    async def _flush_loop(self, interval: float) -> None:
+        from app.core.database import AsyncSessionLocal
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if len(self._rows) > EVENT_BUFFER_MAX_ROWS:
+                overflow = self._rows[:-EVENT_FLUSH_BATCH_SIZE]
+                del self._rows[:len(overflow)]
+                await self._spill(overflow)
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    while await self.flush_to_db(db) >= EVENT_FLUSH_BATCH_SIZE:
+                        pass
+            except Exception as e:
+                logger.warning(f"Failed to flush analytics events: {e}")
+
+    def start(self, interval: float = EVENT_FLUSH_INTERVAL_SECONDS) -> None:
+        """Start the periodic flush (called from the app lifespan)"""
+        if self._flush_task is None:
+            self._wakeup = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_loop(interval))
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write whatever is still buffered"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        from app.core.database import AsyncSessionLocal
+        try:
+            async with AsyncSessionLocal() as db:
+                while self._rows and await self.flush_to_db(db):
+                    pass
+        except Exception as e:
+            logger.warning(f"Failed to flush analytics events on shutdown: {e}")
+
+
+event_buffer = EventBuffer()
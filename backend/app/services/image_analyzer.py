@@ -1,27 +1,29 @@
-import google.generativeai as genai
+from functools import cached_property
 from typing import List, Optional
 import os
 from app.models.image_analysis import ImageAnalysis
 from app.config.ai_models import IMAGE_ANALYSIS_MODEL
-from app.config.ai_config import get_gemini_config
+from app.config.ai_config import get_gemini_config, configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 import logging
-from PIL import Image
 import json
 
 logger = logging.getLogger(__name__)
 
 class ImageAnalyzer:
-    def __init__(self):
+    @cached_property
+    def model(self):
+        """Gemini model, built on first use so importing this module stays cheap"""
+        import google.generativeai as genai
+        
         # Get configuration
         config = get_gemini_config()
         
         # Configure Gemini API
-        genai.configure(api_key=config.api_key)
-        
-        # Use configured model
-        self.model = genai.GenerativeModel(IMAGE_ANALYSIS_MODEL)
+        configure_gemini(config.api_key)
         
         logger.info(f"ImageAnalyzer initialized with model: {IMAGE_ANALYSIS_MODEL}")
+        return genai.GenerativeModel(IMAGE_ANALYSIS_MODEL)
     
     def _get_system_prompt(self) -> str:
         return """You are analyzing an educational image that appears within a reading assignment. Your task is to create a detailed description that will be used to generate comprehension questions and evaluate student answers about this image.
@@ -57,6 +59,10 @@ CRITICAL: If numbers exist, extract EVERY SINGLE ONE - be precise with values.""
         assignment_metadata: dict
     ) -> ImageAnalysis:
         """Analyze an image in educational context"""
+        import google.generativeai as genai
+        
+        # Building the model also configures the SDK, which upload_file needs
+        model = self.model
         
         # Build context for the prompt
         context = f"""
@@ -103,7 +109,9 @@ IMPORTANT: Return ONLY valid JSON, no additional text."""
             
             # Generate content with the image
             logger.info("Sending image to Gemini for analysis...")
-            response = self.model.generate_content([full_prompt, uploaded_file])
+            with ai_telemetry.track("image_analysis", IMAGE_ANALYSIS_MODEL, full_prompt) as call:
+                response = model.generate_content([full_prompt, uploaded_file])
+                call.record_response(response)
             
             # Log the raw response
             logger.info(f"Gemini response received, length: {len(response.text)}")
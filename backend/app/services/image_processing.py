@@ -1,14 +1,16 @@
-from PIL import Image
 import io
-from typing import Dict, Any, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import os
 from pathlib import Path
 from fastapi import UploadFile, HTTPException
 from datetime import datetime
 import secrets
-from supabase import create_client, Client
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 class ImageProcessor:
     """Handle image processing, resizing, and thumbnail generation"""
     
@@ -30,10 +32,14 @@ class ImageProcessor:
     
     def __init__(self):
         self.UPLOAD_DIR.mkdir(exist_ok=True)
-        # Initialize Supabase client if credentials are available
-        self.supabase: Optional[Client] = None
+    
+    @cached_property
+    def supabase(self) -> Optional["Client"]:
+        """Supabase client if credentials are available, created on first upload"""
         if hasattr(settings, 'SUPABASE_URL') and hasattr(settings, 'SUPABASE_KEY'):
-            self.supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+            from supabase import create_client
+            return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+        return None
     
     async def validate_and_process_image(
         self, 
@@ -42,6 +48,8 @@ class ImageProcessor:
         image_number: int
     ) -> Dict[str, Any]:
         """Validate and process uploaded image, creating three versions."""
+        from PIL import Image
+        
         # Validate file size
         if file.size > self.MAX_FILE_SIZE:
             raise HTTPException(
@@ -146,6 +154,8 @@ class ImageProcessor:
         bucket_name: str = "reading-images"
     ) -> Dict[str, Any]:
         """Validate and process uploaded image for Supabase storage."""
+        from PIL import Image
+        
         if not self.supabase:
             raise HTTPException(
                 status_code=500,
@@ -0,0 +1,218 @@
+"""
+Compiled word lists for UMADebate content moderation
+
+The profanity, inappropriate-language and off-topic lists live in the
+``moderation_terms`` table. Each worker compiles them once into a
+``ModerationLexicon`` - whole-word terms become a token lookup table and
+substring terms a single trie-ordered regex - so scanning a post costs one
+tokenization and one regex pass no matter how long the lists get.
+
+The compiled lexicon is swapped atomically when the table changes: a
+background task polls a cheap fingerprint of the table and recompiles on
+change, and admins can force a reload.
+
+Usage:
+
+    from app.services.moderation_lexicon import moderation_lexicon
+
+    signals = moderation_lexicon.current.scan(content)
+    if "profanity" in signals.categories:
+        ...
+"""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# How often workers check moderation_terms for edits
+RELOAD_CHECK_INTERVAL_SECONDS = 60
+
+WORD_MATCH = "word"
+SUBSTRING_MATCH = "substring"
+
+# Used until the table has been read (and if it is empty)
+DEFAULT_TERMS: List[Tuple[str, str, str]] = [
+    ("profanity", "bad_word_1", WORD_MATCH),
+    ("profanity", "bad_word_2", WORD_MATCH),
+    ("inappropriate", "threat", WORD_MATCH),
+    ("inappropriate", "violence", WORD_MATCH),
+    ("inappropriate", "attack", WORD_MATCH),
+    ("inappropriate", "stupid", WORD_MATCH),
+    ("inappropriate", "dumb", WORD_MATCH),
+    ("inappropriate", "idiot", WORD_MATCH),
+    ("off_topic", "homework", SUBSTRING_MATCH),
+    ("off_topic", "test", SUBSTRING_MATCH),
+    ("off_topic", "grade", SUBSTRING_MATCH),
+    ("off_topic", "unrelated", SUBSTRING_MATCH),
+]
+
+_TOKEN_RE = re.compile(r"\w+")
+_LINK_RE = re.compile(r"https?://|www\.")
+
+
+def _trie_pattern(terms: Iterable[str]) -> Optional[str]:
+    """Build a regex from a character trie so shared prefixes are tested once"""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # A shorter term already matched here; the longer branches are optional
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie) if trie else None
+
+
+@dataclass
+class ModerationSignals:
+    """Everything the moderation checks need, gathered from one scan of a post"""
+    categories: Set[str] = field(default_factory=set)
+    words: List[str] = field(default_factory=list)
+    lowered_words: List[str] = field(default_factory=list)
+    char_count: int = 0
+    caps_count: int = 0
+    link_count: int = 0
+
+    @property
+    def caps_ratio(self) -> float:
+        return self.caps_count / self.char_count if self.char_count else 0.0
+
+    @property
+    def repetition_ratio(self) -> float:
+        return len(set(self.words)) / len(self.words) if self.words else 1.0
+
+
+class ModerationLexicon:
+    """Immutable compiled form of the moderation word lists"""
+
+    def __init__(self, terms: Iterable[Tuple[str, str, str]]):
+        # Whole-word terms keyed by their token tuple so multi-word phrases work too
+        self._word_terms: Dict[Tuple[str, ...], Set[str]] = {}
+        substring_categories: Dict[str, Set[str]] = {}
+        self.size = 0
+
+        for category, term, match_type in terms:
+            term = (term or "").strip().lower()
+            if not term:
+                continue
+            self.size += 1
+            if match_type == SUBSTRING_MATCH:
+                substring_categories.setdefault(term, set()).add(category)
+            else:
+                tokens = tuple(_TOKEN_RE.findall(term))
+                if tokens:
+                    self._word_terms.setdefault(tokens, set()).add(category)
+
+        self._max_phrase = max((len(k) for k in self._word_terms), default=0)
+        self._substring_categories = substring_categories
+        pattern = _trie_pattern(substring_categories)
+        # Lookahead so overlapping terms starting inside an earlier match are still seen
+        self._substring_re = re.compile(f"(?=({pattern}))") if pattern else None
+
+    def scan(self, content: str) -> ModerationSignals:
+        """Tokenize a post once and collect matched categories and spam signals"""
+        lowered = content.lower()
+        signals = ModerationSignals(
+            words=content.split(),
+            lowered_words=lowered.split(),
+            char_count=len(content),
+            caps_count=sum(1 for c in content if c.isupper()),
+            link_count=len(_LINK_RE.findall(content)),
+        )
+
+        if self._word_terms:
+            tokens = _TOKEN_RE.findall(lowered)
+            word_terms = self._word_terms
+            max_phrase = self._max_phrase
+            for i in range(len(tokens)):
+                for n in range(1, min(max_phrase, len(tokens) - i) + 1):
+                    categories = word_terms.get(tuple(tokens[i:i + n]))
+                    if categories:
+                        signals.categories |= categories
+
+        if self._substring_re is not None:
+            for match in self._substring_re.finditer(lowered):
+                # The trie regex returns the longest term at a position; shorter
+                # terms sharing that prefix are matched too
+                found = match.group(1)
+                for end in range(1, len(found) + 1):
+                    categories = self._substring_categories.get(found[:end])
+                    if categories:
+                        signals.categories |= categories
+
+        return signals
+
+
+class ModerationLexiconStore:
+    """Holds the current lexicon and reloads it when moderation_terms changes"""
+
+    def __init__(self):
+        self.current = ModerationLexicon(DEFAULT_TERMS)
+        self._fingerprint: Optional[Tuple] = None
+        self._reload_task: Optional[asyncio.Task] = None
+
+    async def _read_fingerprint(self, db: AsyncSession) -> Tuple:
+        result = await db.execute(text("SELECT COUNT(*), MAX(updated_at) FROM moderation_terms"))
+        return tuple(result.one())
+
+    async def reload(self, db: AsyncSession) -> int:
+        """Recompile from the database; returns the number of active terms"""
+        fingerprint = await self._read_fingerprint(db)
+        result = await db.execute(text("""
+            SELECT category, term, match_type
+            FROM moderation_terms
+            WHERE is_active = TRUE
+        """))
+        terms = [tuple(row) for row in result]
+
+        # An empty table keeps the built-in lists rather than disabling moderation
+        self.current = ModerationLexicon(terms or DEFAULT_TERMS)
+        self._fingerprint = fingerprint
+        return len(terms)
+
+    async def reload_if_changed(self, db: AsyncSession) -> bool:
+        if await self._read_fingerprint(db) == self._fingerprint:
+            return False
+        await self.reload(db)
+        return True
+
+    async def _reload_loop(self, interval: int) -> None:
+        from app.core.database import AsyncSessionLocal
+
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    if await self.reload_if_changed(db):
+                        logger.info(f"Reloaded moderation lexicon ({self.current.size} terms)")
+            except Exception as e:
+                logger.warning(f"Failed to reload moderation terms: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: int = RELOAD_CHECK_INTERVAL_SECONDS) -> None:
+        """Load the lists and start watching for edits (called from the app lifespan)"""
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_loop(interval))
+
+    async def stop(self) -> None:
+        if self._reload_task:
+            self._reload_task.cancel()
+            self._reload_task = None
+
+
+moderation_lexicon = ModerationLexiconStore()
@@ -1,7 +1,6 @@
 """
 Pronunciation service for fetching audio URLs and phonetic text from Free Dictionary API
 """
-import aiohttp
 import logging
 from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,6 +26,8 @@ class PronunciationService:
         Returns:
             Tuple of (audio_url, phonetic_text) or (None, None) if not found
         """
+        import aiohttp
+        
         try:
             async with aiohttp.ClientSession() as session:
                 url = f"{PronunciationService.BASE_URL}/{word.lower()}"
@@ -2,15 +2,16 @@ import hashlib
 import json
 from typing import List, Optional, Tuple
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, delete
 from datetime import datetime
 import uuid
 import re
 
-from ..config.ai_models import QUESTION_GENERATION_MODEL
+from ..config.ai_models import QUESTION_GENERATION_MODEL, GEMINI_DEFAULT_MODEL
+from ..core.ai_telemetry import ai_telemetry
 from ..models.reading import ReadingChunk, ReadingAssignment, QuestionCache, AssignmentImage
+from ..config.ai_config import configure_gemini
 
 
 class Question(BaseModel):
@@ -172,6 +173,7 @@ async def generate_questions_for_chunk(
         )
     )
     cached = cached_result.scalar_one_or_none()
+    ai_telemetry.record_cache("umaread_questions", GEMINI_DEFAULT_MODEL, hit=cached is not None)
     
     if cached:
         # Return cached questions
@@ -196,11 +198,13 @@ async def generate_questions_for_chunk(
         import google.generativeai as genai
         import os
         
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        configure_gemini(os.getenv("GEMINI_API_KEY"))
+        model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
         
         # Generate questions
-        response = model.generate_content(prompt)
+        with ai_telemetry.track("umaread_questions", GEMINI_DEFAULT_MODEL, prompt) as call:
+            response = model.generate_content(prompt)
+            call.record_response(response)
         response_text = response.text
         
         # Parse the response
@@ -4,6 +4,8 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import os
+import logging
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
@@ -14,61 +16,135 @@ from app.schemas.reading import (
     PublishResult
 )
 
+logger = logging.getLogger(__name__)
+
+
+# Every tag the markup language knows; everything else is plain text
+_MARKUP_TAG_RE = re.compile(r'<(/?)(chunk|important|image)>')
+
+
+@dataclass
+class MarkupChunk:
+    """One <chunk> with its inner content already stripped"""
+    content: str
+    has_important: bool
+    image_references: List[str] = field(default_factory=list)
+
+
+@dataclass
+class MarkupDocument:
+    """Result of a single tokenizer pass over assignment markup"""
+    chunks: List[MarkupChunk] = field(default_factory=list)
+    image_references: List[str] = field(default_factory=list)
+    tag_counts: Dict[str, List[int]] = field(default_factory=dict)
+    important_outside_chunks: List[int] = field(default_factory=list)
+
 
 class MarkupParser:
     """Handles parsing and validation of reading assignment markup"""
     
     @staticmethod
-    def validate_markup(content: str, available_images: List[str] = []) -> MarkupValidationResult:
-        """Validate the markup content"""
+    def tokenize(content: str) -> MarkupDocument:
+        """Walk the markup tags once, collecting chunks, images and nesting problems.
+        
+        Tags pair up the same way the non-greedy patterns ``<chunk>(.*?)</chunk>``
+        etc. did: an opening tag inside an already open element is ignored, and
+        an <image> reference cannot span a line break.
+        """
+        document = MarkupDocument(tag_counts={tag: [0, 0] for tag in ('chunk', 'important', 'image')})
+        content = content or ""
+        
+        chunk_start = None  # end of the open <chunk> tag
+        chunk_has_important = False
+        chunk_images = []
+        important_start = None  # position of the open <important> tag
+        important_chunk = None  # index of the chunk that tag opened in
+        pending_important = []  # inside a chunk that has not closed yet
+        image_start = None  # end of the open <image> tag
+        
+        for match in _MARKUP_TAG_RE.finditer(content):
+            closing, tag = match.group(1), match.group(2)
+            document.tag_counts[tag][1 if closing else 0] += 1
+            
+            if tag == 'chunk':
+                if not closing:
+                    if chunk_start is None:
+                        chunk_start = match.end()
+                elif chunk_start is not None:
+                    document.chunks.append(MarkupChunk(
+                        content=content[chunk_start:match.start()].strip(),
+                        has_important=chunk_has_important,
+                        image_references=chunk_images
+                    ))
+                    chunk_start = None
+                    chunk_has_important = False
+                    chunk_images = []
+                    pending_important = []
+            
+            elif tag == 'important':
+                if not closing:
+                    if chunk_start is not None:
+                        chunk_has_important = True
+                    if important_start is None:
+                        important_start = match.start()
+                        important_chunk = len(document.chunks) if chunk_start is not None else None
+                elif important_start is not None:
+                    if important_chunk is None:
+                        document.important_outside_chunks.append(important_start)
+                    elif important_chunk == len(document.chunks):
+                        # Only inside a chunk once that chunk closes too
+                        pending_important.append(important_start)
+                    important_start = None
+            
+            else:
+                if not closing:
+                    # A reference is abandoned at a line break, like the old regex
+                    if image_start is None or content.find('\n', image_start, match.start()) != -1:
+                        image_start = match.end()
+                elif image_start is not None:
+                    if content.find('\n', image_start, match.start()) == -1:
+                        image_key = content[image_start:match.start()].strip()
+                        document.image_references.append(image_key)
+                        if chunk_start is not None and chunk_start <= image_start:
+                            chunk_images.append(image_key)
+                    image_start = None
+        
+        # <important> sections in a chunk that never closed are outside any chunk
+        if pending_important:
+            document.important_outside_chunks = sorted(document.important_outside_chunks + pending_important)
+        
+        return document
+    
+    @staticmethod
+    def validate_document(document: MarkupDocument, available_images: List[str] = []) -> MarkupValidationResult:
+        """Validate already tokenized markup"""
         errors = []
         warnings = []
-        image_references = []
-        
-        # Debug logging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Validating content length: {len(content)}")
-        logger.info(f"Content preview: {content[:200]}...")
         
         # Check for unclosed tags
-        for tag in ['chunk', 'important', 'image']:
-            open_count = len(re.findall(f'<{tag}>', content))
-            close_count = len(re.findall(f'</{tag}>', content))
+        for tag, (open_count, close_count) in document.tag_counts.items():
             if open_count != close_count:
                 errors.append(f"Unclosed <{tag}> tag: {open_count} opening tags, {close_count} closing tags")
         
         # Check for at least one chunk
-        chunk_matches = re.findall(r'<chunk>(.*?)</chunk>', content, re.DOTALL)
-        chunk_count = len(chunk_matches)
-        logger.info(f"Found {chunk_count} chunks")
+        chunk_count = len(document.chunks)
+        logger.debug(f"Found {chunk_count} chunks")
         if chunk_count == 0:
             errors.append("At least one <chunk> tag is required")
         
         # Check that important tags are inside chunks
-        important_pattern = r'<important>(.*?)</important>'
-        for match in re.finditer(important_pattern, content, re.DOTALL):
-            start_pos = match.start()
-            # Find if this position is inside a chunk
-            in_chunk = False
-            for chunk_match in re.finditer(r'<chunk>(.*?)</chunk>', content, re.DOTALL):
-                if chunk_match.start() < start_pos < chunk_match.end():
-                    in_chunk = True
-                    break
-            if not in_chunk:
-                errors.append(f"<important> tag at position {start_pos} must be inside a <chunk> tag")
-        
-        # Extract image references
-        image_pattern = r'<image>(.*?)</image>'
-        for match in re.finditer(image_pattern, content):
-            image_key = match.group(1).strip()
-            image_references.append(image_key)
-            if available_images and image_key not in available_images:
+        for start_pos in document.important_outside_chunks:
+            errors.append(f"<important> tag at position {start_pos} must be inside a <chunk> tag")
+        
+        # Check image references
+        available = set(available_images or [])
+        for image_key in document.image_references:
+            if available and image_key not in available:
                 errors.append(f"Referenced image '{image_key}' not found in uploaded images")
         
         # Check for empty chunks
-        for i, chunk_content in enumerate(chunk_matches):
-            if not chunk_content.strip():
+        for i, chunk in enumerate(document.chunks):
+            if not chunk.content:
                 warnings.append(f"Chunk {i+1} is empty")
         
         return MarkupValidationResult(
@@ -76,25 +152,23 @@ class MarkupParser:
             errors=errors,
             warnings=warnings,
             chunk_count=chunk_count,
-            image_references=image_references
+            image_references=list(document.image_references)
         )
     
+    @staticmethod
+    def validate_markup(content: str, available_images: List[str] = []) -> MarkupValidationResult:
+        """Validate the markup content"""
+        logger.debug(f"Validating content length: {len(content or '')}")
+        return MarkupParser.validate_document(MarkupParser.tokenize(content), available_images)
+    
     @staticmethod
     def parse_chunks(content: str) -> List[Tuple[str, bool]]:
         """Parse content into chunks with their content and whether they have important sections"""
-        chunks = []
-        chunk_pattern = r'<chunk>(.*?)</chunk>'
-        
-        for match in re.finditer(chunk_pattern, content, re.DOTALL):
-            chunk_content = match.group(1).strip()
-            has_important = '<important>' in chunk_content
-            
-            # Clean up the content but preserve important tags for later processing
-            cleaned_content = chunk_content
-            
-            chunks.append((cleaned_content, has_important))
-        
-        return chunks
+        # Important tags are preserved for later processing
+        return [
+            (chunk.content, chunk.has_important)
+            for chunk in MarkupParser.tokenize(content).chunks
+        ]
 
 
 class ReadingAssignmentService:
@@ -148,8 +222,8 @@ class ReadingAssignmentService:
         if 'work_type' in update_dict:
             update_dict['work_type'] = update_dict['work_type'].lower()
         
-        for field, value in update_dict.items():
-            setattr(assignment, field, value)
+        for attr, value in update_dict.items():
+            setattr(assignment, attr, value)
         
         assignment.updated_at = datetime.utcnow()
         db.commit()
@@ -209,10 +283,9 @@ class ReadingAssignmentService:
         ).all()
         available_images = [img.image_key for img in images]
         
-        validation_result = MarkupParser.validate_markup(
-            assignment.raw_content, 
-            available_images
-        )
+        # Tokenize once for both validation and chunking
+        document = MarkupParser.tokenize(assignment.raw_content)
+        validation_result = MarkupParser.validate_document(document, available_images)
         
         if not validation_result.is_valid:
             return PublishResult(
@@ -225,15 +298,15 @@ class ReadingAssignmentService:
             ReadingChunk.assignment_id == assignment_id
         ).delete()
         
-        # Parse and create chunks
-        chunks_data = MarkupParser.parse_chunks(assignment.raw_content)
+        # Create chunks
+        chunks_data = document.chunks
         
-        for order, (content, has_important) in enumerate(chunks_data, 1):
+        for order, parsed_chunk in enumerate(chunks_data, 1):
             chunk = ReadingChunk(
                 assignment_id=assignment_id,
                 chunk_order=order,
-                content=content,
-                has_important_sections=has_important
+                content=parsed_chunk.content,
+                has_important_sections=parsed_chunk.has_important
             )
             db.add(chunk)
         
@@ -2,19 +2,20 @@ import re
 from typing import List, Tuple, Optional, Dict
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, delete, text
 from fastapi import HTTPException, status
 import os
 from datetime import datetime
 
-from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
+from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage, QuestionCache
 from app.schemas.reading import (
     ReadingAssignmentCreate, 
     ReadingAssignmentUpdate,
     MarkupValidationResult,
     PublishResult
 )
-from app.services.reading import MarkupParser
+from app.services.reading import MarkupParser, MarkupChunk
+from app.services.text_simplification import create_content_hash
 
 
 class ReadingAssignmentAsyncService:
@@ -150,10 +151,9 @@ class ReadingAssignmentAsyncService:
         images = images_result.scalars().all()
         available_images = [img.image_tag for img in images]
         
-        validation_result = MarkupParser.validate_markup(
-            assignment.raw_content, 
-            available_images
-        )
+        # Tokenize once for both validation and chunking
+        document = MarkupParser.tokenize(assignment.raw_content)
+        validation_result = MarkupParser.validate_document(document, available_images)
         
         if not validation_result.is_valid:
             return PublishResult(
@@ -161,27 +161,9 @@ class ReadingAssignmentAsyncService:
                 message=f"Validation failed: {'; '.join(validation_result.errors)}"
             )
         
-        # Delete existing chunks if any
-        chunks_result = await db.execute(
-            select(ReadingChunk).where(
-                ReadingChunk.assignment_id == assignment_id
-            )
-        )
-        existing_chunks = chunks_result.scalars().all()
-        for chunk in existing_chunks:
-            await db.delete(chunk)
-        
-        # Parse and create chunks
-        chunks_data = MarkupParser.parse_chunks(assignment.raw_content)
-        
-        for order, (content, has_important) in enumerate(chunks_data, 1):
-            chunk = ReadingChunk(
-                assignment_id=assignment_id,
-                chunk_order=order,
-                content=content,
-                has_important_sections=has_important
-            )
-            db.add(chunk)
+        # Rewrite only the chunks whose content changed
+        chunks_data = document.chunks
+        await ReadingAssignmentAsyncService.sync_chunks(db, assignment_id, chunks_data)
         
         # Update assignment
         assignment.total_chunks = len(chunks_data)
@@ -196,6 +178,83 @@ class ReadingAssignmentAsyncService:
             chunk_count=len(chunks_data)
         )
     
+    @staticmethod
+    async def sync_chunks(
+        db: AsyncSession,
+        assignment_id: UUID,
+        chunks: List[MarkupChunk]
+    ) -> List[int]:
+        """Bring reading_chunks in line with freshly parsed markup.
+        
+        Chunks are compared by content hash at each position: unchanged chunks
+        are left alone, changed ones are updated in one bulk statement, new ones
+        inserted in one multi-row insert and surplus ones deleted. Cached
+        questions and simplifications are only dropped for the positions that
+        changed. Returns those chunk numbers. Does not commit.
+        """
+        existing_result = await db.execute(
+            select(ReadingChunk.id, ReadingChunk.chunk_order, ReadingChunk.content)
+            .where(ReadingChunk.assignment_id == assignment_id)
+        )
+        existing = {
+            row.chunk_order: (row.id, create_content_hash(row.content))
+            for row in existing_result
+        }
+        
+        changed_rows = []
+        new_rows = []
+        stale_orders = []
+        for order, chunk in enumerate(chunks, 1):
+            current = existing.get(order)
+            if current is None:
+                new_rows.append({
+                    "assignment_id": assignment_id,
+                    "chunk_order": order,
+                    "content": chunk.content,
+                    "has_important_sections": chunk.has_important
+                })
+            elif current[1] != create_content_hash(chunk.content):
+                changed_rows.append({
+                    "id": current[0],
+                    "content": chunk.content,
+                    "has_important_sections": chunk.has_important
+                })
+                stale_orders.append(order)
+        
+        removed_orders = sorted(order for order in existing if order > len(chunks))
+        stale_orders.extend(removed_orders)
+        
+        if changed_rows:
+            await db.execute(update(ReadingChunk), changed_rows)
+        if new_rows:
+            await db.execute(insert(ReadingChunk), new_rows)
+        if removed_orders:
+            await db.execute(
+                delete(ReadingChunk).where(
+                    ReadingChunk.assignment_id == assignment_id,
+                    ReadingChunk.chunk_order > len(chunks)
+                )
+            )
+        
+        if stale_orders:
+            # Both caches are keyed by chunk number, so only these positions can be stale
+            await db.execute(
+                delete(QuestionCache).where(
+                    QuestionCache.assignment_id == assignment_id,
+                    QuestionCache.chunk_id.in_(stale_orders)
+                )
+            )
+            await db.execute(
+                text("""
+                    DELETE FROM text_simplification_cache
+                    WHERE assignment_id = :assignment_id
+                    AND chunk_number = ANY(:chunk_numbers)
+                """),
+                {"assignment_id": assignment_id, "chunk_numbers": stale_orders}
+            )
+        
+        return stale_orders
+    
     @staticmethod
     async def get_teacher_assignments(
         db: AsyncSession,
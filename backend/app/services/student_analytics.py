@@ -0,0 +1,709 @@
+"""
+Per-student analytics for the teacher reports
+
+Each module's analytics (UMARead, UMAVocab, UMADebate, UMAWrite, UMATest) is
+computed live from the attempt and response tables by the get_*_analytics
+functions below. The result is kept in a student_analytics_rollups row per
+(student, module) that is refreshed in the background whenever the student
+completes work in that module, so the teacher analytics view reads five
+precomputed rows instead of scanning every table on each request.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Set, Tuple
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select, and_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.models.classroom import StudentAssignment
+from app.models.tests import StudentTestAttempt, TestQuestionEvaluation
+from app.models.umaread import UmareadStudentResponse
+from app.models.vocabulary_test import VocabularyTestAttempt
+from app.models.vocabulary_practice import VocabularyPracticeProgress, VocabularyStoryResponse, VocabularyConceptMap
+from app.models.debate import StudentDebate, DebatePost, DebateChallenge
+from app.models.writing import StudentWritingSubmission
+from app.models.analytics import StudentAnalyticsRollup
+
+logger = logging.getLogger(__name__)
+
+# Wait before recomputing so the request that scheduled the refresh has
+# committed, and so bursts of completions collapse into one recompute
+ROLLUP_REFRESH_DELAY_SECONDS = 2.0
+
+# Rollups older than this are recomputed on read, which bounds staleness
+# from changes that don't schedule a refresh (e.g. resets and manual fixes)
+ROLLUP_MAX_AGE = timedelta(hours=6)
+
+_refresh_tasks: Dict[Tuple[UUID, str], asyncio.Task] = {}
+_refresh_pending: Set[Tuple[UUID, str]] = set()
+
+
+async def get_umaread_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
+    """Get UMARead analytics for a student"""
+    # Get assignments completed
+    assignments_result = await db.execute(
+        select(StudentAssignment).where(
+            and_(
+                StudentAssignment.student_id == student_id,
+                StudentAssignment.assignment_type == 'reading',
+                StudentAssignment.status.in_(['completed', 'test_completed'])
+            )
+        )
+    )
+    assignments = assignments_result.scalars().all()
+    
+    # Get detailed responses
+    responses_result = await db.execute(
+        select(UmareadStudentResponse).where(
+            UmareadStudentResponse.student_id == student_id
+        ).order_by(UmareadStudentResponse.created_at.desc())
+    )
+    responses = responses_result.scalars().all()
+    
+    # Get test attempts
+    test_attempts_result = await db.execute(
+        select(
+            StudentTestAttempt,
+            TestQuestionEvaluation
+        ).outerjoin(
+            TestQuestionEvaluation,
+            TestQuestionEvaluation.test_attempt_id == StudentTestAttempt.id
+        ).where(
+            and_(
+                StudentTestAttempt.student_id == student_id,
+                StudentTestAttempt.assignment_id.is_not(None)
+            )
+        )
+    )
+    test_data = test_attempts_result.all()
+    
+    # Calculate aggregated metrics
+    total_responses = len(responses)
+    correct_responses = sum(1 for r in responses if r.is_correct)
+    average_comprehension = round((correct_responses / total_responses * 100) if total_responses > 0 else 0)
+    total_time_spent = round(sum(r.time_spent_seconds or 0 for r in responses) / 60)
+    current_difficulty = max((r.difficulty_level or 3 for r in responses), default=3)
+    
+    # Analyze error patterns
+    error_patterns = {}
+    for response in responses:
+        if not response.is_correct:
+            key = f"{response.question_type}_level_{response.difficulty_level}"
+            error_patterns[key] = error_patterns.get(key, 0) + 1
+    
+    # Analyze progression
+    progression_data = []
+    date_stats = {}
+    for response in responses:
+        date = response.created_at.date().isoformat()
+        if date not in date_stats:
+            date_stats[date] = {'total': 0, 'correct': 0}
+        date_stats[date]['total'] += 1
+        if response.is_correct:
+            date_stats[date]['correct'] += 1
+    
+    for date, stats in date_stats.items():
+        progression_data.append({
+            'date': date,
+            'accuracy': round((stats['correct'] / stats['total']) * 100)
+        })
+    
+    return {
+        "assignmentsCompleted": len(assignments),
+        "averageComprehension": average_comprehension,
+        "totalTimeSpent": total_time_spent,
+        "currentDifficulty": current_difficulty,
+        "responses": [
+            {
+                "assignment_id": r.assignment_id,
+                "chunk_number": r.chunk_number,
+                "question_type": r.question_type,
+                "difficulty_level": r.difficulty_level,
+                "is_correct": r.is_correct,
+                "attempt_number": r.attempt_number,
+                "time_spent_seconds": r.time_spent_seconds,
+                "ai_feedback": r.ai_feedback,
+                "occurred_at": r.created_at.isoformat()
+            }
+            for r in responses[:100]  # Limit to most recent 100
+        ],
+        "testAttempts": [
+            {
+                "assignment_id": ta.StudentTestAttempt.assignment_id,
+                "score": float(ta.StudentTestAttempt.score) if ta.StudentTestAttempt.score else None,
+                "time_spent_seconds": ta.StudentTestAttempt.time_spent_seconds,
+                "completed_at": ta.StudentTestAttempt.submitted_at.isoformat() if ta.StudentTestAttempt.submitted_at else None,
+                "question_number": ta.TestQuestionEvaluation.question_number if ta.TestQuestionEvaluation else None,
+                "rubric_score": ta.TestQuestionEvaluation.rubric_score if ta.TestQuestionEvaluation else None,
+                "scoring_rationale": ta.TestQuestionEvaluation.scoring_rationale if ta.TestQuestionEvaluation else None,
+                "key_concepts_identified": ta.TestQuestionEvaluation.key_concepts_identified if ta.TestQuestionEvaluation else None,
+                "misconceptions_detected": ta.TestQuestionEvaluation.misconceptions_detected if ta.TestQuestionEvaluation else None
+            }
+            for ta in test_data
+        ],
+        "errorPatterns": error_patterns,
+        "progressionData": progression_data
+    }
+
+
+async def get_umavocab_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
+    """Get UMAVocab analytics for a student"""
+    # Get vocabulary test attempts
+    test_attempts_result = await db.execute(
+        select(VocabularyTestAttempt).where(
+            VocabularyTestAttempt.student_id == student_id
+        )
+    )
+    test_attempts = test_attempts_result.scalars().all()
+    
+    # Get practice progress
+    practice_result = await db.execute(
+        select(VocabularyPracticeProgress).where(
+            VocabularyPracticeProgress.student_id == student_id
+        )
+    )
+    practice_progress = practice_result.scalars().all()
+    
+    # Get story responses
+    story_result = await db.execute(
+        select(VocabularyStoryResponse).where(
+            VocabularyStoryResponse.student_id == student_id
+        )
+    )
+    story_responses = story_result.scalars().all()
+    
+    # Get concept maps
+    concept_result = await db.execute(
+        select(VocabularyConceptMap).where(
+            VocabularyConceptMap.student_id == student_id
+        )
+    )
+    concept_maps = concept_result.scalars().all()
+    
+    # Calculate metrics
+    lists_completed = len(set(t.test_id for t in test_attempts))
+    average_test_score = round(sum(t.score_percentage for t in test_attempts) / len(test_attempts)) if test_attempts else 0
+    
+    # Count practice activities completed
+    practice_activities_completed = 0
+    for progress in practice_progress:
+        if progress.practice_status:
+            # Handle both dict and string types
+            if isinstance(progress.practice_status, str):
+                try:
+                    practice_data = json.loads(progress.practice_status)
+                except:
+                    continue
+            else:
+                practice_data = progress.practice_status
+            
+            assignments = practice_data.get('assignments', {})
+            practice_activities_completed += sum(
+                1 for a in assignments.values() 
+                if isinstance(a, dict) and a.get('status') == 'completed'
+            )
+    
+    words_mastered = sum(1 for c in concept_maps if c.word_score >= 3.5)
+    
+    # Identify problem words
+    problem_words = {}
+    for attempt in test_attempts:
+        if attempt.responses:
+            # Handle both dict and string types
+            if isinstance(attempt.responses, str):
+                try:
+                    responses_data = json.loads(attempt.responses)
+                except:
+                    continue
+            else:
+                responses_data = attempt.responses
+                
+            for word_id, response in responses_data.items():
+                if isinstance(response, dict) and not response.get('correct'):
+                    problem_words[word_id] = problem_words.get(word_id, 0) + 1
+    
+    problem_words_list = sorted(
+        [{'wordId': k, 'errorCount': v} for k, v in problem_words.items()],
+        key=lambda x: x['errorCount'],
+        reverse=True
+    )[:10]
+    
+    return {
+        "listsCompleted": lists_completed,
+        "averageTestScore": average_test_score,
+        "practiceActivitiesCompleted": practice_activities_completed,
+        "wordsMastered": words_mastered,
+        "testAttempts": [
+            {
+                "test_id": t.test_id,
+                "score_percentage": float(t.score_percentage),
+                "questions_correct": t.questions_correct,
+                "total_questions": t.total_questions,
+                "time_spent_seconds": t.time_spent_seconds,
+                "completed_at": t.completed_at.isoformat() if t.completed_at else None,
+                "responses": t.responses
+            }
+            for t in test_attempts[:50]
+        ],
+        "practiceProgress": [
+            {
+                "vocabulary_list_id": p.vocabulary_list_id,
+                "practice_status": p.practice_status,
+                "updated_at": p.updated_at.isoformat()
+            }
+            for p in practice_progress
+        ],
+        "storyResponses": [
+            {
+                "vocabulary_list_id": s.vocabulary_list_id,
+                "total_score": s.total_score,
+                "ai_evaluation": s.ai_evaluation,
+                "submitted_at": s.submitted_at.isoformat()
+            }
+            for s in story_responses
+        ],
+        "conceptMaps": [
+            {
+                "word_id": c.word_id,
+                "word_score": float(c.word_score),
+                "ai_evaluation": c.ai_evaluation,
+                "completed_at": c.completed_at.isoformat()
+            }
+            for c in concept_maps
+        ],
+        "problemWords": problem_words_list
+    }
+
+
+async def get_umadebate_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
+    """Get UMADebate analytics for a student"""
+    # Get debate participation
+    debates_result = await db.execute(
+        select(StudentDebate).where(
+            StudentDebate.student_id == student_id
+        )
+    )
+    debates = debates_result.scalars().all()
+    
+    # Get debate posts
+    posts_result = await db.execute(
+        select(DebatePost).join(
+            StudentDebate, DebatePost.student_debate_id == StudentDebate.id
+        ).where(
+            and_(
+                StudentDebate.student_id == student_id,
+                DebatePost.post_type == 'student'
+            )
+        )
+    )
+    posts = posts_result.scalars().all()
+    
+    # Get challenges
+    challenges_result = await db.execute(
+        select(DebateChallenge).where(
+            DebateChallenge.student_id == student_id
+        )
+    )
+    challenges = challenges_result.scalars().all()
+    
+    # Calculate metrics
+    debates_completed = sum(1 for d in debates if d.status == 'completed')
+    average_score = round(
+        sum(d.final_percentage or 0 for d in debates if d.final_percentage) / 
+        sum(1 for d in debates if d.final_percentage)
+    ) if any(d.final_percentage for d in debates) else 0
+    
+    techniques_used = len(set(p.selected_technique for p in posts if p.selected_technique))
+    fallacies_identified = sum(1 for c in challenges if c.challenge_type == 'fallacy' and c.is_correct)
+    
+    # Analyze score breakdown
+    score_dimensions = ['clarity', 'evidence', 'logic', 'persuasiveness', 'rebuttal']
+    score_breakdown = []
+    for dimension in score_dimensions:
+        scores = [getattr(p, f"{dimension}_score") for p in posts if getattr(p, f"{dimension}_score") is not None]
+        if scores:
+            score_breakdown.append({
+                'dimension': dimension,
+                'average': round(sum(scores) / len(scores), 1)
+            })
+    
+    return {
+        "debatesCompleted": debates_completed,
+        "averageScore": average_score,
+        "techniquesUsed": techniques_used,
+        "fallaciesIdentified": fallacies_identified,
+        "debates": [
+            {
+                "assignment_id": d.assignment_id,
+                "status": d.status,
+                "debate_1_percentage": float(d.debate_1_percentage) if d.debate_1_percentage else None,
+                "debate_2_percentage": float(d.debate_2_percentage) if d.debate_2_percentage else None,
+                "debate_3_percentage": float(d.debate_3_percentage) if d.debate_3_percentage else None,
+                "final_percentage": float(d.final_percentage) if d.final_percentage else None,
+                "fallacy_counter": d.fallacy_counter,
+                "created_at": d.created_at.isoformat(),
+                "updated_at": d.updated_at.isoformat()
+            }
+            for d in debates
+        ],
+        "posts": [
+            {
+                "debate_number": p.debate_number,
+                "round_number": p.round_number,
+                "clarity_score": float(p.clarity_score) if p.clarity_score else None,
+                "evidence_score": float(p.evidence_score) if p.evidence_score else None,
+                "logic_score": float(p.logic_score) if p.logic_score else None,
+                "persuasiveness_score": float(p.persuasiveness_score) if p.persuasiveness_score else None,
+                "rebuttal_score": float(p.rebuttal_score) if p.rebuttal_score else None,
+                "final_percentage": float(p.final_percentage) if p.final_percentage else None,
+                "selected_technique": p.selected_technique,
+                "technique_bonus_awarded": float(p.technique_bonus_awarded) if p.technique_bonus_awarded else None,
+                "ai_feedback": p.ai_feedback
+            }
+            for p in posts[:100]
+        ],
+        "challenges": [
+            {
+                "challenge_type": c.challenge_type,
+                "is_correct": c.is_correct,
+                "points_awarded": float(c.points_awarded)
+            }
+            for c in challenges
+        ],
+        "scoreBreakdown": score_breakdown
+    }
+
+
+async def get_umawrite_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
+    """Get UMAWrite analytics for a student"""
+    # Get writing submissions
+    submissions_result = await db.execute(
+        select(StudentWritingSubmission).where(
+            StudentWritingSubmission.student_id == student_id
+        ).order_by(StudentWritingSubmission.submitted_at.desc())
+    )
+    submissions = submissions_result.scalars().all()
+    
+    # Calculate metrics
+    assignments_completed = len(set(s.writing_assignment_id for s in submissions))
+    scored_submissions = [s for s in submissions if s.score is not None]
+    average_score = sum(s.score for s in scored_submissions) / len(scored_submissions) if scored_submissions else 0
+    average_word_count = round(sum(s.word_count for s in submissions) / len(submissions)) if submissions else 0
+    
+    # Calculate improvement rate
+    improvement_rate = 0
+    assignments_by_id = {}
+    for submission in submissions:
+        if submission.writing_assignment_id not in assignments_by_id:
+            assignments_by_id[submission.writing_assignment_id] = []
+        assignments_by_id[submission.writing_assignment_id].append(submission)
+    
+    improvements = []
+    for assignment_id, attempts in assignments_by_id.items():
+        if len(attempts) >= 2:
+            sorted_attempts = sorted(attempts, key=lambda x: x.submission_attempt)
+            first_score = sorted_attempts[0].score or 0
+            last_score = sorted_attempts[-1].score or 0
+            if first_score > 0:
+                improvement = ((last_score - first_score) / first_score) * 100
+                improvements.append(improvement)
+    
+    if improvements:
+        improvement_rate = round(sum(improvements) / len(improvements))
+    
+    # Analyze technique usage
+    technique_usage = {}
+    for submission in submissions:
+        for technique in (submission.selected_techniques or []):
+            technique_usage[technique] = technique_usage.get(technique, 0) + 1
+    
+    # Analyze feedback patterns
+    feedback_patterns = []
+    for submission in submissions:
+        if submission.ai_feedback:
+            if isinstance(submission.ai_feedback, dict):
+                areas = submission.ai_feedback.get('areas_for_improvement', [])
+                feedback_patterns.extend(areas)
+    
+    return {
+        "assignmentsCompleted": assignments_completed,
+        "averageScore": round(average_score, 1),
+        "averageWordCount": average_word_count,
+        "improvementRate": improvement_rate,
+        "submissions": [
+            {
+                "writing_assignment_id": s.writing_assignment_id,
+                "response_text": s.response_text,
+                "selected_techniques": s.selected_techniques,
+                "word_count": s.word_count,
+                "submission_attempt": s.submission_attempt,
+                "score": float(s.score) if s.score else None,
+                "ai_feedback": s.ai_feedback,
+                "submitted_at": s.submitted_at.isoformat()
+            }
+            for s in submissions[:50]
+        ],
+        "techniqueAnalysis": technique_usage,
+        "feedbackPatterns": feedback_patterns[:20]  # Limit to 20 most recent
+    }
+
+
+async def get_umatest_analytics(db: AsyncSession, student_id: UUID) -> Dict[Any, Any]:
+    """Get UMATest analytics for a student"""
+    # Get test attempts
+    test_attempts_result = await db.execute(
+        select(
+            StudentTestAttempt,
+            TestQuestionEvaluation
+        ).outerjoin(
+            TestQuestionEvaluation,
+            TestQuestionEvaluation.test_attempt_id == StudentTestAttempt.id
+        ).where(
+            and_(
+                StudentTestAttempt.student_id == student_id,
+                StudentTestAttempt.test_id.is_not(None)
+            )
+        )
+    )
+    test_data = test_attempts_result.all()
+    
+    # Group by test attempt
+    attempts_dict = {}
+    for row in test_data:
+        attempt = row.StudentTestAttempt
+        evaluation = row.TestQuestionEvaluation
+        
+        if attempt.id not in attempts_dict:
+            attempts_dict[attempt.id] = {
+                'attempt': attempt,
+                'evaluations': []
+            }
+        
+        if evaluation:
+            attempts_dict[attempt.id]['evaluations'].append(evaluation)
+    
+    # Calculate metrics
+    tests_completed = len(set(a['attempt'].test_id for a in attempts_dict.values()))
+    scored_attempts = [a['attempt'] for a in attempts_dict.values() if a['attempt'].score is not None]
+    average_score = round(sum(a.score for a in scored_attempts) / len(scored_attempts)) if scored_attempts else 0
+    pass_rate = round((sum(1 for a in scored_attempts if a.score >= 70) / len(scored_attempts)) * 100) if scored_attempts else 0
+    
+    # Calculate average time per question
+    total_time = 0
+    total_questions = 0
+    for data in attempts_dict.values():
+        if data['attempt'].time_spent_seconds and data['evaluations']:
+            total_time += data['attempt'].time_spent_seconds
+            total_questions += len(data['evaluations'])
+    
+    avg_time_per_question = round(total_time / total_questions) if total_questions > 0 else 0
+    
+    # Analyze concept mastery
+    concept_stats = {}
+    all_misconceptions = []
+    
+    for data in attempts_dict.values():
+        for evaluation in data['evaluations']:
+            if evaluation.key_concepts_identified:
+                for concept in evaluation.key_concepts_identified:
+                    if concept not in concept_stats:
+                        concept_stats[concept] = {'correct': 0, 'total': 0}
+                    concept_stats[concept]['total'] += 1
+                    if evaluation.rubric_score >= 3:
+                        concept_stats[concept]['correct'] += 1
+            
+            if evaluation.misconceptions_detected:
+                all_misconceptions.extend(evaluation.misconceptions_detected)
+    
+    concept_mastery = [
+        {
+            'concept': concept,
+            'mastery': round((stats['correct'] / stats['total']) * 100)
+        }
+        for concept, stats in concept_stats.items()
+    ]
+    
+    return {
+        "testsCompleted": tests_completed,
+        "averageScore": average_score,
+        "passRate": pass_rate,
+        "avgTimePerQuestion": avg_time_per_question,
+        "testAttempts": [
+            {
+                "test_id": data['attempt'].test_id,
+                "score": float(data['attempt'].score) if data['attempt'].score else None,
+                "time_spent_seconds": data['attempt'].time_spent_seconds,
+                "completed_at": data['attempt'].submitted_at.isoformat() if data['attempt'].submitted_at else None,
+                "evaluations": [
+                    {
+                        "question_number": e.question_number,
+                        "rubric_score": e.rubric_score,
+                        "points_earned": float(e.points_earned),
+                        "max_points": float(e.max_points),
+                        "key_concepts_identified": e.key_concepts_identified,
+                        "misconceptions_detected": e.misconceptions_detected,
+                        "scoring_rationale": e.scoring_rationale
+                    }
+                    for e in data['evaluations']
+                ]
+            }
+            for data in list(attempts_dict.values())[:20]  # Limit to 20 most recent
+        ],
+        "conceptMastery": concept_mastery,
+        "misconceptions": list(set(all_misconceptions))[:50]  # Unique misconceptions, limited to 50
+    }
+
+
+MODULE_ANALYTICS = {
+    "umaread": get_umaread_analytics,
+    "umavocab": get_umavocab_analytics,
+    "umadebate": get_umadebate_analytics,
+    "umawrite": get_umawrite_analytics,
+    "umatest": get_umatest_analytics,
+}
+
+# Key in each module's analytics payload that counts completed work
+COMPLETED_KEYS = {
+    "umaread": "assignmentsCompleted",
+    "umavocab": "listsCompleted",
+    "umadebate": "debatesCompleted",
+    "umawrite": "assignmentsCompleted",
+    "umatest": "testsCompleted",
+}
+
+
+def _rollup_values(module: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Pull the headline columns for a rollup row out of a module payload"""
+    values = {
+        "completed_count": data.get(COMPLETED_KEYS[module], 0) or 0,
+        "average_score": None,
+        "time_spent_minutes": None,
+        "current_difficulty": None,
+    }
+    if module == "umaread":
+        values["average_score"] = data.get("averageComprehension")
+        values["time_spent_minutes"] = data.get("totalTimeSpent")
+        values["current_difficulty"] = data.get("currentDifficulty")
+    elif module == "umavocab":
+        values["average_score"] = data.get("averageTestScore")
+        values["time_spent_minutes"] = round(
+            sum(a.get("time_spent_seconds") or 0 for a in data.get("testAttempts", [])) / 60
+        )
+    elif module in ("umadebate", "umawrite"):
+        values["average_score"] = data.get("averageScore")
+    elif module == "umatest":
+        values["average_score"] = data.get("averageScore")
+        values["time_spent_minutes"] = round(
+            sum(a.get("time_spent_seconds") or 0 for a in data.get("testAttempts", [])) / 60
+        )
+    return values
+
+
+async def _compute_module(module: str, student_id: UUID) -> Dict[str, Any]:
+    """Run one module's live computation on its own session"""
+    async with AsyncSessionLocal() as session:
+        data = await MODULE_ANALYTICS[module](session, student_id)
+    # Encode the same way the API response would so stored and live
+    # payloads are indistinguishable
+    return jsonable_encoder(data)
+
+
+async def _store_rollup(db: AsyncSession, student_id: UUID, module: str, data: Dict[str, Any]) -> None:
+    await db.execute(
+        text("""
+            INSERT INTO student_analytics_rollups (
+                student_id, module, completed_count, average_score,
+                time_spent_minutes, current_difficulty, payload, computed_at
+            ) VALUES (
+                :student_id, :module, :completed_count, :average_score,
+                :time_spent_minutes, :current_difficulty, CAST(:payload AS jsonb), NOW()
+            )
+            ON CONFLICT (student_id, module) DO UPDATE SET
+                completed_count = EXCLUDED.completed_count,
+                average_score = EXCLUDED.average_score,
+                time_spent_minutes = EXCLUDED.time_spent_minutes,
+                current_difficulty = EXCLUDED.current_difficulty,
+                payload = EXCLUDED.payload,
+                computed_at = EXCLUDED.computed_at
+        """),
+        {
+            "student_id": student_id,
+            "module": module,
+            "payload": json.dumps(data),
+            **_rollup_values(module, data)
+        }
+    )
+
+
+async def refresh_student_rollup(student_id: UUID, module: str) -> Dict[str, Any]:
+    """Recompute one module's analytics for a student and store the rollup"""
+    data = await _compute_module(module, student_id)
+    async with AsyncSessionLocal() as session:
+        await _store_rollup(session, student_id, module, data)
+        await session.commit()
+    return data
+
+
+async def _run_scheduled_refresh(key: Tuple[UUID, str]) -> None:
+    student_id, module = key
+    try:
+        while True:
+            _refresh_pending.discard(key)
+            await asyncio.sleep(ROLLUP_REFRESH_DELAY_SECONDS)
+            try:
+                await refresh_student_rollup(student_id, module)
+            except Exception as e:
+                logger.error(f"Failed to refresh {module} analytics rollup for {student_id}: {e}")
+            # Completions that arrived while we were computing need another pass
+            if key not in _refresh_pending:
+                break
+    finally:
+        _refresh_tasks.pop(key, None)
+
+
+def schedule_rollup_refresh(student_id: UUID, module: str) -> None:
+    """Refresh a student's module rollup in the background after completed work
+
+    Safe to call before the caller commits; repeated calls while a refresh is
+    queued or running collapse into a single extra pass.
+    """
+    key = (student_id, module)
+    if key in _refresh_tasks:
+        _refresh_pending.add(key)
+        return
+    try:
+        _refresh_tasks[key] = asyncio.get_running_loop().create_task(_run_scheduled_refresh(key))
+    except RuntimeError:
+        # No running loop (e.g. called from a script); the next analytics
+        # read recomputes whatever is missing
+        pass
+
+
+async def get_student_module_analytics(db: AsyncSession, student_id: UUID) -> Dict[str, Dict[str, Any]]:
+    """Analytics for every module, read from rollups where they exist
+
+    Modules without a fresh rollup are computed live - concurrently, each on
+    its own session - and stored so the next read is a lookup.
+    """
+    result = await db.execute(
+        select(StudentAnalyticsRollup.module, StudentAnalyticsRollup.payload).where(
+            StudentAnalyticsRollup.student_id == student_id,
+            StudentAnalyticsRollup.computed_at >= datetime.now(timezone.utc) - ROLLUP_MAX_AGE
+        )
+    )
+    analytics = {row.module: row.payload for row in result if row.module in MODULE_ANALYTICS}
+
+    missing = [module for module in MODULE_ANALYTICS if module not in analytics]
+    if missing:
+        computed = await asyncio.gather(*(_compute_module(module, student_id) for module in missing))
+        for module, data in zip(missing, computed):
+            analytics[module] = data
+            await _store_rollup(db, student_id, module, data)
+        await db.commit()
+
+    return analytics
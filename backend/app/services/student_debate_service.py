@@ -16,6 +16,7 @@ from app.models.debate import (
 from app.models.classroom import ClassroomAssignment, ClassroomStudent
 from app.models.user import User
 from app.core.config import settings
+from app.services.student_analytics import schedule_rollup_refresh
 from app.schemas.student_debate import (
     StudentDebateCreate, StudentDebateUpdate, PostScore
 )
@@ -393,6 +394,8 @@ class StudentDebateService:
             student_debate.fallacy_counter += 1
             if student_debate.fallacy_counter >= 3:
                 student_debate.fallacy_counter = 0
+            
+            schedule_rollup_refresh(student_debate.student_id, "umadebate")
         
         await db.commit()
     
@@ -9,6 +9,8 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from app.config.ai_models import ANSWER_EVALUATION_MODEL
+from app.config.ai_config import configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -95,9 +97,11 @@ Format your response as JSON with these fields:
             import os
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
             model = genai.GenerativeModel(ANSWER_EVALUATION_MODEL)
-            response = model.generate_content(prompt)
+            with ai_telemetry.track("umaread_test_answer_evaluation", ANSWER_EVALUATION_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             # Parse the JSON response
             evaluation = json.loads(response.text)
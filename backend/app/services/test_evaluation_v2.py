@@ -17,12 +17,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, Field, validator
-import google.generativeai as genai
 
 from app.models.tests import StudentTestAttempt, AssignmentTest
 from app.models.reading import ReadingAssignment
 from app.models.user import User
-from app.config.ai_models import ANSWER_EVALUATION_MODEL
+from app.config.ai_models import ANSWER_EVALUATION_MODEL, GEMINI_DEFAULT_MODEL
 from app.config.rubric_config import (
     UMAREAD_SCORING_RUBRIC,
     get_rubric_score_points,
@@ -32,6 +31,8 @@ from app.config.rubric_config import (
     FEEDBACK_GUIDELINES
 )
 from app.core.database import get_db
+from app.config.ai_config import configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -205,48 +206,54 @@ class TestEvaluationServiceV2:
             assignment_metadata=test_data["assignment_metadata"]
         )
         
-        # Retry logic for AI calls
-        for attempt in range(self.max_retries):
-            try:
-                # Configure Gemini
-                import os
-                print(f"=== TEST EVALUATION V2: Starting AI evaluation attempt {attempt + 1} ===")
-                print(f"=== Using GEMINI_API_KEY: {'SET' if os.getenv('GEMINI_API_KEY') else 'NOT SET'} ===")
+        # Imported here rather than at module load; the SDK is slow to import
+        import google.generativeai as genai
+        
+        # Retry logic for AI calls; all attempts count as one tracked call
+        with ai_telemetry.track("umaread_test_evaluation", GEMINI_DEFAULT_MODEL, prompt) as call:
+            for attempt in range(self.max_retries):
+                try:
+                    # Configure Gemini
+                    import os
+                    print(f"=== TEST EVALUATION V2: Starting AI evaluation attempt {attempt + 1} ===")
+                    print(f"=== Using GEMINI_API_KEY: {'SET' if os.getenv('GEMINI_API_KEY') else 'NOT SET'} ===")
                 
-                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-                # TEMPORARY: Using hardcoded model like UMARead for testing
-                # model = genai.GenerativeModel(ANSWER_EVALUATION_MODEL)
-                model = genai.GenerativeModel('gemini-2.0-flash')
-                print(f"=== Configured Gemini with model: gemini-2.0-flash (hardcoded) ===")
+                    configure_gemini(os.getenv("GEMINI_API_KEY"))
+                    # ANSWER_EVALUATION_MODEL may name a non-Gemini provider, so use the Gemini default
+                    model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+                    print(f"=== Configured Gemini with model: {GEMINI_DEFAULT_MODEL} ===")
                 
-                # Generate evaluation
-                print(f"=== Sending prompt to Gemini (length: {len(prompt)} chars) ===")
-                response = model.generate_content(prompt)
-                print(f"=== Received response from Gemini ===")
+                    # Generate evaluation
+                    print(f"=== Sending prompt to Gemini (length: {len(prompt)} chars) ===")
+                    response = model.generate_content(prompt)
+                    call.record_response(response)
+                    print(f"=== Received response from Gemini ===")
                 
-                # Parse response into structured format
-                print(f"=== Raw response text: {response.text[:200]}... ===")
-                evaluation_data = json.loads(response.text)
+                    # Parse response into structured format
+                    print(f"=== Raw response text: {response.text[:200]}... ===")
+                    evaluation_data = json.loads(response.text)
                 
-                # Validate with Pydantic
-                result = TestEvaluationResult(**evaluation_data)
+                    # Validate with Pydantic
+                    result = TestEvaluationResult(**evaluation_data)
                 
-                # Validate we have exactly 10 evaluations
-                if len(result.question_evaluations) != 10:
-                    raise ValueError(f"Expected 10 evaluations, got {len(result.question_evaluations)}")
+                    # Validate we have exactly 10 evaluations
+                    if len(result.question_evaluations) != 10:
+                        raise ValueError(f"Expected 10 evaluations, got {len(result.question_evaluations)}")
                 
-                return result
+                    return result
                 
-            except Exception as e:
-                logger.warning(f"AI evaluation attempt {attempt + 1} failed: {str(e)}")
-                print(f"=== TEST EVALUATION V2 ERROR: Attempt {attempt + 1} failed ===")
-                print(f"=== Error Type: {type(e).__name__} ===")
-                print(f"=== Error Message: {str(e)} ===")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    # Final attempt failed, use fallback
-                    return self._get_fallback_evaluation(questions, student_answers)
+                except Exception as e:
+                    logger.warning(f"AI evaluation attempt {attempt + 1} failed: {str(e)}")
+                    print(f"=== TEST EVALUATION V2 ERROR: Attempt {attempt + 1} failed ===")
+                    print(f"=== Error Type: {type(e).__name__} ===")
+                    print(f"=== Error Message: {str(e)} ===")
+                    if attempt < self.max_retries - 1:
+                        call.retry()
+                        await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    else:
+                        # Final attempt failed, use fallback
+                        call.error_class = type(e).__name__
+                        return self._get_fallback_evaluation(questions, student_answers)
     
     def _build_evaluation_prompt(
         self, 
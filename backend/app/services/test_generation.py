@@ -12,6 +12,8 @@ from app.models.reading import ReadingAssignment, ReadingChunk, AssignmentImage
 from app.core.database import get_db
 from app.config.ai_models import QUESTION_GENERATION_MODEL
 from app.services.image_analyzer import ImageAnalyzer
+from app.config.ai_config import configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -194,7 +196,7 @@ Return ONLY a JSON array with exactly 10 question objects. No other text."""
             logger.debug(f"Chunk texts length: {len(chunk_texts)}")
             logger.debug(f"Important sections: {important_sections}")
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
             model = genai.GenerativeModel(QUESTION_GENERATION_MODEL)
             
             generation_config = genai.GenerationConfig(
@@ -204,10 +206,12 @@ Return ONLY a JSON array with exactly 10 question objects. No other text."""
                 max_output_tokens=8192,  # Increased for comprehensive answer explanations
             )
             
-            response = model.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
+            with ai_telemetry.track("umaread_test_generation", QUESTION_GENERATION_MODEL, prompt) as call:
+                response = model.generate_content(
+                    prompt,
+                    generation_config=generation_config
+                )
+                call.record_response(response)
             
             # Log the raw response for debugging
             logger.debug(f"AI Response: {response.text[:500]}...")
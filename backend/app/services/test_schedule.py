@@ -1,14 +1,17 @@
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, or_, func, select
+from sqlalchemy import and_, or_, select, text as sql_text
+from sqlalchemy.dialects.postgresql import insert
 from uuid import UUID
 import pytz
 import random
 import string
 
-from app.models.test_schedule import ClassroomTestSchedule, ClassroomTestOverride, TestOverrideUsage
-from app.models.classroom import Classroom
+from app.models.test_schedule import ClassroomTestSchedule, ClassroomTestOverride
+from app.models.classroom import Classroom, ClassroomStudent
 from app.models.user import User
 from app.schemas.test_schedule import (
     ClassroomTestScheduleCreate, 
@@ -22,6 +25,158 @@ from app.schemas.test_schedule import (
 from app.core.config import settings
 
 
+# Compiled schedules keyed by (schedule id, updated_at); the cap just bounds memory
+SCHEDULE_CACHE_SIZE = 10000
+_compiled_schedules: Dict[Any, "CompiledSchedule"] = {}
+
+
+@dataclass
+class CompiledSchedule:
+    """A schedule's windows laid out as sorted, merged UTC intervals
+    
+    Covers the local week containing the time it was compiled for plus the
+    following week, so "next window within seven days" never has to look
+    past the table. Lookups are binary searches; timezone conversion only
+    happens when a table is compiled.
+    """
+    timezone: str
+    # UTC instants of local midnight for each of the 15 days from the week's Monday
+    day_starts: List[datetime]
+    starts: List[datetime]
+    # Window ends in the schedule's timezone, with their display labels
+    ends: List[datetime]
+    end_labels: List[str]
+    
+    def covers(self, check_time: datetime) -> bool:
+        return self.day_starts[0] <= check_time < self.day_starts[7]
+    
+    def current_window(self, check_time: datetime) -> Optional[int]:
+        i = bisect_right(self.starts, check_time) - 1
+        if i >= 0 and check_time <= self.ends[i]:
+            return i
+        return None
+    
+    def next_window_start(self, check_time: datetime) -> Optional[datetime]:
+        i = bisect_right(self.starts, check_time)
+        if i == len(self.starts):
+            return None
+        # Same horizon as before: today plus the next six local days
+        today = bisect_right(self.day_starts, check_time) - 1
+        if self.starts[i] >= self.day_starts[today + 7]:
+            return None
+        return self.starts[i]
+
+
+def compile_schedule(schedule: ClassroomTestSchedule, check_time: datetime) -> CompiledSchedule:
+    """Lay out a schedule's windows for the local week containing check_time"""
+    tz = pytz.timezone(schedule.timezone)
+    local_date = check_time.astimezone(tz).date()
+    monday = local_date - timedelta(days=local_date.weekday())
+    
+    def to_utc(day, clock: time) -> datetime:
+        return tz.localize(datetime.combine(day, clock)).astimezone(timezone.utc)
+    
+    windows = [
+        (
+            set(window['days']),
+            time.fromisoformat(window['start_time']),
+            time.fromisoformat(window['end_time'])
+        )
+        for window in schedule.schedule_data.get('windows', [])
+    ]
+    
+    intervals = []
+    for offset in range(14):
+        day = monday + timedelta(days=offset)
+        day_name = day.strftime('%A').lower()
+        for days, start_time, end_time in windows:
+            if day_name in days:
+                intervals.append((to_utc(day, start_time), to_utc(day, end_time), end_time))
+    intervals.sort(key=lambda interval: interval[0])
+    
+    # Merge overlapping windows so a time falls in at most one interval
+    starts, ends, end_times = [], [], []
+    for start, end, end_time in intervals:
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1], end_times[-1] = end, end_time
+            continue
+        starts.append(start)
+        ends.append(end)
+        end_times.append(end_time)
+    
+    return CompiledSchedule(
+        timezone=schedule.timezone,
+        day_starts=[to_utc(monday + timedelta(days=offset), time()) for offset in range(15)],
+        starts=starts,
+        ends=[end.astimezone(tz) for end in ends],
+        end_labels=[end_time.strftime('%I:%M %p') for end_time in end_times]
+    )
+
+
+def get_compiled_schedule(schedule: ClassroomTestSchedule, check_time: datetime) -> CompiledSchedule:
+    """Return the cached table for this schedule version, recompiling when the week rolls over"""
+    cache_key = (schedule.id, schedule.updated_at, schedule.timezone)
+    compiled = _compiled_schedules.get(cache_key)
+    if compiled is None or not compiled.covers(check_time):
+        compiled = compile_schedule(schedule, check_time)
+        if len(_compiled_schedules) >= SCHEDULE_CACHE_SIZE:
+            _compiled_schedules.clear()
+        _compiled_schedules[cache_key] = compiled
+    return compiled
+
+
+# Attempts at drawing an unused override code before giving up
+OVERRIDE_CODE_ATTEMPTS = 10
+
+# Redeem an override in one statement: the WHERE clause is the whole
+# validity check, and the row lock makes current_uses < max_uses hold under
+# concurrent redemptions (a waiting UPDATE re-checks it against the
+# committed row). {key} is override_code or id.
+_REDEEM_OVERRIDE_SQL = """
+    WITH redeemed AS (
+        UPDATE classroom_test_overrides o
+        SET current_uses = o.current_uses + 1,
+            used_at = NOW()
+        WHERE o.{key} = :key
+        AND o.expires_at >= NOW()
+        AND o.current_uses < o.max_uses
+        AND EXISTS (
+            SELECT 1 FROM classroom_students cs
+            WHERE cs.classroom_id = o.classroom_id
+            AND cs.student_id = :student_id
+            AND cs.removed_at IS NULL
+        )
+        RETURNING o.id
+    ),
+    recorded AS (
+        INSERT INTO test_override_usage (override_id, student_id, test_attempt_id)
+        SELECT id, :student_id, :test_attempt_id FROM redeemed
+    )
+    SELECT id FROM redeemed
+"""
+
+# Everything validate_and_use_override reports on, in one lookup
+_OVERRIDE_STATUS_SQL = """
+    SELECT o.id,
+           o.expires_at < NOW() AS expired,
+           o.current_uses >= o.max_uses AS used_up,
+           EXISTS (
+               SELECT 1 FROM classroom_students cs
+               WHERE cs.classroom_id = o.classroom_id
+               AND cs.student_id = :student_id
+               AND cs.removed_at IS NULL
+           ) AS enrolled
+    FROM classroom_test_overrides o
+    WHERE o.override_code = :code
+"""
+
+
+def normalize_override_code(code: str) -> str:
+    """Codes are stored upper-case, so lookups are a plain unique-index match"""
+    return code.strip().upper()
+
+
 class TestScheduleService:
     @staticmethod
     async def create_or_update_schedule(
@@ -83,16 +238,52 @@ class TestScheduleService:
         )
         return result.unique().scalar_one_or_none()
     
+    @staticmethod
+    async def get_student_schedules(
+        db: AsyncSession,
+        student_id: UUID
+    ) -> List[Tuple[Classroom, Optional[ClassroomTestSchedule]]]:
+        """Load a student's active classrooms with their schedules in one query"""
+        result = await db.execute(
+            select(Classroom, ClassroomTestSchedule)
+            .join(
+                ClassroomStudent,
+                and_(
+                    ClassroomStudent.classroom_id == Classroom.id,
+                    ClassroomStudent.student_id == student_id,
+                    ClassroomStudent.removed_at.is_(None)
+                )
+            )
+            .outerjoin(ClassroomTestSchedule, ClassroomTestSchedule.classroom_id == Classroom.id)
+            .where(Classroom.deleted_at.is_(None))
+        )
+        return [(row.Classroom, row.ClassroomTestSchedule) for row in result]
+    
     @staticmethod
     async def check_test_availability(
         db: AsyncSession,
         classroom_id: UUID,
         check_time: Optional[datetime] = None
     ) -> TestAvailabilityStatus:
+        result = await db.execute(
+            select(ClassroomTestSchedule).where(
+                ClassroomTestSchedule.classroom_id == classroom_id
+            )
+        )
+        schedule = result.scalar_one_or_none()
+        
+        return TestScheduleService.evaluate_availability(schedule, check_time)
+    
+    @staticmethod
+    def evaluate_availability(
+        schedule: Optional[ClassroomTestSchedule],
+        check_time: Optional[datetime] = None
+    ) -> TestAvailabilityStatus:
+        """Check a loaded schedule against check_time (default now)"""
         if check_time is None:
             check_time = datetime.now(timezone.utc)
-        
-        schedule = await TestScheduleService.get_schedule(db, classroom_id)
+        elif check_time.tzinfo is None:
+            check_time = check_time.replace(tzinfo=timezone.utc)
         
         # If no schedule exists or it's inactive, testing is always allowed
         if not schedule or not schedule.is_active:
@@ -102,39 +293,20 @@ class TestScheduleService:
                 message="Testing is available 24/7 for this classroom"
             )
         
-        # Get timezone and convert check time
-        tz = pytz.timezone(schedule.timezone)
-        local_time = check_time.astimezone(tz)
-        current_time = local_time.time()
-        current_day = local_time.strftime('%A').lower()
+        compiled = get_compiled_schedule(schedule, check_time)
         
         # Check if current time falls within any window
-        windows = schedule.schedule_data.get('windows', [])
-        current_window_end = None
-        
-        for window in windows:
-            if current_day in window['days']:
-                start_time = time.fromisoformat(window['start_time'])
-                end_time = time.fromisoformat(window['end_time'])
-                
-                if start_time <= current_time <= end_time:
-                    # Currently in a testing window
-                    current_window_end = local_time.replace(
-                        hour=end_time.hour,
-                        minute=end_time.minute,
-                        second=0,
-                        microsecond=0
-                    )
-                    
-                    return TestAvailabilityStatus(
-                        allowed=True,
-                        current_window_end=current_window_end,
-                        schedule_active=True,
-                        message=f"Testing available until {end_time.strftime('%I:%M %p')}"
-                    )
+        window = compiled.current_window(check_time)
+        if window is not None:
+            return TestAvailabilityStatus(
+                allowed=True,
+                current_window_end=compiled.ends[window],
+                schedule_active=True,
+                message=f"Testing available until {compiled.end_labels[window]}"
+            )
         
         # Not in a testing window, find next available window
-        next_window = TestScheduleService._find_next_window(schedule, local_time)
+        next_window = compiled.next_window_start(check_time)
         
         if next_window:
             time_until = next_window - check_time
@@ -159,32 +331,6 @@ class TestScheduleService:
             message="No upcoming testing windows scheduled"
         )
     
-    @staticmethod
-    def _find_next_window(schedule: ClassroomTestSchedule, from_time: datetime) -> Optional[datetime]:
-        windows = schedule.schedule_data.get('windows', [])
-        tz = pytz.timezone(schedule.timezone)
-        
-        # Look ahead up to 7 days
-        for days_ahead in range(7):
-            check_date = from_time + timedelta(days=days_ahead)
-            check_day = check_date.strftime('%A').lower()
-            
-            for window in sorted(windows, key=lambda w: w['start_time']):
-                if check_day in window['days']:
-                    start_time = time.fromisoformat(window['start_time'])
-                    window_datetime = check_date.replace(
-                        hour=start_time.hour,
-                        minute=start_time.minute,
-                        second=0,
-                        microsecond=0
-                    )
-                    
-                    # Only return if the window is in the future
-                    if window_datetime > from_time:
-                        return window_datetime.astimezone(timezone.utc)
-        
-        return None
-    
     @staticmethod
     async def generate_override_code(
         db: AsyncSession,
@@ -205,57 +351,98 @@ class TestScheduleService:
         if not classroom:
             raise ValueError("Classroom not found or access denied")
         
-        # Generate unique code
-        code = await TestScheduleService._generate_unique_code(db)
-        
         # Calculate expiration
         expires_at = datetime.now(timezone.utc) + timedelta(hours=override_data.expires_in_hours)
         
-        # Create override
-        db_override = ClassroomTestOverride(
-            classroom_id=override_data.classroom_id,
-            teacher_id=teacher_id,
-            override_code=code,
-            reason=override_data.reason,
-            expires_at=expires_at,
-            max_uses=override_data.max_uses
-        )
-        
-        db.add(db_override)
-        await db.commit()
-        await db.refresh(db_override)
-        
-        return db_override
-    
-    @staticmethod
-    async def _generate_unique_code(db: AsyncSession) -> str:
-        while True:
-            # Generate 8-character alphanumeric code
+        # The unique constraint on override_code decides whether a code is
+        # free; a collision just draws another one
+        for _ in range(OVERRIDE_CODE_ATTEMPTS):
             code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-            
-            # Check if code already exists
-            result = await db.execute(
-                select(ClassroomTestOverride).where(
-                    ClassroomTestOverride.override_code == code
+            result = await db.scalars(
+                insert(ClassroomTestOverride)
+                .values(
+                    classroom_id=override_data.classroom_id,
+                    teacher_id=teacher_id,
+                    override_code=code,
+                    reason=override_data.reason,
+                    expires_at=expires_at,
+                    max_uses=override_data.max_uses
                 )
+                .on_conflict_do_nothing(index_elements=[ClassroomTestOverride.override_code])
+                .returning(ClassroomTestOverride)
             )
-            existing = result.scalar_one_or_none()
-            
-            if not existing:
-                return code
+            db_override = result.first()
+            if db_override:
+                await db.commit()
+                return db_override
+        
+        raise RuntimeError("Could not generate a unique override code")
+    
+    @staticmethod
+    async def record_override_usage(
+        db: AsyncSession,
+        student_id: UUID,
+        test_attempt_id: UUID,
+        override_id: Optional[UUID] = None,
+        override_code: Optional[str] = None,
+        commit: bool = True
+    ) -> Optional[UUID]:
+        """Count one use of an override, by id or code, if it is still valid for the student
+        
+        Returns the override id, or None if the override is unknown,
+        expired, used up or not for one of the student's classrooms. With
+        ``commit=False`` the use is taken in the caller's transaction, so it
+        stands or falls with whatever the caller writes alongside it.
+        """
+        if override_id is not None:
+            key_column, key = "id", override_id
+        else:
+            key_column, key = "override_code", normalize_override_code(override_code)
+        
+        result = await db.execute(
+            sql_text(_REDEEM_OVERRIDE_SQL.format(key=key_column)),
+            {
+                "key": key,
+                "student_id": student_id,
+                "test_attempt_id": test_attempt_id
+            }
+        )
+        redeemed_id = result.scalar()
+        if redeemed_id is None:
+            return None
+        
+        if commit:
+            await db.commit()
+        return redeemed_id
     
     @staticmethod
     async def validate_and_use_override(
         db: AsyncSession,
         validation_data: ValidateOverrideRequest
     ) -> Dict[str, Any]:
-        # Find the override code (case-insensitive comparison)
-        result = await db.execute(
-            select(ClassroomTestOverride).where(
-                func.upper(ClassroomTestOverride.override_code) == validation_data.override_code.upper()
+        code = normalize_override_code(validation_data.override_code)
+        
+        # Record usage if test_attempt_id provided
+        if validation_data.test_attempt_id:
+            override_id = await TestScheduleService.record_override_usage(
+                db,
+                validation_data.student_id,
+                validation_data.test_attempt_id,
+                override_code=code
             )
+            if override_id:
+                return {
+                    "valid": True,
+                    "override_id": override_id,
+                    "message": "Override code validated successfully"
+                }
+        
+        # Look up why the code cannot be used (or confirm it can)
+        result = await db.execute(
+            sql_text(_OVERRIDE_STATUS_SQL),
+            {"code": code, "student_id": validation_data.student_id}
         )
-        override = result.scalar_one_or_none()
+        override = result.mappings().first()
         
         if not override:
             return {
@@ -264,56 +451,37 @@ class TestScheduleService:
             }
         
         # Check if expired
-        if override.expires_at < datetime.now(timezone.utc):
+        if override["expired"]:
             return {
                 "valid": False,
                 "message": "Override code has expired"
             }
         
         # Check if max uses reached
-        if override.current_uses >= override.max_uses:
+        if override["used_up"]:
             return {
                 "valid": False,
                 "message": "Override code has reached maximum uses"
             }
         
         # Check if student is in the classroom
-        from app.models.classroom import ClassroomStudent
-        result = await db.execute(
-            select(ClassroomStudent).where(
-                and_(
-                    ClassroomStudent.classroom_id == override.classroom_id,
-                    ClassroomStudent.student_id == validation_data.student_id,
-                    ClassroomStudent.removed_at.is_(None)
-                )
-            )
-        )
-        student_enrollment = result.scalar_one_or_none()
-        
-        if not student_enrollment:
+        if not override["enrolled"]:
             return {
                 "valid": False,
                 "message": "Student not enrolled in this classroom"
             }
         
-        # Record usage if test_attempt_id provided
         if validation_data.test_attempt_id:
-            usage = TestOverrideUsage(
-                override_id=override.id,
-                student_id=validation_data.student_id,
-                test_attempt_id=validation_data.test_attempt_id
-            )
-            db.add(usage)
-            
-            # Increment usage count
-            override.current_uses += 1
-            override.used_at = datetime.now(timezone.utc)
-        
-        await db.commit()
+            # The redemption failed although the code looks valid now:
+            # another student took its last use in between
+            return {
+                "valid": False,
+                "message": "Override code has reached maximum uses"
+            }
         
         return {
             "valid": True,
-            "override_id": override.id,
+            "override_id": override["id"],
             "message": "Override code validated successfully"
         }
     
@@ -11,8 +11,10 @@ from datetime import datetime
 import uuid
 import os
 
-from ..config.ai_models import QUESTION_GENERATION_MODEL
+from ..config.ai_models import QUESTION_GENERATION_MODEL, GEMINI_DEFAULT_MODEL
 from ..models.reading import ReadingChunk, ReadingAssignment
+from ..config.ai_config import configure_gemini
+from ..core.ai_telemetry import ai_telemetry
 
 
 class TextSimplificationCache(BaseModel):
@@ -173,11 +175,13 @@ async def simplify_text_with_ai(
         # Use Google Generative AI directly (same pattern as question generation)
         import google.generativeai as genai
         
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        configure_gemini(os.getenv("GEMINI_API_KEY"))
+        model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
         
         # Generate simplified text
-        response = model.generate_content(prompt)
+        with ai_telemetry.track("umaread_simplification", GEMINI_DEFAULT_MODEL, prompt) as call:
+            response = model.generate_content(prompt)
+            call.record_response(response)
         return response.text.strip()
         
     except Exception as e:
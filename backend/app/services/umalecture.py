@@ -21,8 +21,219 @@ from app.schemas.umalecture import (
     LectureStudentProgress
 )
 from app.services.image_processing import ImageProcessor
+from app.services.event_buffer import event_buffer
 from app.core.config import settings
 
+# (student assignment id, student id) -> lecture id, used by track_interaction
+LECTURE_ID_CACHE_SIZE = 50000
+_interaction_lecture_ids: Dict[Any, UUID] = {}
+
+
+# progress_metadata is updated in place with a single UPDATE ... RETURNING per
+# operation: the row lock serializes concurrent clicks and no read round trip
+# is needed. Each statement starts from the stored document (or an empty one;
+# the column defaults to '{}').
+_EMPTY_PROGRESS = '{"topic_completion": {}, "current_topic": null, "current_tab": null, "lecture_complete": false}'
+_EMPTY_TOPIC_PROGRESS = '{"completed_tabs": [], "completed_at": null, "questions_correct": {}}'
+
+_PROGRESS_TOPIC_FROM = f"""
+    FROM (
+        SELECT COALESCE(NULLIF(sa.progress_metadata, '{{}}'::jsonb), '{_EMPTY_PROGRESS}'::jsonb) AS stored
+    ) base
+    CROSS JOIN LATERAL (
+        SELECT stored || jsonb_build_object(
+            'topic_completion', COALESCE(stored->'topic_completion', '{{}}'::jsonb)
+        ) AS doc
+    ) d
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(doc->'topic_completion'->CAST(:topic_id AS text), '{_EMPTY_TOPIC_PROGRESS}'::jsonb) AS topic
+    ) t
+"""
+
+_PROGRESS_WHERE = """
+    WHERE sa.classroom_assignment_id = :assignment_id
+    AND sa.student_id = :student_id
+    RETURNING sa.progress_metadata
+"""
+
+# A lecture's grade is the score of the highest difficulty completed in any topic
+LECTURE_DIFFICULTY_SCORES = {
+    "basic": 70,
+    "intermediate": 80,
+    "advanced": 90,
+    "expert": 100
+}
+
+# Grade of progress recorded before highest_score was stored: the best
+# completed tab in any topic (expert only counts with every answer correct),
+# as calculate_lecture_grade scores it
+_LEGACY_HIGHEST_SCORE_SQL = f"""(
+    SELECT MAX(CASE tab.name
+        {" ".join(f"WHEN '{tab}' THEN {score}" for tab, score in LECTURE_DIFFICULTY_SCORES.items())}
+    END)
+    FROM jsonb_each(doc->'topic_completion') AS tc(topic_id, progress)
+    CROSS JOIN jsonb_array_elements_text(COALESCE(tc.progress->'completed_tabs', '[]'::jsonb)) AS tab(name)
+    WHERE tab.name <> 'expert'
+    OR (
+        jsonb_array_length(COALESCE(tc.progress->'questions_correct'->'expert', '[]'::jsonb)) > 0
+        AND NOT (tc.progress->'questions_correct'->'expert' @> '[false]'::jsonb)
+    )
+)"""
+
+# Upsert lecture gradebook rows from a source of (student_id,
+# classroom_assignment_id, score); an existing row only ever goes up. The
+# classroom and title joins run only when there is a grade to write.
+_GRADEBOOK_UPSERT_SQL = """
+    INSERT INTO gradebook_entries (
+        student_id, classroom_id, assignment_type, assignment_id,
+        score_percentage, points_earned, points_possible,
+        completed_at, metadata
+    )
+    SELECT g.student_id, ca.classroom_id, 'umalecture', ca.assignment_id,
+           g.score, g.score, 100, NOW(),
+           jsonb_build_object('assignment_name', la.assignment_title, 'classroom_name', c.name)
+    FROM {source} g
+    JOIN classroom_assignments ca ON ca.id = g.classroom_assignment_id
+    JOIN classrooms c ON c.id = ca.classroom_id
+    JOIN reading_assignments la ON la.id = ca.assignment_id
+    WHERE ca.assignment_type = 'UMALecture'
+    ON CONFLICT (student_id, classroom_id, assignment_id) WHERE assignment_type = 'umalecture'
+    DO UPDATE SET score_percentage = EXCLUDED.score_percentage,
+                  points_earned = EXCLUDED.points_earned,
+                  points_possible = EXCLUDED.points_possible,
+                  completed_at = EXCLUDED.completed_at,
+                  updated_at = NOW()
+    WHERE gradebook_entries.score_percentage < EXCLUDED.score_percentage
+"""
+
+# Rows of the progress CTE below whose grade was raised by this statement
+_NEW_GRADE_SOURCE = """(
+            SELECT student_id, classroom_assignment_id, (progress_metadata->>'highest_score')::int AS score
+            FROM progress
+            WHERE progress_metadata->>'graded_at' = CAST(:completed_at AS text)
+        )"""
+
+# Set one question flag (padding earlier ones with false), append the tab to
+# completed_tabs once all its flags are true, and move to the topic/tab.
+# Completing a tab worth more than highest_score (or, for legacy progress
+# without one, the completed tabs' grade) raises it and stamps graded_at
+# with this call's timestamp, which is how the gradebook upsert in
+# the same statement knows there is a new grade to write.
+_RECORD_ANSWER_SQL = f"""
+    WITH progress AS (
+        UPDATE student_assignments sa
+        SET progress_metadata = (
+            SELECT jsonb_set(
+                jsonb_set(
+                    jsonb_set(
+                        CASE WHEN graded
+                            THEN doc || jsonb_build_object(
+                                'highest_score', CAST(:tab_score AS int),
+                                'graded_at', CAST(:completed_at AS text)
+                            )
+                            ELSE doc
+                        END,
+                        ARRAY['topic_completion', CAST(:topic_id AS text)],
+                        topic || jsonb_build_object(
+                            'questions_correct',
+                            COALESCE(topic->'questions_correct', '{{}}'::jsonb) || jsonb_build_object(CAST(:tab AS text), answers),
+                            'completed_tabs',
+                            CASE WHEN newly_complete
+                                THEN COALESCE(topic->'completed_tabs', '[]'::jsonb) || to_jsonb(CAST(:tab AS text))
+                                ELSE COALESCE(topic->'completed_tabs', '[]'::jsonb)
+                            END,
+                            'completed_at',
+                            CASE WHEN newly_complete AND COALESCE(topic->>'completed_at', '') = ''
+                                THEN to_jsonb(CAST(:completed_at AS text))
+                                ELSE COALESCE(topic->'completed_at', 'null'::jsonb)
+                            END
+                        )
+                    ),
+                    '{{current_topic}}', to_jsonb(CAST(:topic_id AS text))
+                ),
+                '{{current_tab}}', to_jsonb(CAST(:tab AS text))
+            )
+            {_PROGRESS_TOPIC_FROM}
+            CROSS JOIN LATERAL (
+                SELECT jsonb_agg(
+                    CASE WHEN i = CAST(:question_index AS int)
+                        THEN to_jsonb(CAST(:is_correct AS boolean))
+                        ELSE COALESCE(previous->i, 'false'::jsonb)
+                    END
+                    ORDER BY i
+                ) AS answers
+                FROM (
+                    SELECT COALESCE(topic->'questions_correct'->CAST(:tab AS text), '[]'::jsonb) AS previous
+                ) p
+                CROSS JOIN generate_series(0, GREATEST(jsonb_array_length(previous) - 1, CAST(:question_index AS int))) AS i
+            ) a
+            CROSS JOIN LATERAL (
+                SELECT NOT (answers @> '[false]'::jsonb)
+                    AND NOT COALESCE(topic->'completed_tabs' ? CAST(:tab AS text), FALSE) AS newly_complete
+            ) c
+            CROSS JOIN LATERAL (
+                SELECT COALESCE(
+                    newly_complete AND CAST(:tab_score AS int) > COALESCE(
+                        (doc->>'highest_score')::int, {_LEGACY_HIGHEST_SCORE_SQL}, 0
+                    ),
+                    FALSE
+                ) AS graded
+            ) g
+        ),
+        updated_at = NOW()
+        WHERE sa.classroom_assignment_id = :assignment_id
+        AND sa.student_id = :student_id
+        RETURNING sa.progress_metadata, sa.student_id, sa.classroom_assignment_id
+    ),
+    graded AS (
+        {_GRADEBOOK_UPSERT_SQL.format(source=_NEW_GRADE_SOURCE)}
+    )
+    SELECT progress_metadata FROM progress
+"""
+
+# Move to a topic/tab, creating the topic's progress entry if needed
+_ENTER_TOPIC_SQL = f"""
+    UPDATE student_assignments sa
+    SET progress_metadata = (
+        SELECT jsonb_set(
+            jsonb_set(
+                jsonb_set(doc, ARRAY['topic_completion', CAST(:topic_id AS text)], topic),
+                '{{current_topic}}', to_jsonb(CAST(:topic_id AS text))
+            ),
+            '{{current_tab}}', to_jsonb(CAST(:tab AS text))
+        )
+        {_PROGRESS_TOPIC_FROM}
+    ),
+    updated_at = NOW()
+    {_PROGRESS_WHERE}
+"""
+
+# Set current_topic and/or current_tab; a NULL parameter keeps the stored value
+_SET_POSITION_SQL = f"""
+    UPDATE student_assignments sa
+    SET progress_metadata = COALESCE(NULLIF(sa.progress_metadata, '{{}}'::jsonb), '{_EMPTY_PROGRESS}'::jsonb)
+        || jsonb_strip_nulls(jsonb_build_object(
+            'current_topic', CAST(:current_topic AS text),
+            'current_tab', CAST(:current_tab AS text)
+        )),
+        updated_at = NOW()
+    {_PROGRESS_WHERE}
+"""
+
+_SET_LECTURE_COMPLETE_SQL = f"""
+    UPDATE student_assignments sa
+    SET progress_metadata = jsonb_set(sa.progress_metadata, '{{lecture_complete}}', to_jsonb(CAST(:lecture_complete AS boolean))),
+        updated_at = NOW()
+    {_PROGRESS_WHERE}
+"""
+
+
+def build_topic_manifest(structure: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize a lecture structure as the topic count and ids used by reports"""
+    topics = (structure or {}).get("topics") or {}
+    topic_ids = list(topics.keys()) if isinstance(topics, dict) else []
+    return {"topic_count": len(topic_ids), "topic_ids": topic_ids}
+
 
 class UMALectureService:
     """Service class for UMALecture operations"""
@@ -231,6 +442,8 @@ class UMALectureService:
         if update_data.lecture_structure is not None:
             metadata["lecture_structure"] = update_data.lecture_structure
             metadata_updated = True
+            update_fields.append("topic_manifest = CAST(:topic_manifest AS jsonb)")
+            params["topic_manifest"] = json.dumps(build_topic_manifest(update_data.lecture_structure))
         
         if metadata_updated:
             update_fields.append("raw_content = :metadata")
@@ -569,6 +782,7 @@ class UMALectureService:
         query = sql_text("""
             UPDATE reading_assignments
             SET raw_content = :metadata,
+                topic_manifest = CAST(:topic_manifest AS jsonb),
                 updated_at = NOW()
             WHERE id = :lecture_id 
             AND teacher_id = :teacher_id
@@ -582,7 +796,8 @@ class UMALectureService:
             {
                 "lecture_id": lecture_id,
                 "teacher_id": teacher_id,
-                "metadata": json.dumps(metadata)
+                "metadata": json.dumps(metadata),
+                "topic_manifest": json.dumps(build_topic_manifest(structure))
             }
         )
         
@@ -610,6 +825,7 @@ class UMALectureService:
         query = sql_text("""
             UPDATE reading_assignments
             SET status = 'published',
+                topic_manifest = CAST(:topic_manifest AS jsonb),
                 updated_at = NOW()
             WHERE id = :lecture_id 
             AND teacher_id = :teacher_id
@@ -621,7 +837,11 @@ class UMALectureService:
         
         result = await db.execute(
             query,
-            {"lecture_id": lecture_id, "teacher_id": teacher_id}
+            {
+                "lecture_id": lecture_id,
+                "teacher_id": teacher_id,
+                "topic_manifest": json.dumps(build_topic_manifest(metadata["lecture_structure"]))
+            }
         )
         
         published = result.scalar()
@@ -841,6 +1061,47 @@ class UMALectureService:
         
         return topics
     
+    async def get_content_version(
+        self,
+        db: AsyncSession,
+        assignment_id: int,
+        topic_id: Optional[str] = None,
+        student_id: Optional[UUID] = None
+    ) -> Optional[str]:
+        """Cheap version stamp for a lecture's published content.
+        
+        Structure edits bump the lecture's updated_at and images are only ever
+        added or removed. When a student and topic are given, that student's
+        completion state for the topic is folded in too.
+        """
+        query = sql_text("""
+            SELECT ra.id, ra.updated_at,
+                   img.image_count, img.images_created_at,
+                   (
+                       SELECT md5((sa.progress_metadata->'topic_completion'->CAST(:topic_id AS text))::text)
+                       FROM student_assignments sa
+                       WHERE sa.classroom_assignment_id = ca.id
+                       AND sa.student_id = :student_id
+                   ) AS topic_progress
+            FROM classroom_assignments ca
+            JOIN reading_assignments ra ON ra.id = ca.assignment_id
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS image_count, MAX(li.created_at) AS images_created_at
+                FROM lecture_images li
+                WHERE li.lecture_id = ra.id
+            ) img
+            WHERE ca.id = :assignment_id
+        """)
+        
+        result = await db.execute(
+            query,
+            {"assignment_id": assignment_id, "topic_id": topic_id, "student_id": student_id}
+        )
+        row = result.first()
+        if not row:
+            return None
+        return ":".join("" if value is None else str(value) for value in row)
+    
     async def get_topic_content(
         self,
         db: AsyncSession,
@@ -930,55 +1191,47 @@ class UMALectureService:
         student_answer: Optional[str] = None,
         is_correct: Optional[bool] = None
     ) -> None:
-        """Track student interaction with lecture content"""
-        # Get lecture ID
-        lecture_query = sql_text("""
-            SELECT ra.id as lecture_id
-            FROM reading_assignments ra
-            JOIN classroom_assignments ca ON ca.assignment_id = ra.id
-            JOIN student_assignments sa ON sa.classroom_assignment_id = ca.id
-            WHERE sa.id = :assignment_id
-            AND sa.student_id = :student_id
-        """)
+        """Track student interaction with lecture content.
         
-        result = await db.execute(
-            lecture_query,
-            {"assignment_id": assignment_id, "student_id": student_id}
-        )
-        
-        lecture_data = result.mappings().first()
-        if not lecture_data:
-            return
-        
-        # Insert interaction
-        insert_query = sql_text("""
-            INSERT INTO lecture_student_interactions (
-                student_id, assignment_id, lecture_id,
-                topic_id, difficulty_level, interaction_type,
-                question_text, student_answer, is_correct,
-                time_spent_seconds
-            ) VALUES (
-                :student_id, :assignment_id, :lecture_id,
-                :topic_id, :difficulty_level, :interaction_type,
-                :question_text, :student_answer, :is_correct,
-                :time_spent
+        The interaction row is written behind by the analytics event buffer;
+        the student assignment to lecture lookup only touches the database
+        the first time an assignment is seen by this worker. Points for a
+        correct answer are part of the student's progress and are written
+        straight away.
+        """
+        cache_key = (assignment_id, student_id)
+        lecture_id = _interaction_lecture_ids.get(cache_key)
+        
+        if lecture_id is None:
+            lecture_query = sql_text("""
+                SELECT ra.id as lecture_id
+                FROM reading_assignments ra
+                JOIN classroom_assignments ca ON ca.assignment_id = ra.id
+                JOIN student_assignments sa ON sa.classroom_assignment_id = ca.id
+                WHERE ca.id = :assignment_id
+                AND sa.student_id = :student_id
+            """)
+            
+            result = await db.execute(
+                lecture_query,
+                {"assignment_id": assignment_id, "student_id": student_id}
             )
-        """)
-        
-        params = {
-            "student_id": student_id,
-            "assignment_id": assignment_id,
-            "lecture_id": lecture_data["lecture_id"],
-            "topic_id": topic_id,
-            "difficulty_level": difficulty,
-            "interaction_type": interaction_type,
-            "question_text": question_text,
-            "student_answer": student_answer,
-            "is_correct": is_correct,
-            "time_spent": 0
-        }
-        
-        await db.execute(insert_query, params)
+            
+            lecture_data = result.mappings().first()
+            if not lecture_data:
+                return
+            
+            lecture_id = lecture_data["lecture_id"]
+            # The mapping never changes; the cap just bounds memory
+            if len(_interaction_lecture_ids) >= LECTURE_ID_CACHE_SIZE:
+                _interaction_lecture_ids.clear()
+            _interaction_lecture_ids[cache_key] = lecture_id
+        
+        event_buffer.add_lecture_interaction(
+            student_id, assignment_id, lecture_id,
+            topic_id, difficulty, interaction_type,
+            question_text, student_answer, is_correct
+        )
         
         # Update progress metadata
         if interaction_type == "answer_question" and is_correct:
@@ -991,17 +1244,18 @@ class UMALectureService:
                 ),
                 last_activity_at = NOW()
                 WHERE classroom_assignment_id = :assignment_id
+                AND student_id = :student_id
             """)
             
             await db.execute(
                 update_query,
                 {
                     "assignment_id": assignment_id,
+                    "student_id": student_id,
                     "points": 1  # Default points
                 }
             )
-        
-        await db.commit()
+            await db.commit()
     
     async def submit_answer(
         self,
@@ -1358,84 +1612,54 @@ class UMALectureService:
         question_index: Optional[int],
         is_correct: Optional[bool]
     ) -> Optional[Dict[str, Any]]:
-        """Update student progress for topic/tab/question"""
+        """Update student progress for topic/tab/question
+        
+        The change is applied in the database in one statement and the
+        resulting document is returned, so concurrent answers cannot
+        overwrite each other. Completing a tab that raises the lecture grade
+        also upserts the gradebook entry in that statement.
+        """
         # Clean topic_id by removing trailing periods
         topic_id = topic_id.rstrip('.')
         
-        # Get current progress
-        progress_query = sql_text("""
-            SELECT id, progress_metadata
-            FROM student_assignments
-            WHERE classroom_assignment_id = :assignment_id
-            AND student_id = :student_id
-        """)
-        
-        result = await db.execute(
-            progress_query,
-            {"assignment_id": assignment_id, "student_id": student_id}
-        )
-        
-        data = result.mappings().first()
-        if not data:
-            return None
-        
-        progress_metadata = data["progress_metadata"] or self._initialize_progress_metadata()
-        
-        # Initialize topic completion if needed
-        if "topic_completion" not in progress_metadata:
-            progress_metadata["topic_completion"] = {}
-        
-        if topic_id not in progress_metadata["topic_completion"]:
-            progress_metadata["topic_completion"][topic_id] = {
-                "completed_tabs": [],
-                "completed_at": None,
-                "questions_correct": {}
-            }
-        
-        topic_progress = progress_metadata["topic_completion"][topic_id]
+        params = {
+            "assignment_id": assignment_id,
+            "student_id": student_id,
+            "topic_id": topic_id,
+            "tab": tab
+        }
         
-        # Update question correctness if provided
         if question_index is not None and is_correct is not None:
-            if tab not in topic_progress["questions_correct"]:
-                topic_progress["questions_correct"][tab] = []
-            
-            # Ensure list is long enough
-            while len(topic_progress["questions_correct"][tab]) <= question_index:
-                topic_progress["questions_correct"][tab].append(False)
-            
-            topic_progress["questions_correct"][tab][question_index] = is_correct
-            
-            # Check if tab is complete (all questions correct)
-            if all(topic_progress["questions_correct"][tab]):
-                if tab not in topic_progress["completed_tabs"]:
-                    topic_progress["completed_tabs"].append(tab)
-                    if not topic_progress["completed_at"]:
-                        topic_progress["completed_at"] = datetime.utcnow().isoformat()
-        
-        # Update current position
-        progress_metadata["current_topic"] = topic_id
-        progress_metadata["current_tab"] = tab
-        
-        # Check if lecture is complete
-        progress_metadata["lecture_complete"] = self._check_lecture_complete(progress_metadata)
+            # Update question correctness; completes the tab once all questions are correct
+            result = await db.execute(
+                sql_text(_RECORD_ANSWER_SQL),
+                {
+                    **params,
+                    "question_index": question_index,
+                    "is_correct": bool(is_correct),
+                    "completed_at": datetime.utcnow().isoformat(),
+                    "tab_score": LECTURE_DIFFICULTY_SCORES.get(tab)
+                }
+            )
+        else:
+            result = await db.execute(sql_text(_ENTER_TOPIC_SQL), params)
         
-        # Update in database
-        update_query = sql_text("""
-            UPDATE student_assignments
-            SET progress_metadata = :metadata,
-                updated_at = NOW()
-            WHERE classroom_assignment_id = :assignment_id
-            AND student_id = :student_id
-        """)
+        progress_metadata = result.scalar()
+        if progress_metadata is None:
+            return None
         
-        await db.execute(
-            update_query,
-            {
-                "metadata": json.dumps(progress_metadata),
-                "assignment_id": assignment_id,
-                "student_id": student_id
-            }
-        )
+        # Check if lecture is complete; only written when it changes
+        lecture_complete = self._check_lecture_complete(progress_metadata)
+        if progress_metadata.get("lecture_complete") != lecture_complete:
+            result = await db.execute(
+                sql_text(_SET_LECTURE_COMPLETE_SQL),
+                {
+                    "assignment_id": assignment_id,
+                    "student_id": student_id,
+                    "lecture_complete": lecture_complete
+                }
+            )
+            progress_metadata = result.scalar()
         
         await db.commit()
         
@@ -1489,49 +1713,19 @@ class UMALectureService:
         if current_topic:
             current_topic = current_topic.rstrip('.')
         
-        # Get current progress
-        progress_query = sql_text("""
-            SELECT progress_metadata
-            FROM student_assignments
-            WHERE classroom_assignment_id = :assignment_id
-            AND student_id = :student_id
-        """)
-        
         result = await db.execute(
-            progress_query,
-            {"assignment_id": assignment_id, "student_id": student_id}
-        )
-        
-        data = result.mappings().first()
-        if not data:
-            return False
-        
-        progress_metadata = data["progress_metadata"] or self._initialize_progress_metadata()
-        
-        # Update position
-        if current_topic:
-            progress_metadata["current_topic"] = current_topic
-        if current_tab:
-            progress_metadata["current_tab"] = current_tab
-        
-        # Update in database
-        update_query = sql_text("""
-            UPDATE student_assignments
-            SET progress_metadata = :metadata,
-                updated_at = NOW()
-            WHERE classroom_assignment_id = :assignment_id
-            AND student_id = :student_id
-        """)
-        
-        await db.execute(
-            update_query,
+            sql_text(_SET_POSITION_SQL),
             {
-                "metadata": json.dumps(progress_metadata),
                 "assignment_id": assignment_id,
-                "student_id": student_id
+                "student_id": student_id,
+                "current_topic": current_topic or None,
+                "current_tab": current_tab or None
             }
         )
         
+        if result.scalar() is None:
+            return False
+        
         await db.commit()
         
         return True
@@ -1598,7 +1792,7 @@ class UMALectureService:
             exploration_term, student_question
         )
         
-        response = await ai_service._generate_content_async(prompt)
+        response = await ai_service._generate_content_async(prompt, feature="umalecture_exploration")
         return response.strip().upper() == "ON_TOPIC"
     
     async def generate_exploration_explanation(
@@ -1623,7 +1817,7 @@ class UMALectureService:
             grade_level=grade_level
         )
         
-        return await ai_service._generate_content_async(prompt)
+        return await ai_service._generate_content_async(prompt, feature="umalecture_exploration")
     
     async def generate_exploration_response(
         self,
@@ -1648,7 +1842,7 @@ class UMALectureService:
             grade_level=grade_level
         )
         
-        return await ai_service._generate_content_async(prompt)
+        return await ai_service._generate_content_async(prompt, feature="umalecture_exploration")
     
     async def generate_exploration_redirect(
         self,
@@ -1664,7 +1858,7 @@ class UMALectureService:
             exploration_term, student_question
         )
         
-        return await ai_service._generate_content_async(prompt)
+        return await ai_service._generate_content_async(prompt, feature="umalecture_exploration")
     
     async def calculate_lecture_grade(
         self,
@@ -1679,64 +1873,48 @@ class UMALectureService:
         - Intermediate completed: 80%
         - Advanced completed: 90%
         - Expert completed: 100%
-        """
-        # Get student progress
-        progress_query = sql_text("""
-            SELECT sa.progress_metadata, la.raw_content
-            FROM student_assignments sa
-            JOIN classroom_assignments ca ON ca.id = sa.classroom_assignment_id
-            JOIN reading_assignments la ON la.id = ca.assignment_id
-            WHERE sa.classroom_assignment_id = :assignment_id
-            AND sa.student_id = :student_id
-            AND ca.assignment_type = 'UMALecture'
-        """)
         
+        The grade is kept in progress_metadata.highest_score as tabs are
+        completed; progress recorded before that was tracked is scored from
+        its completed tabs.
+        """
         result = await db.execute(
-            progress_query,
+            sql_text("""
+                SELECT sa.progress_metadata
+                FROM student_assignments sa
+                JOIN classroom_assignments ca ON ca.id = sa.classroom_assignment_id
+                WHERE sa.classroom_assignment_id = :assignment_id
+                AND sa.student_id = :student_id
+                AND ca.assignment_type = 'UMALecture'
+            """),
             {"assignment_id": assignment_id, "student_id": student_id}
         )
         
-        data = result.mappings().first()
-        if not data or not data["progress_metadata"]:
+        progress_metadata = result.scalar()
+        if not progress_metadata:
             return None
         
-        progress_metadata = data["progress_metadata"]
-        # Parse lecture structure from raw_content
-        raw_content = json.loads(data["raw_content"]) if isinstance(data["raw_content"], str) else data["raw_content"]
-        lecture_structure = raw_content.get("lecture_structure", {}) if raw_content else {}
-        
-        # Get topic completion data
-        topic_completion = progress_metadata.get("topic_completion", {})
-        if not topic_completion:
-            return None
-        
-        # Define difficulty levels and their scores
-        difficulty_scores = {
-            "basic": 70,
-            "intermediate": 80,
-            "advanced": 90,
-            "expert": 100
-        }
+        if progress_metadata.get("highest_score"):
+            return progress_metadata["highest_score"]
         
         # Find highest completed difficulty across all topics
         highest_score = 0
         
-        for topic_id, topic_progress in topic_completion.items():
+        for topic_progress in progress_metadata.get("topic_completion", {}).values():
             completed_tabs = topic_progress.get("completed_tabs", [])
             questions_correct = topic_progress.get("questions_correct", {})
             
-            # Check each difficulty level
             for difficulty in ["expert", "advanced", "intermediate", "basic"]:
                 if difficulty in completed_tabs:
                     # For expert level, verify all questions were answered correctly
                     if difficulty == "expert":
                         expert_questions = questions_correct.get("expert", [])
                         if expert_questions and all(expert_questions):
-                            highest_score = max(highest_score, difficulty_scores[difficulty])
+                            highest_score = max(highest_score, LECTURE_DIFFICULTY_SCORES[difficulty])
                             break
                     else:
                         # For other levels, being in completed_tabs means all questions were correct
-                        highest_score = max(highest_score, difficulty_scores[difficulty])
+                        highest_score = max(highest_score, LECTURE_DIFFICULTY_SCORES[difficulty])
                         break
         
         return highest_score if highest_score > 0 else None
@@ -1749,95 +1927,23 @@ class UMALectureService:
         lecture_id: UUID,
         score: int
     ) -> None:
-        """Create or update gradebook entry for UMALecture"""
-        # Get classroom information
-        classroom_query = sql_text("""
-            SELECT ca.classroom_id, c.name as classroom_name,
-                   la.assignment_title as assignment_name
-            FROM classroom_assignments ca
-            JOIN classrooms c ON c.id = ca.classroom_id
-            JOIN reading_assignments la ON la.id = ca.assignment_id
-            WHERE ca.id = :assignment_id
-            AND ca.assignment_type = 'UMALecture'
-        """)
+        """Create or update gradebook entry for UMALecture
         
-        result = await db.execute(
-            classroom_query,
-            {"assignment_id": assignment_id}
-        )
-        
-        classroom_data = result.mappings().first()
-        if not classroom_data:
-            return
-        
-        # Check if gradebook entry exists
-        existing_query = sql_text("""
-            SELECT id, score_percentage
-            FROM gradebook_entries
-            WHERE student_id = :student_id
-            AND classroom_id = :classroom_id
-            AND assignment_type = 'umalecture'
-            AND assignment_id = :lecture_id
-        """)
-        
-        existing_result = await db.execute(
-            existing_query,
+        update_student_progress keeps entries current as tabs are completed;
+        this is for backfilling progress recorded before that. The lecture is
+        resolved from the classroom assignment, so lecture_id is not used.
+        """
+        await db.execute(
+            sql_text(_GRADEBOOK_UPSERT_SQL.format(
+                source="(SELECT CAST(:student_id AS uuid) AS student_id, "
+                       "CAST(:assignment_id AS int) AS classroom_assignment_id, "
+                       "CAST(:score AS int) AS score)"
+            )),
             {
                 "student_id": student_id,
-                "classroom_id": classroom_data["classroom_id"],
-                "lecture_id": lecture_id
+                "assignment_id": assignment_id,
+                "score": score
             }
         )
         
-        existing_entry = existing_result.mappings().first()
-        
-        if existing_entry:
-            # Update existing entry if new score is higher
-            if score > existing_entry["score_percentage"]:
-                update_query = sql_text("""
-                    UPDATE gradebook_entries
-                    SET score_percentage = :score,
-                        points_earned = :score,
-                        points_possible = 100,
-                        completed_at = NOW(),
-                        updated_at = NOW()
-                    WHERE id = :entry_id
-                """)
-                
-                await db.execute(
-                    update_query,
-                    {
-                        "score": score,
-                        "entry_id": existing_entry["id"]
-                    }
-                )
-        else:
-            # Create new gradebook entry
-            insert_query = sql_text("""
-                INSERT INTO gradebook_entries (
-                    student_id, classroom_id, assignment_type, assignment_id,
-                    score_percentage, points_earned, points_possible,
-                    completed_at, metadata
-                ) VALUES (
-                    :student_id, :classroom_id, 'umalecture', :lecture_id,
-                    :score, :score, 100, NOW(), :metadata
-                )
-            """)
-            
-            metadata = {
-                "assignment_name": classroom_data["assignment_name"],
-                "classroom_name": classroom_data["classroom_name"]
-            }
-            
-            await db.execute(
-                insert_query,
-                {
-                    "student_id": student_id,
-                    "classroom_id": classroom_data["classroom_id"],
-                    "lecture_id": lecture_id,
-                    "score": score,
-                    "metadata": json.dumps(metadata)
-                }
-            )
-        
-        await db.commit()
\ No newline at end of file
+        await db.commit()
@@ -4,22 +4,23 @@ Handles lecture content generation, image analysis, and question creation
 """
 import json
 import asyncio
+from functools import cached_property
 from typing import Dict, Any, List, Optional
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text as sql_text
-import google.generativeai as genai
 import os
 from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
 
 from app.core.database import get_db
 from app.services.image_processing import ImageProcessor
 from app.services.umalecture_prompts import UMALecturePromptManager
-from app.config.ai_config import get_gemini_config
+from app.services.umalecture import build_topic_manifest
+from app.config.ai_config import get_gemini_config, configure_gemini
 from app.config.ai_models import LECTURE_GENERATION_MODEL, LECTURE_QUESTION_MODEL
+from app.core.ai_telemetry import ai_telemetry
 
 
 class LectureQuestion(BaseModel):
@@ -42,30 +43,43 @@ class UMALectureAIService:
     """AI service for UMALecture content generation and processing"""
     
     def __init__(self):
-        # Configure Google Generative AI using centralized config
         self.config = get_gemini_config()
-        genai.configure(api_key=self.config.api_key)
         # Use the centralized model configuration
-        model_name = LECTURE_GENERATION_MODEL or 'gemini-2.0-flash'
-        self.model = genai.GenerativeModel(model_name)
+        self.model_name = LECTURE_GENERATION_MODEL or 'gemini-2.0-flash'
         self.prompt_manager = UMALecturePromptManager()
         self.executor = ThreadPoolExecutor(max_workers=3)
+    
+    # The AI SDKs are imported on first use so importing this module stays cheap
+    
+    @cached_property
+    def model(self):
+        import google.generativeai as genai
         
-        # Initialize Pydantic AI agent for structured question generation
-        self.question_agent = Agent(
+        # Configure Google Generative AI using centralized config
+        configure_gemini(self.config.api_key)
+        return genai.GenerativeModel(self.model_name)
+    
+    @cached_property
+    def question_agent(self):
+        """Pydantic AI agent for structured question generation"""
+        from pydantic_ai import Agent
+        
+        return Agent(
             LECTURE_QUESTION_MODEL,  # Use the configured model
             result_type=LectureQuestionSet,
             system_prompt="You are an expert educational question generator for interactive lectures."
         )
     
-    async def _generate_content_async(self, prompt: Any) -> str:
+    async def _generate_content_async(self, prompt: Any, feature: str = "umalecture_content") -> str:
         """Wrapper to run synchronous generate_content in thread pool"""
         loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            self.executor,
-            self.model.generate_content,
-            prompt
-        )
+        with ai_telemetry.track(feature, self.model_name, prompt) as call:
+            response = await loop.run_in_executor(
+                self.executor,
+                self.model.generate_content,
+                prompt
+            )
+            call.record_response(response)
         return response.text
     
     async def _generate_questions_structured(
@@ -86,7 +100,9 @@ class UMALectureAIService:
             )
             
             # Use Pydantic AI agent to generate structured questions
-            result = await self.question_agent.run(prompt)
+            with ai_telemetry.track("umalecture_questions", LECTURE_QUESTION_MODEL, prompt) as call:
+                result = await self.question_agent.run(prompt)
+                call.record_response(result)
             
             # Convert Pydantic models to dictionaries
             questions = []
@@ -207,6 +223,7 @@ class UMALectureAIService:
         update_query = sql_text("""
             UPDATE reading_assignments
             SET raw_content = :metadata,
+                topic_manifest = CAST(:topic_manifest AS jsonb),
                 status = 'published',
                 updated_at = NOW()
             WHERE id = :lecture_id
@@ -217,7 +234,8 @@ class UMALectureAIService:
             update_query,
             {
                 "lecture_id": lecture_id,
-                "metadata": json.dumps(metadata)
+                "metadata": json.dumps(metadata),
+                "topic_manifest": json.dumps(build_topic_manifest(structure))
             }
         )
         await db.commit()
@@ -686,7 +704,7 @@ Be fair but maintain standards. An answer must actually demonstrate knowledge to
         
         try:
             # Generate evaluation
-            response = await self._generate_content_async(prompt)
+            response = await self._generate_content_async(prompt, feature="umalecture_answer_evaluation")
             
             # Parse JSON response
             # Remove any markdown formatting if present
@@ -153,6 +153,38 @@ class UMAReadService:
             status=student_assignment.status
         )
     
+    async def get_chunk_version(self,
+                                db: AsyncSession,
+                                assignment_id: UUID) -> Optional[str]:
+        """Cheap version stamp for an assignment's chunks and images.
+        
+        Chunks are only rewritten by publish/content edits, which bump the
+        assignment's updated_at; image uploads and description edits are
+        covered by the image timestamps.
+        """
+        result = await db.execute(
+            text("""
+                SELECT ra.updated_at,
+                       (SELECT COUNT(*) FROM reading_chunks rc
+                        WHERE rc.assignment_id = ra.id) AS chunk_count,
+                       img.image_count, img.images_created_at, img.descriptions_at
+                FROM reading_assignments ra
+                CROSS JOIN LATERAL (
+                    SELECT COUNT(*) AS image_count,
+                           MAX(ai.created_at) AS images_created_at,
+                           MAX(ai.description_generated_at) AS descriptions_at
+                    FROM assignment_images ai
+                    WHERE ai.assignment_id = ra.id
+                ) img
+                WHERE ra.id = :assignment_id
+            """),
+            {"assignment_id": assignment_id}
+        )
+        row = result.first()
+        if not row:
+            return None
+        return ":".join("" if value is None else str(value) for value in row)
+    
     async def get_chunk_content(self,
                               db: AsyncSession,
                               assignment_id: UUID,
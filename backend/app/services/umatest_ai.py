@@ -4,19 +4,22 @@ Phase 1: Test Creation with 70/20/10 distribution
 """
 
 from typing import List, Dict, Any, Optional, Tuple
-from uuid import uuid4
+from uuid import UUID, uuid4
 import hashlib
 import json
 from datetime import datetime
 import asyncio
-import google.generativeai as genai
+from dataclasses import dataclass
+from functools import cached_property
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert
 import logging
 import os
 
 from app.config.ai_models import QUESTION_GENERATION_MODEL
-from app.config.ai_config import get_gemini_config
+from app.config.ai_config import get_gemini_config, configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 from app.models.umatest import TestAssignment, TestQuestionCache, TestGenerationLog
 from app.models.reading import ReadingAssignment, AssignmentImage
 
@@ -28,27 +31,52 @@ BASIC_INTERMEDIATE_QUESTIONS = 7  # 70%
 ADVANCED_QUESTIONS = 2  # 20%
 EXPERT_QUESTIONS = 1  # 10%
 
+# Model calls in flight at once while generating a test
+QUESTION_GENERATION_CONCURRENCY = 8
+
 # Pydantic models removed - using direct JSON parsing with Gemini instead
 
+
+@dataclass
+class QuestionJob:
+    """One batch of questions to produce for a topic and difficulty"""
+    lecture_id: UUID
+    topic_id: str
+    cache_level: str
+    content_hash: str
+    content: str
+    topic_title: str
+    grade_level: str
+    prompt_level: str
+    num_questions: int
+    
+    @property
+    def cache_key(self) -> Tuple:
+        return (self.lecture_id, self.topic_id, self.cache_level, self.content_hash)
+
+
 class UMATestAIService:
     """Service for generating test questions from UMALecture content"""
     
     def __init__(self):
-        # Get configuration
-        config = get_gemini_config()
-        
-        # Configure Gemini API
-        genai.configure(api_key=config.api_key)
-        
-        # Use configured model
-        self.model = genai.GenerativeModel(QUESTION_GENERATION_MODEL)
-        
         self.system_prompt = """You are an expert educational assessment creator. 
         Generate thoughtful, comprehension-based questions that test understanding 
         of the provided content. Questions should be clear, unambiguous, and 
         appropriate for the specified grade level and difficulty."""
+    
+    @cached_property
+    def model(self):
+        """Gemini model, built on first use so importing this module stays cheap"""
+        import google.generativeai as genai
+        
+        # Get configuration
+        config = get_gemini_config()
+        
+        # Configure Gemini API
+        configure_gemini(config.api_key)
         
         logger.info(f"UMATestAIService initialized with model: {QUESTION_GENERATION_MODEL}")
+        return genai.GenerativeModel(QUESTION_GENERATION_MODEL)
     
     async def generate_test_questions(
         self,
@@ -105,14 +133,14 @@ class UMATestAIService:
                 }
             }
             
-            total_topics = 0
-            cache_hits = 0
-            cache_misses = 0
+            # Plan every (topic, difficulty) batch first so the cache can be
+            # probed once and the misses generated concurrently
+            planned_topics = []
+            jobs = []
             
             for lecture in lectures:
                 # Parse raw_content if it's a string
                 if isinstance(lecture.raw_content, str):
-                    import json
                     try:
                         content = json.loads(lecture.raw_content)
                     except:
@@ -124,26 +152,29 @@ class UMATestAIService:
                 topics = lecture_structure.get('topics', {})
                 
                 for topic_id, topic_data in topics.items():
-                    total_topics += 1
                     logger.info(f"Processing topic {topic_id}: {topic_data.get('title', 'Unknown')}")
-                    
-                    # Generate questions for this topic
-                    topic_questions, hits, misses = await self._generate_topic_questions(
-                        db, lecture, topic_id, topic_data
-                    )
-                    
-                    cache_hits += hits
-                    cache_misses += misses
-                    
-                    # Add to test structure
-                    test_structure['topics'][f"{lecture.id}_{topic_id}"] = {
-                        'topic_title': topic_data.get('title', 'Unknown Topic'),
-                        'source_lecture_id': str(lecture.id),
-                        'source_lecture_title': lecture.assignment_title,
-                        'questions': topic_questions
-                    }
-                    
-                    test_structure['total_questions'] += len(topic_questions)
+                    topic_jobs = self._plan_topic_jobs(lecture, topic_id, topic_data)
+                    planned_topics.append((lecture, topic_id, topic_data, len(jobs), len(jobs) + len(topic_jobs)))
+                    jobs.extend(topic_jobs)
+            
+            job_questions, cache_hits, cache_misses = await self._generate_jobs(db, jobs)
+            
+            for lecture, topic_id, topic_data, first_job, end_job in planned_topics:
+                topic_questions = [
+                    question
+                    for questions in job_questions[first_job:end_job]
+                    for question in questions
+                ]
+                
+                # Add to test structure
+                test_structure['topics'][f"{lecture.id}_{topic_id}"] = {
+                    'topic_title': topic_data.get('title', 'Unknown Topic'),
+                    'source_lecture_id': str(lecture.id),
+                    'source_lecture_title': lecture.assignment_title,
+                    'questions': topic_questions
+                }
+                
+                test_structure['total_questions'] += len(topic_questions)
             
             # Update test assignment with generated structure
             test.test_structure = test_structure
@@ -152,7 +183,7 @@ class UMATestAIService:
             # Update generation log
             log_entry.completed_at = datetime.utcnow()
             log_entry.status = 'completed'
-            log_entry.total_topics_processed = total_topics
+            log_entry.total_topics_processed = len(planned_topics)
             log_entry.total_questions_generated = test_structure['total_questions']
             log_entry.cache_hits = cache_hits
             log_entry.cache_misses = cache_misses
@@ -187,178 +218,174 @@ class UMATestAIService:
         )
         return result.scalars().all()
     
-    async def _generate_topic_questions(
+    def _plan_topic_jobs(
         self,
-        db: AsyncSession,
         lecture: ReadingAssignment,
         topic_id: str,
         topic_data: Dict[str, Any]
-    ) -> Tuple[List[Dict[str, Any]], int, int]:
+    ) -> List[QuestionJob]:
         """
-        Generate questions for a single topic following 70/20/10 distribution
+        Plan the question batches for a single topic following 70/20/10 distribution
         
-        Returns:
-            Tuple of (questions list, cache hits, cache misses)
+        Levels without content get no job.
         """
-        questions = []
-        cache_hits = 0
-        cache_misses = 0
-        
         difficulty_levels = topic_data.get('difficulty_levels', {})
+        topic_title = topic_data.get('title', 'Unknown Topic')
         
-        # Generate questions for each difficulty level according to distribution
-        # 70% from Basic + Intermediate (combined)
-        basic_int_questions = await self._generate_questions_for_levels(
-            db, lecture, topic_id, topic_data,
-            ['basic', 'intermediate'],
-            BASIC_INTERMEDIATE_QUESTIONS
-        )
-        questions.extend(basic_int_questions[0])
-        cache_hits += basic_int_questions[1]
-        cache_misses += basic_int_questions[2]
-        
+        # (levels whose content is combined, cache key level, prompt level, question count)
+        batches = [
+            # 70% from Basic + Intermediate (combined, cached under 'basic')
+            (['basic', 'intermediate'], 'basic', 'basic-intermediate', BASIC_INTERMEDIATE_QUESTIONS),
+        ]
         # 20% from Advanced
         if 'advanced' in difficulty_levels:
-            adv_questions = await self._generate_questions_for_level(
-                db, lecture, topic_id, topic_data,
-                'advanced',
-                ADVANCED_QUESTIONS
-            )
-            questions.extend(adv_questions[0])
-            cache_hits += adv_questions[1]
-            cache_misses += adv_questions[2]
-        
+            batches.append((['advanced'], 'advanced', 'advanced', ADVANCED_QUESTIONS))
         # 10% from Expert
         if 'expert' in difficulty_levels:
-            exp_questions = await self._generate_questions_for_level(
-                db, lecture, topic_id, topic_data,
-                'expert',
-                EXPERT_QUESTIONS
-            )
-            questions.extend(exp_questions[0])
-            cache_hits += exp_questions[1]
-            cache_misses += exp_questions[2]
+            batches.append((['expert'], 'expert', 'expert', EXPERT_QUESTIONS))
+        
+        jobs = []
+        for levels, cache_level, prompt_level, num_questions in batches:
+            if len(levels) > 1:
+                content = "\n\n".join(
+                    f"[{level.upper()}]\n{difficulty_levels[level]['content']}"
+                    for level in levels
+                    if difficulty_levels.get(level, {}).get('content')
+                )
+            else:
+                content = difficulty_levels.get(levels[0], {}).get('content', '')
+            
+            if not content:
+                continue
+            
+            jobs.append(QuestionJob(
+                lecture_id=lecture.id,
+                topic_id=topic_id,
+                cache_level=cache_level,
+                content_hash=hashlib.sha256(content.encode()).hexdigest(),
+                content=content,
+                topic_title=topic_title,
+                grade_level=lecture.grade_level,
+                prompt_level=prompt_level,
+                num_questions=num_questions
+            ))
         
-        return questions, cache_hits, cache_misses
+        return jobs
     
-    async def _generate_questions_for_levels(
+    async def _probe_cache(
         self,
         db: AsyncSession,
-        lecture: ReadingAssignment,
-        topic_id: str,
-        topic_data: Dict[str, Any],
-        levels: List[str],
-        num_questions: int
-    ) -> Tuple[List[Dict[str, Any]], int, int]:
-        """Generate questions from combined difficulty levels (for basic+intermediate)"""
-        # Combine content from multiple levels
-        combined_content = []
-        for level in levels:
-            level_data = topic_data.get('difficulty_levels', {}).get(level, {})
-            if level_data.get('content'):
-                combined_content.append(f"[{level.upper()}]\n{level_data['content']}")
-        
-        if not combined_content:
-            return [], 0, 0
+        jobs: List[QuestionJob]
+    ) -> Dict[Tuple, List[Dict[str, Any]]]:
+        """Look up cached questions for all jobs in one query"""
+        if not jobs:
+            return {}
         
-        content = "\n\n".join(combined_content)
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
-        
-        # Check cache first (using 'basic' as cache key for combined)
-        cached = await self._check_cache(db, lecture.id, topic_id, 'basic', content_hash)
-        if cached and len(cached) >= num_questions:
-            return cached[:num_questions], 1, 0
-        
-        # Generate new questions
-        questions = await self._call_ai_for_questions(
-            content,
-            topic_data.get('title', 'Unknown Topic'),
-            lecture.grade_level,
-            'basic-intermediate',
-            num_questions
-        )
-        
-        # Cache the generated questions
-        await self._cache_questions(
-            db, lecture.id, topic_id, 'basic', content_hash, questions
+        result = await db.execute(
+            select(
+                TestQuestionCache.lecture_id,
+                TestQuestionCache.topic_id,
+                TestQuestionCache.difficulty_level,
+                TestQuestionCache.content_hash,
+                TestQuestionCache.questions
+            ).where(
+                tuple_(
+                    TestQuestionCache.lecture_id,
+                    TestQuestionCache.topic_id,
+                    TestQuestionCache.difficulty_level,
+                    TestQuestionCache.content_hash
+                ).in_([job.cache_key for job in jobs])
+            )
         )
         
-        return questions, 0, 1
+        return {
+            (row.lecture_id, row.topic_id, row.difficulty_level, row.content_hash): row.questions
+            for row in result
+        }
     
-    async def _generate_questions_for_level(
+    async def _generate_jobs(
         self,
         db: AsyncSession,
-        lecture: ReadingAssignment,
-        topic_id: str,
-        topic_data: Dict[str, Any],
-        level: str,
-        num_questions: int
-    ) -> Tuple[List[Dict[str, Any]], int, int]:
-        """Generate questions for a single difficulty level"""
-        level_data = topic_data.get('difficulty_levels', {}).get(level, {})
-        content = level_data.get('content', '')
-        
-        if not content:
-            return [], 0, 0
-        
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        jobs: List[QuestionJob]
+    ) -> Tuple[List[List[Dict[str, Any]]], int, int]:
+        """
+        Produce the questions for every job, in job order
         
-        # Check cache first
-        cached = await self._check_cache(db, lecture.id, topic_id, level, content_hash)
-        if cached and len(cached) >= num_questions:
-            return cached[:num_questions], 1, 0
+        Cache hits come from one probe; misses are sent to the model
+        concurrently (at most QUESTION_GENERATION_CONCURRENCY at a time) and
+        written back to the cache in one statement. If any miss fails, the
+        ones that succeeded are still cached before the error is raised.
         
-        # Generate new questions
-        questions = await self._call_ai_for_questions(
-            content,
-            topic_data.get('title', 'Unknown Topic'),
-            lecture.grade_level,
-            level,
-            num_questions
-        )
+        Returns:
+            Tuple of (questions per job, cache hits, cache misses)
+        """
+        cached = await self._probe_cache(db, jobs)
         
-        # Cache the generated questions
-        await self._cache_questions(
-            db, lecture.id, topic_id, level, content_hash, questions
-        )
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(jobs)
+        misses = []
+        for i, job in enumerate(jobs):
+            entry = cached.get(job.cache_key)
+            hit = entry is not None and len(entry) >= job.num_questions
+            ai_telemetry.record_cache("umatest_questions", QUESTION_GENERATION_MODEL, hit=hit)
+            if hit:
+                # Convert cached questions to test format
+                results[i] = [
+                    {
+                        'id': str(uuid4()),
+                        'question_text': q['question_text'],
+                        'difficulty_level': job.cache_level,
+                        'source_content': q['source_excerpt'],
+                        'answer_key': q['answer_key']
+                    }
+                    for q in entry[:job.num_questions]
+                ]
+            else:
+                misses.append(i)
         
-        return questions, 0, 1
-    
-    async def _check_cache(
-        self,
-        db: AsyncSession,
-        lecture_id: str,
-        topic_id: str,
-        difficulty_level: str,
-        content_hash: str
-    ) -> Optional[List[Dict[str, Any]]]:
-        """Check if questions are already cached"""
-        result = await db.execute(
-            select(TestQuestionCache).where(
-                and_(
-                    TestQuestionCache.lecture_id == lecture_id,
-                    TestQuestionCache.topic_id == topic_id,
-                    TestQuestionCache.difficulty_level == difficulty_level,
-                    TestQuestionCache.content_hash == content_hash
-                )
+        if misses:
+            semaphore = asyncio.Semaphore(QUESTION_GENERATION_CONCURRENCY)
+            
+            async def generate(job: QuestionJob) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._call_ai_for_questions(
+                        job.content,
+                        job.topic_title,
+                        job.grade_level,
+                        job.prompt_level,
+                        job.num_questions
+                    )
+            
+            generated = await asyncio.gather(
+                *(generate(jobs[i]) for i in misses),
+                return_exceptions=True
             )
-        )
-        cache_entry = result.scalar_one_or_none()
-        
-        if cache_entry:
-            # Convert cached questions to test format
-            return [
-                {
-                    'id': str(uuid4()),
-                    'question_text': q['question_text'],
-                    'difficulty_level': difficulty_level,
-                    'source_content': q['source_excerpt'],
-                    'answer_key': q['answer_key']
-                }
-                for q in cache_entry.questions
-            ]
+            
+            succeeded = []
+            failures = []
+            for i, outcome in zip(misses, generated):
+                if isinstance(outcome, Exception):
+                    job = jobs[i]
+                    logger.error(
+                        f"Question generation failed for topic {job.topic_id} "
+                        f"({job.prompt_level}): {outcome}"
+                    )
+                    failures.append(outcome)
+                else:
+                    results[i] = outcome
+                    succeeded.append(i)
+            
+            # Cache whatever was generated, so a retry only goes back to the
+            # model for the jobs that failed
+            if succeeded:
+                await self._cache_questions(db, [(jobs[i], results[i]) for i in succeeded])
+            
+            if failures:
+                raise ValueError(
+                    f"Question generation failed for {len(failures)} of {len(misses)} "
+                    f"topic levels: {failures[0]}"
+                ) from failures[0]
         
-        return None
+        return results, len(jobs) - len(misses), len(misses)
     
     async def _call_ai_for_questions(
         self,
@@ -409,15 +436,17 @@ Return the response as a JSON object with the following structure:
         
         try:
             # Generate content using Gemini
-            response = await asyncio.to_thread(
-                self.model.generate_content,
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=2048,
-                    response_mime_type="application/json"
+            with ai_telemetry.track("umatest_questions", QUESTION_GENERATION_MODEL, prompt) as call:
+                response = await asyncio.to_thread(
+                    self.model.generate_content,
+                    prompt,
+                    generation_config={
+                        "temperature": 0.7,
+                        "max_output_tokens": 2048,
+                        "response_mime_type": "application/json"
+                    }
                 )
-            )
+                call.record_response(response)
             
             # Parse the JSON response
             result_data = json.loads(response.text)
@@ -446,32 +475,41 @@ Return the response as a JSON object with the following structure:
     async def _cache_questions(
         self,
         db: AsyncSession,
-        lecture_id: str,
-        topic_id: str,
-        difficulty_level: str,
-        content_hash: str,
-        questions: List[Dict[str, Any]]
+        generated: List[Tuple[QuestionJob, List[Dict[str, Any]]]]
     ):
-        """Cache generated questions"""
-        cache_entry = TestQuestionCache(
-            id=str(uuid4()),
-            lecture_id=lecture_id,
-            topic_id=topic_id,
-            difficulty_level=difficulty_level,
-            content_hash=content_hash,
-            questions=[
-                {
-                    'question_text': q['question_text'],
-                    'answer_key': q['answer_key'],
-                    'source_excerpt': q['source_content']
+        """Cache generated questions, replacing entries that had too few"""
+        statement = insert(TestQuestionCache).values([
+            {
+                'id': uuid4(),
+                'lecture_id': job.lecture_id,
+                'topic_id': job.topic_id,
+                'difficulty_level': job.cache_level,
+                'content_hash': job.content_hash,
+                'questions': [
+                    {
+                        'question_text': q['question_text'],
+                        'answer_key': q['answer_key'],
+                        'source_excerpt': q['source_content']
+                    }
+                    for q in questions
+                ],
+                'ai_model': QUESTION_GENERATION_MODEL,
+                'generation_timestamp': datetime.utcnow()
+            }
+            for job, questions in generated
+        ])
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=['lecture_id', 'topic_id', 'difficulty_level', 'content_hash'],
+                set_={
+                    'questions': statement.excluded.questions,
+                    'ai_model': statement.excluded.ai_model,
+                    'generation_timestamp': statement.excluded.generation_timestamp
                 }
-                for q in questions
-            ],
-            ai_model=QUESTION_GENERATION_MODEL,
-            generation_timestamp=datetime.utcnow()
+            )
         )
-        db.add(cache_entry)
         await db.commit()
 
+
 # Singleton instance
 umatest_ai_service = UMATestAIService()
\ No newline at end of file
@@ -3,13 +3,13 @@ UMATest AI Assistant Service using Google Generative AI and Pydantic AI
 Helps teachers improve hand-built test questions
 """
 import json
+from functools import cached_property
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent
-import google.generativeai as genai
 
 from app.config.ai_config import get_gemini_config
 from app.config.ai_models import LECTURE_QUESTION_MODEL
+from app.core.ai_telemetry import ai_telemetry
 
 
 class ImprovedQuestion(BaseModel):
@@ -27,12 +27,14 @@ class UMATestAIAssistant:
     """AI Assistant for improving hand-built test questions"""
     
     def __init__(self):
-        # Configure Google Generative AI
         self.config = get_gemini_config()
-        genai.configure(api_key=self.config.api_key)
+    
+    @cached_property
+    def improvement_agent(self):
+        """Pydantic AI agent for structured question improvement, built on first use"""
+        from pydantic_ai import Agent
         
-        # Initialize Pydantic AI agent for structured question improvement
-        self.improvement_agent = Agent(
+        return Agent(
             LECTURE_QUESTION_MODEL,  # Use the same model as UMALecture
             result_type=ImprovedQuestion,
             system_prompt="""You are an expert educational content assistant helping teachers create high-quality test questions.
@@ -105,7 +107,9 @@ For {difficulty_level} level:
 IMPORTANT: Preserve the teacher's original intent and subject matter while making improvements."""
 
             # Use Pydantic AI agent to generate structured improvements
-            result = await self.improvement_agent.run(prompt)
+            with ai_telemetry.track("umatest_question_improvement", LECTURE_QUESTION_MODEL, prompt) as call:
+                result = await self.improvement_agent.run(prompt)
+                call.record_response(result)
             
             # Extract improvements made
             improvements = result.data.improvements_made
@@ -14,13 +14,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, Field, validator
-import google.generativeai as genai
 
 from app.models.tests import StudentTestAttempt, TestQuestionEvaluation
 from app.models.umatest import TestAssignment, HandBuiltTestQuestion
 from app.models.user import User
 from app.config.ai_models import ANSWER_EVALUATION_MODEL
-from app.config.ai_config import get_gemini_config
+from app.config.ai_config import get_gemini_config, configure_gemini
+from app.core.ai_telemetry import ai_telemetry
 from app.config.rubric_config import (
     UMAREAD_SCORING_RUBRIC,
     get_rubric_score_points,
@@ -338,51 +338,58 @@ class UMATestEvaluationService:
             lecture_context=lecture_context
         )
         
-        # Try AI evaluation with retries
-        for attempt in range(self.max_retries):
-            try:
-                # Configure Gemini for each attempt to ensure fresh connection
-                gemini_config = get_gemini_config()
-                if not gemini_config.api_key:
-                    logger.error("GEMINI_API_KEY not found in configuration!")
-                    raise ValueError("GEMINI_API_KEY is not configured")
-                genai.configure(api_key=gemini_config.api_key)
+        # Imported here rather than at module load; the SDK is slow to import
+        import google.generativeai as genai
+        
+        # Try AI evaluation with retries; all attempts count as one tracked call
+        with ai_telemetry.track("umatest_evaluation", ANSWER_EVALUATION_MODEL, prompt) as call:
+            for attempt in range(self.max_retries):
+                try:
+                    # Configure Gemini for each attempt to ensure fresh connection
+                    gemini_config = get_gemini_config()
+                    if not gemini_config.api_key:
+                        logger.error("GEMINI_API_KEY not found in configuration!")
+                        raise ValueError("GEMINI_API_KEY is not configured")
+                    configure_gemini(gemini_config.api_key)
                 
-                logger.info(f"Creating Gemini model {ANSWER_EVALUATION_MODEL} for question evaluation (attempt {attempt + 1})")
+                    logger.info(f"Creating Gemini model {ANSWER_EVALUATION_MODEL} for question evaluation (attempt {attempt + 1})")
                 
-                model = genai.GenerativeModel(
-                    model_name=ANSWER_EVALUATION_MODEL,
-                    generation_config={
-                        "temperature": 0.3,
-                        "top_p": 0.95,
-                        "max_output_tokens": 1000,
-                    }
-                )
+                    model = genai.GenerativeModel(
+                        model_name=ANSWER_EVALUATION_MODEL,
+                        generation_config={
+                            "temperature": 0.3,
+                            "top_p": 0.95,
+                            "max_output_tokens": 1000,
+                        }
+                    )
                 
-                # Use asyncio.to_thread for async compatibility
-                logger.info(f"Sending request to Gemini API for question evaluation...")
-                response = await asyncio.to_thread(
-                    model.generate_content,
-                    prompt
-                )
+                    # Use asyncio.to_thread for async compatibility
+                    logger.info(f"Sending request to Gemini API for question evaluation...")
+                    response = await asyncio.to_thread(
+                        model.generate_content,
+                        prompt
+                    )
+                    call.record_response(response)
                 
-                logger.info(f"Received response from Gemini API")
-                logger.debug(f"Raw AI response: {response.text[:500]}...")
+                    logger.info(f"Received response from Gemini API")
+                    logger.debug(f"Raw AI response: {response.text[:500]}...")
                 
-                # Parse the response
-                evaluation = self._parse_ai_response(response.text)
-                logger.info(f"Successfully parsed AI response - Score: {evaluation.rubric_score}")
-                return evaluation
+                    # Parse the response
+                    evaluation = self._parse_ai_response(response.text)
+                    logger.info(f"Successfully parsed AI response - Score: {evaluation.rubric_score}")
+                    return evaluation
                 
-            except Exception as e:
-                logger.error(f"AI evaluation attempt {attempt + 1} failed for question: {str(e)}")
-                logger.error(f"Question text: {question_data.get('question_text', '')[:100]}...")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    # Fallback to basic evaluation
-                    logger.warning("Using fallback basic evaluation")
-                    return self._basic_evaluation(student_answer, question_data)
+                except Exception as e:
+                    logger.error(f"AI evaluation attempt {attempt + 1} failed for question: {str(e)}")
+                    logger.error(f"Question text: {question_data.get('question_text', '')[:100]}...")
+                    if attempt < self.max_retries - 1:
+                        call.retry()
+                        await asyncio.sleep(self.retry_delay)
+                    else:
+                        call.error_class = type(e).__name__
+                        # Fallback to basic evaluation
+                        logger.warning("Using fallback basic evaluation")
+                        return self._basic_evaluation(student_answer, question_data)
     
     def _build_evaluation_prompt(
         self,
@@ -2,19 +2,34 @@
 Vocabulary Concept Map Evaluator Service
 Evaluates student concept maps using AI
 """
+import asyncio
 import json
 import logging
 import os
+from functools import cached_property
 from typing import Dict, Any, List
 
+from app.core.ai_telemetry import ai_telemetry
+from app.config.ai_config import configure_gemini
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
+
 logger = logging.getLogger(__name__)
 
 
 class VocabularyConceptMapEvaluator:
     """Service for evaluating student concept maps using AI"""
     
-    def __init__(self):
-        pass
+    def __init__(self, model=None):
+        if model is not None:
+            # Shared long-lived client, see VocabularyEvaluationService
+            self.model = model
+    
+    @cached_property
+    def model(self):
+        import google.generativeai as genai
+        
+        configure_gemini(os.getenv("GEMINI_API_KEY"))
+        return genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
     
     async def evaluate_concept_map(
         self,
@@ -29,6 +44,27 @@ class VocabularyConceptMapEvaluator:
     ) -> Dict[str, Any]:
         """Evaluate a student's concept map for a vocabulary word"""
         
+        try:
+            return await self.evaluate_concept_map_with_ai(
+                word, grade_level, definition, synonyms, antonyms,
+                context_theme, connotation, example_sentence
+            )
+        except Exception as e:
+            return self._get_error_evaluation(word, e)
+    
+    async def evaluate_concept_map_with_ai(
+        self,
+        word: str,
+        grade_level: str,
+        definition: str,
+        synonyms: str,
+        antonyms: str,
+        context_theme: str,
+        connotation: str,
+        example_sentence: str
+    ) -> Dict[str, Any]:
+        """AI verdict for a concept map; raises instead of returning the fallback"""
+        
         prompt = f"""You are evaluating a {grade_level} grade student's concept map for the vocabulary word "{word}".
         
 The student has provided the following responses:
@@ -89,47 +125,46 @@ Return a JSON response with this exact structure:
     "areas_for_improvement": [<list 1-2 specific areas to focus on>]
 }}"""
 
-        try:
-            import google.generativeai as genai
-            
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            evaluation = json.loads(response_text.strip())
-            
-            # Validate response structure
-            required_fields = ["overall_score", "component_scores", "overall_feedback", "areas_for_improvement"]
-            if not all(field in evaluation for field in required_fields):
-                raise ValueError("Invalid evaluation response structure")
-            
-            # Validate component scores
-            required_components = ["definition", "synonyms", "antonyms", "context_theme", "connotation", "example_sentence"]
-            for component in required_components:
-                if component not in evaluation["component_scores"]:
-                    raise ValueError(f"Missing component score: {component}")
-                if not isinstance(evaluation["component_scores"][component].get("score"), (int, float)):
-                    raise ValueError(f"Invalid score for component: {component}")
-                if not 1 <= evaluation["component_scores"][component]["score"] <= 4:
-                    raise ValueError(f"Score out of range for component: {component}")
-            
-            return evaluation
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response as JSON: {e}")
-            return self._get_fallback_evaluation(word)
-        except Exception as e:
-            logger.error(f"Error evaluating concept map: {e}")
-            if "rate limit" in str(e).lower():
-                return self._get_fallback_evaluation(word, "The evaluation service is temporarily busy. Your work has been saved.")
+        with ai_telemetry.track("vocab_concept_map_evaluation", GEMINI_DEFAULT_MODEL, prompt) as call:
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            call.record_response(response)
+        response_text = response.text.strip()
+        
+        # Extract JSON from response
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        evaluation = json.loads(response_text.strip())
+        
+        # Validate response structure
+        required_fields = ["overall_score", "component_scores", "overall_feedback", "areas_for_improvement"]
+        if not all(field in evaluation for field in required_fields):
+            raise ValueError("Invalid evaluation response structure")
+        
+        # Validate component scores
+        required_components = ["definition", "synonyms", "antonyms", "context_theme", "connotation", "example_sentence"]
+        for component in required_components:
+            if component not in evaluation["component_scores"]:
+                raise ValueError(f"Missing component score: {component}")
+            if not isinstance(evaluation["component_scores"][component].get("score"), (int, float)):
+                raise ValueError(f"Invalid score for component: {component}")
+            if not 1 <= evaluation["component_scores"][component]["score"] <= 4:
+                raise ValueError(f"Score out of range for component: {component}")
+        
+        return evaluation
+    
+    def _get_error_evaluation(self, word: str, error: Exception) -> Dict[str, Any]:
+        """Fallback evaluation for a failed AI evaluation"""
+        
+        if isinstance(error, json.JSONDecodeError):
+            logger.error(f"Failed to parse AI response as JSON: {error}")
             return self._get_fallback_evaluation(word)
+        logger.error(f"Error evaluating concept map: {error}")
+        if "rate limit" in str(error).lower():
+            return self._get_fallback_evaluation(word, "The evaluation service is temporarily busy. Your work has been saved.")
+        return self._get_fallback_evaluation(word)
     
     def _get_fallback_evaluation(self, word: str, message: str = None) -> Dict[str, Any]:
         """Provide a fallback evaluation when AI is unavailable"""
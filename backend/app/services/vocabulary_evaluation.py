@@ -0,0 +1,246 @@
+"""
+Shared AI evaluation for vocabulary stories and concept maps
+
+A class finishing an activity at the end of a period submits all at once, so
+evaluation is organised around the provider rather than around one request:
+
+- one long-lived Gemini model serves every evaluation in the worker, instead
+  of each evaluator configuring and building its own
+- provider calls run in worker threads, at most ``EVALUATION_CONCURRENCY`` at
+  a time; identical submissions already being evaluated share that call
+- verdicts are stored in Redis keyed by the normalized submission and the
+  word or prompt it answers, so a resubmission of the same text is answered
+  from the stored verdict without calling the model again
+- stories get the template score straight away; if the AI verdict is not back
+  within ``PROVISIONAL_AFTER_SECONDS`` that score is returned marked
+  ``provisional`` while the AI call finishes and stores its verdict, and the
+  caller replaces it through ``wait_for_story_verdict``
+
+Usage:
+
+    evaluation = await VocabularyEvaluationService.evaluate_story(
+        prompt_id, story_text, required_words, setting, tone, max_score
+    )
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+
+from app.config.ai_config import configure_gemini, get_gemini_config
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
+from app.core.ai_telemetry import ai_telemetry
+from app.core.redis import redis_client
+from app.services.vocabulary_concept_map_evaluator import VocabularyConceptMapEvaluator
+from app.services.vocabulary_story_evaluator import VocabularyStoryEvaluator
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_MODEL = GEMINI_DEFAULT_MODEL
+
+# Provider calls in flight per worker
+EVALUATION_CONCURRENCY = 8
+
+# How long a story submission waits for the AI verdict before the template score stands in
+PROVISIONAL_AFTER_SECONDS = 20
+
+VERDICT_CACHE_SECONDS = 7 * 24 * 3600
+VERDICT_KEY_PREFIX = "vocab_verdict"
+
+_model = None
+_model_lock = threading.Lock()
+
+_provider_slots = asyncio.Semaphore(EVALUATION_CONCURRENCY)
+
+# Evaluations in flight, by verdict key
+_pending: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+# Requests currently awaiting each pending evaluation; a failure with none
+# left is logged by the evaluation itself
+_waiters: Dict[str, int] = {}
+
+
+def get_evaluation_model():
+    """The worker's shared Gemini model, or None if no API key is set"""
+    global _model
+    if _model is None:
+        config = get_gemini_config()
+        if not config.api_key:
+            return None
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+
+                configure_gemini(config.api_key)
+                _model = genai.GenerativeModel(EVALUATION_MODEL)
+    return _model
+
+
+def normalize_submission(text: str) -> str:
+    """Case and whitespace differences don't change a verdict"""
+    return re.sub(r"\s+", " ", (text or "").strip()).casefold()
+
+
+def verdict_key(activity: str, scope_id: Any, *parts: str) -> str:
+    digest = hashlib.sha256(
+        "\x1f".join(normalize_submission(part) for part in parts).encode()
+    ).hexdigest()
+    return f"{VERDICT_KEY_PREFIX}:{activity}:{scope_id}:{digest}"
+
+
+async def _load_verdict(key: str) -> Optional[Dict[str, Any]]:
+    try:
+        cached = await redis_client.get(key)
+        if cached:
+            return json.loads(cached)
+    except Exception as e:
+        logger.warning(f"Failed to read stored verdict {key}: {e}")
+    return None
+
+
+async def _store_verdict(key: str, verdict: Dict[str, Any]) -> None:
+    try:
+        await redis_client.set_with_expiry(key, json.dumps(verdict), VERDICT_CACHE_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to store verdict {key}: {e}")
+
+
+def _mark_retrieved(task: "asyncio.Task") -> None:
+    # Failures are logged by whoever sees them (see run and _await_verdict);
+    # fetching the exception stops asyncio reporting it again
+    if not task.cancelled():
+        task.exception()
+
+
+def _start_evaluation(key: str, evaluate: Callable[[], Awaitable[Dict[str, Any]]]) -> "asyncio.Task":
+    """Run (or join) the AI evaluation for a verdict key and store its result"""
+    task = _pending.get(key)
+    if task is not None:
+        return task
+
+    async def run() -> Dict[str, Any]:
+        try:
+            async with _provider_slots:
+                verdict = await evaluate()
+        except Exception as e:
+            if not _waiters.get(key):
+                # A provisional score was returned and nobody awaits the verdict any more
+                logger.error(f"Background evaluation failed: {e}")
+            raise
+        await _store_verdict(key, verdict)
+        return verdict
+
+    task = asyncio.create_task(run())
+    _pending[key] = task
+    task.add_done_callback(lambda _: _pending.pop(key, None))
+    task.add_done_callback(_mark_retrieved)
+    return task
+
+
+async def _await_verdict(key: str, task: "asyncio.Task", timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Wait for a pending evaluation without cancelling it for other waiters"""
+    _waiters[key] = _waiters.get(key, 0) + 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    finally:
+        _waiters[key] -= 1
+        if not _waiters[key]:
+            del _waiters[key]
+
+
+class VocabularyEvaluationService:
+    """Entry point for story and concept map evaluation"""
+
+    @staticmethod
+    async def evaluate_story(
+        prompt_id: UUID,
+        story_text: str,
+        required_words: List[str],
+        setting: str,
+        tone: str,
+        max_score: int = 100
+    ) -> Dict[str, Any]:
+        """Evaluate a story, reusing the stored verdict for an identical resubmission"""
+        key = verdict_key("story", prompt_id, story_text)
+        cached = await _load_verdict(key)
+        ai_telemetry.record_cache("vocab_story_evaluation", EVALUATION_MODEL, hit=cached is not None)
+        if cached is not None:
+            return cached
+
+        evaluator = VocabularyStoryEvaluator(get_evaluation_model())
+        # Instant, and what the student sees if the AI verdict is slow or fails
+        template = await evaluator._template_evaluate_story(story_text, required_words, setting, tone, max_score)
+        if not await evaluator._is_ai_available():
+            return template
+
+        task = _start_evaluation(
+            key,
+            lambda: evaluator.evaluate_story_with_ai(story_text, required_words, setting, tone, max_score)
+        )
+        try:
+            return await _await_verdict(key, task, PROVISIONAL_AFTER_SECONDS)
+        except asyncio.TimeoutError:
+            logger.info(f"Story verdict for prompt {prompt_id} still pending; returning provisional score")
+            return {**template, 'provisional': True}
+        except Exception as e:
+            logger.error(f"AI evaluation failed: {e}")
+            return template
+
+    @staticmethod
+    async def evaluate_concept_map(
+        word_id: UUID,
+        word: str,
+        grade_level: str,
+        definition: str,
+        synonyms: str,
+        antonyms: str,
+        context_theme: str,
+        connotation: str,
+        example_sentence: str
+    ) -> Dict[str, Any]:
+        """Evaluate a concept map, reusing the stored verdict for an identical resubmission"""
+        key = verdict_key(
+            "concept_map", word_id, grade_level,
+            definition, synonyms, antonyms, context_theme, connotation, example_sentence
+        )
+        cached = await _load_verdict(key)
+        ai_telemetry.record_cache("vocab_concept_map_evaluation", EVALUATION_MODEL, hit=cached is not None)
+        if cached is not None:
+            return cached
+
+        model = get_evaluation_model()
+        evaluator = VocabularyConceptMapEvaluator(model)
+        if model is None:
+            return evaluator._get_fallback_evaluation(word)
+
+        task = _start_evaluation(
+            key,
+            lambda: evaluator.evaluate_concept_map_with_ai(
+                word, grade_level, definition, synonyms, antonyms,
+                context_theme, connotation, example_sentence
+            )
+        )
+        try:
+            return await _await_verdict(key, task)
+        except Exception as e:
+            return evaluator._get_error_evaluation(word, e)
+
+    @staticmethod
+    async def wait_for_story_verdict(prompt_id: UUID, story_text: str) -> Optional[Dict[str, Any]]:
+        """The AI verdict behind a provisional story score, once it is in
+
+        None if the evaluation failed or its verdict is no longer around.
+        """
+        key = verdict_key("story", prompt_id, story_text)
+        task = _pending.get(key)
+        if task is None:
+            return await _load_verdict(key)
+        try:
+            return await _await_verdict(key, task)
+        except Exception as e:
+            logger.error(f"AI evaluation failed: {e}")
+            return None
@@ -0,0 +1,254 @@
+"""
+Offline lexical checks for grading vocabulary answers
+
+Everything here is local and synchronous so answer checking can decide the
+common cases in microseconds, before (and usually instead of) a model call:
+
+- ``damerau_levenshtein`` - edit distance counting insertions, deletions,
+  substitutions and adjacent transpositions, with an early exit once the
+  distance is known to exceed a bound
+- ``lemmatize`` / ``stem`` - irregular forms plus light suffix stripping, so
+  "studies", "studied" and "studying" all reduce to the same key
+- ``RelatedForms`` - a synonym / related-form table built from the words and
+  definitions already stored in a vocabulary list
+
+Usage:
+
+    from app.services.vocabulary_lexicon import RelatedForms, damerau_levenshtein, same_lemma
+
+    if damerau_levenshtein("recieve", "receive", 2) <= 2:
+        ...
+    related = RelatedForms.from_words(vocabulary_list.words)
+    related.are_related("plentiful", "abundant")
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.vocabulary import VocabularyWord
+
+# Irregular forms the suffix rules cannot reach
+IRREGULAR_LEMMAS: Dict[str, str] = {
+    "am": "be", "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "being": "be",
+    "has": "have", "had": "have", "does": "do", "did": "do", "done": "do",
+    "went": "go", "gone": "go", "goes": "go",
+    "ran": "run", "ate": "eat", "eaten": "eat", "saw": "see", "seen": "see",
+    "took": "take", "taken": "take", "gave": "give", "given": "give",
+    "made": "make", "came": "come", "knew": "know", "known": "know",
+    "thought": "think", "brought": "bring", "bought": "buy", "caught": "catch",
+    "taught": "teach", "fought": "fight", "sought": "seek",
+    "wrote": "write", "written": "write", "spoke": "speak", "spoken": "speak",
+    "chose": "choose", "chosen": "choose", "began": "begin", "begun": "begin",
+    "grew": "grow", "grown": "grow", "drew": "draw", "drawn": "draw",
+    "flew": "fly", "flown": "fly", "threw": "throw", "thrown": "throw",
+    "felt": "feel", "kept": "keep", "left": "leave", "meant": "mean",
+    "found": "find", "held": "hold", "told": "tell", "sold": "sell",
+    "stood": "stand", "understood": "understand", "led": "lead", "fed": "feed",
+    "children": "child", "men": "man", "women": "woman", "people": "person",
+    "feet": "foot", "teeth": "tooth", "mice": "mouse", "geese": "goose",
+    "better": "good", "best": "good", "worse": "bad", "worst": "bad",
+}
+
+# Longest first; each entry is (suffix, replacement, minimum stem length)
+_SUFFIX_RULES = (
+    ("ational", "ate", 2), ("fulness", "ful", 2), ("iveness", "ive", 2),
+    ("ousness", "ous", 2), ("ization", "ize", 2), ("isation", "ize", 2),
+    ("ations", "ate", 2), ("ation", "ate", 2), ("ements", "", 3),
+    ("ement", "", 3), ("ments", "", 3), ("ment", "", 3),
+    ("nesses", "", 3), ("ness", "", 3), ("ities", "", 3), ("ity", "", 3),
+    ("ingly", "", 3), ("edly", "", 3), ("ously", "ous", 2), ("ly", "", 3),
+    ("ies", "y", 2), ("ied", "y", 2), ("ing", "", 3), ("ed", "", 3),
+    ("es", "", 3), ("er", "", 4), ("s", "", 3),
+)
+
+_DOUBLED_ENDING = re.compile(r"([bdfgklmnprt])\1$")
+
+# Suffixes that swallow a silent e: making -> mak, cared -> car
+_VOWEL_SUFFIXES = ("ing", "ed", "er", "es")
+
+# mak, car, hop: a stem short enough that its silent e has to come back
+_SHORT_SILENT_E_STEM = re.compile(r"^[^aeiou][aeiou][^aeiouwxy]$")
+
+# Shortest stem a trailing e is dropped from; shorter ones keep it so that
+# care/car and hate/hat stay apart
+_MIN_E_STEM = 4
+
+_WORD_RE = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+
+# Definition words too common to say anything about meaning
+_STOPWORDS = frozenset("""
+    a an the and or but of to in on at by for with from as into about than
+    that this these those which who whom whose what when where why how
+    is are was were be been being has have had do does did can could
+    will would shall should may might must it its they them their there
+    something someone somebody thing things way very more most much many
+    some any each other such not no one person people used use using
+""".split())
+
+
+def normalize(word: str) -> str:
+    return word.strip().lower()
+
+
+def damerau_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """Edit distance with adjacent transpositions (optimal string alignment)
+
+    Returns max_distance + 1 as soon as the distance is known to be larger,
+    so comparing against unrelated words costs a few rows at most.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return max(len(a), len(b))
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(
+                previous[j] + 1,         # deletion
+                current[j - 1] + 1,      # insertion
+                previous[j - 1] + cost   # substitution
+            )
+            if (
+                previous_previous is not None and j > 1
+                and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]
+            ):
+                value = min(value, previous_previous[j - 2] + 1)  # transposition
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return min(previous[len(b)], max_distance + 1)
+
+
+def spelling_tolerance(word: str) -> int:
+    """Edits allowed before an answer stops counting as a misspelling"""
+    return 2 if len(word) > 3 else 1
+
+
+def stem(word: str) -> str:
+    """Strip common inflectional and derivational suffixes"""
+    word = normalize(word)
+    stripped = None
+    for suffix, replacement, min_stem in _SUFFIX_RULES:
+        # famous, glass, basis: the s belongs to the word
+        if suffix == "s" and word.endswith(("us", "ss", "is")):
+            continue
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            word = word[:-len(suffix)] + replacement
+            stripped = suffix
+            break
+    # running -> runn -> run, stopped -> stopp -> stop
+    if _DOUBLED_ENDING.search(word) and len(word) > 3:
+        word = word[:-1]
+    # making -> mak -> make, caring -> care; buses keep their s without an e
+    elif (
+        stripped in _VOWEL_SUFFIXES
+        and _SHORT_SILENT_E_STEM.match(word)
+        and not (stripped == "es" and word.endswith(("s", "z")))
+    ):
+        word += "e"
+    # happiness -> happi, happy: y and i endings compare equal
+    if word.endswith("i") and len(word) > 3:
+        word = word[:-1] + "y"
+    # achieving -> achiev, achieve -> achiev: compare without a trailing e
+    if word.endswith("e") and len(word) > _MIN_E_STEM:
+        word = word[:-1]
+    return word
+
+
+@lru_cache(maxsize=50000)
+def lemmatize(word: str) -> str:
+    """Map a word to a comparison key shared by its inflected forms"""
+    word = normalize(word)
+    return stem(IRREGULAR_LEMMAS.get(word, word))
+
+
+def same_lemma(a: str, b: str) -> bool:
+    return lemmatize(a) == lemmatize(b)
+
+
+def content_words(text: str) -> Set[str]:
+    return {
+        token for token in _WORD_RE.findall(text.lower())
+        if len(token) > 2 and token not in _STOPWORDS
+    }
+
+
+class RelatedForms:
+    """Related-word table for one vocabulary list, keyed by lemma
+
+    Two words are related when one is a form of the other, when a definition
+    gives the other as a one-word synonym ("abundant: plentiful; ample"), or
+    when one list word is used in another's definition.
+    """
+
+    def __init__(self):
+        self._related: Dict[str, Set[str]] = {}
+
+    def add(self, a: str, b: str) -> None:
+        a_key, b_key = lemmatize(a), lemmatize(b)
+        if a_key != b_key:
+            self._related.setdefault(a_key, set()).add(b_key)
+            self._related.setdefault(b_key, set()).add(a_key)
+
+    def are_related(self, a: str, b: str) -> bool:
+        a_key, b_key = lemmatize(a), lemmatize(b)
+        return a_key == b_key or b_key in self._related.get(a_key, ())
+
+    @classmethod
+    def from_words(cls, words: Iterable[VocabularyWord]) -> "RelatedForms":
+        table = cls()
+        words = list(words)
+        list_lemmas = {lemmatize(w.word): w.word for w in words}
+
+        for w in words:
+            table._related.setdefault(lemmatize(w.word), set())
+            definition = w.teacher_definition or w.ai_definition or ""
+
+            # One-word segments of a definition are synonyms
+            for segment in re.split(r"[;,]| or ", definition):
+                tokens = content_words(segment)
+                if len(tokens) == 1:
+                    table.add(w.word, tokens.pop())
+
+            # List words used in each other's definitions
+            for token in content_words(definition):
+                other = list_lemmas.get(lemmatize(token))
+                if other and other != w.word:
+                    table.add(w.word, other)
+
+        return table
+
+
+# Tables per (list id, list updated_at); old versions are never asked for again
+RELATED_FORMS_CACHE_SIZE = 500
+_related_forms: Dict[tuple, RelatedForms] = {}
+
+
+async def get_related_forms(db: AsyncSession, list_id, version: Optional[Any] = None) -> RelatedForms:
+    """Build (or reuse) the related-word table for a vocabulary list"""
+    cache_key = (list_id, version)
+    table = _related_forms.get(cache_key) if version is not None else None
+    if table is None:
+        result = await db.execute(
+            select(VocabularyWord).where(VocabularyWord.list_id == list_id)
+        )
+        table = RelatedForms.from_words(result.scalars().all())
+        if version is not None:
+            if len(_related_forms) >= RELATED_FORMS_CACHE_SIZE:
+                _related_forms.clear()
+            _related_forms[cache_key] = table
+    return table
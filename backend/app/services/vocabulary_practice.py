@@ -2,7 +2,7 @@
 Vocabulary practice activity service
 Manages student progress through vocabulary practice games
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,6 +14,7 @@ import logging
 import random
 import asyncio
 
+from app.core.database import AsyncSessionLocal
 from app.models.vocabulary import VocabularyList, VocabularyWord
 from app.models.vocabulary_practice import (
     VocabularyPracticeProgress,
@@ -32,14 +33,68 @@ from app.models.vocabulary_practice import (
 from app.models.classroom import ClassroomAssignment, StudentAssignment
 from app.models.user import User
 from app.services.vocabulary_story_generator import VocabularyStoryGenerator
-from app.services.vocabulary_story_evaluator import VocabularyStoryEvaluator
 from app.services.vocabulary_concept_map_evaluator import VocabularyConceptMapEvaluator
+from app.services.vocabulary_evaluation import VocabularyEvaluationService
 from app.services.vocabulary_puzzle_generator import VocabularyPuzzleGenerator
 from app.services.vocabulary_puzzle_evaluator import VocabularyPuzzleEvaluator
+from app.services.vocabulary_lexicon import get_related_forms
 from app.services.vocabulary_session import VocabularySessionManager
+from app.services.student_analytics import schedule_rollup_refresh
 
 logger = logging.getLogger(__name__)
 
+# Provisional story scores waiting for their AI verdict
+_story_reconciliations: Set[asyncio.Task] = set()
+
+
+async def _reconcile_story_score(
+    story_response_id: UUID,
+    story_attempt_id: UUID,
+    prompt_id: UUID,
+    story_text: str
+) -> None:
+    """Replace a provisional story score with the AI verdict once it arrives"""
+    verdict = await VocabularyEvaluationService.wait_for_story_verdict(prompt_id, story_text)
+    if verdict is None:
+        # Same as an evaluation that failed in time: the template score stands
+        return
+    
+    try:
+        async with AsyncSessionLocal() as db:
+            story_attempt = await db.get(VocabularyStoryAttempt, story_attempt_id, with_for_update=True)
+            story_response = await db.get(VocabularyStoryResponse, story_response_id)
+            if not story_attempt or not story_response or not story_response.ai_evaluation.get('provisional'):
+                return
+            
+            score_change = verdict['total_score'] - story_response.total_score
+            story_response.ai_evaluation = verdict
+            story_response.feedback = verdict
+            story_response.total_score = verdict['total_score']
+            story_response.score = verdict['total_score']
+            story_response.words_used = verdict.get('vocabulary_analysis', {}).get('words_used', [])
+            story_response.used_required_words = verdict.get('vocabulary_analysis', {}).get('words_used_correctly', [])
+            
+            story_attempt.story_responses = [
+                {**entry, 'score': verdict['total_score'], 'evaluation': verdict}
+                if (
+                    entry.get('prompt_id') == str(prompt_id)
+                    and entry.get('story_text') == story_text
+                    and entry.get('evaluation', {}).get('provisional')
+                ) else entry
+                for entry in story_attempt.story_responses
+            ]
+            story_attempt.current_score += score_change
+            
+            # Pass/fail was decided on the provisional score; decide again
+            # unless the student has already confirmed completion
+            if story_attempt.status in ('pending_confirmation', 'failed'):
+                percentage_score = (story_attempt.current_score / story_attempt.max_possible_score) * 100
+                story_attempt.status = 'pending_confirmation' if percentage_score >= 70 else 'failed'
+            
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Failed to apply AI verdict to story response {story_response_id}: {e}")
+
 
 class VocabularyPracticeService:
     """Service for managing vocabulary practice activities"""
@@ -134,92 +189,47 @@ class VocabularyPracticeService:
     ) -> Dict[str, Any]:
         """Get practice status for a student with session restoration"""
         
-        progress = await self.get_or_create_practice_progress(
+        # Activity completions and test state change only when an activity or
+        # test is completed, so they are cached briefly in the student's
+        # session hash and invalidated on completion
+        status_facts = await self.session_manager.get_cached_status(
             student_id, vocabulary_list_id, classroom_assignment_id
         )
         
-        # Update activity tracking
-        await self.session_manager.update_activity(student_id, vocabulary_list_id)
-        
-        # Restore session state from database if not in Redis
-        current_session = await self.session_manager.get_current_session(student_id, vocabulary_list_id)
-        if not current_session and progress.current_game_session:
-            await self.session_manager.restore_session_from_db(
-                student_id, vocabulary_list_id, progress.current_game_session
+        if status_facts is None:
+            practice_status, game_session, status_facts = await self._load_practice_status(
+                student_id, vocabulary_list_id, classroom_assignment_id
             )
+        else:
+            progress = await self.get_or_create_practice_progress(
+                student_id, vocabulary_list_id, classroom_assignment_id
+            )
+            practice_status, game_session = progress.practice_status, progress.current_game_session
         
-        # Restore progress state to Redis for faster access
-        await self.session_manager.restore_progress_from_db(
-            student_id, vocabulary_list_id, progress.practice_status
+        # Update activity tracking, restore the session if Redis lost it,
+        # refresh progress state and store the status facts in one round-trip
+        current_session = await self.session_manager.restore_from_db(
+            student_id, vocabulary_list_id,
+            game_session, practice_status,
+            status=status_facts
         )
         
-        # Check StudentAssignment for completion status (new authoritative source)
-        assignment_completions = {}
-        for assignment_type in ['story_builder', 'concept_mapping', 'puzzle_path', 'fill_in_blank']:
-            # Map assignment types to specific vocabulary subtypes
-            student_assignment_type = f"vocabulary_{assignment_type}" if assignment_type != 'story_builder' else "vocabulary_story_builder"
-            
-            result = await self.db.execute(
-                select(StudentAssignment.completed_at)
-                .where(
-                    and_(
-                        StudentAssignment.student_id == student_id,
-                        StudentAssignment.assignment_id == vocabulary_list_id,
-                        StudentAssignment.classroom_assignment_id == classroom_assignment_id,
-                        StudentAssignment.assignment_type == "vocabulary",
-                        StudentAssignment.progress_metadata['completed_subtypes'].contains([assignment_type])
-                    )
-                )
-            )
-            completion_date = result.scalar_one_or_none()
-            assignment_completions[assignment_type] = completion_date
+        assignment_completions = {
+            assignment_type: datetime.fromisoformat(completed_at) if completed_at else None
+            for assignment_type, completed_at in status_facts['completions'].items()
+        }
         
         # Count completed assignments based on StudentAssignment records
         completed_count = sum(1 for completion in assignment_completions.values() if completion is not None)
         test_unlocked = completed_count >= self.ASSIGNMENTS_TO_COMPLETE
         
-        # Check vocabulary test completion status
-        test_completion_result = await self.db.execute(
-            text("""
-                SELECT COUNT(*) as attempt_count,
-                       MAX(score_percentage) as best_score,
-                       MAX(completed_at) as last_completed,
-                       MAX(vt.max_attempts) as max_attempts
-                FROM vocabulary_test_attempts vta
-                JOIN vocabulary_tests vt ON vt.id = vta.test_id  
-                WHERE vta.student_id = :student_id 
-                AND vt.vocabulary_list_id = :vocabulary_list_id
-                AND vt.classroom_assignment_id = :classroom_assignment_id
-                AND vta.status = 'completed'
-            """),
-            {
-                "student_id": str(student_id),
-                "vocabulary_list_id": str(vocabulary_list_id), 
-                "classroom_assignment_id": classroom_assignment_id
-            }
+        test_attempts_count = status_facts['test_attempts_count']
+        best_test_score = status_facts['best_test_score']
+        last_test_completed_at = (
+            datetime.fromisoformat(status_facts['last_test_completed_at'])
+            if status_facts['last_test_completed_at'] else None
         )
-        test_completion_data = test_completion_result.fetchone()
-        
-        test_attempts_count = test_completion_data.attempt_count if test_completion_data else 0
-        best_test_score = test_completion_data.best_score if test_completion_data else None
-        last_test_completed_at = test_completion_data.last_completed if test_completion_data else None
-        
-        # Get max_test_attempts from test config if not found in existing tests
-        if test_completion_data and test_completion_data.max_attempts:
-            max_test_attempts = test_completion_data.max_attempts
-            logger.info(f"Using max_test_attempts from existing test data: {max_test_attempts}")
-        else:
-            # Import VocabularyTestService to get test configuration
-            from app.services.vocabulary_test import VocabularyTestService
-            test_config = await VocabularyTestService.get_test_config(self.db, vocabulary_list_id)
-            logger.info(f"Test config for vocabulary list {vocabulary_list_id}: {test_config}")
-            if test_config and test_config.get("max_attempts"):
-                max_test_attempts = test_config["max_attempts"]
-                logger.info(f"Using max_test_attempts from config: {max_test_attempts}")
-            else:
-                # Default to 3 only if no config exists
-                max_test_attempts = 3
-                logger.info(f"Using default max_test_attempts: {max_test_attempts}")
+        max_test_attempts = status_facts['max_test_attempts']
         
         test_completed = test_attempts_count >= max_test_attempts  # Test is completed when all attempts are used
         
@@ -227,7 +237,7 @@ class VocabularyPracticeService:
         assignments = []
         
         for assignment_type in ['story_builder', 'concept_mapping', 'puzzle_path', 'fill_in_blank']:
-            assignment_data = progress.practice_status.get('assignments', {}).get(assignment_type, {})
+            assignment_data = practice_status.get('assignments', {}).get(assignment_type, {})
             is_completed = assignment_completions[assignment_type] is not None
             
             # Check if there's an active session for this assignment type
@@ -266,7 +276,7 @@ class VocabularyPracticeService:
             'completed_count': completed_count,
             'required_count': self.ASSIGNMENTS_TO_COMPLETE,
             'test_unlocked': test_unlocked,
-            'test_unlock_date': progress.practice_status.get('test_unlock_date'),
+            'test_unlock_date': practice_status.get('test_unlock_date'),
             'test_completed': test_completed,
             'test_attempts_count': test_attempts_count,
             'max_test_attempts': max_test_attempts,
@@ -275,6 +285,98 @@ class VocabularyPracticeService:
             'current_session': current_session
         }
     
+    async def _load_practice_status(
+        self,
+        student_id: UUID,
+        vocabulary_list_id: UUID,
+        classroom_assignment_id: int
+    ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Read practice progress, activity completions and test state in one query
+
+        Returns the practice status, the saved game session and the status
+        facts that get_practice_status caches.
+        """
+        result = await self.db.execute(
+            text("""
+                SELECT
+                    vpp.id AS progress_id,
+                    vpp.practice_status,
+                    vpp.current_game_session,
+                    sa.completed_at AS assignment_completed_at,
+                    sa.completed_subtypes,
+                    t.attempt_count,
+                    t.best_score,
+                    t.last_completed,
+                    t.max_attempts,
+                    cfg.max_attempts AS config_max_attempts
+                FROM (SELECT 1) AS base
+                LEFT JOIN vocabulary_practice_progress vpp
+                    ON vpp.student_id = :student_id
+                    AND vpp.vocabulary_list_id = :vocabulary_list_id
+                    AND vpp.classroom_assignment_id = :classroom_assignment_id
+                LEFT JOIN LATERAL (
+                    SELECT completed_at, progress_metadata->'completed_subtypes' AS completed_subtypes
+                    FROM student_assignments
+                    WHERE student_id = :student_id
+                    AND assignment_id = :vocabulary_list_id
+                    AND classroom_assignment_id = :classroom_assignment_id
+                    AND assignment_type = 'vocabulary'
+                    LIMIT 1
+                ) sa ON true
+                LEFT JOIN LATERAL (
+                    SELECT COUNT(*) AS attempt_count,
+                           MAX(vta.score_percentage) AS best_score,
+                           MAX(vta.completed_at) AS last_completed,
+                           MAX(vt.max_attempts) AS max_attempts
+                    FROM vocabulary_test_attempts vta
+                    JOIN vocabulary_tests vt ON vt.id = vta.test_id
+                    WHERE vta.student_id = :student_id
+                    AND vt.vocabulary_list_id = :vocabulary_list_id
+                    AND vt.classroom_assignment_id = :classroom_assignment_id
+                    AND vta.status = 'completed'
+                ) t ON true
+                LEFT JOIN vocabulary_test_configs cfg
+                    ON cfg.vocabulary_list_id = :vocabulary_list_id
+            """),
+            {
+                "student_id": str(student_id),
+                "vocabulary_list_id": str(vocabulary_list_id),
+                "classroom_assignment_id": classroom_assignment_id
+            }
+        )
+        row = result.fetchone()
+        
+        if row.progress_id is None:
+            progress = await self.get_or_create_practice_progress(
+                student_id, vocabulary_list_id, classroom_assignment_id
+            )
+            practice_status, game_session = progress.practice_status, progress.current_game_session
+        else:
+            practice_status, game_session = row.practice_status, row.current_game_session
+        
+        # An activity counts as completed once it is in the StudentAssignment's
+        # completed_subtypes (the authoritative source)
+        completed_subtypes = row.completed_subtypes or []
+        completions = {
+            assignment_type: (
+                row.assignment_completed_at.isoformat()
+                if row.assignment_completed_at and assignment_type in completed_subtypes else None
+            )
+            for assignment_type in ['story_builder', 'concept_mapping', 'puzzle_path', 'fill_in_blank']
+        }
+        
+        # Prefer max_attempts from existing tests, then the test config, then 3
+        max_test_attempts = row.max_attempts or row.config_max_attempts or 3
+        
+        return practice_status, game_session, {
+            'classroom_assignment_id': classroom_assignment_id,
+            'completions': completions,
+            'test_attempts_count': row.attempt_count or 0,
+            'best_test_score': float(row.best_score) if row.best_score is not None else None,
+            'last_test_completed_at': row.last_completed.isoformat() if row.last_completed else None,
+            'max_test_attempts': max_test_attempts
+        }
+    
     def _get_assignment_display_name(self, assignment_type: str) -> str:
         """Get display name for assignment type"""
         names = {
@@ -437,9 +539,8 @@ class VocabularyPracticeService:
         await self.db.commit()
         
         # Store session in Redis for fast access
-        await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.set_current_attempt(
-            student_id, vocabulary_list_id, 'concept_mapping',
+        await self.session_manager.set_session_and_attempt(
+            student_id, vocabulary_list_id, session_data, 'concept_mapping',
             {
                 'attempt_id': str(concept_attempt.id),
                 'attempt_number': attempt_number,
@@ -506,7 +607,6 @@ class VocabularyPracticeService:
         }
         
         await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.update_activity(student_id, vocabulary_list_id)
         
         return {
             'concept_attempt_id': str(concept_attempt.id),
@@ -578,7 +678,8 @@ class VocabularyPracticeService:
             }
         
         # Evaluate the concept map
-        evaluation = await evaluator.evaluate_concept_map(
+        evaluation = await VocabularyEvaluationService.evaluate_concept_map(
+            word_id=word_id,
             word=word.word,
             grade_level=concept_attempt.vocabulary_list.grade_level,
             definition=definition,
@@ -656,9 +757,6 @@ class VocabularyPracticeService:
             await self.session_manager.set_current_session(
                 concept_attempt.student_id, concept_attempt.vocabulary_list_id, session_data
             )
-            await self.session_manager.update_activity(
-                concept_attempt.student_id, concept_attempt.vocabulary_list_id
-            )
         
         # Get next word if not complete
         next_word = None
@@ -993,8 +1091,7 @@ class VocabularyPracticeService:
             )
         
         # Clear Redis session data
-        await self.session_manager.clear_session(concept_attempt.student_id, concept_attempt.vocabulary_list_id)
-        await self.session_manager.clear_attempt(concept_attempt.student_id, concept_attempt.vocabulary_list_id, 'concept_mapping')
+        await self.session_manager.clear_session_and_attempt(concept_attempt.student_id, concept_attempt.vocabulary_list_id, 'concept_mapping')
     
     # Puzzle Path Methods
     
@@ -1144,9 +1241,8 @@ class VocabularyPracticeService:
         await self.db.commit()
         
         # Store session in Redis for fast access
-        await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.set_current_attempt(
-            student_id, vocabulary_list_id, 'puzzle_path',
+        await self.session_manager.set_session_and_attempt(
+            student_id, vocabulary_list_id, session_data, 'puzzle_path',
             {
                 'attempt_id': str(puzzle_attempt.id),
                 'attempt_number': attempt_number,
@@ -1210,7 +1306,6 @@ class VocabularyPracticeService:
         }
         
         await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.update_activity(student_id, vocabulary_list_id)
         
         return {
             'puzzle_attempt_id': str(puzzle_attempt.id),
@@ -1281,6 +1376,9 @@ class VocabularyPracticeService:
         
         # Evaluate the puzzle response
         try:
+            evaluator.related_forms = await get_related_forms(
+                self.db, vocab_list.id, version=vocab_list.updated_at
+            )
             evaluation = await evaluator.evaluate_puzzle_response(
                 puzzle_type=puzzle.puzzle_type,
                 puzzle_data=puzzle.puzzle_data,
@@ -1439,9 +1537,6 @@ class VocabularyPracticeService:
                 await self.session_manager.set_current_session(
                     puzzle_attempt.student_id, puzzle_attempt.vocabulary_list_id, session_data
                 )
-                await self.session_manager.update_activity(
-                    puzzle_attempt.student_id, puzzle_attempt.vocabulary_list_id
-                )
             except Exception as e:
                 logger.warning(f"Redis session update failed: {e}")
                 # Continue execution - Redis failures shouldn't break the main flow
@@ -1608,8 +1703,7 @@ class VocabularyPracticeService:
         progress.current_game_session = None  # Clear current session
         
         # Clear Redis session data
-        await self.session_manager.clear_session(puzzle_attempt.student_id, puzzle_attempt.vocabulary_list_id)
-        await self.session_manager.clear_attempt(puzzle_attempt.student_id, puzzle_attempt.vocabulary_list_id, 'puzzle_path')
+        await self.session_manager.clear_session_and_attempt(puzzle_attempt.student_id, puzzle_attempt.vocabulary_list_id, 'puzzle_path')
     
     async def confirm_puzzle_completion(
         self,
@@ -1820,8 +1914,7 @@ class VocabularyPracticeService:
                     await self.db.delete(failed_assignment)
             
             # Clear sessions and force fresh start
-            await self.session_manager.clear_session(student_id, vocabulary_list_id)
-            await self.session_manager.clear_attempt(student_id, vocabulary_list_id, 'story_builder')
+            await self.session_manager.clear_session_and_attempt(student_id, vocabulary_list_id, 'story_builder')
             
             # Reset the status to allow fresh attempt but keep historical data
             story_builder_status['status'] = 'not_started'
@@ -1848,8 +1941,7 @@ class VocabularyPracticeService:
                 return await self._resume_story_builder(student_id, vocabulary_list_id, existing_session)
             else:
                 # Clear stale session data
-                await self.session_manager.clear_session(student_id, vocabulary_list_id)
-                await self.session_manager.clear_attempt(student_id, vocabulary_list_id, 'story_builder')
+                await self.session_manager.clear_session_and_attempt(student_id, vocabulary_list_id, 'story_builder')
         
         # Check if prompts exist, generate if not
         prompts_result = await self.db.execute(
@@ -1924,9 +2016,8 @@ class VocabularyPracticeService:
         await self.db.commit()
         
         # Store session in Redis for fast access
-        await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.set_current_attempt(
-            student_id, vocabulary_list_id, 'story_builder',
+        await self.session_manager.set_session_and_attempt(
+            student_id, vocabulary_list_id, session_data, 'story_builder',
             {
                 'attempt_id': str(story_attempt.id),
                 'attempt_number': attempt_number,
@@ -1990,7 +2081,6 @@ class VocabularyPracticeService:
         }
         
         await self.session_manager.set_current_session(student_id, vocabulary_list_id, session_data)
-        await self.session_manager.update_activity(student_id, vocabulary_list_id)
         
         return {
             'story_attempt_id': str(story_attempt.id),
@@ -2053,8 +2143,8 @@ class VocabularyPracticeService:
             raise ValueError("Prompt not found")
         
         # Evaluate the story
-        evaluator = VocabularyStoryEvaluator()
-        evaluation = await evaluator.evaluate_story(
+        evaluation = await VocabularyEvaluationService.evaluate_story(
+            prompt_id=prompt_id,
             story_text=story_text,
             required_words=prompt.required_words,
             setting=prompt.setting,
@@ -2062,6 +2152,18 @@ class VocabularyPracticeService:
             max_score=prompt.max_score
         )
         
+        # A provisional score from an earlier prompt may have been reconciled
+        # while this story was evaluated; lock and re-read the attempt so the
+        # update below builds on the committed score and responses
+        await self.db.execute(
+            select(VocabularyStoryAttempt)
+            .where(VocabularyStoryAttempt.id == story_attempt_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        if story_attempt.status != 'in_progress':
+            raise ValueError("Story attempt is already completed or invalid")
+        
         # Calculate prompt order
         prompt_order = len(story_attempt.story_responses) + 1
         
@@ -2119,6 +2221,14 @@ class VocabularyPracticeService:
         
         await self.db.commit()
         
+        if evaluation.get('provisional'):
+            # The score above is the template's; swap in the AI verdict when it lands
+            task = asyncio.create_task(_reconcile_story_score(
+                story_response.id, story_attempt.id, prompt_id, story_text
+            ))
+            _story_reconciliations.add(task)
+            task.add_done_callback(_story_reconciliations.discard)
+        
         # Update Redis session if not complete
         if not is_complete:
             session_data = {
@@ -2129,9 +2239,6 @@ class VocabularyPracticeService:
             await self.session_manager.set_current_session(
                 story_attempt.student_id, story_attempt.vocabulary_list_id, session_data
             )
-            await self.session_manager.update_activity(
-                story_attempt.student_id, story_attempt.vocabulary_list_id
-            )
         
         # Get next prompt if not complete
         next_prompt = None
@@ -2261,8 +2368,7 @@ class VocabularyPracticeService:
         progress.current_game_session = None  # Clear current session
         
         # Clear Redis session data
-        await self.session_manager.clear_session(story_attempt.student_id, story_attempt.vocabulary_list_id)
-        await self.session_manager.clear_attempt(story_attempt.student_id, story_attempt.vocabulary_list_id, 'story_builder')
+        await self.session_manager.clear_session_and_attempt(story_attempt.student_id, story_attempt.vocabulary_list_id, 'story_builder')
     
     async def confirm_story_completion(
         self,
@@ -2426,6 +2532,10 @@ class VocabularyPracticeService:
                 if len(completed_subtypes) >= 3:
                     student_assignment.status = "completed"
         
+        # First completions create the record, so both branches change the status
+        await self.session_manager.invalidate_status(student_id, assignment_id)
+        schedule_rollup_refresh(student_id, "umavocab")
+        
         return student_assignment
     
     # Fill-in-the-Blank Methods
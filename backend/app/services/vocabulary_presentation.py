@@ -0,0 +1,137 @@
+"""
+Versioned render cache for vocabulary presentation decks
+
+A deck's version is derived from one aggregate query over the list and its
+words (list updated_at, word count, newest word updated_at) plus the
+template digest, so any edit produces a new version without explicit
+invalidation. Rendered decks are stored gzipped in Redis under that version
+and double as the HTTP ETag, letting browsers revalidate with a 304 before
+any words are loaded.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import redis_client
+from app.models.vocabulary import VocabularyList, VocabularyWord, VocabularyStatus
+from app.services.vocabulary import VocabularyService, PRESENTATION_TEMPLATE_DIGEST
+
+logger = logging.getLogger(__name__)
+
+# Old versions are never read again, so the TTL only bounds memory
+PRESENTATION_CACHE_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class PresentationVersion:
+    """What the export endpoint needs to authorize and revalidate a deck"""
+    list_id: UUID
+    teacher_id: UUID
+    status: VocabularyStatus
+    title: str
+    word_count: int
+    last_modified: datetime
+    etag: str
+
+    @property
+    def cache_key(self) -> str:
+        return f"vocab:presentation:{self.list_id}:{self.etag}"
+
+
+# Renders in flight in this worker, so a class opening the deck at once renders it once
+_renders: Dict[str, asyncio.Future] = {}
+
+
+async def get_presentation_version(db: AsyncSession, list_id: UUID) -> Optional[PresentationVersion]:
+    """Fingerprint a list without loading its words"""
+    result = await db.execute(
+        select(
+            VocabularyList.teacher_id,
+            VocabularyList.status,
+            VocabularyList.title,
+            VocabularyList.updated_at,
+            func.count(VocabularyWord.id).label("word_count"),
+            func.max(VocabularyWord.updated_at).label("words_updated_at")
+        )
+        .outerjoin(VocabularyWord, VocabularyWord.list_id == VocabularyList.id)
+        .where(
+            VocabularyList.id == list_id,
+            VocabularyList.deleted_at.is_(None)
+        )
+        .group_by(VocabularyList.id)
+    )
+    row = result.first()
+    if not row:
+        return None
+
+    last_modified = max(ts for ts in (row.updated_at, row.words_updated_at) if ts is not None)
+    fingerprint = (
+        f"{list_id}:{row.updated_at.isoformat()}:{row.word_count}:"
+        f"{row.words_updated_at.isoformat() if row.words_updated_at else ''}:"
+        f"{PRESENTATION_TEMPLATE_DIGEST}"
+    )
+
+    return PresentationVersion(
+        list_id=list_id,
+        teacher_id=row.teacher_id,
+        status=row.status,
+        title=row.title,
+        word_count=row.word_count,
+        last_modified=last_modified,
+        etag=hashlib.sha1(fingerprint.encode()).hexdigest()[:20]
+    )
+
+
+async def _render_gzipped(db: AsyncSession, version: PresentationVersion) -> bytes:
+    vocabulary_list = await VocabularyService.get_vocabulary_list(db, version.list_id, include_words=True)
+    html_content = await VocabularyService.generate_presentation_html(vocabulary_list)
+    body = gzip.compress(html_content.encode("utf-8"), compresslevel=6)
+
+    try:
+        # The Redis client decodes responses, so the bytes are stored base64-encoded
+        await redis_client.set_with_expiry(
+            version.cache_key,
+            base64.b64encode(body).decode("ascii"),
+            PRESENTATION_CACHE_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache vocabulary presentation {version.list_id}: {e}")
+
+    return body
+
+
+async def get_presentation_gzip(db: AsyncSession, version: PresentationVersion) -> bytes:
+    """Return the gzipped deck for this version, rendering it only on a cache miss"""
+    try:
+        cached = await redis_client.get(version.cache_key)
+        if cached:
+            return base64.b64decode(cached)
+    except Exception as e:
+        logger.warning(f"Failed to read cached vocabulary presentation {version.list_id}: {e}")
+
+    pending = _renders.get(version.cache_key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _renders[version.cache_key] = future
+    try:
+        body = await _render_gzipped(db, version)
+        future.set_result(body)
+        return body
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so an unawaited failure does not log a warning
+        future.exception()
+        raise
+    finally:
+        _renders.pop(version.cache_key, None)
@@ -1,12 +1,18 @@
 """
 Vocabulary Puzzle Evaluator Service
-Evaluates student puzzle responses using AI and rule-based methods
+Evaluates student puzzle responses using rule-based methods
 """
-import json
 import logging
-import os
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional
+
+from app.services.vocabulary_lexicon import (
+    RelatedForms,
+    damerau_levenshtein,
+    normalize,
+    same_lemma,
+    spelling_tolerance,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +20,10 @@ logger = logging.getLogger(__name__)
 class VocabularyPuzzleEvaluator:
     """Service for evaluating student puzzle responses"""
     
-    def __init__(self):
-        pass
-    
+    def __init__(self, related_forms: Optional[RelatedForms] = None):
+        # Related words from the puzzle's vocabulary list, see vocabulary_lexicon
+        self.related_forms = related_forms or RelatedForms()
+
     async def evaluate_puzzle_response(
         self,
         puzzle_type: str,
@@ -105,7 +112,7 @@ class VocabularyPuzzleEvaluator:
             return {
                 'score': 1,
                 'accuracy': 'incorrect',
-                'feedback': f"Not quite. The clue points to '{correct}'.",
+                'feedback': self._near_miss_feedback(student, correct) or f"Not quite. The clue points to '{correct}'.",
                 'areas_checked': ['clue_comprehension']
             }
     
@@ -162,93 +169,29 @@ class VocabularyPuzzleEvaluator:
             return {
                 'score': 1,
                 'accuracy': 'incorrect',
-                'feedback': f"Not quite. The correct word is '{word}'.",
+                'feedback': self._near_miss_feedback(student, correct) or f"Not quite. The correct word is '{word}'.",
                 'areas_checked': ['context_understanding']
             }
     
+    def _near_miss_feedback(self, student: str, correct: str) -> Optional[str]:
+        """Feedback for answers that are a form or a misspelling of the right word"""
+        if same_lemma(student, correct):
+            return f"You have the right word! Check its form - the answer is '{correct}'."
+        if self._is_close_spelling(student, correct):
+            return f"Very close! Check your spelling - the answer is '{correct}'."
+        if self.related_forms.are_related(student, correct):
+            return f"Good thinking - '{student}' is related, but the answer is '{correct}'."
+        return None
+
     def _is_close_spelling(self, student_answer: str, correct_answer: str) -> bool:
         """Check if student answer is close in spelling to correct answer"""
         
-        if len(student_answer) != len(correct_answer):
-            return False
-        
-        # Count character differences
-        differences = sum(1 for s, c in zip(student_answer, correct_answer) if s != c)
-        
-        # Allow 1-2 character differences for words longer than 3 characters
-        if len(correct_answer) > 3:
-            return differences <= 2
-        else:
-            return differences <= 1
-    
-    async def _is_related_word(self, student_answer: str, correct_answer: str, grade_level: str) -> bool:
-        """Check if student answer is semantically related using AI"""
-        
-        if len(student_answer) < 2:
-            return False
-        
-        prompt = f"""Are these two words related in meaning for a {grade_level} grade student?
-
-Word 1: {student_answer}
-Word 2: {correct_answer}
-
-Consider if they are:
-- Synonyms or near-synonyms
-- Words that could be confused for each other
-- Related concepts that a student might mix up
-
-Respond with only "YES" or "NO"."""
-
-        try:
-            import google.generativeai as genai
-            
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
-            
-            result = response.text.strip().upper()
-            return result == "YES"
-            
-        except Exception as e:
-            logger.error(f"Error checking word relationship: {e}")
-            # Fallback: very basic check
-            return student_answer in correct_answer or correct_answer in student_answer
-    
-    async def _fits_context(self, student_answer: str, sentence: str, grade_level: str) -> bool:
-        """Check if the student answer fits grammatically in the sentence"""
-        
-        if len(student_answer) < 2:
-            return False
-        
-        # Replace blank with student answer
-        filled_sentence = sentence.replace("___", student_answer)
-        
-        prompt = f"""Does this sentence make grammatical sense for a {grade_level} grade level?
-
-Sentence: {filled_sentence}
-
-Consider:
-- Grammar correctness
-- Logical meaning
-- Age-appropriate language
+        # Allow 1-2 edits (insert, delete, substitute, swap) for words longer than 3 characters
+        max_distance = spelling_tolerance(correct_answer)
+        return damerau_levenshtein(
+            normalize(student_answer), normalize(correct_answer), max_distance
+        ) <= max_distance
 
-Respond with only "YES" or "NO"."""
-
-        try:
-            import google.generativeai as genai
-            
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
-            
-            result = response.text.strip().upper()
-            return result == "YES"
-            
-        except Exception as e:
-            logger.error(f"Error checking context fit: {e}")
-            # Fallback: basic word length and alphabet check
-            return len(student_answer) > 2 and student_answer.isalpha()
-    
     def validate_student_input(
         self,
         puzzle_type: str,
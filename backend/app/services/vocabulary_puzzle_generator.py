@@ -14,6 +14,9 @@ from sqlalchemy.orm import selectinload
 from uuid import UUID
 
 from app.models.vocabulary import VocabularyList, VocabularyWord
+from app.config.ai_config import configure_gemini
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
+from app.core.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -320,9 +323,11 @@ Return only the context hint, nothing else."""
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_hint", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             hint = response.text.strip()
             # Clean up any quotes or extra formatting
@@ -355,9 +360,11 @@ Return only the sentence with the blank, nothing else."""
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_sentence", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             sentence = response.text.strip()
             
@@ -401,9 +408,11 @@ Return your response in this exact JSON format:
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_multiple_choice", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             response_text = response.text.strip()
             
@@ -483,9 +492,11 @@ Return only the context hint, nothing else."""
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_hint", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             hint = response.text.strip()
             # Clean up any quotes or extra formatting
@@ -518,9 +529,11 @@ Return only the sentence with the blank, nothing else."""
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_sentence", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             sentence = response.text.strip()
             
@@ -564,9 +577,11 @@ Return your response in this exact JSON format:
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-            model = genai.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+            model = genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
+            with ai_telemetry.track("vocab_puzzle_multiple_choice", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = model.generate_content(prompt)
+                call.record_response(response)
             
             response_text = response.text.strip()
             
@@ -1,9 +1,15 @@
 """
 Vocabulary Practice Session Manager
 Manages student sessions using Redis for active sessions and database for persistence
+
+All state for one (user, assignment) lives in a single Redis hash with one
+TTL, so reads and writes touching several fields are a single round-trip.
+A per-user index set lists the user's state hashes so they can be cleared
+without scanning the keyspace.
 """
 import json
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 from datetime import datetime, timezone
@@ -12,148 +18,184 @@ from app.core.redis import get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# One TTL for the whole hash, refreshed on every write
+SESSION_TTL_SECONDS = 7200
+
+# Hash fields
+ACTIVITY_FIELD = "activity"
+SESSION_FIELD = "session"
+PROGRESS_FIELD = "progress"
+STATUS_FIELD = "status"
+ATTEMPT_FIELD_PREFIX = "attempt:"
+
+# How long get_practice_status may reuse cached completion and test state
+STATUS_CACHE_SECONDS = 60
+
+# Sorted set of state keys scored by last activity, for monitoring
+ACTIVE_SESSIONS_KEY = "vocab:active"
+
+# Per-list time before which cached statuses are void (teacher changed settings)
+STATUS_RESET_KEY_PREFIX = "vocab:status_reset"
+
 
 class VocabularySessionManager:
     """Manages vocabulary practice sessions using Redis for active state"""
-    
+
     def __init__(self):
         try:
             self.redis = get_redis_client()
         except Exception as e:
             logger.warning(f"Redis client not available: {e}")
             self.redis = None
-    
-    # Session State Keys
-    def _activity_key(self, user_id: UUID, assignment_id: UUID) -> str:
-        """Key for tracking last activity"""
-        return f"vocab:activity:{user_id}:{assignment_id}"
-    
-    def _session_key(self, user_id: UUID, assignment_id: UUID) -> str:
-        """Key for storing current game session"""
-        return f"vocab:session:{user_id}:{assignment_id}"
-    
-    def _progress_key(self, user_id: UUID, assignment_id: UUID) -> str:
-        """Key for storing progress state"""
-        return f"vocab:progress:{user_id}:{assignment_id}"
-    
-    def _attempt_key(self, user_id: UUID, assignment_id: UUID, activity_type: str) -> str:
-        """Key for storing current attempt info"""
-        return f"vocab:attempt:{user_id}:{assignment_id}:{activity_type}"
-    
+
+    # Keys
+    def _state_key(self, user_id: UUID, assignment_id: UUID) -> str:
+        """Hash holding activity, session, progress and attempt state"""
+        return f"vocab:state:{user_id}:{assignment_id}"
+
+    def _user_index_key(self, user_id: UUID) -> str:
+        """Set of state keys belonging to a user"""
+        return f"vocab:user:{user_id}"
+
+    def _attempt_field(self, activity_type: str) -> str:
+        return f"{ATTEMPT_FIELD_PREFIX}{activity_type}"
+
+    async def _write(
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
+        fields: Dict[str, Any],
+        if_absent: Optional[Dict[str, Any]] = None,
+        read_back: Optional[str] = None
+    ) -> Optional[Any]:
+        """Write fields plus a fresh activity timestamp in one pipelined round-trip
+
+        Values are JSON encoded; ``if_absent`` fields are only set when the
+        hash does not already hold them. If ``read_back`` names a field, its
+        value after the write is returned.
+        """
+        key = self._state_key(user_id, assignment_id)
+        index_key = self._user_index_key(user_id)
+        mapping = {name: json.dumps(value, default=str) for name, value in fields.items()}
+        mapping[ACTIVITY_FIELD] = datetime.now(timezone.utc).isoformat()
+
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping=mapping)
+        for name, value in (if_absent or {}).items():
+            pipe.hsetnx(key, name, json.dumps(value, default=str))
+        pipe.expire(key, SESSION_TTL_SECONDS)
+        pipe.sadd(index_key, key)
+        pipe.expire(index_key, SESSION_TTL_SECONDS)
+        now = time.time()
+        pipe.zadd(ACTIVE_SESSIONS_KEY, {key: now})
+        pipe.zremrangebyscore(ACTIVE_SESSIONS_KEY, "-inf", now - SESSION_TTL_SECONDS)
+        if read_back:
+            pipe.hget(key, read_back)
+        results = await pipe.execute()
+
+        if read_back and results[-1]:
+            return json.loads(results[-1])
+        return None
+
+    async def _read(self, user_id: UUID, assignment_id: UUID, field: str) -> Optional[Any]:
+        value = await self.redis.hget(self._state_key(user_id, assignment_id), field)
+        return json.loads(value) if value else None
+
     # Activity Tracking
     async def update_activity(self, user_id: UUID, assignment_id: UUID) -> None:
         """Update last activity timestamp"""
         if not self.redis:
             return
         try:
-            timestamp = datetime.now(timezone.utc).isoformat()
-            await self.redis.setex(
-                self._activity_key(user_id, assignment_id),
-                3600,  # 1 hour TTL
-                timestamp
-            )
+            await self._write(user_id, assignment_id, {})
         except Exception as e:
             logger.error(f"Failed to update activity: {e}")
-    
+
     async def get_last_activity(self, user_id: UUID, assignment_id: UUID) -> Optional[datetime]:
         """Get last activity timestamp"""
         if not self.redis:
             return None
         try:
-            timestamp_str = await self.redis.get(self._activity_key(user_id, assignment_id))
+            timestamp_str = await self.redis.hget(self._state_key(user_id, assignment_id), ACTIVITY_FIELD)
             if timestamp_str:
                 return datetime.fromisoformat(timestamp_str)
             return None
         except Exception as e:
             logger.error(f"Failed to get last activity: {e}")
             return None
-    
+
     # Session Management
     async def set_current_session(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         session_data: Dict[str, Any]
     ) -> None:
         """Store current session data in Redis"""
         if not self.redis:
             return
         try:
-            session_json = json.dumps(session_data, default=str)
-            await self.redis.setex(
-                self._session_key(user_id, assignment_id),
-                3600,  # 1 hour TTL
-                session_json
-            )
-            await self.update_activity(user_id, assignment_id)
+            await self._write(user_id, assignment_id, {SESSION_FIELD: session_data})
         except Exception as e:
             logger.error(f"Failed to set session: {e}")
-    
+
     async def get_current_session(
-        self, 
-        user_id: UUID, 
+        self,
+        user_id: UUID,
         assignment_id: UUID
     ) -> Optional[Dict[str, Any]]:
         """Get current session data from Redis"""
         if not self.redis:
             return None
         try:
-            session_json = await self.redis.get(self._session_key(user_id, assignment_id))
-            if session_json:
-                return json.loads(session_json)
-            return None
+            return await self._read(user_id, assignment_id, SESSION_FIELD)
         except Exception as e:
             logger.error(f"Failed to get session: {e}")
             return None
-    
+
     async def clear_session(self, user_id: UUID, assignment_id: UUID) -> None:
         """Clear session data from Redis"""
         if not self.redis:
             return
         try:
-            await self.redis.delete(self._session_key(user_id, assignment_id))
+            await self.redis.hdel(self._state_key(user_id, assignment_id), SESSION_FIELD)
         except Exception as e:
             logger.error(f"Failed to clear session: {e}")
-    
+
     # Progress State
     async def set_progress_state(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         progress_data: Dict[str, Any]
     ) -> None:
         """Store progress state in Redis"""
+        if not self.redis:
+            return
         try:
-            progress_json = json.dumps(progress_data, default=str)
-            await self.redis.setex(
-                self._progress_key(user_id, assignment_id),
-                7200,  # 2 hours TTL for progress state
-                progress_json
-            )
-            await self.update_activity(user_id, assignment_id)
+            await self._write(user_id, assignment_id, {PROGRESS_FIELD: progress_data})
         except Exception as e:
             logger.error(f"Failed to set progress state: {e}")
-    
+
     async def get_progress_state(
-        self, 
-        user_id: UUID, 
+        self,
+        user_id: UUID,
         assignment_id: UUID
     ) -> Optional[Dict[str, Any]]:
         """Get progress state from Redis"""
-        try:
-            progress_json = await self.redis.get(self._progress_key(user_id, assignment_id))
-            if progress_json:
-                return json.loads(progress_json)
+        if not self.redis:
             return None
+        try:
+            return await self._read(user_id, assignment_id, PROGRESS_FIELD)
         except Exception as e:
             logger.error(f"Failed to get progress state: {e}")
             return None
-    
+
     # Attempt Tracking
     async def set_current_attempt(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         activity_type: str,
         attempt_data: Dict[str, Any]
     ) -> None:
@@ -161,101 +203,218 @@ class VocabularySessionManager:
         if not self.redis:
             return
         try:
-            attempt_json = json.dumps(attempt_data, default=str)
-            await self.redis.setex(
-                self._attempt_key(user_id, assignment_id, activity_type),
-                3600,  # 1 hour TTL
-                attempt_json
-            )
-            await self.update_activity(user_id, assignment_id)
+            await self._write(user_id, assignment_id, {self._attempt_field(activity_type): attempt_data})
         except Exception as e:
             logger.error(f"Failed to set attempt: {e}")
-    
+
+    async def set_session_and_attempt(
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
+        session_data: Dict[str, Any],
+        activity_type: str,
+        attempt_data: Dict[str, Any]
+    ) -> None:
+        """Store the current session and attempt together in one round-trip"""
+        if not self.redis:
+            return
+        try:
+            await self._write(user_id, assignment_id, {
+                SESSION_FIELD: session_data,
+                self._attempt_field(activity_type): attempt_data
+            })
+        except Exception as e:
+            logger.error(f"Failed to set session and attempt: {e}")
+
     async def get_current_attempt(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         activity_type: str
     ) -> Optional[Dict[str, Any]]:
         """Get current attempt data from Redis"""
         if not self.redis:
             return None
         try:
-            attempt_json = await self.redis.get(self._attempt_key(user_id, assignment_id, activity_type))
-            if attempt_json:
-                return json.loads(attempt_json)
-            return None
+            return await self._read(user_id, assignment_id, self._attempt_field(activity_type))
         except Exception as e:
             logger.error(f"Failed to get attempt: {e}")
             return None
-    
+
     async def clear_attempt(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         activity_type: str
     ) -> None:
         """Clear current attempt data from Redis"""
         if not self.redis:
             return
         try:
-            await self.redis.delete(self._attempt_key(user_id, assignment_id, activity_type))
+            await self.redis.hdel(self._state_key(user_id, assignment_id), self._attempt_field(activity_type))
         except Exception as e:
             logger.error(f"Failed to clear attempt: {e}")
-    
+
+    async def clear_session_and_attempt(
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
+        activity_type: str
+    ) -> None:
+        """Clear the current session and an activity's attempt in one round-trip"""
+        if not self.redis:
+            return
+        try:
+            await self.redis.hdel(
+                self._state_key(user_id, assignment_id),
+                SESSION_FIELD,
+                self._attempt_field(activity_type)
+            )
+        except Exception as e:
+            logger.error(f"Failed to clear session and attempt: {e}")
+
     # Session Restoration
     async def restore_session_from_db(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         db_session_data: Optional[Dict[str, Any]]
     ) -> None:
         """Restore session state from database to Redis"""
         if db_session_data:
             await self.set_current_session(user_id, assignment_id, db_session_data)
-    
+
     async def restore_progress_from_db(
-        self, 
-        user_id: UUID, 
-        assignment_id: UUID, 
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
         db_progress_data: Dict[str, Any]
     ) -> None:
         """Restore progress state from database to Redis"""
         await self.set_progress_state(user_id, assignment_id, db_progress_data)
-    
+
+    async def restore_from_db(
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
+        db_session_data: Optional[Dict[str, Any]],
+        db_progress_data: Dict[str, Any],
+        status: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Touch activity, refresh progress and restore the session if Redis lost it
+
+        Replaces the update_activity / get_current_session /
+        restore_session_from_db / restore_progress_from_db sequence with a
+        single pipelined round-trip. ``status`` caches practice status facts
+        (see get_cached_status). Returns the current session, or the database
+        copy if Redis is unavailable.
+        """
+        if not self.redis:
+            return db_session_data or None
+        fields = {PROGRESS_FIELD: db_progress_data}
+        if status is not None:
+            # A status read from the cache keeps its age, so the TTL cannot slide
+            fields[STATUS_FIELD] = {**status, "cached_at": status.get("cached_at", time.time())}
+        try:
+            return await self._write(
+                user_id,
+                assignment_id,
+                fields,
+                if_absent={SESSION_FIELD: db_session_data} if db_session_data else None,
+                read_back=SESSION_FIELD
+            )
+        except Exception as e:
+            logger.error(f"Failed to restore session state: {e}")
+            return None
+
+    # Practice Status Cache
+    async def get_cached_status(
+        self,
+        user_id: UUID,
+        assignment_id: UUID,
+        classroom_assignment_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get cached activity completion and test state if still fresh"""
+        if not self.redis:
+            return None
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hget(self._state_key(user_id, assignment_id), STATUS_FIELD)
+            pipe.get(f"{STATUS_RESET_KEY_PREFIX}:{assignment_id}")
+            status, reset_at = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to get cached status: {e}")
+            return None
+        if not status:
+            return None
+        status = json.loads(status)
+        cached_at = status.get("cached_at", 0)
+        if (
+            status.get("classroom_assignment_id") != classroom_assignment_id
+            or time.time() - cached_at > STATUS_CACHE_SECONDS
+            or (reset_at and cached_at <= float(reset_at))
+        ):
+            return None
+        return status
+
+    async def invalidate_status(self, user_id: UUID, assignment_id: UUID) -> None:
+        """Drop cached practice status after an activity or test completes"""
+        if not self.redis:
+            return
+        try:
+            await self.redis.hdel(self._state_key(user_id, assignment_id), STATUS_FIELD)
+        except Exception as e:
+            logger.error(f"Failed to invalidate status: {e}")
+
+    async def invalidate_list_status(self, assignment_id: UUID) -> None:
+        """Void every student's cached practice status for a list after its settings change"""
+        if not self.redis:
+            return
+        try:
+            # Statuses expire after STATUS_CACHE_SECONDS anyway, so the marker can too
+            await self.redis.set_with_expiry(
+                f"{STATUS_RESET_KEY_PREFIX}:{assignment_id}", str(time.time()), STATUS_CACHE_SECONDS + 1
+            )
+        except Exception as e:
+            logger.error(f"Failed to invalidate list status: {e}")
+
     # Cleanup
     async def clear_all_session_data(self, user_id: UUID, assignment_id: UUID) -> None:
         """Clear all session data for an assignment"""
+        if not self.redis:
+            return
         try:
-            keys_to_delete = [
-                self._activity_key(user_id, assignment_id),
-                self._session_key(user_id, assignment_id),
-                self._progress_key(user_id, assignment_id),
-                # Clear all activity type attempts
-                self._attempt_key(user_id, assignment_id, "vocabulary_challenge"),
-                self._attempt_key(user_id, assignment_id, "story_builder"),
-                self._attempt_key(user_id, assignment_id, "concept_mapping"),
-                self._attempt_key(user_id, assignment_id, "puzzle_path"),
-            ]
-            
-            # Only delete keys that exist
-            existing_keys = []
-            for key in keys_to_delete:
-                if await self.redis.exists(key):
-                    existing_keys.append(key)
-            
-            if existing_keys:
-                await self.redis.delete(*existing_keys)
-                
+            key = self._state_key(user_id, assignment_id)
+            pipe = self.redis.pipeline()
+            pipe.delete(key)
+            pipe.srem(self._user_index_key(user_id), key)
+            pipe.zrem(ACTIVE_SESSIONS_KEY, key)
+            await pipe.execute()
         except Exception as e:
             logger.error(f"Failed to clear session data: {e}")
-    
+
+    async def clear_all_user_sessions(self, user_id: UUID) -> int:
+        """Clear every vocabulary session for a user; returns the number of sessions cleared"""
+        if not self.redis:
+            return 0
+        index_key = self._user_index_key(user_id)
+        keys: List[str] = list(await self.redis.smembers(index_key))
+        pipe = self.redis.pipeline()
+        if keys:
+            pipe.delete(*keys)
+            pipe.zrem(ACTIVE_SESSIONS_KEY, *keys)
+        pipe.delete(index_key)
+        results = await pipe.execute()
+        return results[0] if keys else 0
+
     # Monitoring
     async def get_active_sessions_count(self) -> int:
         """Get count of active vocabulary sessions"""
+        if not self.redis:
+            return 0
         try:
-            cursor, keys = await self.redis.scan(0, match="vocab:activity:*", count=1000)
-            return len(keys)
+            cutoff = time.time() - SESSION_TTL_SECONDS
+            return await self.redis.zcount(ACTIVE_SESSIONS_KEY, cutoff, "+inf")
         except Exception as e:
             logger.error(f"Failed to get active sessions count: {e}")
-            return 0
\ No newline at end of file
+            return 0
@@ -4,10 +4,12 @@ Evaluates student stories for vocabulary usage, coherence, tone, and creativity
 """
 import re
 import json
+from functools import cached_property
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
-from app.config.ai_config import get_gemini_config
-import google.generativeai as genai
+from app.config.ai_config import get_gemini_config, configure_gemini
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
+from app.core.ai_telemetry import ai_telemetry
 import asyncio
 import logging
 
@@ -23,15 +25,21 @@ class VocabularyStoryEvaluator:
     TONE_WEIGHT = 0.20        # 20 points
     CREATIVITY_WEIGHT = 0.15  # 15 points
     
-    def __init__(self):
+    def __init__(self, gemini_model=None):
         self.gemini_config = get_gemini_config()
-        
-        # Initialize Gemini if API key is available
-        if self.gemini_config.api_key:
-            genai.configure(api_key=self.gemini_config.api_key)
-            self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-        else:
-            self.gemini_model = None
+        if gemini_model is not None:
+            # Shared long-lived client, see VocabularyEvaluationService
+            self.gemini_model = gemini_model
+
+    @cached_property
+    def gemini_model(self):
+        """Gemini model if an API key is set; the SDK is imported on first use"""
+        if not self.gemini_config.api_key:
+            return None
+        import google.generativeai as genai
+        
+        configure_gemini(self.gemini_config.api_key)
+        return genai.GenerativeModel(GEMINI_DEFAULT_MODEL)
     
     async def evaluate_story(
         self,
@@ -63,24 +71,33 @@ class VocabularyStoryEvaluator:
     ) -> Dict[str, Any]:
         """Evaluate story using AI service"""
         
-        prompt = self._build_evaluation_prompt(story_text, required_words, setting, tone)
-        
         try:
-            # Call AI service
-            ai_response = await self._call_ai_api(prompt)
-            
-            # Parse AI response
-            evaluation = self._parse_ai_evaluation(ai_response, max_score)
-            
-            # Validate and adjust scores
-            evaluation = self._validate_scores(evaluation, story_text, required_words, max_score)
-            
-            return evaluation
-            
+            return await self.evaluate_story_with_ai(story_text, required_words, setting, tone, max_score)
         except Exception as e:
             logger.error(f"AI evaluation failed: {e}")
             return await self._template_evaluate_story(story_text, required_words, setting, tone, max_score)
     
+    async def evaluate_story_with_ai(
+        self,
+        story_text: str,
+        required_words: List[str],
+        setting: str,
+        tone: str,
+        max_score: int = 100
+    ) -> Dict[str, Any]:
+        """AI verdict for a story; raises instead of falling back to the template"""
+        
+        prompt = self._build_evaluation_prompt(story_text, required_words, setting, tone)
+        
+        # Call AI service
+        ai_response = await self._call_ai_api(prompt)
+        
+        # Parse AI response
+        evaluation = self._parse_ai_evaluation(ai_response, max_score)
+        
+        # Validate and adjust scores
+        return self._validate_scores(evaluation, story_text, required_words, max_score)
+    
     async def _template_evaluate_story(
         self,
         story_text: str,
@@ -366,7 +383,7 @@ SUGGESTION: [one specific revision suggestion]"""
             if not self.gemini_config.api_key:
                 raise Exception("Gemini API key not configured")
             
-            logger.debug(f"Calling Gemini API with model: gemini-2.0-flash")
+            logger.debug(f"Calling Gemini API with model: {GEMINI_DEFAULT_MODEL}")
             
             # Configure generation settings for consistent evaluation
             generation_config = {
@@ -375,15 +392,14 @@ SUGGESTION: [one specific revision suggestion]"""
                 "top_p": 0.95,
             }
             
-            # Generate response in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.gemini_model.generate_content(
+            # Generate response in a worker thread to avoid blocking
+            with ai_telemetry.track("vocab_story_evaluation", GEMINI_DEFAULT_MODEL, prompt) as call:
+                response = await asyncio.to_thread(
+                    self.gemini_model.generate_content,
                     prompt,
                     generation_config=generation_config
                 )
-            )
+                call.record_response(response)
             
             if response.text:
                 logger.info("Gemini API call successful")
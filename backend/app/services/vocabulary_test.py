@@ -16,6 +16,8 @@ from sqlalchemy.orm import selectinload
 from app.models.vocabulary import VocabularyList, VocabularyWord
 from app.models.classroom import ClassroomAssignment
 from app.services.ai_vocabulary_evaluator import AIVocabularyEvaluator
+from app.services.student_analytics import schedule_rollup_refresh
+from app.services.vocabulary_session import VocabularySessionManager
 
 logger = logging.getLogger(__name__)
 
@@ -736,6 +738,8 @@ class VocabularyTestService:
         )
         
         await db.commit()
+        await VocabularySessionManager().invalidate_status(attempt_data.student_id, attempt_data.vocabulary_list_id)
+        schedule_rollup_refresh(attempt_data.student_id, "umavocab")
         
         return {
             "test_attempt_id": test_attempt_id,
@@ -42,7 +42,7 @@ class WritingAIService:
         # Get AI evaluation
         try:
             logger.info("Calling AI for evaluation...")
-            response = await get_ai_response(prompt, max_tokens=2000)
+            response = await get_ai_response(prompt, max_tokens=2000, feature="writing_evaluation")
             logger.info(f"Received AI evaluation response: {len(response)} chars")
             
             # Parse the JSON response
@@ -1,20 +1,31 @@
 """
 AI Helper for debate responses using Google Gemini
 """
-import google.generativeai as genai
 from typing import Optional
 import logging
 import asyncio
-from app.config.ai_config import get_gemini_config
+from app.config.ai_config import get_gemini_config, configure_gemini
+from app.config.ai_models import GEMINI_DEFAULT_MODEL
+from app.core.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
-# Initialize Gemini
-config = get_gemini_config()
-genai.configure(api_key=config.api_key)
-model = genai.GenerativeModel('gemini-2.0-flash')
+MODEL_NAME = GEMINI_DEFAULT_MODEL
 
-async def get_ai_response(prompt: str, max_tokens: int = 300, timeout: int = 30) -> str:
+_model = None
+
+
+def _get_model():
+    """Configure Gemini and build the model on first use rather than at import"""
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+        
+        configure_gemini(get_gemini_config().api_key)
+        _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
+
+async def get_ai_response(prompt: str, max_tokens: int = 300, timeout: int = 30, feature: str = "ai_helper") -> str:
     """
     Generate AI response using Google Gemini with timeout.
     
@@ -22,11 +33,14 @@ async def get_ai_response(prompt: str, max_tokens: int = 300, timeout: int = 30)
         prompt: The prompt for AI generation
         max_tokens: Maximum tokens to generate
         timeout: Timeout in seconds (default 30)
+        feature: Feature name recorded in AI call telemetry
     """
     try:
+        model = _get_model()
+        
         # Configure generation settings
         generation_config = {
-            "temperature": config.temperature,
+            "temperature": get_gemini_config().temperature,
             "max_output_tokens": max_tokens,
             "top_p": 0.95,
         }
@@ -36,16 +50,18 @@ async def get_ai_response(prompt: str, max_tokens: int = 300, timeout: int = 30)
         
         # Create the generation task with timeout
         try:
-            response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: model.generate_content(
-                        prompt,
-                        generation_config=generation_config
-                    )
-                ),
-                timeout=timeout
-            )
+            with ai_telemetry.track(feature, MODEL_NAME, prompt) as call:
+                response = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        None,
+                        lambda: model.generate_content(
+                            prompt,
+                            generation_config=generation_config
+                        )
+                    ),
+                    timeout=timeout
+                )
+                call.record_response(response)
         except asyncio.TimeoutError:
             logger.error(f"AI response generation timed out after {timeout} seconds")
             raise TimeoutError(f"AI response generation timed out after {timeout} seconds")
@@ -0,0 +1,56 @@
+"""
+Conditional GET helpers
+
+Routes serving content that rarely changes compute a strong ETag from a cheap
+version check (timestamps, counts), and answer ``If-None-Match`` with a 304
+before loading the content itself.
+
+Usage:
+
+    etag = make_etag("chunk", assignment_id, chunk_number, version.updated_at)
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    ...build and return the full body as usual...
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Per-user content: the browser keeps it but revalidates on every use
+PRIVATE_REVALIDATE = "private, no-cache"
+
+# Reference data that is the same for everyone; shared caches may keep it briefly
+PUBLIC_SHORT = "public, max-age=300, stale-while-revalidate=3600"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted strong ETag from the values that determine a response"""
+    digest = hashlib.sha1("|".join("" if p is None else str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = PRIVATE_REVALIDATE
+) -> Optional[Response]:
+    """Attach validators to the outgoing response; return a 304 if the client's copy is current"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
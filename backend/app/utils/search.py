@@ -0,0 +1,41 @@
+"""
+Trigram-indexed text search for list endpoints
+
+The searched columns carry ``gin_trgm_ops`` GIN indexes (see the
+add_trigram_search_indexes migration). ``ILIKE '%term%'`` on such a column is
+answered from its index, and an OR over several indexed columns becomes a
+BitmapOr of index scans, so search cost follows the number of matches rather
+than the size of the table. Results are ranked by pg_trgm ``word_similarity``:
+the closest match in any searched column first.
+
+Usage:
+
+    columns = (DebateAssignment.title, DebateAssignment.topic)
+    query = query.where(search_condition(search, *columns))
+    query = query.order_by(search_rank(search, *columns).desc(), DebateAssignment.created_at.desc())
+"""
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.user import User
+
+# "first last", written exactly like the expression index on users so the
+# planner can match it; also covers searches for either name alone
+USER_FULL_NAME = User.first_name + literal_column("' '") + User.last_name
+
+
+def escape_like(term: str) -> str:
+    """Make LIKE wildcards in user input match literally (backslash is Postgres' default escape)"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_condition(term: str, *columns) -> ColumnElement:
+    """Case-insensitive substring match on any of the columns"""
+    pattern = f"%{escape_like(term.strip())}%"
+    return or_(*(column.ilike(pattern) for column in columns))
+
+
+def search_rank(term: str, *columns) -> ColumnElement:
+    """Best trigram word similarity of the term to any of the columns (NULL columns are skipped)"""
+    term = term.strip()
+    return func.greatest(*(func.word_similarity(term, column) for column in columns))
@@ -1,15 +1,24 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
+import secrets
+from typing import Optional
 from dotenv import load_dotenv
 
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.api.v1 import auth_supabase as auth, admin_simple as admin, teacher, student, umaread_simple as umaread, tests, umaread_hybrid, student_tests, teacher_settings, test_schedule, student_debate, writing, umalecture, teacher_umatest, student_umatest
 from app.core.redis import redis_client
+from app.core.responses import FastJSONResponse
+from app.core.ai_telemetry import ai_telemetry
+from app.core.preload import preload_clients
+from app.services.moderation_lexicon import moderation_lexicon
+from app.services.event_buffer import event_buffer
 
 load_dotenv()
 
@@ -22,16 +31,27 @@ logging.basicConfig(
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    # Slow imports (AI SDKs, Supabase) load in the background while the worker starts serving
+    preload_task = asyncio.create_task(preload_clients())
     await redis_client.initialize()
+    ai_telemetry.start()
+    moderation_lexicon.start()
+    event_buffer.start()
     yield
     # Shutdown
+    await event_buffer.stop()
+    await moderation_lexicon.stop()
+    await ai_telemetry.stop()
     await redis_client.close()
+    if not preload_task.done():
+        preload_task.cancel()
 
 app = FastAPI(
     title="UmaDex API",
     description="Educational Assignment App API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -73,6 +93,19 @@ async def health_check():
     """Basic health check endpoint"""
     return {"status": "healthy", "service": "umadex-api"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus metrics for AI calls made by this worker (bearer METRICS_TOKEN)"""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(authorization or "", f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return ai_telemetry.render_prometheus()
+
 @app.get("/health/detailed")
 async def detailed_health_check():
     """Detailed health check including database and redis connectivity"""
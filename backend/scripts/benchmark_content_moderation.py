@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for debate content moderation
+
+Times ContentModerationService.analyze_content on a fixed set of posts while
+the compiled word lists grow from the built-in defaults to tens of thousands
+of synthetic terms. Per-post cost should stay roughly flat. No database is
+needed - the lexicon is swapped in directly.
+
+Usage:
+    python scripts/benchmark_content_moderation.py --posts 2000 --sizes 12 1000 10000 50000
+"""
+import argparse
+import asyncio
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.services.content_moderation import ContentModerationService
+from app.services.moderation_lexicon import (
+    DEFAULT_TERMS, SUBSTRING_MATCH, WORD_MATCH, ModerationLexicon, moderation_lexicon
+)
+
+TOPIC = "Schools should start later in the morning"
+
+SENTENCES = [
+    "Schools should start later because teenagers need more sleep in the morning.",
+    "Starting later would push sports and jobs into the evening, which hurts students.",
+    "Research shows that attention in first period improves when school starts after nine.",
+    "Buses would have to run on a different schedule and that costs the district money.",
+    "My older brother says his grades went up when his school changed its start time.",
+]
+
+
+def _synthetic_terms(count: int, rng: random.Random):
+    categories = ["profanity", "inappropriate", "off_topic"]
+    terms = list(DEFAULT_TERMS)
+    while len(terms) < count:
+        term = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+        match_type = SUBSTRING_MATCH if rng.random() < 0.2 else WORD_MATCH
+        terms.append((rng.choice(categories), term, match_type))
+    return terms
+
+
+def _posts(count: int, rng: random.Random):
+    return [" ".join(rng.choices(SENTENCES, k=rng.randint(1, 5))) for _ in range(count)]
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    posts = _posts(args.posts, rng)
+    service = ContentModerationService()
+
+    print(f"{'terms':>8} {'compile ms':>11} {'us/post':>9}")
+    for size in args.sizes:
+        started = time.perf_counter()
+        moderation_lexicon.current = ModerationLexicon(_synthetic_terms(size, rng))
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        # Warm up, then time
+        for post in posts[:50]:
+            await service.analyze_content(post, TOPIC, None)
+        started = time.perf_counter()
+        for post in posts:
+            await service.analyze_content(post, TOPIC, None)
+        per_post_us = (time.perf_counter() - started) / len(posts) * 1_000_000
+
+        print(f"{size:>8} {compile_ms:>11.1f} {per_post_us:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark debate content moderation")
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12, 1000, 10000, 50000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for API response serialization
+
+Renders synthetic versions of our largest payloads - a full gradebook page,
+a generated UMATest detail with its test_structure, and lecture topic content
+with every difficulty level - three ways:
+
+  stdlib   FastAPI's default path: validate against response_model,
+           jsonable_encoder, json.dumps (JSONResponse)
+  orjson   the same validation/encoding pass, rendered by FastJSONResponse
+           (what every route gets from the app-wide default class)
+  direct   the route returns FastJSONResponse itself, skipping the pass
+
+Reports wall time and CPU time per request. No database is needed.
+
+Usage:
+    python scripts/benchmark_json_responses.py --iterations 200
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.v1.teacher_reports import GradebookResponse, GradebookSummary, StudentGrade
+from app.core.responses import FastJSONResponse
+from app.schemas.umatest import LectureInfo, TestDetailResponse
+
+WORDS = (
+    "photosynthesis converts light energy into chemical energy stored in glucose "
+    "the chloroplast contains chlorophyll which absorbs mostly red and blue light"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def gradebook(rng: random.Random, rows: int) -> GradebookResponse:
+    now = datetime.now(timezone.utc)
+    assignment_ids = [uuid.uuid4() for _ in range(20)]
+    grades = [
+        StudentGrade(
+            id=str(uuid.uuid4()),
+            student_id=uuid.uuid4(),
+            student_name=f"Student {i}",
+            assignment_id=rng.choice(assignment_ids),
+            assignment_title=_text(rng, 4),
+            assignment_type=rng.choice(["UMARead", "UMAVocab", "UMADebate", "UMAWrite", "UMATest"]),
+            work_title=_text(rng, 3),
+            date_assigned=now - timedelta(days=rng.randint(1, 60)),
+            date_completed=now - timedelta(days=rng.randint(0, 30)),
+            test_date=now,
+            test_score=round(rng.uniform(40, 100), 1),
+            difficulty_reached=rng.randint(1, 8),
+            time_spent=rng.randint(60, 3600),
+            status="completed"
+        )
+        for i in range(rows)
+    ]
+    return GradebookResponse(
+        grades=grades,
+        summary=GradebookSummary(
+            total_students=rows,
+            average_score=78.5,
+            completion_rate=91.0,
+            average_time=1200.0,
+            class_average_by_assignment={str(aid): rng.uniform(60, 95) for aid in assignment_ids}
+        ),
+        total_count=rows,
+        page=1,
+        page_size=rows
+    )
+
+
+def test_detail(rng: random.Random, lectures: int, topics: int, questions: int) -> TestDetailResponse:
+    now = datetime.now(timezone.utc)
+    lecture_ids = [uuid.uuid4() for _ in range(lectures)]
+    structure: Dict[str, Any] = {"total_questions": 0, "topics": {}}
+    for lecture_id in lecture_ids:
+        for t in range(topics):
+            structure["topics"][f"{lecture_id}_topic_{t}"] = {
+                "topic_title": _text(rng, 4),
+                "source_lecture_id": str(lecture_id),
+                "questions": [
+                    {
+                        "question_text": _text(rng, 20) + "?",
+                        "difficulty_level": rng.choice(["basic", "intermediate", "advanced", "expert"]),
+                        "answer_key": {"correct_answer": _text(rng, 40), "key_points": [_text(rng, 6) for _ in range(3)]}
+                    }
+                    for _ in range(questions)
+                ]
+            }
+            structure["total_questions"] += questions
+    return TestDetailResponse(
+        id=uuid.uuid4(),
+        teacher_id=uuid.uuid4(),
+        test_title="Unit test",
+        test_description=_text(rng, 20),
+        test_type="lecture_based",
+        selected_lecture_ids=lecture_ids,
+        time_limit_minutes=60,
+        attempt_limit=1,
+        randomize_questions=False,
+        show_feedback_immediately=True,
+        status="published",
+        created_at=now,
+        updated_at=now,
+        test_structure=structure,
+        selected_lectures=[
+            LectureInfo(id=lid, title=_text(rng, 3), subject="Science", grade_level="8", topic_count=topics)
+            for lid in lecture_ids
+        ]
+    )
+
+
+def topic_content(rng: random.Random, images: int) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": "photosynthesis",
+        "topic_id": "photosynthesis",
+        "title": "Photosynthesis",
+        "difficulty_levels": {
+            level: {
+                "content": _text(rng, 600),
+                "questions": [
+                    {"question": _text(rng, 15) + "?", "type": "short_answer", "correct_answer": _text(rng, 20)}
+                    for _ in range(5)
+                ]
+            }
+            for level in ("basic", "intermediate", "advanced", "expert")
+        },
+        "images": [
+            {
+                "id": uuid.uuid4(),
+                "lecture_id": uuid.uuid4(),
+                "filename": f"image_{i}.png",
+                "teacher_description": _text(rng, 15),
+                "ai_description": _text(rng, 80),
+                "node_id": "photosynthesis",
+                "position": i,
+                "original_url": f"https://example.com/{i}.png",
+                "display_url": f"https://example.com/{i}_display.png",
+                "thumbnail_url": f"https://example.com/{i}_thumb.png",
+                "file_size": 123456,
+                "mime_type": "image/png",
+                "created_at": now
+            }
+            for i in range(images)
+        ],
+        "completed_tabs": ["basic"],
+        "questions_correct": {"basic": [True, False, True]}
+    }
+
+
+async def _render(mode: str, field, content) -> bytes:
+    if mode == "direct":
+        return FastJSONResponse(content).body
+    encoded = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    response_class = JSONResponse if mode == "stdlib" else FastJSONResponse
+    return response_class(encoded).body
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    payloads = [
+        ("gradebook", GradebookResponse, gradebook(rng, args.grades)),
+        ("test detail", TestDetailResponse, test_detail(rng, args.lectures, 8, 10)),
+        ("lecture topic", None, topic_content(rng, args.images)),
+    ]
+
+    print(f"{'payload':<14} {'KB':>7} {'mode':<7} {'ms/req':>8} {'cpu ms':>8} {'speedup':>8}")
+    for name, model, content in payloads:
+        field = create_response_field(name="response", type_=model) if model else None
+        baseline = None
+        for mode in ("stdlib", "orjson", "direct"):
+            body = await _render(mode, field, content)
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            for _ in range(args.iterations):
+                await _render(mode, field, content)
+            wall_ms = (time.perf_counter() - wall_started) / args.iterations * 1000
+            cpu_ms = (time.process_time() - cpu_started) / args.iterations * 1000
+            baseline = baseline or wall_ms
+            print(f"{name:<14} {len(body) / 1024:>7.0f} {mode:<7} {wall_ms:>8.2f} {cpu_ms:>8.2f} {baseline / wall_ms:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API response serialization")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--grades", type=int, default=2000, help="Gradebook rows in the payload")
+    parser.add_argument("--lectures", type=int, default=10, help="Lectures in the test structure")
+    parser.add_argument("--images", type=int, default=20, help="Images in the lecture topic")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for API workers
+
+Spawns fresh interpreters and times how long ``import main`` takes (what a
+new worker pays before it can accept connections), then how long the
+background preload of the lazily imported clients takes on top of that.
+With --top, also lists the slowest top-level imports from -X importtime.
+
+No database or Redis is needed; the Supabase clients are built but make no
+network calls until used.
+
+Usage:
+    python scripts/benchmark_startup.py --runs 5 --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+MEASURE = """
+import time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from app.core.preload import _preload
+_preload()
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def _run_once() -> tuple:
+    output = subprocess.run(
+        [sys.executable, "-c", MEASURE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip().splitlines()[-1]
+    import_s, preload_s = (float(value) for value in output.split())
+    return import_s, preload_s
+
+
+def _slowest_imports(top: int) -> list:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Direct imports of main are indented one level (two spaces) past it
+        if name.startswith("   ") and not name.startswith("    "):
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API worker cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest top-level imports")
+    args = parser.parse_args()
+
+    results = [_run_once() for _ in range(args.runs)]
+    import_times = [r[0] * 1000 for r in results]
+    preload_times = [r[1] * 1000 for r in results]
+
+    print(f"{'phase':<22} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for name, times in (("import main", import_times), ("background preload", preload_times)):
+        print(f"{name:<22} {statistics.median(times):>10.0f} {min(times):>8.0f} {max(times):>8.0f}")
+
+    if args.top:
+        print("\nSlowest top-level imports:")
+        for ms, name in _slowest_imports(args.top):
+            print(f"  {ms:>8.0f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark fixture for trigram-indexed list search
+
+Loads a throwaway teacher with a few hundred thousand debate assignments and
+as many student accounts, then runs EXPLAIN ANALYZE on the debate list search
+and the admin user search exactly as the endpoints build them (see
+app/utils/search.py). Each query is explained twice: with the pg_trgm indexes
+from the add_trigram_search_indexes migration, and inside a rolled-back
+transaction with those indexes dropped, which is the plan the old ILIKE
+filters always got. All fixture rows are removed afterwards.
+
+Dropping an index locks its table until the rollback, so run this against a
+scratch or staging database, not production.
+
+Usage:
+    python scripts/benchmark_trigram_search.py --rows 300000 --term "unit 4217"
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.admin_simple import USER_SEARCH_COLUMNS
+from app.core.database import AsyncSessionLocal
+from app.models.debate import DebateAssignment
+from app.models.user import User
+from app.services.debate_service import DEBATE_SEARCH_COLUMNS
+from app.utils.search import search_condition, search_rank
+
+TRIGRAM_INDEXES = {
+    "debate": (
+        "idx_debate_assignments_title_trgm",
+        "idx_debate_assignments_topic_trgm",
+        "idx_debate_assignments_description_trgm",
+    ),
+    "users": (
+        "idx_users_email_trgm",
+        "idx_users_username_trgm",
+        "idx_users_full_name_trgm",
+    ),
+}
+
+TOPICS = [
+    "school uniforms", "social media", "homework limits", "year-round school",
+    "space exploration", "renewable energy", "zoos", "video games", "recess",
+    "cell phones in class", "electric cars", "four-day school week",
+]
+
+
+async def create_fixtures(run: str, rows: int):
+    teacher_id = uuid.uuid4()
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            text("""
+                INSERT INTO users (id, email, first_name, last_name, username, role)
+                VALUES (:id, :email, 'Bench', 'Teacher', :username, 'teacher')
+            """),
+            {"id": teacher_id, "email": f"bench-{run}@example.com", "username": f"bench-{run}"}
+        )
+        await db.execute(
+            text("""
+                INSERT INTO debate_assignments (teacher_id, title, topic, description, grade_level, subject)
+                SELECT
+                    :teacher_id,
+                    'Unit ' || g || ': ' || topics[1 + g % cardinality(topics)],
+                    'Should we change our approach to ' || topics[1 + (g / 7) % cardinality(topics)] || '?',
+                    'Debate prompt ' || md5(g::text),
+                    '6-8',
+                    'English'
+                FROM generate_series(1, :rows) AS g, CAST(:topics AS text[]) AS topics
+            """),
+            {"teacher_id": teacher_id, "topics": TOPICS, "rows": rows}
+        )
+        await db.execute(
+            text("""
+                INSERT INTO users (email, first_name, last_name, username, role)
+                SELECT
+                    'bench-' || :run || '-' || g || '@example.com',
+                    'Student' || (g % 997),
+                    'Bench' || md5(g::text),
+                    'bench-' || :run || '-' || g,
+                    'student'
+                FROM generate_series(1, :rows) AS g
+            """),
+            {"run": run, "rows": rows}
+        )
+        await db.commit()
+        await db.execute(text("ANALYZE debate_assignments"))
+        await db.execute(text("ANALYZE users"))
+        await db.commit()
+    return teacher_id
+
+
+async def remove_fixtures(run: str, teacher_id):
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("DELETE FROM debate_assignments WHERE teacher_id = :id"), {"id": teacher_id})
+        await db.execute(text("DELETE FROM users WHERE username LIKE :pattern"), {"pattern": f"bench-{run}%"})
+        await db.commit()
+
+
+def _compile(query) -> str:
+    # Named paramstyle so the literal LIKE patterns keep single percent signs
+    dialect = postgresql.dialect(paramstyle="named")
+    return str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def explain(sql: str, drop_indexes=()) -> tuple:
+    """EXPLAIN ANALYZE a query, optionally with some indexes dropped (rolled back)"""
+    async with AsyncSessionLocal() as db:
+        try:
+            for index in drop_indexes:
+                await db.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            started = time.perf_counter()
+            plan = (await db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))).scalars().all()
+            return plan, time.perf_counter() - started
+        finally:
+            await db.rollback()
+
+
+async def compare(label: str, query, indexes) -> None:
+    sql = _compile(query)
+    for heading, dropped in (("without trigram indexes", indexes), ("with trigram indexes", ())):
+        plan, elapsed = await explain(sql, dropped)
+        print(f"\n=== {label}, {heading} ({elapsed * 1000:.1f} ms)")
+        print("\n".join(plan))
+
+
+async def main(rows: int, term: str) -> None:
+    run = uuid.uuid4().hex[:8]
+    print(f"Loading {rows} debate assignments and {rows} users (run {run})...")
+    teacher_id = await create_fixtures(run, rows)
+    try:
+        debate_query = (
+            select(DebateAssignment)
+            .where(
+                DebateAssignment.teacher_id == teacher_id,
+                DebateAssignment.deleted_at.is_(None),
+                search_condition(term, *DEBATE_SEARCH_COLUMNS)
+            )
+            .order_by(search_rank(term, *DEBATE_SEARCH_COLUMNS).desc(), DebateAssignment.created_at.desc())
+            .limit(20)
+        )
+        await compare(f"debate list search for {term!r}", debate_query, TRIGRAM_INDEXES["debate"])
+
+        user_term = "student42 bench"
+        user_query = (
+            select(User)
+            .where(User.deleted_at.is_(None), search_condition(user_term, *USER_SEARCH_COLUMNS))
+            .order_by(search_rank(user_term, *USER_SEARCH_COLUMNS).desc(), User.created_at.desc())
+            .limit(50)
+        )
+        await compare(f"admin user search for {user_term!r}", user_query, TRIGRAM_INDEXES["users"])
+    finally:
+        await remove_fixtures(run, teacher_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=300000)
+    parser.add_argument("--term", default="unit 4217")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.term))
@@ -0,0 +1,5 @@
+"""
+Synthetic load-test harness for core student flows
+
+See scripts/loadtest/README.md for usage.
+"""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Local Gemini-compatible stub server for load testing
+
+Answers the REST generateContent call used by google.generativeai with a
+canned response after a configurable delay, so AI-backed endpoints can be
+driven at load without calling (or paying for) the real API.
+
+Point the backend at it with:
+
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8089
+
+Usage:
+    python -m scripts.loadtest.gemini_stub --port 8089 --latency-ms 800 --jitter-ms 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Plain-text reply that satisfies the line-based parsers used across the app:
+# UMARead question generation and answer evaluation, debate post scoring and
+# vocabulary story evaluation all pick out the lines they know about.
+DEFAULT_TEXT_RESPONSE = """Summary Question: What are the main events described in this section?
+Summary Answer: The section introduces the main characters and the problem they face. It sets up the conflict for the rest of the story.
+Comprehension Question: Why does the main character make the decision described in the passage?
+Comprehension Answer: Because they want to protect their family from the coming storm.
+Correct: yes
+Confidence: 0.9
+Feedback: Nice work connecting your answer to details from the text.
+CLARITY: 4
+EVIDENCE: 3
+LOGIC: 4
+PERSUASIVENESS: 3
+REBUTTAL: 3
+FEEDBACK: Clear position with some supporting evidence. Try adding a specific example.
+VOCABULARY: 32/40 - Most required words are used correctly.
+COHERENCE: 20/25 - The story is easy to follow.
+TONE: 16/20 - The tone mostly matches the prompt.
+CREATIVITY: 12/15 - Some original ideas.
+TOTAL: 80/100
+OVERALL: A solid story that uses the vocabulary well.
+SUGGESTION: Add more sensory detail to the setting."""
+
+# JSON reply for prompts that ask for JSON. Carries the keys expected by the
+# UMATest question generator, concept map evaluator and definition evaluator.
+DEFAULT_JSON_RESPONSE = {
+    "questions": [
+        {
+            "question_text": "Explain the main idea of this topic in your own words.",
+            "correct_answer": "The topic explains how the process works and why it matters.",
+            "explanation": "The answer restates the central idea of the content.",
+            "evaluation_rubric": "Full credit for identifying the central idea with one supporting detail.",
+            "source_excerpt": "The central idea of the content."
+        }
+    ],
+    "overall_score": 3.0,
+    "component_scores": {
+        component: {"score": 3, "feedback": "Good understanding with minor gaps."}
+        for component in ["definition", "synonyms", "antonyms", "context_theme", "connotation", "example_sentence"]
+    },
+    "overall_feedback": "Good work overall. Keep practicing.",
+    "areas_for_improvement": ["Add more detail to your example sentence."],
+    "score": 80,
+    "is_correct": True,
+    "feedback": "Good work overall."
+}
+
+
+def build_response_text(prompt_text: str, overrides: list) -> str:
+    for rule in overrides:
+        if rule["match"] in prompt_text:
+            return rule["text"]
+    if 'Respond with only "YES" or "NO"' in prompt_text:
+        return "YES"
+    if "ON_TOPIC" in prompt_text:
+        return "ON_TOPIC"
+    if "JSON" in prompt_text:
+        return json.dumps(DEFAULT_JSON_RESPONSE)
+    return DEFAULT_TEXT_RESPONSE
+
+
+def create_app(latency_ms: int, jitter_ms: int, error_rate: float, overrides: list) -> web.Application:
+    stats = {"requests": 0, "errors": 0}
+
+    async def generate_content(request: web.Request) -> web.Response:
+        stats["requests"] += 1
+        body = await request.json()
+        prompt_text = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+
+        delay = max(0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            return web.json_response(
+                {"error": {"code": 503, "message": "Stubbed overload", "status": "UNAVAILABLE"}},
+                status=503
+            )
+
+        text = build_response_text(prompt_text, overrides)
+        return web.json_response({
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt_text) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt_text) + len(text)) // 4
+            }
+        })
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response(stats)
+
+    app = web.Application(client_max_size=32 * 1024 * 1024)
+    app.router.add_post("/v1beta/models/{model}:generateContent", generate_content)
+    app.router.add_get("/stats", get_stats)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini-compatible stub server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=int, default=800, help="Mean response delay")
+    parser.add_argument("--jitter-ms", type=int, default=200, help="Uniform +/- jitter on the delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 503")
+    parser.add_argument("--responses", help='JSON file of [{"match": "...", "text": "..."}] overrides')
+    args = parser.parse_args()
+
+    overrides = []
+    if args.responses:
+        with open(args.responses) as f:
+            overrides = json.load(f)
+
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(
+        create_app(args.latency_ms, args.jitter_ms, args.error_rate, overrides),
+        host=args.host,
+        port=args.port
+    )
+
+
+if __name__ == "__main__":
+    main()
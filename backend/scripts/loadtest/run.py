@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Drive concurrent synthetic student sessions through the core flows
+
+Runs the FastAPI app in-process over httpx's ASGI transport, with the
+Supabase auth dependency replaced by a lookup of the seeded student, and
+reports throughput, p50/p95/p99 latency and DB queries per endpoint.
+AI calls go to the Gemini stub (scripts/loadtest/gemini_stub.py) through
+GEMINI_API_ENDPOINT, so DATABASE_URL and REDIS_URL must point at a
+disposable Postgres/Redis seeded with scripts/loadtest/seed.py.
+
+Usage:
+    python -m scripts.loadtest.run --manifest loadtest_manifest.json \\
+        --sessions 50 --duration 120 --start-stub --llm-latency-ms 800
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+FLOWS = ["umaread", "vocab", "debate", "umatest", "lecture"]
+
+DEBATE_POST = " ".join(
+    ["Starting school later would let students get the sleep that doctors recommend for teenagers."] * 6
+)
+
+# Number of SQL statements issued while serving the current request
+_query_count: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("loadtest_query_count", default=None)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Collects latency, status and DB query count per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client, name: str, method: str, url: str, user_id: str,
+                      ok_statuses=(200, 201), **kwargs):
+        counter = [0]
+        token = _query_count.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers={"X-Loadtest-User": user_id}, **kwargs)
+            status = response.status_code
+        except Exception:
+            response = None
+            status = 599
+        finally:
+            elapsed = time.perf_counter() - started
+            _query_count.reset(token)
+
+        self.latencies[name].append(elapsed)
+        self.queries[name].append(counter[0])
+        self.statuses[name][status] += 1
+        if status not in ok_statuses:
+            self.errors[name] += 1
+        return response if response is not None and status in ok_statuses else None
+
+    def report(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            queries = self.queries[name]
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "throughput_rps": round(len(values) / wall_seconds, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "avg_db_queries": round(sum(queries) / len(queries), 1),
+                "max_db_queries": max(queries),
+                "statuses": dict(self.statuses[name])
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "wall_seconds": round(wall_seconds, 1),
+            "total_requests": total,
+            "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0,
+            "endpoints": endpoints
+        }
+
+
+async def umaread_flow(client, rec: Recorder, student_id: str, room: dict):
+    base = f"/api/v1/student/umaread/assignments/{room['reading_id']}"
+    await rec.request(client, "GET umaread/start", "GET", f"{base}/start", student_id)
+    for chunk in range(1, min(room["reading_chunks"], 3) + 1):
+        await rec.request(client, "GET umaread/chunk", "GET", f"{base}/chunks/{chunk}", student_id)
+        for _ in range(2):  # summary, then comprehension
+            question = await rec.request(
+                client, "GET umaread/question", "GET", f"{base}/chunks/{chunk}/question", student_id,
+                ok_statuses=(200, 400)
+            )
+            if question is None or question.status_code == 400:
+                break
+            await rec.request(
+                client, "POST umaread/answer", "POST", f"{base}/chunks/{chunk}/answer", student_id,
+                json={"answer_text": "The family watches the flood rise and worries about the farm."}
+            )
+    await rec.request(client, "GET umaread/progress", "GET", f"{base}/progress", student_id)
+
+
+async def vocab_flow(client, rec: Recorder, student_id: str, room: dict):
+    base = f"/api/v1/student/vocabulary/{room['vocabulary_list_id']}"
+    await rec.request(client, "GET vocab/assignment", "GET", base, student_id)
+    await rec.request(client, "GET vocab/practice-status", "GET", f"{base}/practice/status", student_id)
+    await rec.request(client, "GET vocab/test-eligibility", "GET", f"{base}/test/eligibility", student_id)
+
+
+async def debate_flow(client, rec: Recorder, student_id: str, room: dict):
+    base = f"/api/v1/student/debate/{room['debate_id']}"
+    # 400 means the debate was already started by an earlier iteration
+    await rec.request(client, "POST debate/start", "POST", f"{base}/start", student_id, ok_statuses=(200, 400))
+    await rec.request(client, "GET debate/current", "GET", f"{base}/current", student_id)
+    await rec.request(
+        client, "POST debate/post", "POST", f"{base}/post", student_id,
+        ok_statuses=(200, 400),
+        json={"content": DEBATE_POST, "word_count": len(DEBATE_POST.split())}
+    )
+
+
+async def umatest_flow(client, rec: Recorder, student_id: str, room: dict):
+    started = await rec.request(
+        client, "POST umatest/start", "POST",
+        f"/api/v1/student/umatest/test/{room['test_assignment_id']}/start", student_id
+    )
+    if started is None:
+        return
+    attempt_id = started.json()["test_attempt_id"]
+    for index in range(room["test_questions"]):
+        await rec.request(
+            client, "POST umatest/save-answer", "POST",
+            f"/api/v1/student/umatest/test/{attempt_id}/save-answer", student_id,
+            json={"question_index": index, "answer": "Evaporation turns water into vapor.", "time_spent_seconds": 20}
+        )
+    await rec.request(client, "POST umatest/submit", "POST", f"/api/v1/student/umatest/test/{attempt_id}/submit", student_id)
+
+
+async def lecture_flow(client, rec: Recorder, student_id: str, room: dict):
+    base = f"/api/v1/umalecture/assignments/{room['lecture_assignment_id']}"
+    await rec.request(client, "GET lecture/start", "GET", f"{base}/start", student_id)
+    await rec.request(client, "GET lecture/topics", "GET", f"{base}/topics", student_id)
+    topic_id = random.choice(room["lecture_topics"])
+    await rec.request(client, "GET lecture/topic-content", "GET", f"{base}/topics/{topic_id}/content", student_id)
+    await rec.request(
+        client, "POST lecture/answer", "POST", f"{base}/topics/{topic_id}/answer", student_id,
+        json={"difficulty": "basic", "question_index": 0, "answer": "Water moves between the land, the sea and the sky."}
+    )
+
+
+FLOW_FUNCTIONS = {
+    "umaread": umaread_flow,
+    "vocab": vocab_flow,
+    "debate": debate_flow,
+    "umatest": umatest_flow,
+    "lecture": lecture_flow,
+}
+
+
+async def student_session(client, rec: Recorder, student_id: str, room: dict, flows: List[str], deadline: float):
+    while time.monotonic() < deadline:
+        flow = random.choice(flows)
+        await FLOW_FUNCTIONS[flow](client, rec, student_id, room)
+        # Think time between activities
+        await asyncio.sleep(random.uniform(0.1, 0.5))
+
+
+async def run(args) -> dict:
+    os.environ["GEMINI_API_ENDPOINT"] = args.stub_url
+
+    import httpx
+    from fastapi import Depends, HTTPException, Request
+    from sqlalchemy import event, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from main import app
+    from app.core.database import engine, get_db
+    from app.models.user import User
+    from app.utils.supabase_deps import get_current_user_supabase
+
+    async def loadtest_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+        result = await db.execute(select(User).where(User.id == request.headers["X-Loadtest-User"]))
+        user = result.scalar_one_or_none()
+        if not user:
+            raise HTTPException(status_code=401, detail="Unknown load test user")
+        return user
+
+    app.dependency_overrides[get_current_user_supabase] = loadtest_user
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _query_count.get()
+        if counter is not None:
+            counter[0] += 1
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+
+    sessions = []
+    for room in manifest["classrooms"]:
+        for student_id in room["student_ids"]:
+            sessions.append((student_id, room))
+    random.shuffle(sessions)
+    sessions = sessions[:args.sessions]
+
+    rec = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+            started = time.monotonic()
+            deadline = started + args.duration
+            await asyncio.gather(*[
+                student_session(client, rec, student_id, room, args.flows, deadline)
+                for student_id, room in sessions
+            ])
+            wall = time.monotonic() - started
+
+    report = rec.report(wall)
+    report["sessions"] = len(sessions)
+    report["flows"] = args.flows
+    return report
+
+
+def print_report(report: dict):
+    print()
+    print(f"Sessions: {report['sessions']}  Flows: {', '.join(report['flows'])}")
+    print(f"Wall time: {report['wall_seconds']}s  Requests: {report['total_requests']}  "
+          f"Throughput: {report['throughput_rps']} req/s")
+    print()
+    header = f"{'endpoint':<28}{'reqs':>7}{'errs':>6}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'db q':>7}{'max q':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in report["endpoints"].items():
+        print(
+            f"{name:<28}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput_rps']:>8}"
+            f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+            f"{stats['avg_db_queries']:>7}{stats['max_db_queries']:>7}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test core student flows")
+    parser.add_argument("--manifest", default="loadtest_manifest.json")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent student sessions")
+    parser.add_argument("--duration", type=int, default=60, help="Seconds to run")
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"Comma-separated subset of {FLOWS}")
+    parser.add_argument("--stub-url", default="http://127.0.0.1:8089")
+    parser.add_argument("--start-stub", action="store_true", help="Launch the Gemini stub as a subprocess")
+    parser.add_argument("--llm-latency-ms", type=int, default=800)
+    parser.add_argument("--llm-jitter-ms", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for flow selection")
+    parser.add_argument("--json-output", help="Also write the report as JSON")
+    args = parser.parse_args()
+    args.flows = [f.strip() for f in args.flows.split(",") if f.strip()]
+    unknown = set(args.flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"Unknown flows: {', '.join(sorted(unknown))}")
+    random.seed(args.seed)
+
+    stub = None
+    if args.start_stub:
+        port = args.stub_url.rsplit(":", 1)[-1].strip("/")
+        stub = subprocess.Popen([
+            sys.executable, "-m", "scripts.loadtest.gemini_stub",
+            "--port", port,
+            "--latency-ms", str(args.llm_latency_ms),
+            "--jitter-ms", str(args.llm_jitter_ms)
+        ])
+        time.sleep(2)
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if stub:
+            stub.terminate()
+
+    print_report(report)
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
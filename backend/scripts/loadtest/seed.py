@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Seed a synthetic dataset for load testing
+
+Creates a teacher per classroom, enrolled students, and one published
+UMARead reading, vocabulary list, UMALecture, debate and hand-built UMATest
+assigned to every classroom. Writes the ids the load runner needs to a JSON
+manifest.
+
+Run against a disposable database - rows are tagged with --tag in emails and
+titles but are not cleaned up.
+
+Usage:
+    python -m scripts.loadtest.seed --classrooms 5 --students 30 --output loadtest_manifest.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import sys
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.core.database import AsyncSessionLocal
+from app.models.user import User, UserRole
+from app.models.classroom import Classroom, ClassroomStudent, ClassroomAssignment
+from app.models.reading import ReadingAssignment, ReadingChunk
+from app.models.vocabulary import VocabularyList, VocabularyWord, VocabularyStatus, DefinitionSource
+from app.models.debate import DebateAssignment
+from app.models.umatest import TestAssignment, HandBuiltTestQuestion
+
+PARAGRAPH = (
+    "The river had risen overnight, and by morning the lower fields were under water. "
+    "Mara watched from the porch as her father walked the fence line, counting the posts "
+    "that had washed away. Nobody in the valley remembered a spring this wet, and the "
+    "older farmers said the mountain snow had melted all at once. "
+)
+
+VOCABULARY = [
+    ("abundant", "existing in large quantities"),
+    ("benevolent", "well meaning and kindly"),
+    ("candid", "truthful and straightforward"),
+    ("diligent", "showing care in one's work"),
+    ("eloquent", "fluent or persuasive in speaking"),
+    ("frugal", "sparing or economical with money"),
+    ("gregarious", "fond of company; sociable"),
+    ("hinder", "to create difficulties for"),
+    ("impartial", "treating all rivals equally"),
+    ("jubilant", "feeling great happiness"),
+    ("keen", "having or showing eagerness"),
+    ("lament", "to express sorrow"),
+    ("meticulous", "showing great attention to detail"),
+    ("novice", "a person new to an activity"),
+    ("obsolete", "no longer produced or used"),
+]
+
+DIFFICULTY_LEVELS = ["basic", "intermediate", "advanced", "expert"]
+
+
+def _class_code() -> str:
+    return "".join(random.choices(string.ascii_uppercase + string.digits, k=8))
+
+
+def _reading_content(chunks: int) -> str:
+    return "\n".join(
+        f"<chunk>{PARAGRAPH * 3}</chunk>" for _ in range(chunks)
+    )
+
+
+def _lecture_structure(topics: int) -> dict:
+    structure = {"topics": {}}
+    for t in range(1, topics + 1):
+        topic_id = f"topic_{t}"
+        structure["topics"][topic_id] = {
+            "title": f"Topic {t}: The Water Cycle, Part {t}",
+            "difficulty_levels": {
+                level: {
+                    "content": PARAGRAPH * 4,
+                    "questions": [
+                        {
+                            "question": f"What is the main idea of part {t} at the {level} level?",
+                            "question_type": "short_answer",
+                            "difficulty": level,
+                            "correct_answer": "Water moves between the land, the sea and the sky.",
+                            "options": None,
+                            "uses_images": False
+                        }
+                        for _ in range(3)
+                    ]
+                }
+                for level in DIFFICULTY_LEVELS
+            }
+        }
+    return structure
+
+
+async def seed(args) -> dict:
+    manifest = {"tag": args.tag, "classrooms": []}
+
+    async with AsyncSessionLocal() as db:
+        for c in range(args.classrooms):
+            teacher = User(
+                email=f"loadtest+{args.tag}-t{c}@umadex.test",
+                first_name="Load",
+                last_name=f"Teacher {c}",
+                username=f"loadtest_{args.tag}_t{c}",
+                role=UserRole.TEACHER
+            )
+            db.add(teacher)
+            await db.flush()
+
+            classroom = Classroom(
+                name=f"Load Test {args.tag} Period {c + 1}",
+                teacher_id=teacher.id,
+                class_code=_class_code()
+            )
+            db.add(classroom)
+            await db.flush()
+
+            students = []
+            for s in range(args.students):
+                student = User(
+                    email=f"loadtest+{args.tag}-c{c}-s{s}@umadex.test",
+                    first_name="Load",
+                    last_name=f"Student {c}-{s}",
+                    username=f"loadtest_{args.tag}_c{c}_s{s}",
+                    role=UserRole.STUDENT
+                )
+                db.add(student)
+                students.append(student)
+            await db.flush()
+            for student in students:
+                db.add(ClassroomStudent(classroom_id=classroom.id, student_id=student.id))
+
+            # UMARead
+            reading = ReadingAssignment(
+                teacher_id=teacher.id,
+                assignment_title=f"Load Test Reading {args.tag}-{c}",
+                work_title="The Flood",
+                author="Load Test",
+                grade_level="7-8",
+                work_type="fiction",
+                literary_form="prose",
+                genre="Realistic Fiction",
+                subject="English Language Arts",
+                raw_content=_reading_content(args.chunks),
+                total_chunks=args.chunks,
+                status="published",
+                assignment_type="UMARead"
+            )
+            db.add(reading)
+            await db.flush()
+            for order in range(1, args.chunks + 1):
+                db.add(ReadingChunk(
+                    assignment_id=reading.id,
+                    chunk_order=order,
+                    content=PARAGRAPH * 3
+                ))
+            db.add(ClassroomAssignment(
+                classroom_id=classroom.id,
+                assignment_id=reading.id,
+                assignment_type="reading"
+            ))
+
+            # UMAVocab
+            vocab_list = VocabularyList(
+                teacher_id=teacher.id,
+                title=f"Load Test Vocabulary {args.tag}-{c}",
+                context_description="Words from the unit reading",
+                grade_level="7-8",
+                subject_area="English Language Arts",
+                status=VocabularyStatus.PUBLISHED
+            )
+            db.add(vocab_list)
+            await db.flush()
+            for position, (word, definition) in enumerate(VOCABULARY[:args.vocab_words], start=1):
+                db.add(VocabularyWord(
+                    list_id=vocab_list.id,
+                    word=word,
+                    teacher_definition=definition,
+                    teacher_example_1=f"The {word} example sentence goes here.",
+                    teacher_example_2=f"Another sentence that uses {word}.",
+                    definition_source=DefinitionSource.TEACHER,
+                    examples_source=DefinitionSource.TEACHER,
+                    position=position
+                ))
+            db.add(ClassroomAssignment(
+                classroom_id=classroom.id,
+                vocabulary_list_id=vocab_list.id,
+                assignment_type="vocabulary"
+            ))
+
+            # UMALecture
+            lecture = ReadingAssignment(
+                teacher_id=teacher.id,
+                assignment_title=f"Load Test Lecture {args.tag}-{c}",
+                work_title="The Water Cycle",
+                grade_level="7-8",
+                work_type="non-fiction",
+                literary_form="prose",
+                genre="Lecture",
+                subject="Science",
+                raw_content=json.dumps({
+                    "topic": "The Water Cycle",
+                    "learning_objectives": ["Describe the water cycle"],
+                    "lecture_structure": _lecture_structure(args.lecture_topics)
+                }),
+                topic_manifest={
+                    "topic_count": args.lecture_topics,
+                    "topic_ids": [f"topic_{t}" for t in range(1, args.lecture_topics + 1)]
+                },
+                status="published",
+                assignment_type="UMALecture"
+            )
+            db.add(lecture)
+            await db.flush()
+            lecture_ca = ClassroomAssignment(
+                classroom_id=classroom.id,
+                assignment_id=lecture.id,
+                assignment_type="UMALecture"
+            )
+            db.add(lecture_ca)
+
+            # UMADebate
+            debate = DebateAssignment(
+                teacher_id=teacher.id,
+                title=f"Load Test Debate {args.tag}-{c}",
+                topic="Schools should start later in the morning",
+                description="Argue for or against a later school start time.",
+                grade_level="7-8",
+                subject="Social Studies",
+                content_moderation_enabled=True
+            )
+            db.add(debate)
+            await db.flush()
+            db.add(ClassroomAssignment(
+                classroom_id=classroom.id,
+                assignment_id=debate.id,
+                assignment_type="debate"
+            ))
+
+            # UMATest
+            test = TestAssignment(
+                teacher_id=teacher.id,
+                test_title=f"Load Test UMATest {args.tag}-{c}",
+                test_description="Hand-built load test",
+                test_type="hand_built",
+                attempt_limit=1000,
+                status="published",
+                test_structure={}
+            )
+            db.add(test)
+            await db.flush()
+            for position in range(1, args.test_questions + 1):
+                db.add(HandBuiltTestQuestion(
+                    test_assignment_id=test.id,
+                    question_text=f"Question {position}: explain one stage of the water cycle.",
+                    correct_answer="Evaporation turns liquid water into vapor.",
+                    explanation="Evaporation is driven by heat from the sun.",
+                    evaluation_rubric="Full credit for naming a stage and describing it.",
+                    difficulty_level=DIFFICULTY_LEVELS[position % len(DIFFICULTY_LEVELS)],
+                    position=position
+                ))
+            test_ca = ClassroomAssignment(
+                classroom_id=classroom.id,
+                assignment_id=test.id,
+                assignment_type="test"
+            )
+            db.add(test_ca)
+
+            await db.flush()
+            manifest["classrooms"].append({
+                "classroom_id": str(classroom.id),
+                "teacher_id": str(teacher.id),
+                "student_ids": [str(s.id) for s in students],
+                "reading_id": str(reading.id),
+                "reading_chunks": args.chunks,
+                "vocabulary_list_id": str(vocab_list.id),
+                "lecture_id": str(lecture.id),
+                "lecture_assignment_id": lecture_ca.id,
+                "lecture_topics": [f"topic_{t}" for t in range(1, args.lecture_topics + 1)],
+                "debate_id": str(debate.id),
+                "test_assignment_id": test_ca.id,
+                "test_questions": args.test_questions
+            })
+            print(f"Seeded classroom {c + 1}/{args.classrooms} with {args.students} students")
+
+        await db.commit()
+
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic dataset for load testing")
+    parser.add_argument("--classrooms", type=int, default=5)
+    parser.add_argument("--students", type=int, default=30, help="Students per classroom")
+    parser.add_argument("--chunks", type=int, default=12, help="Chunks per reading")
+    parser.add_argument("--vocab-words", type=int, default=10)
+    parser.add_argument("--lecture-topics", type=int, default=4)
+    parser.add_argument("--test-questions", type=int, default=10)
+    parser.add_argument("--tag", default=uuid.uuid4().hex[:6], help="Tag used to make seeded rows unique")
+    parser.add_argument("--output", default="loadtest_manifest.json")
+    args = parser.parse_args()
+
+    manifest = asyncio.run(seed(args))
+    with open(args.output, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Wrote manifest to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
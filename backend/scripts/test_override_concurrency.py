@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Concurrency test for test override code redemption
+
+Creates a throwaway teacher, classroom and enrolled students, issues one
+override code with a small max_uses, then fires many redemptions at it at
+once, each from its own database session (and so its own connection). Exactly
+max_uses of them must succeed, current_uses must equal max_uses and there must
+be one usage row per success. All rows created are removed afterwards.
+
+Usage:
+    python scripts/test_override_concurrency.py --students 50 --max-uses 5
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal
+from app.schemas.test_schedule import OverrideCodeCreate, ValidateOverrideRequest
+from app.services.test_schedule import TestScheduleService
+
+
+async def create_fixtures(students: int):
+    run = uuid.uuid4().hex[:8]
+    teacher_id = uuid.uuid4()
+    classroom_id = uuid.uuid4()
+    student_ids = [uuid.uuid4() for _ in range(students)]
+    attempt_ids = [uuid.uuid4() for _ in range(students)]
+
+    async with AsyncSessionLocal() as db:
+        users = [(teacher_id, "teacher")] + [(student_id, "student") for student_id in student_ids]
+        for i, (user_id, role) in enumerate(users):
+            await db.execute(
+                text("""
+                    INSERT INTO users (id, email, first_name, last_name, username, role)
+                    VALUES (:id, :email, 'Override', 'Test', :username, CAST(:role AS user_role))
+                """),
+                {
+                    "id": user_id,
+                    "email": f"override-{run}-{i}@example.com",
+                    "username": f"override-{run}-{i}",
+                    "role": role
+                }
+            )
+        await db.execute(
+            text("""
+                INSERT INTO classrooms (id, teacher_id, name, class_code)
+                VALUES (:id, :teacher_id, 'Override concurrency test', :code)
+            """),
+            {"id": classroom_id, "teacher_id": teacher_id, "code": run.upper()}
+        )
+        for student_id, attempt_id in zip(student_ids, attempt_ids):
+            await db.execute(
+                text("INSERT INTO classroom_students (classroom_id, student_id) VALUES (:classroom_id, :student_id)"),
+                {"classroom_id": classroom_id, "student_id": student_id}
+            )
+            await db.execute(
+                text("INSERT INTO student_test_attempts (id, student_id) VALUES (:id, :student_id)"),
+                {"id": attempt_id, "student_id": student_id}
+            )
+        await db.commit()
+
+    return teacher_id, classroom_id, list(zip(student_ids, attempt_ids))
+
+
+async def remove_fixtures(teacher_id, classroom_id, students):
+    student_ids = [student_id for student_id, _ in students]
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("DELETE FROM classroom_test_overrides WHERE classroom_id = :id"), {"id": classroom_id})
+        await db.execute(text("DELETE FROM student_test_attempts WHERE student_id = ANY(:ids)"), {"ids": student_ids})
+        await db.execute(text("DELETE FROM classrooms WHERE id = :id"), {"id": classroom_id})
+        await db.execute(text("DELETE FROM users WHERE id = ANY(:ids)"), {"ids": student_ids + [teacher_id]})
+        await db.commit()
+
+
+async def redeem(code: str, student_id, attempt_id, start: asyncio.Event):
+    async with AsyncSessionLocal() as db:
+        await start.wait()
+        return await TestScheduleService.validate_and_use_override(
+            db,
+            ValidateOverrideRequest(
+                # Mixed case on purpose; codes are matched case-insensitively
+                override_code=code.lower(),
+                student_id=student_id,
+                test_attempt_id=attempt_id
+            )
+        )
+
+
+async def main(students: int, max_uses: int) -> bool:
+    teacher_id, classroom_id, enrolled = await create_fixtures(students)
+    try:
+        async with AsyncSessionLocal() as db:
+            override = await TestScheduleService.generate_override_code(
+                db,
+                teacher_id,
+                OverrideCodeCreate(classroom_id=classroom_id, reason="Concurrency test", max_uses=max_uses)
+            )
+            code, override_id = override.override_code, override.id
+        print(f"Issued code {code} with max_uses={max_uses}; redeeming from {students} sessions at once")
+
+        start = asyncio.Event()
+        tasks = [
+            asyncio.create_task(redeem(code, student_id, attempt_id, start))
+            for student_id, attempt_id in enrolled
+        ]
+        await asyncio.sleep(0.5)
+        start.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        outcomes = Counter(r["message"] for r in results if not isinstance(r, Exception))
+        for message, count in outcomes.most_common():
+            print(f"  {count:4d}  {message}")
+        for error in errors[:5]:
+            print(f"  error: {error!r}")
+
+        async with AsyncSessionLocal() as db:
+            current_uses = (await db.execute(
+                text("SELECT current_uses FROM classroom_test_overrides WHERE id = :id"), {"id": override_id}
+            )).scalar()
+            usage_rows = (await db.execute(
+                text("SELECT COUNT(*) FROM test_override_usage WHERE override_id = :id"), {"id": override_id}
+            )).scalar()
+
+        successes = sum(1 for r in results if not isinstance(r, Exception) and r["valid"])
+        expected = min(max_uses, students)
+        print(f"successes={successes} current_uses={current_uses} usage_rows={usage_rows} (expected {expected})")
+
+        passed = not errors and successes == current_uses == usage_rows == expected
+        print("PASS" if passed else "FAIL")
+        return passed
+    finally:
+        await remove_fixtures(teacher_id, classroom_id, enrolled)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--students", type=int, default=50)
+    parser.add_argument("--max-uses", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.students, args.max_uses)) else 1)
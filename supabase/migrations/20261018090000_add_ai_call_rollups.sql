@@ -0,0 +1,29 @@
+-- Add ai_call_rollups table for AI call telemetry
+-- Hourly per-feature, per-model totals flushed from the in-process aggregator
+
+CREATE TABLE IF NOT EXISTS ai_call_rollups (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    bucket_start TIMESTAMPTZ NOT NULL,
+    feature VARCHAR(100) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    cache_hits INTEGER NOT NULL DEFAULT 0,
+    cache_misses INTEGER NOT NULL DEFAULT 0,
+    prompt_chars BIGINT NOT NULL DEFAULT 0,
+    response_chars BIGINT NOT NULL DEFAULT 0,
+    prompt_tokens BIGINT NOT NULL DEFAULT 0,
+    output_tokens BIGINT NOT NULL DEFAULT 0,
+    latency_ms_total BIGINT NOT NULL DEFAULT 0,
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    -- One row per hour bucket, feature and model; the flush upserts into it
+    CONSTRAINT uq_ai_call_rollups_bucket_feature_model UNIQUE (bucket_start, feature, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_call_rollups_feature_bucket ON ai_call_rollups(feature, bucket_start);
+
+COMMENT ON TABLE ai_call_rollups IS 'Hourly AI call telemetry (latency, tokens, cache hits, estimated cost) per feature and model';
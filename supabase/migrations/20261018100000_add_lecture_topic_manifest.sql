@@ -0,0 +1,26 @@
+-- Add topic_manifest to reading_assignments for UMALecture reports
+-- Holds {"topic_count": n, "topic_ids": [...]} so progress reports can count
+-- topics without loading and parsing the full lecture raw_content
+
+ALTER TABLE reading_assignments
+ADD COLUMN IF NOT EXISTS topic_manifest JSONB;
+
+-- Backfill existing lectures from the stored lecture structure. The CTE is
+-- materialized so the jsonb cast only runs on UMALecture rows (UMARead rows
+-- hold markup, not JSON)
+WITH lectures AS MATERIALIZED (
+    SELECT id, raw_content::jsonb -> 'lecture_structure' -> 'topics' AS topics
+    FROM reading_assignments
+    WHERE assignment_type = 'UMALecture'
+    AND topic_manifest IS NULL
+)
+UPDATE reading_assignments ra
+SET topic_manifest = jsonb_build_object(
+    'topic_count', (SELECT COUNT(*) FROM jsonb_object_keys(l.topics)),
+    'topic_ids', COALESCE((SELECT jsonb_agg(k) FROM jsonb_object_keys(l.topics) AS k), '[]'::jsonb)
+)
+FROM lectures l
+WHERE ra.id = l.id
+AND jsonb_typeof(l.topics) = 'object';
+
+COMMENT ON COLUMN reading_assignments.topic_manifest IS 'UMALecture topic count and ids, written whenever the lecture structure is saved or published';
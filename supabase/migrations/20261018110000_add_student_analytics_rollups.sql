@@ -0,0 +1,18 @@
+-- Add student_analytics_rollups for the teacher student-analytics view
+-- One row per student and module, refreshed in the background when the
+-- student completes work, so the view no longer scans every attempt table
+
+CREATE TABLE IF NOT EXISTS student_analytics_rollups (
+    student_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    module VARCHAR(20) NOT NULL CHECK (module IN ('umaread', 'umavocab', 'umadebate', 'umawrite', 'umatest')),
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    average_score NUMERIC(6, 2),
+    time_spent_minutes INTEGER,
+    current_difficulty INTEGER,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (student_id, module)
+);
+
+COMMENT ON TABLE student_analytics_rollups IS 'Per-student, per-module analytics (completion counts, averages, difficulty, time spent) with the full module payload';
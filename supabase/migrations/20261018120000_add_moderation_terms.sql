@@ -0,0 +1,39 @@
+-- Add moderation_terms for UMADebate content moderation
+-- Word lists are compiled into one matcher per worker and reloaded when
+-- this table changes, so lists can be edited without a restart
+
+CREATE TABLE IF NOT EXISTS moderation_terms (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    category VARCHAR(20) NOT NULL CHECK (category IN ('profanity', 'inappropriate', 'off_topic')),
+    term VARCHAR(200) NOT NULL,
+    -- 'word' matches whole words or phrases, 'substring' matches anywhere in the text
+    match_type VARCHAR(20) NOT NULL DEFAULT 'word' CHECK (match_type IN ('word', 'substring')),
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT uq_moderation_terms_category_term UNIQUE (category, term)
+);
+
+CREATE TRIGGER update_moderation_terms_updated_at
+    BEFORE UPDATE ON moderation_terms
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Seed with the lists that were previously hard-coded in the service
+INSERT INTO moderation_terms (category, term, match_type) VALUES
+    ('profanity', 'bad_word_1', 'word'),
+    ('profanity', 'bad_word_2', 'word'),
+    ('inappropriate', 'threat', 'word'),
+    ('inappropriate', 'violence', 'word'),
+    ('inappropriate', 'attack', 'word'),
+    ('inappropriate', 'stupid', 'word'),
+    ('inappropriate', 'dumb', 'word'),
+    ('inappropriate', 'idiot', 'word'),
+    ('off_topic', 'homework', 'substring'),
+    ('off_topic', 'test', 'substring'),
+    ('off_topic', 'grade', 'substring'),
+    ('off_topic', 'unrelated', 'substring')
+ON CONFLICT (category, term) DO NOTHING;
+
+COMMENT ON TABLE moderation_terms IS 'Debate moderation word lists; workers poll for changes and recompile their matcher';
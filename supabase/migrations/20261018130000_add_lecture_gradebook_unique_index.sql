@@ -0,0 +1,17 @@
+-- One gradebook row per student, classroom and lecture
+-- UMALecture progress updates upsert the student's grade as tabs are
+-- completed (INSERT ... ON CONFLICT), which needs a unique index to target
+
+-- Keep only the highest-scoring row of any existing duplicates
+DELETE FROM gradebook_entries ge
+USING gradebook_entries other
+WHERE ge.assignment_type = 'umalecture'
+AND other.assignment_type = 'umalecture'
+AND other.student_id = ge.student_id
+AND other.classroom_id = ge.classroom_id
+AND other.assignment_id = ge.assignment_id
+AND (other.score_percentage, other.id) > (ge.score_percentage, ge.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_gradebook_entries_umalecture_unique
+ON gradebook_entries(student_id, classroom_id, assignment_id)
+WHERE assignment_type = 'umalecture';
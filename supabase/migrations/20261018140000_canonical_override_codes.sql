@@ -0,0 +1,22 @@
+-- Store test override codes in one canonical (upper) case
+-- Validation looks codes up with a plain equality on the unique index
+-- instead of comparing UPPER(override_code), and redeems them with a
+-- single conditional UPDATE that also records the usage row
+
+UPDATE classroom_test_overrides
+SET override_code = UPPER(TRIM(override_code))
+WHERE override_code <> UPPER(TRIM(override_code));
+
+ALTER TABLE classroom_test_overrides
+DROP CONSTRAINT IF EXISTS canonical_override_code;
+
+ALTER TABLE classroom_test_overrides
+ADD CONSTRAINT canonical_override_code CHECK (override_code = UPPER(override_code));
+
+-- The UNIQUE constraint already indexes override_code
+DROP INDEX IF EXISTS idx_classroom_test_overrides_code;
+
+-- Usage rows reference the test attempt they unlocked (the application
+-- model has always written this column)
+ALTER TABLE test_override_usage
+ADD COLUMN IF NOT EXISTS test_attempt_id UUID REFERENCES student_test_attempts(id);
@@ -0,0 +1,8 @@
+-- Covering index for a student's attempts per UMARead test
+-- The available-tests listing counts a student's finished attempts per test
+-- and picks the latest one in the same query; with id included the lookup
+-- is an index-only scan
+
+CREATE INDEX IF NOT EXISTS idx_student_test_attempts_student_test_status
+ON student_test_attempts(student_id, assignment_test_id, status, created_at DESC)
+INCLUDE (id);
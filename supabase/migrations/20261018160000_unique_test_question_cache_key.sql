@@ -0,0 +1,24 @@
+-- Enforce one test_question_cache row per cache key
+-- UMATest generation probes the cache for all of a test's keys in one query
+-- and writes new entries with a single INSERT ... ON CONFLICT, which needs
+-- the key to be unique (the application model has always declared it so)
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'unique_test_question_cache'
+    ) THEN
+        -- Keep the newest entry of any duplicates
+        DELETE FROM test_question_cache c
+        USING test_question_cache newer
+        WHERE newer.lecture_id = c.lecture_id
+        AND newer.topic_id = c.topic_id
+        AND newer.difficulty_level IS NOT DISTINCT FROM c.difficulty_level
+        AND newer.content_hash = c.content_hash
+        AND (COALESCE(newer.generation_timestamp, '-infinity'), newer.id) > (COALESCE(c.generation_timestamp, '-infinity'), c.id);
+
+        ALTER TABLE test_question_cache
+        ADD CONSTRAINT unique_test_question_cache
+        UNIQUE (lecture_id, topic_id, difficulty_level, content_hash);
+    END IF;
+END $$;
@@ -0,0 +1,54 @@
+-- Trigram indexes for list search
+-- Teacher and admin listings search with ILIKE '%term%' across several
+-- columns (see app/utils/search.py). A gin_trgm_ops index answers such a
+-- pattern for its column, and an OR over indexed columns becomes a BitmapOr,
+-- so search no longer scans a tenant's whole history
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- UMADebate
+CREATE INDEX IF NOT EXISTS idx_debate_assignments_title_trgm
+ON debate_assignments USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_debate_assignments_topic_trgm
+ON debate_assignments USING gin (topic gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_debate_assignments_description_trgm
+ON debate_assignments USING gin (description gin_trgm_ops);
+
+-- Users: first and last name are searched as one "first last" string
+-- (USER_FULL_NAME), which must match this expression exactly
+CREATE INDEX IF NOT EXISTS idx_users_email_trgm
+ON users USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_username_trgm
+ON users USING gin (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_users_full_name_trgm
+ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops);
+
+-- UMARead / UMALecture
+CREATE INDEX IF NOT EXISTS idx_reading_assignments_assignment_title_trgm
+ON reading_assignments USING gin (assignment_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_reading_assignments_work_title_trgm
+ON reading_assignments USING gin (work_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_reading_assignments_author_trgm
+ON reading_assignments USING gin (author gin_trgm_ops);
+
+-- UMAVocab
+CREATE INDEX IF NOT EXISTS idx_vocabulary_lists_title_trgm
+ON vocabulary_lists USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_lists_context_description_trgm
+ON vocabulary_lists USING gin (context_description gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_lists_subject_area_trgm
+ON vocabulary_lists USING gin (subject_area gin_trgm_ops);
+
+-- UMAWrite
+CREATE INDEX IF NOT EXISTS idx_writing_assignments_title_trgm
+ON writing_assignments USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_writing_assignments_prompt_text_trgm
+ON writing_assignments USING gin (prompt_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_writing_assignments_subject_trgm
+ON writing_assignments USING gin (subject gin_trgm_ops);
+
+-- UMATest
+CREATE INDEX IF NOT EXISTS idx_test_assignments_test_title_trgm
+ON test_assignments USING gin (test_title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_test_assignments_test_description_trgm
+ON test_assignments USING gin (test_description gin_trgm_ops);
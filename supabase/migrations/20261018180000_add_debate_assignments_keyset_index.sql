@@ -0,0 +1,14 @@
+-- Keyset index for the teacher debate assignment listing
+-- The listing orders by (created_at, id) newest first and continues from an
+-- opaque cursor with (created_at, id) < (:created_at, :id), so each page is a
+-- range scan of one teacher's slice of this index instead of an OFFSET that
+-- reads and discards every earlier row. The partial index serves the default
+-- listing, which hides archived assignments; the full one serves
+-- include_archived and the total count
+
+CREATE INDEX IF NOT EXISTS idx_debate_assignments_teacher_active_listing
+ON debate_assignments (teacher_id, created_at DESC, id DESC)
+WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_debate_assignments_teacher_listing
+ON debate_assignments (teacher_id, created_at DESC, id DESC);